@@ -0,0 +1,229 @@
+"""
+Catálogo de habilidades BNCC em memória
+
+A tabela ``bncc_habilidades`` (alguns milhares de linhas) é lida inteira uma
+vez por processo e indexada por componente (``componente_codigo``), ano/bloco
+(``ano_bloco``) e código, com as descrições normalizadas sem acentos para
+busca por trecho. Os filtros dos comboboxes de habilidade passam a ser
+resolvidos em memória, sem consulta e sem o antigo ``LIMIT 500``.
+
+A cópia é guardada também no cache em disco (:mod:`src.utils.cache_disco`),
+validada por ``COUNT(*)``/``MAX(updated_at)`` da tabela — uma consulta
+simples, refeita no máximo a cada ``INTERVALO_VALIDACAO`` segundos.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from db.connection import get_cursor
+from src.core.config_logs import get_logger
+from src.utils.cache import _CACHE_MISS
+from src.utils.cache_disco import cache_disco
+
+from .indice_busca import normalizar_texto
+
+logger = get_logger(__name__)
+
+# Incrementar quando as colunas guardadas mudarem
+VERSAO_CATALOGO = 1
+
+# A tabela só muda pelo importador; conferir o marcador com esta frequência
+INTERVALO_VALIDACAO = 600.0
+
+# Tamanho da descrição nos rótulos dos comboboxes
+LARGURA_ROTULO = 80
+
+_QUERY_MARCADOR = "SELECT COUNT(*) AS total, MAX(updated_at) AS atualizado_em FROM bncc_habilidades"
+_QUERY_HABILIDADES = (
+    "SELECT codigo, descricao, componente_codigo, ano_bloco, etapa_sigla "
+    "FROM bncc_habilidades ORDER BY codigo"
+)
+
+# Separador entre descrições no texto de busca (não aparece após normalizar)
+_SEP = '\x00'
+
+
+class Habilidade(NamedTuple):
+    codigo: str
+    descricao: str
+    componente: Optional[str]
+    ano_bloco: Optional[str]
+    etapa: Optional[str]
+
+
+def rotulo(habilidade: Habilidade, largura: int = LARGURA_ROTULO) -> str:
+    """Texto "CODIGO - Descrição resumida" usado nos comboboxes."""
+    descricao = habilidade.descricao
+    if len(descricao) > largura:
+        descricao = descricao[:largura - 3] + "..."
+    return f"{habilidade.codigo} - {descricao}"
+
+
+class CatalogoBNCC:
+    """Habilidades indexadas por componente, ano/bloco, código e descrição."""
+
+    def __init__(self, habilidades: Iterable[Habilidade]):
+        self.habilidades: List[Habilidade] = sorted(habilidades, key=lambda h: h.codigo.upper())
+        self._codigos: List[str] = [h.codigo.upper() for h in self.habilidades]
+        self._por_codigo: Dict[str, int] = {c: i for i, c in enumerate(self._codigos)}
+        self._por_componente: Dict[str, List[int]] = {}
+        self._por_ano_bloco: Dict[str, List[int]] = {}
+        for i, h in enumerate(self.habilidades):
+            if h.componente:
+                self._por_componente.setdefault(h.componente.upper(), []).append(i)
+            if h.ano_bloco:
+                self._por_ano_bloco.setdefault(h.ano_bloco, []).append(i)
+
+        # Descrições normalizadas concatenadas: uma busca por trecho é uma
+        # sequência de str.find, e o deslocamento encontrado indica a
+        # habilidade pelo início de cada descrição.
+        self._inicios: List[int] = []
+        partes = []
+        posicao = 0
+        for h in self.habilidades:
+            texto = normalizar_texto(f"{h.codigo} {h.descricao}")
+            self._inicios.append(posicao)
+            partes.append(texto)
+            posicao += len(texto) + 1
+        self._texto = _SEP.join(partes)
+
+    def __len__(self) -> int:
+        return len(self.habilidades)
+
+    def obter(self, codigo: str) -> Optional[Habilidade]:
+        i = self._por_codigo.get((codigo or '').strip().upper())
+        return self.habilidades[i] if i is not None else None
+
+    def _com_prefixo(self, prefixo: str) -> range:
+        prefixo = prefixo.strip().upper()
+        inicio = bisect_left(self._codigos, prefixo)
+        fim = bisect_right(self._codigos, prefixo + '\uffff', lo=inicio)
+        return range(inicio, fim)
+
+    def _com_trecho(self, trecho: str) -> List[int]:
+        trecho = normalizar_texto(trecho).strip()
+        if not trecho:
+            return list(range(len(self.habilidades)))
+        encontrados: List[int] = []
+        pos = self._texto.find(trecho)
+        while pos != -1:
+            i = bisect_right(self._inicios, pos) - 1
+            encontrados.append(i)
+            # Continua a partir da próxima descrição
+            proxima = self._inicios[i + 1] if i + 1 < len(self._inicios) else len(self._texto)
+            pos = self._texto.find(trecho, proxima)
+        return encontrados
+
+    def filtrar(
+        self,
+        componente: Optional[str] = None,
+        anos_bloco: Optional[Sequence[str]] = None,
+        prefixo: Optional[str] = None,
+        texto: Optional[str] = None,
+        limite: Optional[int] = None,
+    ) -> List[Habilidade]:
+        """
+        Habilidades que atendem a todos os filtros informados, por código.
+
+        Args:
+            componente: Sigla do componente (LP, MA, ...)
+            anos_bloco: Valores aceitos de ``ano_bloco`` (ex.: ['06', '67', '69'])
+            prefixo: Início do código (ex.: 'EF07MA')
+            texto: Trecho do código ou da descrição, sem diferenciar acentos
+            limite: Máximo de resultados (None = todos)
+        """
+        conjuntos = []
+        if componente:
+            conjuntos.append(self._por_componente.get(componente.upper(), ()))
+        if anos_bloco:
+            conjuntos.append([i for bloco in anos_bloco for i in self._por_ano_bloco.get(bloco, ())])
+        if prefixo:
+            conjuntos.append(self._com_prefixo(prefixo))
+        if texto:
+            conjuntos.append(self._com_trecho(texto))
+
+        if not conjuntos:
+            indices: Iterable[int] = range(len(self.habilidades))
+        else:
+            conjuntos.sort(key=len)
+            selecionados = set(conjuntos[0])
+            for outro in conjuntos[1:]:
+                selecionados.intersection_update(outro)
+            indices = sorted(selecionados)
+
+        resultado = []
+        for i in indices:
+            resultado.append(self.habilidades[i])
+            if limite is not None and len(resultado) >= limite:
+                break
+        return resultado
+
+
+_lock = threading.Lock()
+_catalogo: Optional[CatalogoBNCC] = None
+_marcador: Any = None
+_validado_em = 0.0
+
+
+def _chave_disco() -> str:
+    # Bancos diferentes (produção, homologação) não compartilham entradas
+    return f"bncc:{os.getenv('DB_HOST', '')}/{os.getenv('DB_NAME', '')}"
+
+
+def _ler_do_banco(cursor) -> List[Habilidade]:
+    cursor.execute(_QUERY_HABILIDADES)
+    return [
+        Habilidade(
+            str(r['codigo']).strip(), r['descricao'] or '', r.get('componente_codigo'),
+            r.get('ano_bloco'), r.get('etapa_sigla'),
+        )
+        for r in cursor.fetchall() or []
+        if r.get('codigo')
+    ]
+
+
+def obter_catalogo() -> CatalogoBNCC:
+    """
+    Catálogo do processo: memória, depois disco, depois banco.
+
+    Em caso de erro no banco devolve o último catálogo carregado (ou um
+    catálogo vazio, que não é guardado).
+    """
+    global _catalogo, _marcador, _validado_em
+    with _lock:
+        if _catalogo is not None and time.monotonic() - _validado_em < INTERVALO_VALIDACAO:
+            return _catalogo
+        try:
+            with get_cursor() as cursor:
+                cursor.execute(_QUERY_MARCADOR)
+                linha = cursor.fetchone() or {}
+                marcador = (VERSAO_CATALOGO, linha.get('total'), str(linha.get('atualizado_em')))
+                _validado_em = time.monotonic()
+                if _catalogo is not None and marcador == _marcador:
+                    return _catalogo
+
+                habilidades = cache_disco.ler(_chave_disco(), marcador)
+                origem = 'disco'
+                if habilidades is _CACHE_MISS:
+                    habilidades = _ler_do_banco(cursor)
+                    cache_disco.gravar(_chave_disco(), marcador, [tuple(h) for h in habilidades])
+                    origem = 'banco'
+                else:
+                    habilidades = [Habilidade(*h) for h in habilidades]
+        except Exception as e:
+            logger.error(f"Erro ao carregar catálogo BNCC: {e}")
+            return _catalogo if _catalogo is not None else CatalogoBNCC(())
+
+        _catalogo, _marcador = CatalogoBNCC(habilidades), marcador
+        logger.debug(f"Catálogo BNCC lido do {origem} ({len(_catalogo)} habilidades)")
+        return _catalogo
+
+
+def invalidar_catalogo() -> None:
+    """Força a conferência do marcador na próxima leitura (após importações)."""
+    global _validado_em
+    with _lock:
+        _validado_em = 0.0
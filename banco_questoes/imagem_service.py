@@ -0,0 +1,391 @@
+"""
+Imagens das questões do Banco de Questões
+
+Miniaturas das imagens de enunciado e alternativas nos tamanhos usados pela
+tela de detalhes, com dois níveis de cache:
+
+- disco (``CACHE_DIR/miniaturas_questoes``), endereçado pelo conteúdo do
+  arquivo original: ``<sha1 do original>_<tamanho>.png``. Trocar a imagem de
+  uma questão gera outro hash, então não há invalidação a fazer;
+- memória: LRU das últimas miniaturas já decodificadas.
+
+Originais que ainda não estão em ``uploads/`` são baixados do Google Drive
+por ``pre_carregar`` (página de resultados da busca) ou por ``carregar``,
+sempre em threads de trabalho — a UI só chama ``obter_em_cache``, que nunca
+acessa rede nem lê o original: o hash só é calculado nas threads de trabalho
+e memorizado por (caminho, mtime, tamanho do arquivo).
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.core.config import get_cache_path
+from src.core.config_logs import get_logger
+from db.connection import get_cursor
+
+logger = get_logger(__name__)
+
+DIRETORIO_MINIATURAS = 'miniaturas_questoes'
+
+# Tamanhos (lado maior, em px) usados pela tela de detalhes
+TAMANHO_ENUNCIADO = 300
+TAMANHO_ENUNCIADO_LATERAL = 250
+TAMANHO_ALTERNATIVA = 80
+
+# Miniaturas decodificadas mantidas em memória
+MAX_MINIATURAS_MEMORIA = 128
+
+_BASE_DIR = Path(__file__).resolve().parent.parent
+
+_MODOS_PNG = ('1', 'L', 'LA', 'P', 'RGB', 'RGBA')
+
+
+def tamanho_exibicao(arquivo: Dict[str, Any]) -> int:
+    """Tamanho em que a tela de detalhes mostra ``arquivo``."""
+    if arquivo.get('alternativa_id') is not None:
+        return TAMANHO_ALTERNATIVA
+    if arquivo.get('posicao') in ('esquerda', 'direita'):
+        return TAMANHO_ENUNCIADO_LATERAL
+    return TAMANHO_ENUNCIADO
+
+
+def extrair_drive_id(arquivo: Dict[str, Any]) -> Optional[str]:
+    """ID do arquivo no Drive, direto ou extraído de ``link_no_drive``."""
+    file_id = arquivo.get('drive_file_id')
+    if file_id:
+        return file_id
+    link = arquivo.get('link_no_drive') or ''
+    if '/d/' in link:
+        return link.split('/d/')[1].split('/')[0] or None
+    if 'id=' in link:
+        return link.split('id=')[1].split('&')[0] or None
+    return None
+
+
+class ImagemQuestaoService:
+    """Miniaturas das imagens de questões com cache em disco e em memória."""
+
+    def __init__(self, diretorio: Optional[Path] = None,
+                 max_memoria: int = MAX_MINIATURAS_MEMORIA):
+        self._diretorio = Path(diretorio) if diretorio else None
+        self.max_memoria = max_memoria
+        self._lock = threading.Lock()
+        self._memoria: 'OrderedDict[Tuple[str, int], Any]' = OrderedDict()
+        # (caminho, mtime_ns, tamanho do arquivo) -> sha1 do conteúdo
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        # Download em andamento por caminho local, para não baixar duas vezes
+        self._baixando: Dict[str, threading.Lock] = {}
+        # Arquivos das questões da página atual de resultados
+        self._arquivos: Dict[int, List[Dict[str, Any]]] = {}
+        self._geracao = 0
+
+    # ------------------------------------------------------------------
+    # Caminhos
+    # ------------------------------------------------------------------
+
+    @property
+    def diretorio(self) -> Path:
+        if self._diretorio is None:
+            self._diretorio = get_cache_path(f'{DIRETORIO_MINIATURAS}/.keep').parent
+        return self._diretorio
+
+    def caminho_original(self, arquivo: Dict[str, Any]) -> Optional[Path]:
+        """Onde o original fica (ou ficará, após o download) no disco."""
+        relativo = arquivo.get('caminho_relativo')
+        if relativo:
+            return _BASE_DIR / relativo.replace('\\', '/')
+        file_id = extrair_drive_id(arquivo)
+        if file_id:
+            return self.diretorio / 'originais' / file_id
+        return None
+
+    def _digest(self, caminho: Path, calcular: bool = True) -> Optional[str]:
+        """sha1 do original; com ``calcular=False`` só consulta o já memorizado."""
+        st = caminho.stat()
+        chave = (str(caminho), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            digest = self._digests.get(chave)
+        if digest is None and calcular:
+            h = hashlib.sha1()
+            with open(caminho, 'rb') as f:
+                for bloco in iter(lambda: f.read(1 << 16), b''):
+                    h.update(bloco)
+            digest = h.hexdigest()
+            with self._lock:
+                self._digests[chave] = digest
+        return digest
+
+    def _caminho_miniatura(self, digest: str, tamanho: int) -> Path:
+        return self.diretorio / digest[:2] / f'{digest}_{tamanho}.png'
+
+    # ------------------------------------------------------------------
+    # Cache em memória
+    # ------------------------------------------------------------------
+
+    def _lembrar(self, chave: Tuple[str, int], img) -> None:
+        with self._lock:
+            self._memoria[chave] = img
+            self._memoria.move_to_end(chave)
+            while len(self._memoria) > self.max_memoria:
+                self._memoria.popitem(last=False)
+
+    def _da_memoria(self, chave: Tuple[str, int]):
+        with self._lock:
+            img = self._memoria.get(chave)
+            if img is not None:
+                self._memoria.move_to_end(chave)
+            return img
+
+    # ------------------------------------------------------------------
+    # Miniaturas
+    # ------------------------------------------------------------------
+
+    def obter_em_cache(self, arquivo: Dict[str, Any], tamanho: int):
+        """
+        Miniatura já pronta (memória ou disco), ou None.
+
+        Não baixa, não lê nem redimensiona o original; seguro para a thread
+        da UI. Original ainda sem hash memorizado conta como ausente.
+        """
+        caminho = self.caminho_original(arquivo)
+        if caminho is None or not caminho.exists():
+            return None
+        try:
+            digest = self._digest(caminho, calcular=False)
+            return self._ler_miniatura(digest, tamanho) if digest else None
+        except Exception as e:
+            logger.warning(f"Miniatura em cache ilegível ({caminho}): {e}")
+            return None
+
+    def _ler_miniatura(self, digest: str, tamanho: int):
+        chave = (digest, tamanho)
+        img = self._da_memoria(chave)
+        if img is not None:
+            return img
+        miniatura = self._caminho_miniatura(digest, tamanho)
+        if not miniatura.exists():
+            return None
+        from PIL import Image
+        with Image.open(miniatura) as aberta:
+            img = aberta.copy()
+        self._lembrar(chave, img)
+        return img
+
+    def carregar(self, arquivo: Dict[str, Any], tamanho: int):
+        """
+        Miniatura de ``arquivo`` em ``tamanho``, gerando-a se preciso.
+
+        Baixa o original do Drive quando não existe localmente. Bloqueia:
+        chamar a partir de uma thread de trabalho.
+
+        Returns:
+            PIL.Image ou None se o original não puder ser obtido
+        """
+        img = self.obter_em_cache(arquivo, tamanho)
+        if img is not None:
+            return img
+        caminho = self._garantir_original(arquivo)
+        if caminho is None:
+            return None
+        try:
+            # Hash calculado aqui (thread de trabalho); a miniatura pode já estar no disco
+            img = self._ler_miniatura(self._digest(caminho), tamanho)
+            if img is not None:
+                return img
+            return self._gerar_miniaturas(caminho, (tamanho,))[tamanho]
+        except Exception as e:
+            logger.error(f"Erro ao gerar miniatura de {caminho}: {e}")
+            return None
+
+    def _gerar_miniaturas(self, caminho: Path, tamanhos: Iterable[int]) -> Dict[int, Any]:
+        """Decodifica o original uma vez e grava as miniaturas que faltam."""
+        from PIL import Image
+
+        digest = self._digest(caminho)
+        resultado: Dict[int, Any] = {}
+        faltando = []
+        for tamanho in tamanhos:
+            img = self._ler_miniatura(digest, tamanho)
+            if img is not None:
+                resultado[tamanho] = img
+            else:
+                faltando.append(tamanho)
+        if not faltando:
+            return resultado
+
+        with Image.open(caminho) as original:
+            original.load()
+            if original.mode not in _MODOS_PNG:
+                original = original.convert('RGBA' if 'A' in original.getbands() else 'RGB')
+            for tamanho in faltando:
+                ratio = min(tamanho / original.width, tamanho / original.height)
+                if ratio < 1:
+                    img = original.resize(
+                        (max(1, int(original.width * ratio)), max(1, int(original.height * ratio))),
+                        Image.Resampling.LANCZOS,
+                    )
+                else:
+                    img = original.copy()
+                destino = self._caminho_miniatura(digest, tamanho)
+                try:
+                    destino.parent.mkdir(parents=True, exist_ok=True)
+                    temporario = destino.with_name(f'{destino.name}.{threading.get_ident()}.tmp')
+                    img.save(temporario, format='PNG')
+                    os.replace(temporario, destino)
+                except OSError as e:
+                    logger.warning(f"Não foi possível gravar miniatura {destino}: {e}")
+                self._lembrar((digest, tamanho), img)
+                resultado[tamanho] = img
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Originais no Drive
+    # ------------------------------------------------------------------
+
+    def _garantir_original(self, arquivo: Dict[str, Any]) -> Optional[Path]:
+        caminho = self.caminho_original(arquivo)
+        if caminho is None:
+            return None
+        if caminho.exists():
+            return caminho
+        file_id = extrair_drive_id(arquivo)
+        if not file_id:
+            logger.warning(f"Imagem não encontrada localmente e sem ID no Drive: {caminho}")
+            return None
+
+        with self._lock:
+            trava = self._baixando.setdefault(str(caminho), threading.Lock())
+        with trava:
+            if not caminho.exists():
+                dados = self._baixar_drive(file_id)
+                if dados is None:
+                    return None
+                try:
+                    caminho.parent.mkdir(parents=True, exist_ok=True)
+                    temporario = caminho.with_name(f'{caminho.name}.{threading.get_ident()}.tmp')
+                    temporario.write_bytes(dados)
+                    os.replace(temporario, caminho)
+                    logger.info(f"Imagem baixada do Drive e salva em cache: {caminho}")
+                except OSError as e:
+                    logger.warning(f"Não foi possível salvar cache local: {e}")
+                    return None
+        with self._lock:
+            self._baixando.pop(str(caminho), None)
+        return caminho
+
+    @staticmethod
+    def _baixar_drive(file_id: str) -> Optional[bytes]:
+        """Bytes do arquivo ``file_id`` no Google Drive, ou None."""
+        try:
+            from src.utils.utilitarios.gerenciador_documentos import gerenciador
+
+            if not gerenciador.service:
+                gerenciador.setup_google_drive()
+            svc = gerenciador.service
+            if not svc:
+                logger.warning("Drive service não inicializado ao tentar baixar arquivo")
+                return None
+
+            from googleapiclient.http import MediaIoBaseDownload
+            dados = io.BytesIO()
+            downloader = MediaIoBaseDownload(dados, svc.files().get_media(fileId=file_id))
+            done = False
+            while not done:
+                _, done = downloader.next_chunk()
+            return dados.getvalue()
+        except Exception as e:
+            logger.error(f"Erro ao baixar imagem do Drive: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Arquivos por questão
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _consultar_arquivos(questao_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        por_questao: Dict[int, List[Dict[str, Any]]] = {qid: [] for qid in questao_ids}
+        if not questao_ids:
+            return por_questao
+        marcadores = ', '.join(['%s'] * len(questao_ids))
+        with get_cursor() as cursor:
+            cursor.execute(f"""
+                SELECT qa.*, qalt.letra as alternativa_letra
+                FROM questoes_arquivos qa
+                LEFT JOIN questoes_alternativas qalt ON qa.alternativa_id = qalt.id
+                WHERE qa.questao_id IN ({marcadores})
+                ORDER BY qa.questao_id, qa.posicao, qa.id
+            """, tuple(questao_ids))
+            for linha in cursor.fetchall():
+                por_questao[int(linha['questao_id'])].append(linha)
+        return por_questao
+
+    def arquivos_questao(self, questao_id: int) -> List[Dict[str, Any]]:
+        """Arquivos (imagens) da questão; usa o lote da página atual se houver."""
+        with self._lock:
+            arquivos = self._arquivos.get(questao_id)
+        if arquivos is not None:
+            return arquivos
+        try:
+            arquivos = self._consultar_arquivos([questao_id])[questao_id]
+        except Exception as e:
+            logger.error(f"Erro ao carregar arquivos da questão: {e}")
+            return []
+        with self._lock:
+            self._arquivos[questao_id] = arquivos
+        return arquivos
+
+    def esquecer(self, questao_id: int) -> None:
+        """Descarta os arquivos em memória de uma questão (após editá-la)."""
+        with self._lock:
+            self._arquivos.pop(questao_id, None)
+
+    def pre_carregar(self, questao_ids: Iterable[int]) -> int:
+        """
+        Carrega os arquivos das questões em uma consulta e prepara as
+        miniaturas nos tamanhos da tela, baixando originais que faltam.
+
+        Uma chamada mais nova (nova busca) interrompe a anterior entre um
+        arquivo e outro. Bloqueia: usar com ``submit_background``.
+
+        Returns:
+            Número de arquivos preparados
+        """
+        ids = [int(q) for q in questao_ids]
+        with self._lock:
+            self._geracao += 1
+            geracao = self._geracao
+        try:
+            por_questao = self._consultar_arquivos(ids)
+        except Exception as e:
+            logger.error(f"Erro ao carregar arquivos das questões: {e}")
+            return 0
+        with self._lock:
+            self._arquivos = por_questao
+
+        preparados = 0
+        for arquivos in por_questao.values():
+            for arquivo in arquivos:
+                if self._geracao != geracao:
+                    return preparados
+                tamanho = tamanho_exibicao(arquivo)
+                if self.obter_em_cache(arquivo, tamanho) is not None:
+                    preparados += 1
+                    continue
+                caminho = self._garantir_original(arquivo)
+                if caminho is None:
+                    continue
+                try:
+                    self._gerar_miniaturas(caminho, (tamanho,))
+                    preparados += 1
+                except Exception as e:
+                    logger.warning(f"Erro ao preparar miniatura de {caminho}: {e}")
+        return preparados
+
+
+# Instância do processo
+imagens_questoes = ImagemQuestaoService()
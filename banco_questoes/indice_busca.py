@@ -0,0 +1,523 @@
+"""
+Índice de busca textual do Banco de Questões
+
+Índice invertido em memória sobre enunciado, comando, alternativas, códigos
+de habilidade BNCC e textos base das questões. Os termos são normalizados
+sem acentos (``"função"`` e ``"funcao"`` casam), a busca é ranqueada por
+BM25 e o último termo digitado é tratado como prefixo, o que permite usar o
+mesmo índice para autocompletar.
+
+O índice é mantido por ``QuestaoService`` (criar/atualizar/excluir) e salvo
+em disco (``CACHE_DIR/indice_questoes.pkl``) para que a abertura do módulo
+não precise reconstruí-lo a partir do banco.
+"""
+
+import atexit
+import math
+import pickle
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.core.config import get_cache_path
+from src.core.config_logs import get_logger
+from db.connection import get_cursor
+
+logger = get_logger(__name__)
+
+ARQUIVO_INDICE = 'indice_questoes.pkl'
+
+# Incrementar quando a tokenização ou o formato mudarem, para descartar
+# arquivos salvos por versões anteriores.
+VERSAO_INDICE = 1
+
+# Peso de cada campo na frequência do termo. Código BNCC e enunciado pesam
+# mais que o texto base, que costuma ser longo e compartilhado.
+PESOS_CAMPOS = {
+    'habilidade': 4.0,
+    'enunciado': 2.0,
+    'comando': 1.5,
+    'alternativas': 1.0,
+    'texto_apoio': 1.0,
+    'texto_base': 0.5,
+}
+
+# Parâmetros do BM25
+_K1 = 1.2
+_B = 0.75
+
+STOPWORDS = frozenset("""
+    a o as os um uma uns umas de da do das dos em na no nas nos por pela pelo
+    pelas pelos para com sem sob sobre e ou que se ao aos à às é são ser foi
+    como mais menos muito seu sua seus suas ele ela eles elas isso isto esse
+    essa este esta entre ate até qual quais
+""".split())
+
+_RE_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def normalizar_texto(texto: Optional[str]) -> str:
+    """Remove acentos e converte para minúsculas."""
+    if not texto:
+        return ''
+    decomposto = unicodedata.normalize('NFKD', str(texto))
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return sem_acentos.lower()
+
+
+def tokenizar(texto: Optional[str]) -> List[str]:
+    """Quebra o texto em termos normalizados, sem stopwords."""
+    return [
+        t for t in _RE_TOKEN.findall(normalizar_texto(texto))
+        if t not in STOPWORDS and (len(t) > 1 or t.isdigit())
+    ]
+
+
+class IndiceQuestoes:
+    """
+    Índice invertido de questões com ranqueamento BM25.
+
+    Estrutura:
+        _postings: termo -> {questao_id: frequência ponderada}
+        _termos_questao: questao_id -> termos indexados (para remoção)
+        _comprimentos: questao_id -> soma dos pesos (comprimento do documento)
+
+    Todas as operações são protegidas por um lock, pois a UI consulta o
+    índice enquanto o serviço o atualiza a partir de outras threads.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._termos_questao: Dict[int, Set[str]] = {}
+        self._comprimentos: Dict[int, float] = {}
+        self._soma_comprimentos = 0.0
+        self._vocabulario: Optional[List[str]] = None
+        self._lock = threading.RLock()
+        self.marcador: Optional[Tuple[Any, ...]] = None
+
+    def __len__(self) -> int:
+        return len(self._comprimentos)
+
+    def __contains__(self, questao_id: int) -> bool:
+        return questao_id in self._comprimentos
+
+    # ========================================================================
+    # ATUALIZAÇÃO
+    # ========================================================================
+
+    def indexar(self, questao_id: int, campos: Dict[str, Optional[str]]) -> None:
+        """
+        Indexa (ou reindexa) uma questão.
+
+        Args:
+            questao_id: ID da questão
+            campos: Texto de cada campo (chaves de PESOS_CAMPOS)
+        """
+        frequencias: Dict[str, float] = defaultdict(float)
+        for campo, texto in campos.items():
+            peso = PESOS_CAMPOS.get(campo, 1.0)
+            for termo in tokenizar(texto):
+                frequencias[termo] += peso
+
+        with self._lock:
+            self._remover(questao_id)
+            if not frequencias:
+                return
+            for termo, freq in frequencias.items():
+                self._postings.setdefault(termo, {})[questao_id] = freq
+            self._termos_questao[questao_id] = set(frequencias)
+            comprimento = sum(frequencias.values())
+            self._comprimentos[questao_id] = comprimento
+            self._soma_comprimentos += comprimento
+            self._vocabulario = None
+
+    def remover(self, questao_id: int) -> None:
+        """Remove uma questão do índice (sem efeito se não estiver indexada)."""
+        with self._lock:
+            self._remover(questao_id)
+
+    def _remover(self, questao_id: int) -> None:
+        termos = self._termos_questao.pop(questao_id, None)
+        if termos is None:
+            return
+        for termo in termos:
+            docs = self._postings.get(termo)
+            if docs is None:
+                continue
+            docs.pop(questao_id, None)
+            if not docs:
+                del self._postings[termo]
+                self._vocabulario = None
+        self._soma_comprimentos -= self._comprimentos.pop(questao_id, 0.0)
+
+    # ========================================================================
+    # CONSULTA
+    # ========================================================================
+
+    def _vocab(self) -> List[str]:
+        if self._vocabulario is None:
+            self._vocabulario = sorted(self._postings)
+        return self._vocabulario
+
+    def _expandir_prefixo(self, prefixo: str) -> List[str]:
+        vocab = self._vocab()
+        inicio = bisect_left(vocab, prefixo)
+        termos = []
+        for termo in vocab[inicio:]:
+            if not termo.startswith(prefixo):
+                break
+            termos.append(termo)
+        return termos
+
+    def _grupos_consulta(self, consulta: str) -> List[List[str]]:
+        """
+        Converte a consulta em grupos de termos: cada grupo precisa casar
+        (semântica AND). O último termo vira um grupo com todas as suas
+        expansões, a menos que a consulta termine em espaço.
+        """
+        termos = tokenizar(consulta)
+        if not termos:
+            return []
+        grupos = [[t] for t in termos]
+        if not consulta[-1:].isspace():
+            grupos[-1] = self._expandir_prefixo(termos[-1])
+        return grupos
+
+    def buscar(self, consulta: str, limite: Optional[int] = 50) -> List[Tuple[int, float]]:
+        """
+        Busca questões pela consulta, ordenadas por relevância.
+
+        Args:
+            consulta: Texto digitado pelo usuário
+            limite: Máximo de resultados (None para todos)
+
+        Returns:
+            Lista de (questao_id, pontuação) em ordem decrescente de pontuação
+        """
+        with self._lock:
+            grupos = self._grupos_consulta(consulta)
+            if not grupos or not self._comprimentos:
+                return []
+
+            total_docs = len(self._comprimentos)
+            media = self._soma_comprimentos / total_docs
+            pontuacoes: Optional[Dict[int, float]] = None
+
+            # Grupos mais seletivos primeiro, para encolher os candidatos cedo
+            def _tamanho(grupo):
+                return sum(len(self._postings.get(t, ())) for t in grupo)
+
+            for grupo in sorted(grupos, key=_tamanho):
+                parciais: Dict[int, float] = defaultdict(float)
+                for termo in grupo:
+                    docs = self._postings.get(termo)
+                    if not docs:
+                        continue
+                    idf = math.log(1 + (total_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for qid, freq in docs.items():
+                        if pontuacoes is not None and qid not in pontuacoes:
+                            continue
+                        norma = _K1 * (1 - _B + _B * self._comprimentos[qid] / media)
+                        parciais[qid] += idf * freq * (_K1 + 1) / (freq + norma)
+                if pontuacoes is None:
+                    pontuacoes = dict(parciais)
+                else:
+                    pontuacoes = {qid: pontuacoes[qid] + p for qid, p in parciais.items()}
+                if not pontuacoes:
+                    return []
+
+        ranking = sorted(pontuacoes.items(), key=lambda item: (-item[1], item[0]))
+        return ranking[:limite] if limite is not None else ranking
+
+    def ids_correspondentes(self, consulta: str) -> List[int]:
+        """Retorna os IDs de todas as questões que casam, por relevância."""
+        return [qid for qid, _ in self.buscar(consulta, limite=None)]
+
+    def completar(self, prefixo: str, limite: int = 10) -> List[str]:
+        """
+        Sugere termos do índice que começam com o prefixo.
+
+        Returns:
+            Termos normalizados, dos mais frequentes para os menos frequentes
+        """
+        termos = tokenizar(prefixo)
+        if not termos:
+            return []
+        with self._lock:
+            candidatos = self._expandir_prefixo(termos[-1])
+            candidatos.sort(key=lambda t: (-len(self._postings[t]), t))
+        return candidatos[:limite]
+
+    # ========================================================================
+    # PERSISTÊNCIA
+    # ========================================================================
+
+    def salvar(self, caminho: Path) -> None:
+        """Grava o índice em disco (escrita atômica via arquivo temporário)."""
+        with self._lock:
+            dados = {
+                'versao': VERSAO_INDICE,
+                'marcador': self.marcador,
+                'postings': self._postings,
+                'comprimentos': self._comprimentos,
+            }
+            temporario = caminho.with_suffix(caminho.suffix + '.tmp')
+            with open(temporario, 'wb') as arquivo:
+                pickle.dump(dados, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        temporario.replace(caminho)
+
+    @classmethod
+    def carregar(cls, caminho: Path) -> Optional['IndiceQuestoes']:
+        """Lê um índice salvo; retorna None se ausente, corrompido ou de outra versão."""
+        try:
+            with open(caminho, 'rb') as arquivo:
+                dados = pickle.load(arquivo)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Índice de questões em disco ilegível, será reconstruído: {e}")
+            return None
+
+        if not isinstance(dados, dict) or dados.get('versao') != VERSAO_INDICE:
+            return None
+
+        indice = cls()
+        indice.marcador = dados.get('marcador')
+        indice._postings = dados['postings']
+        indice._comprimentos = dados['comprimentos']
+        indice._soma_comprimentos = sum(indice._comprimentos.values())
+        for termo, docs in indice._postings.items():
+            for qid in docs:
+                indice._termos_questao.setdefault(qid, set()).add(termo)
+        return indice
+
+    # ========================================================================
+    # CONSTRUÇÃO A PARTIR DO BANCO
+    # ========================================================================
+
+    @staticmethod
+    def campos_da_questao(
+        questao: Dict[str, Any],
+        alternativas: Iterable[str] = (),
+        textos_base: Iterable[str] = ()
+    ) -> Dict[str, str]:
+        """Monta os campos indexáveis a partir de uma linha de ``questoes``."""
+        return {
+            'habilidade': ' '.join(filter(None, (
+                questao.get('habilidade_bncc_codigo'),
+                questao.get('habilidade_bncc_secundaria'),
+            ))),
+            'enunciado': questao.get('enunciado') or '',
+            'comando': questao.get('comando') or '',
+            'texto_apoio': questao.get('texto_apoio') or '',
+            'alternativas': ' '.join(filter(None, alternativas)),
+            'texto_base': ' '.join(filter(None, textos_base)),
+        }
+
+    @staticmethod
+    def obter_marcador(cursor) -> Tuple[Any, ...]:
+        """Resumo do estado da tabela, usado para detectar índice desatualizado."""
+        cursor.execute("SELECT COUNT(*) AS total, MAX(updated_at) AS ultima FROM questoes")
+        row = cursor.fetchone() or {}
+        ultima = row.get('ultima')
+        return (row.get('total') or 0, str(ultima) if ultima else None)
+
+    @staticmethod
+    def _carregar_textos(cursor, questao_ids: Optional[List[int]] = None):
+        """Alternativas e textos base por questão (todas, ou só as informadas)."""
+        filtro_alt = filtro_tb = ""
+        params: List[Any] = []
+        if questao_ids is not None:
+            marcadores = ', '.join(['%s'] * len(questao_ids))
+            filtro_alt = f"WHERE questao_id IN ({marcadores})"
+            filtro_tb = f"AND aq.questao_id IN ({marcadores})"
+            params = list(questao_ids)
+
+        alternativas: Dict[int, List[str]] = defaultdict(list)
+        cursor.execute(f"SELECT questao_id, texto FROM questoes_alternativas {filtro_alt}", params)
+        for row in cursor.fetchall():
+            alternativas[row['questao_id']].append(row['texto'])
+
+        # Textos base se ligam às avaliações; uma questão herda os textos das
+        # avaliações em que aparece.
+        textos: Dict[int, List[str]] = defaultdict(list)
+        cursor.execute(f"""
+            SELECT DISTINCT aq.questao_id, tb.titulo, tb.conteudo
+            FROM avaliacoes_questoes aq
+            JOIN avaliacoes_textos_base atb ON atb.avaliacao_id = aq.avaliacao_id
+            JOIN textos_base tb ON tb.id = atb.texto_base_id
+            WHERE tb.tipo = 'texto' {filtro_tb}
+        """, params)
+        for row in cursor.fetchall():
+            textos[row['questao_id']].append(f"{row['titulo'] or ''} {row['conteudo'] or ''}")
+        return alternativas, textos
+
+    @classmethod
+    def construir(cls, cursor) -> 'IndiceQuestoes':
+        """Constrói o índice completo a partir do banco (três consultas)."""
+        indice = cls()
+        indice.marcador = cls.obter_marcador(cursor)
+        alternativas, textos = cls._carregar_textos(cursor)
+        cursor.execute("""
+            SELECT id, habilidade_bncc_codigo, habilidade_bncc_secundaria,
+                   enunciado, comando, texto_apoio
+            FROM questoes
+        """)
+        for row in cursor.fetchall():
+            qid = row['id']
+            indice.indexar(qid, cls.campos_da_questao(row, alternativas[qid], textos[qid]))
+        return indice
+
+    def reindexar_do_banco(self, cursor, questao_id: int) -> None:
+        """Relê uma questão do banco e atualiza sua entrada no índice."""
+        cursor.execute("""
+            SELECT id, habilidade_bncc_codigo, habilidade_bncc_secundaria,
+                   enunciado, comando, texto_apoio
+            FROM questoes WHERE id = %s
+        """, (questao_id,))
+        row = cursor.fetchone()
+        if not row:
+            self.remover(questao_id)
+            return
+        alternativas, textos = self._carregar_textos(cursor, [questao_id])
+        self.indexar(questao_id, self.campos_da_questao(
+            row, alternativas[questao_id], textos[questao_id]
+        ))
+
+
+# ============================================================================
+# INSTÂNCIA DO PROCESSO
+# ============================================================================
+
+_indice: Optional[IndiceQuestoes] = None
+_alterado = False
+_lock_instancia = threading.Lock()
+
+
+def indice_carregado() -> Optional[IndiceQuestoes]:
+    """Retorna o índice se já estiver em memória, sem carregar nem construir."""
+    return _indice
+
+
+def obter_indice() -> IndiceQuestoes:
+    """
+    Retorna o índice do processo, carregando do disco ou construindo do banco.
+
+    O arquivo salvo só é aproveitado se o marcador (total de questões e última
+    atualização) bater com o banco; caso contrário o índice é reconstruído e
+    regravado.
+    """
+    global _indice
+    if _indice is not None:
+        return _indice
+    with _lock_instancia:
+        if _indice is not None:
+            return _indice
+        caminho = get_cache_path(ARQUIVO_INDICE)
+        with get_cursor() as cursor:
+            marcador = IndiceQuestoes.obter_marcador(cursor)
+            indice = IndiceQuestoes.carregar(caminho)
+            if indice is None or indice.marcador != marcador:
+                indice = IndiceQuestoes.construir(cursor)
+                try:
+                    indice.salvar(caminho)
+                except OSError as e:
+                    logger.warning(f"Não foi possível salvar o índice de questões: {e}")
+                logger.info(f"Índice de questões construído ({len(indice)} questões)")
+        _indice = indice
+        return _indice
+
+
+def descartar_indice() -> None:
+    """Descarta a instância em memória (a próxima chamada recarrega)."""
+    global _indice, _alterado
+    with _lock_instancia:
+        _indice = None
+        _alterado = False
+
+
+def salvar_se_alterado() -> None:
+    """
+    Grava o índice se houve alterações incrementais desde a última gravação.
+
+    Registrado em ``atexit``: edições feitas na sessão chegam ao disco sem
+    reescrever o arquivo a cada questão salva.
+
+    O índice é gravado com o seu marcador: o da construção/carga, avançado
+    pelas notificações de edições feitas por esta sessão quando o índice
+    estava em dia antes da escrita. Se o marcador do banco difere (outros
+    clientes, ou edições que o índice não acompanhou), a gravação é pulada:
+    o arquivo seria descartado na próxima abertura de qualquer forma, e
+    carimbar o marcador atual faria um índice desatualizado passar por válido.
+    """
+    global _alterado
+    indice = _indice
+    if indice is None or not _alterado:
+        return
+    try:
+        with get_cursor() as cursor:
+            atual = IndiceQuestoes.obter_marcador(cursor)
+        if atual != indice.marcador:
+            logger.info("Banco de questões mudou desde a carga; índice será reconstruído")
+        else:
+            indice.salvar(get_cache_path(ARQUIVO_INDICE))
+        _alterado = False
+    except Exception as e:
+        logger.warning(f"Não foi possível salvar o índice de questões: {e}")
+
+
+atexit.register(salvar_se_alterado)
+
+
+def marcador_antes_de_alterar(cursor) -> Optional[Tuple[Any, ...]]:
+    """
+    Marcador do banco lido antes de uma escrita em ``questoes``.
+
+    Passado às notificações abaixo para que o índice avance o próprio
+    marcador só se estava em dia. None se o índice não está carregado.
+    """
+    if _indice is None:
+        return None
+    return IndiceQuestoes.obter_marcador(cursor)
+
+
+def _avancar_marcador(indice: IndiceQuestoes, cursor,
+                      marcador_anterior: Optional[Tuple[Any, ...]]) -> None:
+    # Mesmo cursor/transação da escrita: o marcador lido já inclui a edição
+    if cursor is not None and marcador_anterior is not None and marcador_anterior == indice.marcador:
+        indice.marcador = IndiceQuestoes.obter_marcador(cursor)
+
+
+def notificar_questao_salva(cursor, questao_id: int,
+                            marcador_anterior: Optional[Tuple[Any, ...]] = None) -> None:
+    """
+    Atualiza o índice (se carregado) após criar/atualizar uma questão.
+
+    Args:
+        cursor: Cursor da transação que gravou a questão
+        questao_id: ID da questão
+        marcador_anterior: Resultado de ``marcador_antes_de_alterar``
+    """
+    global _alterado
+    indice = _indice
+    if indice is None:
+        return
+    indice.reindexar_do_banco(cursor, questao_id)
+    _avancar_marcador(indice, cursor, marcador_anterior)
+    _alterado = True
+
+
+def notificar_questao_removida(questao_id: int, cursor=None,
+                               marcador_anterior: Optional[Tuple[Any, ...]] = None) -> None:
+    """Remove a questão do índice (se carregado); ver ``notificar_questao_salva``."""
+    global _alterado
+    indice = _indice
+    if indice is None:
+        return
+    indice.remover(questao_id)
+    _avancar_marcador(indice, cursor, marcador_anterior)
+    _alterado = True
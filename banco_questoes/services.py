@@ -5,6 +5,7 @@ Serviço para CRUD de questões, avaliações e operações relacionadas.
 """
 
 from typing import List, Optional, Dict, Any, Tuple
+from dataclasses import replace
 from datetime import datetime, date
 from decimal import Decimal
 import json
@@ -12,8 +13,10 @@ import json
 from src.core.config_logs import get_logger
 from db.connection import get_cursor
 from src.core.config import perfis_habilitados
+from src.utils.cache import CacheManager
 from auth.usuario_logado import UsuarioLogado
 
+from . import catalogo_bncc, indice_busca
 from .models import (
     Questao, QuestaoAlternativa, QuestaoArquivo,
     Avaliacao, AvaliacaoQuestao, AvaliacaoAplicada,
@@ -27,10 +30,26 @@ from .models import (
 
 logger = get_logger(__name__)
 
+# Totais por filtro da busca de questões. A tela de busca refaz a contagem a
+# cada alteração de filtro; escritas deste processo invalidam na hora e o TTL
+# curto cobre alterações feitas por outros clientes.
+_cache_contagens = CacheManager(ttl_seconds=60, max_size=256)
+
 
 class QuestaoService:
     """Serviço para operações com questões."""
     
+    # Campos aceitos em ordenar_por -> expressão SQL de ordenação.
+    # ENUMs são ordenados pelo índice (dificuldade + 0), como no ORDER BY nativo,
+    # para que a comparação do keyset siga a mesma ordem.
+    _CAMPOS_ORDENACAO = {
+        'created_at': 'q.created_at',
+        'updated_at': 'q.updated_at',
+        'vezes_aplicada': 'q.vezes_aplicada',
+        'taxa_acerto_media': 'q.taxa_acerto_media',
+        'dificuldade': 'q.dificuldade + 0',
+    }
+    
     # ========================================================================
     # CRUD DE QUESTÕES
     # ========================================================================
@@ -88,6 +107,7 @@ class QuestaoService:
                     questao.autor_id
                 )
 
+                marcador = indice_busca.marcador_antes_de_alterar(cursor)
                 cursor.execute(sql, params)
                 questao_id = cursor.lastrowid
 
@@ -97,12 +117,22 @@ class QuestaoService:
                         QuestaoService._inserir_alternativa(cursor, questao_id, alt)
 
                 logger.info(f"Questão criada com ID {questao_id}")
+                QuestaoService._atualizar_indice(cursor, questao_id, marcador)
+                QuestaoService.invalidar_contagens()
                 return questao_id
                 
         except Exception as e:
             logger.exception(f"Erro ao criar questão: {e}")
             return None
     
+    @staticmethod
+    def _atualizar_indice(cursor, questao_id: int, marcador_anterior=None) -> None:
+        """Reindexa a questão no índice textual; falhas não desfazem a escrita."""
+        try:
+            indice_busca.notificar_questao_salva(cursor, questao_id, marcador_anterior)
+        except Exception as e:
+            logger.warning(f"Falha ao reindexar questão {questao_id}: {e}")
+    
     @staticmethod
     def _inserir_alternativa(cursor, questao_id: int, alt: QuestaoAlternativa) -> Optional[int]:
         """Insere uma alternativa no banco."""
@@ -132,7 +162,7 @@ class QuestaoService:
             return False
         
         try:
-            with get_cursor() as cursor:
+            with get_cursor(commit=True) as cursor:
                 sql = """
                     UPDATE questoes SET
                         componente_curricular = %s,
@@ -182,6 +212,7 @@ class QuestaoService:
                     questao.id
                 )
                 
+                marcador = indice_busca.marcador_antes_de_alterar(cursor)
                 cursor.execute(sql, params)
                 
                 # Atualizar alternativas
@@ -193,6 +224,8 @@ class QuestaoService:
                         QuestaoService._inserir_alternativa(cursor, questao.id, alt)
                 
                 logger.info(f"Questão {questao.id} atualizada")
+                QuestaoService._atualizar_indice(cursor, questao.id, marcador)
+                QuestaoService.invalidar_contagens()
                 return True
                 
         except Exception as e:
@@ -325,22 +358,27 @@ class QuestaoService:
             True se excluída, False caso contrário
         """
         try:
-            with get_cursor() as cursor:
+            with get_cursor(commit=True) as cursor:
                 # Verificar se questão está em alguma avaliação
                 cursor.execute("""
-                    SELECT COUNT(*) FROM avaliacoes_questoes WHERE questao_id = %s
+                    SELECT COUNT(*) AS total FROM avaliacoes_questoes WHERE questao_id = %s
                 """, (questao_id,))
-                count = cursor.fetchone()[0]
+                count = cursor.fetchone()['total']
                 
                 if count > 0:
                     logger.warning(f"Questão {questao_id} não pode ser excluída pois está em {count} avaliações")
                     return False
                 
                 # Excluir (cascade vai remover alternativas e arquivos)
+                marcador = indice_busca.marcador_antes_de_alterar(cursor)
                 cursor.execute("DELETE FROM questoes WHERE id = %s", (questao_id,))
                 
+                excluida = cursor.rowcount > 0
                 logger.info(f"Questão {questao_id} excluída")
-                return cursor.rowcount > 0
+                if excluida:
+                    indice_busca.notificar_questao_removida(questao_id, cursor, marcador)
+                QuestaoService.invalidar_contagens()
+                return excluida
                 
         except Exception as e:
             logger.exception(f"Erro ao excluir questão {questao_id}: {e}")
@@ -387,6 +425,7 @@ class QuestaoService:
                      f'Mudança de status: {status_anterior} → {novo_status}'))
                 
                 logger.info(f"Status da questão {questao_id} alterado: {status_anterior} → {novo_status}")
+                QuestaoService.invalidar_contagens()
                 return True
                 
         except Exception as e:
@@ -437,6 +476,7 @@ class QuestaoService:
                         logger.warning(f"Não foi possível salvar comentário: {e}")
                 
                 logger.info(f"Questão {questao_id} aprovada por usuário {aprovador_id}")
+                QuestaoService.invalidar_contagens()
                 return True
                 
         except Exception as e:
@@ -494,6 +534,7 @@ class QuestaoService:
                     logger.warning(f"Não foi possível salvar comentário: {e}")
                 
                 logger.info(f"Questão {questao_id} devolvida para revisão por usuário {revisor_id}")
+                QuestaoService.invalidar_contagens()
                 return True
                 
         except Exception as e:
@@ -504,6 +545,60 @@ class QuestaoService:
     # BUSCA E FILTROS
     # ========================================================================
     
+    @staticmethod
+    def invalidar_contagens() -> None:
+        """Descarta os totais de busca cacheados (chamado após escritas)."""
+        _cache_contagens.invalidate()
+    
+    @staticmethod
+    def _montar_where(filtros: Optional[FiltroQuestoes]) -> Tuple[str, List[Any]]:
+        """
+        Monta a cláusula WHERE e seus parâmetros a partir dos filtros.
+        
+        Com o índice textual em memória, ``texto_busca`` vira um filtro por
+        IDs em vez do LIKE sobre enunciado/texto_apoio.
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        
+        indice = indice_busca.indice_carregado()
+        if filtros and filtros.texto_busca and indice is not None:
+            ids = indice.ids_correspondentes(filtros.texto_busca)
+            if ids:
+                conditions.append(f"q.id IN ({', '.join(['%s'] * len(ids))})")
+                params.extend(sorted(ids))
+            else:
+                conditions.append("1 = 0")
+            filtros = replace(filtros, texto_busca=None)
+        
+        if filtros:
+            conds, prms = filtros.to_sql_conditions()
+            conditions.extend(conds)
+            params.extend(prms)
+        
+        where_clause = ""
+        if conditions:
+            where_clause = "WHERE " + " AND ".join(conditions)
+        return where_clause, params
+    
+    @staticmethod
+    def _contar(cursor, where_clause: str, params: List[Any]) -> int:
+        """Conta questões do filtro, reaproveitando o total cacheado."""
+        chave = f"questoes_count:{where_clause}:{params!r}"
+        total = _cache_contagens.get(chave, None)
+        if total is None:
+            cursor.execute(f"SELECT COUNT(*) as total FROM questoes q {where_clause}", params)
+            total = cursor.fetchone()['total']
+            _cache_contagens.set(chave, total)
+        return total
+    
+    @staticmethod
+    def _normalizar_ordenacao(ordenar_por: str, ordem: str) -> Tuple[str, str]:
+        if ordenar_por not in QuestaoService._CAMPOS_ORDENACAO:
+            ordenar_por = 'created_at'
+        ordem = 'DESC' if ordem.upper() not in ['ASC', 'DESC'] else ordem.upper()
+        return ordenar_por, ordem
+    
     @staticmethod
     def buscar(
         filtros: Optional[FiltroQuestoes] = None,
@@ -515,6 +610,9 @@ class QuestaoService:
         """
         Busca questões com filtros.
         
+        O total é cacheado por filtro (ver ``_cache_contagens``). Para navegar
+        por páginas profundas prefira ``buscar_pagina`` (keyset).
+        
         Args:
             filtros: Filtros a aplicar
             limite: Máximo de resultados
@@ -534,35 +632,16 @@ class QuestaoService:
                     LEFT JOIN funcionarios f ON f.id = q.autor_id
                 """
                 
-                # Construir condições
-                conditions = []
-                params = []
-                
-                if filtros:
-                    conds, prms = filtros.to_sql_conditions()
-                    conditions.extend(conds)
-                    params.extend(prms)
-                
-                # Montar WHERE
-                where_clause = ""
-                if conditions:
-                    where_clause = "WHERE " + " AND ".join(conditions)
-                
-                # Query de contagem
-                sql_count = f"SELECT COUNT(*) as total FROM questoes q {where_clause}"
-                cursor.execute(sql_count, params)
-                total = cursor.fetchone()['total']
+                where_clause, params = QuestaoService._montar_where(filtros)
+                total = QuestaoService._contar(cursor, where_clause, params)
                 
                 # Query principal com ordenação e paginação
-                campos_ordenacao = ['created_at', 'updated_at', 'vezes_aplicada', 'taxa_acerto_media', 'dificuldade']
-                if ordenar_por not in campos_ordenacao:
-                    ordenar_por = 'created_at'
-                ordem = 'DESC' if ordem.upper() not in ['ASC', 'DESC'] else ordem.upper()
+                ordenar_por, ordem = QuestaoService._normalizar_ordenacao(ordenar_por, ordem)
                 
                 sql_main = f"""
                     {sql_base}
                     {where_clause}
-                    ORDER BY q.{ordenar_por} {ordem}
+                    ORDER BY q.{ordenar_por} {ordem}, q.id {ordem}
                     LIMIT %s OFFSET %s
                 """
                 params.extend([limite, offset])
@@ -578,6 +657,151 @@ class QuestaoService:
             logger.exception(f"Erro na busca de questões: {e}")
             return [], 0
     
+    @staticmethod
+    def buscar_pagina(
+        filtros: Optional[FiltroQuestoes] = None,
+        limite: int = 50,
+        apos: Optional[Tuple[Any, int]] = None,
+        ordenar_por: str = "created_at",
+        ordem: str = "DESC",
+        contar: bool = True
+    ) -> Tuple[List[Questao], Optional[int], Optional[Tuple[Any, int]]]:
+        """
+        Busca questões com paginação keyset (seek) em vez de OFFSET.
+        
+        A posição é dada pelo par (valor de ordenação, id) da última questão
+        da página anterior, então o custo de cada página não cresce com a
+        profundidade. Valores NULL seguem a ordem do MySQL (primeiro em ASC,
+        por último em DESC).
+        
+        Args:
+            filtros: Filtros a aplicar
+            limite: Máximo de resultados
+            apos: Cursor devolvido pela página anterior (None = primeira página)
+            ordenar_por: Campo para ordenação
+            ordem: ASC ou DESC
+            contar: Se False, não calcula o total (retorna None)
+            
+        Returns:
+            Tupla (lista_questoes, total_sem_limite, cursor_proxima_pagina).
+            O cursor é None quando não há mais páginas.
+        """
+        try:
+            with get_cursor() as cursor:
+                where_clause, params = QuestaoService._montar_where(filtros)
+                total = QuestaoService._contar(cursor, where_clause, params) if contar else None
+                
+                ordenar_por, ordem = QuestaoService._normalizar_ordenacao(ordenar_por, ordem)
+                chave = QuestaoService._CAMPOS_ORDENACAO[ordenar_por]
+                
+                seek_params: List[Any] = []
+                seek = ""
+                if apos is not None:
+                    valor, ultimo_id = apos
+                    comp = '<' if ordem == 'DESC' else '>'
+                    if valor is None:
+                        # NULLs vêm por último em DESC e primeiro em ASC
+                        seek = f"(({chave}) IS NULL AND q.id {comp} %s)"
+                        seek_params = [ultimo_id]
+                        if ordem == 'ASC':
+                            seek = f"({seek} OR ({chave}) IS NOT NULL)"
+                    else:
+                        seek = f"(({chave}) {comp} %s OR (({chave}) = %s AND q.id {comp} %s)"
+                        seek_params = [valor, valor, ultimo_id]
+                        if ordem == 'DESC':
+                            seek += f" OR ({chave}) IS NULL"
+                        seek += ")"
+                
+                if seek:
+                    where_pagina = f"{where_clause} AND {seek}" if where_clause else f"WHERE {seek}"
+                else:
+                    where_pagina = where_clause
+                
+                sql_main = f"""
+                    SELECT q.*, f.nome as autor_nome, {chave} AS chave_ordenacao
+                    FROM questoes q
+                    LEFT JOIN funcionarios f ON f.id = q.autor_id
+                    {where_pagina}
+                    ORDER BY chave_ordenacao {ordem}, q.id {ordem}
+                    LIMIT %s
+                """
+                cursor.execute(sql_main, params + seek_params + [limite + 1])
+                rows = cursor.fetchall() or []
+                
+                proximo = None
+                if len(rows) > limite:
+                    rows = rows[:limite]
+                    ultima = rows[-1]
+                    proximo = (ultima['chave_ordenacao'], ultima['id'])
+                
+                questoes = [Questao.from_row(row) for row in rows]
+                return questoes, total, proximo
+                
+        except Exception as e:
+            logger.exception(f"Erro na busca paginada de questões: {e}")
+            return [], 0 if contar else None, None
+
+    @staticmethod
+    def buscar_texto(
+        consulta: str,
+        filtros: Optional[FiltroQuestoes] = None,
+        limite: int = 50
+    ) -> List[Questao]:
+        """
+        Busca questões por texto, ordenadas por relevância.
+
+        Usa o índice textual (carregado ou construído na primeira chamada);
+        os demais filtros são aplicados no banco sobre os IDs encontrados.
+
+        Args:
+            consulta: Texto digitado (o último termo vale como prefixo)
+            filtros: Filtros adicionais (texto_busca é ignorado)
+            limite: Máximo de resultados
+
+        Returns:
+            Lista de questões, da mais relevante para a menos relevante
+        """
+        try:
+            ranking = indice_busca.obter_indice().ids_correspondentes(consulta)
+            if not ranking:
+                return []
+
+            filtros = replace(filtros, texto_busca=None) if filtros else None
+            where_clause, params = QuestaoService._montar_where(filtros)
+
+            questoes: List[Questao] = []
+            with get_cursor() as cursor:
+                # Consultar em blocos na ordem do ranking até completar o limite
+                for inicio in range(0, len(ranking), max(limite, 1) * 2):
+                    bloco = ranking[inicio:inicio + max(limite, 1) * 2]
+                    cond_ids = f"q.id IN ({', '.join(['%s'] * len(bloco))})"
+                    where_bloco = f"{where_clause} AND {cond_ids}" if where_clause else f"WHERE {cond_ids}"
+                    cursor.execute(f"""
+                        SELECT q.*, f.nome as autor_nome
+                        FROM questoes q
+                        LEFT JOIN funcionarios f ON f.id = q.autor_id
+                        {where_bloco}
+                    """, params + bloco)
+                    por_id = {row['id']: row for row in cursor.fetchall()}
+                    questoes.extend(Questao.from_row(por_id[qid]) for qid in bloco if qid in por_id)
+                    if len(questoes) >= limite:
+                        break
+
+            return questoes[:limite]
+
+        except Exception as e:
+            logger.exception(f"Erro na busca textual de questões: {e}")
+            return []
+
+    @staticmethod
+    def sugerir_termos(prefixo: str, limite: int = 10) -> List[str]:
+        """Sugestões de autocompletar para o campo de busca, a partir do índice."""
+        try:
+            return indice_busca.obter_indice().completar(prefixo, limite)
+        except Exception as e:
+            logger.exception(f"Erro ao sugerir termos de busca: {e}")
+            return []
+
     @staticmethod
     def buscar_por_habilidade(
         habilidade_codigo: str,
@@ -713,6 +937,44 @@ class QuestaoService:
             return False
 
 
+class HabilidadeBNCCService:
+    """Consulta ao catálogo de habilidades BNCC (em memória)."""
+    
+    @staticmethod
+    def listar(
+        componente: Optional[str] = None,
+        anos_bloco: Optional[List[str]] = None,
+        prefixo: Optional[str] = None,
+        texto: Optional[str] = None,
+        limite: Optional[int] = None
+    ) -> List[catalogo_bncc.Habilidade]:
+        """
+        Habilidades filtradas por componente, ano/bloco, prefixo do código e
+        trecho da descrição (sem diferenciar acentos), ordenadas por código.
+        """
+        return catalogo_bncc.obter_catalogo().filtrar(
+            componente=componente, anos_bloco=anos_bloco,
+            prefixo=prefixo, texto=texto, limite=limite
+        )
+    
+    @staticmethod
+    def listar_rotulos(
+        componente: Optional[str] = None,
+        anos_bloco: Optional[List[str]] = None,
+        texto: Optional[str] = None
+    ) -> List[str]:
+        """Habilidades formatadas como "CODIGO - Descrição" para comboboxes."""
+        return [
+            catalogo_bncc.rotulo(h)
+            for h in HabilidadeBNCCService.listar(componente, anos_bloco, texto=texto)
+        ]
+    
+    @staticmethod
+    def obter(codigo: str) -> Optional[catalogo_bncc.Habilidade]:
+        """Habilidade pelo código (ex: EF07MA02), ou None."""
+        return catalogo_bncc.obter_catalogo().obter(codigo)
+
+
 class EstatisticasService:
     """Serviço para estatísticas de questões."""
     
@@ -1188,50 +1450,79 @@ class RespostaService:
             logger.exception(f"Erro ao lançar resposta: {e}")
             return None
     
+    # Condição de acerto usada na correção em lote (mesma regra do gabarito:
+    # resposta preenchida e igual à letra do gabarito, sem diferenciar caixa)
+    _SQL_ACERTO = """
+        (r.resposta_letra IS NOT NULL AND r.resposta_letra <> ''
+         AND q.gabarito_letra IS NOT NULL
+         AND UPPER(r.resposta_letra) = UPPER(q.gabarito_letra))
+    """
+    
+    _SQL_JOIN_CORRECAO = """
+        FROM respostas_alunos r
+        INNER JOIN questoes q ON q.id = r.questao_id
+        INNER JOIN avaliacoes_aplicadas aa ON aa.id = r.avaliacao_aplicada_id
+        INNER JOIN avaliacoes_questoes aq ON aq.questao_id = q.id AND aq.avaliacao_id = aa.avaliacao_id
+        WHERE r.avaliacao_aplicada_id = %s
+        AND q.tipo = 'multipla_escolha'
+        AND r.correta IS NULL
+    """
+    
     @staticmethod
     def corrigir_automaticamente(avaliacao_aplicada_id: int) -> Dict[str, int]:
         """
         Corrige automaticamente questões de múltipla escolha.
         
+        A correção é feita no banco, em três instruções para a aplicação
+        inteira: uma contagem (que trava as linhas pendentes), os deltas de
+        desempenho por habilidade e um único UPDATE ... JOIN com gabarito e
+        pontuação da avaliação.
+        
         Returns:
             Dicionário com estatísticas da correção
         """
+        acerto = RespostaService._SQL_ACERTO
+        join = RespostaService._SQL_JOIN_CORRECAO
         try:
-            with get_cursor() as cursor:
-                # Buscar respostas não corrigidas de questões de múltipla escolha
-                cursor.execute("""
-                    SELECT r.id, r.resposta_letra, q.gabarito_letra, aq.pontuacao
-                    FROM respostas_alunos r
+            with get_cursor(commit=True) as cursor:
+                cursor.execute(f"""
+                    SELECT
+                        COUNT(*) AS total,
+                        COALESCE(SUM(CASE WHEN {acerto} THEN 1 ELSE 0 END), 0) AS corretas
+                    {join}
+                    FOR UPDATE
+                """, (avaliacao_aplicada_id,))
+                
+                contagem = cursor.fetchone() or {}
+                total = int(contagem.get('total') or 0)
+                corretas = int(contagem.get('corretas') or 0)
+                
+                if total == 0:
+                    return {'corretas': 0, 'erradas': 0, 'total': 0}
+                
+                # Deltas do desempenho por habilidade, calculados enquanto as
+                # respostas ainda estão pendentes (mesma transação)
+                DesempenhoService.aplicar_deltas_correcao(cursor, avaliacao_aplicada_id)
+                
+                # UPDATE multi-tabela não aceita ORDER BY/LIMIT nem garante a
+                # ordem das atribuições, por isso a condição é repetida
+                cursor.execute(f"""
+                    UPDATE respostas_alunos r
                     INNER JOIN questoes q ON q.id = r.questao_id
-                    INNER JOIN avaliacoes_questoes aq ON aq.questao_id = q.id
-                    INNER JOIN avaliacoes_aplicadas aa ON aa.id = r.avaliacao_aplicada_id AND aa.avaliacao_id = aq.avaliacao_id
+                    INNER JOIN avaliacoes_aplicadas aa ON aa.id = r.avaliacao_aplicada_id
+                    INNER JOIN avaliacoes_questoes aq ON aq.questao_id = q.id AND aq.avaliacao_id = aa.avaliacao_id
+                    SET r.correta = CASE WHEN {acerto} THEN TRUE ELSE FALSE END,
+                        r.pontuacao_obtida = CASE WHEN {acerto} THEN aq.pontuacao ELSE 0 END
                     WHERE r.avaliacao_aplicada_id = %s
                     AND q.tipo = 'multipla_escolha'
                     AND r.correta IS NULL
                 """, (avaliacao_aplicada_id,))
                 
-                respostas = cursor.fetchall()
-                
-                corretas = 0
-                erradas = 0
-                
-                for resp in respostas:
-                    resp_id, resp_letra, gabarito, pontuacao = resp
-                    is_correta = resp_letra and resp_letra.upper() == gabarito.upper() if gabarito else False
-                    pts = pontuacao if is_correta else 0
-                    
-                    cursor.execute("""
-                        UPDATE respostas_alunos
-                        SET correta = %s, pontuacao_obtida = %s
-                        WHERE id = %s
-                    """, (is_correta, pts, resp_id))
-                    
-                    if is_correta:
-                        corretas += 1
-                    else:
-                        erradas += 1
-                
-                return {'corretas': corretas, 'erradas': erradas, 'total': corretas + erradas}
+                logger.info(
+                    f"Correção automática da aplicação {avaliacao_aplicada_id}: "
+                    f"{corretas}/{total} corretas ({cursor.rowcount} linhas atualizadas)"
+                )
+                return {'corretas': corretas, 'erradas': total - corretas, 'total': total}
                 
         except Exception as e:
             logger.exception(f"Erro na correção automática: {e}")
@@ -1244,17 +1535,41 @@ class RespostaService:
         corretor_id: int,
         feedback: Optional[str] = None
     ) -> bool:
-        """Corrige uma questão dissertativa."""
+        """Corrige uma questão dissertativa e atualiza o desempenho por habilidade."""
         try:
-            with get_cursor() as cursor:
+            with get_cursor(commit=True) as cursor:
+                cursor.execute("""
+                    SELECT r.aluno_id, r.correta, q.habilidade_bncc_codigo, t.ano_letivo_id
+                    FROM respostas_alunos r
+                    INNER JOIN questoes q ON q.id = r.questao_id
+                    INNER JOIN avaliacoes_aplicadas aa ON aa.id = r.avaliacao_aplicada_id
+                    INNER JOIN turmas t ON t.id = aa.turma_id
+                    WHERE r.id = %s
+                    FOR UPDATE
+                """, (resposta_id,))
+                anterior = cursor.fetchone()
+                
+                correta = pontuacao > 0
                 cursor.execute("""
                     UPDATE respostas_alunos
                     SET pontuacao_obtida = %s, correta = %s, 
                         corrigida_por = %s, corrigida_em = NOW(),
                         feedback_professor = %s
                     WHERE id = %s
-                """, (pontuacao, pontuacao > 0, corretor_id, feedback, resposta_id))
-                return cursor.rowcount > 0
+                """, (pontuacao, correta, corretor_id, feedback, resposta_id))
+                atualizada = cursor.rowcount > 0
+                
+                if atualizada and anterior and anterior['habilidade_bncc_codigo']:
+                    ja_corrigida = anterior['correta'] is not None
+                    delta_total = 0 if ja_corrigida else 1
+                    delta_acertos = int(correta) - (int(bool(anterior['correta'])) if ja_corrigida else 0)
+                    if delta_total or delta_acertos:
+                        DesempenhoService.aplicar_delta(
+                            cursor, anterior['aluno_id'], anterior['habilidade_bncc_codigo'],
+                            anterior['ano_letivo_id'], delta_total, delta_acertos
+                        )
+                
+                return atualizada
         except Exception as e:
             logger.exception(f"Erro ao corrigir dissertativa: {e}")
             return False
@@ -1263,6 +1578,179 @@ class RespostaService:
 class DesempenhoService:
     """Serviço para análise de desempenho."""
     
+    @staticmethod
+    def _sql_nivel_dominio(taxa: str) -> str:
+        """CASE SQL equivalente a DesempenhoAlunoHabilidade.calcular_nivel_dominio."""
+        return f"""
+            CASE
+                WHEN {taxa} >= 80 THEN 'avancado'
+                WHEN {taxa} >= 60 THEN 'intermediario'
+                WHEN {taxa} >= 40 THEN 'basico'
+                ELSE 'inicial'
+            END
+        """
+    
+    @staticmethod
+    def _sql_atualizar_taxa_e_nivel() -> str:
+        """Atribuições finais do ON DUPLICATE KEY UPDATE incremental.
+        
+        O MySQL avalia as atribuições da esquerda para a direita, então taxa
+        e nível enxergam os totais já somados.
+        """
+        return f"""
+            taxa_acerto = IF(total_questoes_respondidas > 0,
+                             total_acertos * 100 / total_questoes_respondidas, NULL),
+            nivel_dominio = {DesempenhoService._sql_nivel_dominio('taxa_acerto')},
+            updated_at = NOW()
+        """
+    
+    @staticmethod
+    def aplicar_delta(
+        cursor,
+        aluno_id: int,
+        habilidade_codigo: str,
+        ano_letivo_id: int,
+        delta_total: int,
+        delta_acertos: int
+    ) -> None:
+        """Soma um delta ao desempenho de um aluno em uma habilidade.
+        
+        Usa o cursor do chamador: o delta entra na mesma transação da correção.
+        """
+        total_inicial = max(delta_total, 0)
+        acertos_inicial = max(delta_acertos, 0)
+        taxa_inicial = (acertos_inicial / total_inicial) * 100 if total_inicial else None
+        nivel_inicial = DesempenhoAlunoHabilidade.calcular_nivel_dominio(taxa_inicial or 0)
+        
+        cursor.execute(f"""
+            INSERT INTO desempenho_aluno_habilidade (
+                aluno_id, habilidade_bncc_codigo, ano_letivo_id,
+                total_questoes_respondidas, total_acertos, taxa_acerto, nivel_dominio
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                total_questoes_respondidas = GREATEST(CAST(total_questoes_respondidas AS SIGNED) + %s, 0),
+                total_acertos = GREATEST(CAST(total_acertos AS SIGNED) + %s, 0),
+                {DesempenhoService._sql_atualizar_taxa_e_nivel()}
+        """, (
+            aluno_id, habilidade_codigo, ano_letivo_id,
+            total_inicial, acertos_inicial, taxa_inicial, nivel_inicial.value,
+            delta_total, delta_acertos
+        ))
+    
+    @staticmethod
+    def aplicar_deltas_correcao(cursor, avaliacao_aplicada_id: int) -> int:
+        """Soma ao desempenho as respostas objetivas pendentes de uma aplicação.
+        
+        Deve ser chamado na mesma transação e imediatamente antes do UPDATE
+        de RespostaService.corrigir_automaticamente, enquanto as respostas
+        ainda têm ``correta IS NULL``. Um único INSERT ... SELECT agrupado por
+        (aluno, habilidade) aplica todos os deltas.
+        
+        Returns:
+            Linhas afetadas informadas pelo MySQL
+        """
+        acerto = RespostaService._SQL_ACERTO
+        taxa_nova = f"SUM(CASE WHEN {acerto} THEN 1 ELSE 0 END) * 100 / COUNT(*)"
+        cursor.execute(f"""
+            INSERT INTO desempenho_aluno_habilidade (
+                aluno_id, habilidade_bncc_codigo, ano_letivo_id,
+                total_questoes_respondidas, total_acertos, taxa_acerto, nivel_dominio
+            )
+            SELECT
+                r.aluno_id, q.habilidade_bncc_codigo, t.ano_letivo_id,
+                COUNT(*),
+                SUM(CASE WHEN {acerto} THEN 1 ELSE 0 END),
+                {taxa_nova},
+                {DesempenhoService._sql_nivel_dominio(taxa_nova)}
+            FROM respostas_alunos r
+            INNER JOIN questoes q ON q.id = r.questao_id
+            INNER JOIN avaliacoes_aplicadas aa ON aa.id = r.avaliacao_aplicada_id
+            INNER JOIN avaliacoes_questoes aq ON aq.questao_id = q.id AND aq.avaliacao_id = aa.avaliacao_id
+            INNER JOIN turmas t ON t.id = aa.turma_id
+            WHERE r.avaliacao_aplicada_id = %s
+            AND q.tipo = 'multipla_escolha'
+            AND r.correta IS NULL
+            AND q.habilidade_bncc_codigo IS NOT NULL
+            GROUP BY r.aluno_id, q.habilidade_bncc_codigo, t.ano_letivo_id
+            ON DUPLICATE KEY UPDATE
+                total_questoes_respondidas = total_questoes_respondidas + VALUES(total_questoes_respondidas),
+                total_acertos = total_acertos + VALUES(total_acertos),
+                {DesempenhoService._sql_atualizar_taxa_e_nivel()}
+        """, (avaliacao_aplicada_id,))
+        return cursor.rowcount
+    
+    @staticmethod
+    def recalcular_desempenho_aplicacao(avaliacao_aplicada_id: int) -> int:
+        """Recalcula do zero o desempenho de todos os pares afetados por uma aplicação.
+        
+        Para cada (aluno, habilidade, ano letivo) que aparece na aplicação,
+        refaz a contagem sobre todas as respostas corrigidas do ano e grava
+        tudo com um único INSERT ... SELECT ... ON DUPLICATE KEY UPDATE.
+        Útil para corrigir desvios dos deltas ou após importações.
+        
+        Returns:
+            Número de pares (aluno, habilidade) recalculados, ou -1 em erro
+        """
+        taxa = "SUM(CASE WHEN r.correta = TRUE THEN 1 ELSE 0 END) * 100 / COUNT(*)"
+        try:
+            with get_cursor(commit=True) as cursor:
+                cursor.execute(f"""
+                    INSERT INTO desempenho_aluno_habilidade (
+                        aluno_id, habilidade_bncc_codigo, ano_letivo_id,
+                        total_questoes_respondidas, total_acertos, taxa_acerto, nivel_dominio
+                    )
+                    SELECT
+                        r.aluno_id, q.habilidade_bncc_codigo, t.ano_letivo_id,
+                        COUNT(*),
+                        SUM(CASE WHEN r.correta = TRUE THEN 1 ELSE 0 END),
+                        {taxa},
+                        {DesempenhoService._sql_nivel_dominio(taxa)}
+                    FROM respostas_alunos r
+                    INNER JOIN questoes q ON q.id = r.questao_id
+                    INNER JOIN avaliacoes_aplicadas aa ON aa.id = r.avaliacao_aplicada_id
+                    INNER JOIN avaliacoes a ON a.id = aa.avaliacao_id
+                    INNER JOIN turmas t ON t.id = aa.turma_id
+                    INNER JOIN (
+                        SELECT DISTINCT r2.aluno_id, q2.habilidade_bncc_codigo, t2.ano_letivo_id
+                        FROM respostas_alunos r2
+                        INNER JOIN questoes q2 ON q2.id = r2.questao_id
+                        INNER JOIN avaliacoes_aplicadas aa2 ON aa2.id = r2.avaliacao_aplicada_id
+                        INNER JOIN turmas t2 ON t2.id = aa2.turma_id
+                        WHERE r2.avaliacao_aplicada_id = %s
+                        AND q2.habilidade_bncc_codigo IS NOT NULL
+                    ) alvo ON alvo.aluno_id = r.aluno_id
+                        AND alvo.habilidade_bncc_codigo = q.habilidade_bncc_codigo
+                        AND alvo.ano_letivo_id = t.ano_letivo_id
+                    WHERE r.correta IS NOT NULL
+                    GROUP BY r.aluno_id, q.habilidade_bncc_codigo, t.ano_letivo_id
+                    ON DUPLICATE KEY UPDATE
+                        total_questoes_respondidas = VALUES(total_questoes_respondidas),
+                        total_acertos = VALUES(total_acertos),
+                        taxa_acerto = VALUES(taxa_acerto),
+                        nivel_dominio = VALUES(nivel_dominio),
+                        updated_at = NOW()
+                """, (avaliacao_aplicada_id,))
+                
+                # rowcount conta 1 por inserção e 2 por atualização; a contagem
+                # de pares vem do SELECT de alvos
+                cursor.execute("""
+                    SELECT COUNT(*) AS total FROM (
+                        SELECT DISTINCT r.aluno_id, q.habilidade_bncc_codigo
+                        FROM respostas_alunos r
+                        INNER JOIN questoes q ON q.id = r.questao_id
+                        WHERE r.avaliacao_aplicada_id = %s
+                        AND q.habilidade_bncc_codigo IS NOT NULL
+                    ) pares
+                """, (avaliacao_aplicada_id,))
+                row = cursor.fetchone()
+                total = int(row['total'] or 0) if row else 0
+                logger.info(f"Desempenho recalculado para {total} pares da aplicação {avaliacao_aplicada_id}")
+                return total
+                
+        except Exception as e:
+            logger.exception(f"Erro ao recalcular desempenho da aplicação: {e}")
+            return -1
+    
     @staticmethod
     def atualizar_desempenho_aluno_habilidade(
         aluno_id: int,
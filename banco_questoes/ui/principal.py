@@ -63,7 +63,15 @@ class InterfaceBancoQuestoes:
             self.funcionario_id = UsuarioLogado.get_funcionario_id()
         
         self.criar_interface()
-    
+
+        # Carregar o índice textual e o catálogo BNCC em segundo plano para a
+        # primeira busca/combobox não esperar a leitura do disco/construção.
+        from src.utils.executor import submit_background
+        from banco_questoes.indice_busca import obter_indice
+        from banco_questoes.catalogo_bncc import obter_catalogo
+        submit_background(obter_indice)
+        submit_background(obter_catalogo)
+
     def ao_fechar_janela(self):
         """Trata o evento de fechamento da janela."""
         if self.janela_principal:
@@ -171,50 +179,9 @@ class InterfaceBancoQuestoes:
         return mapa.get(ano, [])
     
     def _carregar_habilidades_bncc(self, componente_sigla: Optional[str] = None, anos_bloco: Optional[list] = None) -> list:
-        """Carrega habilidades BNCC do banco de dados filtradas por componente e ano."""
-        try:
-            from src.core.conexao import conectar_bd
-            conn = conectar_bd()
-            if not conn:
-                return []
-            
-            cursor: Any = conn.cursor(dictionary=True)
-            
-            # Construir query com filtros opcionais
-            query = "SELECT codigo, descricao FROM bncc_habilidades WHERE 1=1"
-            params = []
-            
-            if componente_sigla:
-                query += " AND componente_codigo = %s"
-                params.append(componente_sigla)
-            
-            if anos_bloco:
-                placeholders = ", ".join(["%s"] * len(anos_bloco))
-                query += f" AND ano_bloco IN ({placeholders})"
-                params.extend(anos_bloco)
-            
-            query += " ORDER BY codigo LIMIT 500"
-            
-            cursor.execute(query, params)
-            resultados = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            
-            # Formatar como "CODIGO - Descrição resumida"
-            habilidades = []
-            for row in resultados:
-                codigo = row['codigo']
-                descricao = row['descricao'] or ''
-                # Truncar descrição se muito longa
-                if len(descricao) > 80:
-                    descricao = descricao[:77] + "..."
-                habilidades.append(f"{codigo} - {descricao}")
-            
-            return habilidades
-            
-        except Exception as e:
-            logger.error(f"Erro ao carregar habilidades BNCC: {e}")
-            return []
+        """Habilidades BNCC filtradas por componente e ano (catálogo em memória)."""
+        from banco_questoes.services import HabilidadeBNCCService
+        return HabilidadeBNCCService.listar_rotulos(componente_sigla, anos_bloco)
     
     def _atualizar_habilidades_busca(self, event=None):
         """Atualiza o combobox de habilidades na aba de busca com base nos filtros."""
@@ -466,6 +433,12 @@ class InterfaceBancoQuestoes:
         try:
             questoes, total = QuestaoService.buscar(filtros, limite=100)
             
+            # Arquivos e miniaturas da página em segundo plano, para abrir
+            # os detalhes sem consulta nem download na thread da UI
+            from banco_questoes.imagem_service import imagens_questoes
+            from src.utils.executor import submit_background
+            submit_background(imagens_questoes.pre_carregar, [q.id for q in questoes])
+            
             for q in questoes:
                 self.tree_busca.insert("", "end", values=(
                     q.id,
@@ -702,154 +675,61 @@ Status: {questao.status.value if questao.status else ''}"""
     
     def _carregar_arquivos_questao(self, questao_id: int) -> list:
         """Carrega arquivos (imagens) vinculados a uma questão."""
-        try:
-            from src.core.conexao import conectar_bd
-            conn = conectar_bd()
-            if not conn:
-                return []
-            
-            cursor: Any = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT qa.*, qalt.letra as alternativa_letra
-                FROM questoes_arquivos qa
-                LEFT JOIN questoes_alternativas qalt ON qa.alternativa_id = qalt.id
-                WHERE qa.questao_id = %s
-                ORDER BY qa.posicao, qa.id
-            """, (questao_id,))
-            
-            arquivos = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            
-            return arquivos
-            
-        except Exception as e:
-            logger.error(f"Erro ao carregar arquivos da questão: {e}")
-            return []
+        from banco_questoes.imagem_service import imagens_questoes
+        return imagens_questoes.arquivos_questao(questao_id)
     
     def _mostrar_imagem_questao(self, parent: tk.Widget, arquivo: dict, max_size: int = 300, posicao = None):
-        """Mostra uma imagem da questão no widget pai. Busca do Drive se não encontrar localmente."""
-        import os
+        """
+        Mostra uma imagem da questão no widget pai.
         
+        Usa a miniatura em cache quando existe; caso contrário mostra um
+        aviso de carregamento e gera a miniatura (baixando o original do
+        Drive, se preciso) em segundo plano.
+        """
         try:
-            from PIL import Image, ImageTk
-            
-            caminho_relativo = arquivo.get('caminho_relativo', '')
-            link_drive = arquivo.get('link_no_drive', '')
-            drive_file_id = arquivo.get('drive_file_id', '')
-            
-            # Construir caminho absoluto
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            caminho_absoluto = os.path.join(base_dir, caminho_relativo.replace("/", os.sep)) if caminho_relativo else None
-            
-            img = None
-            
-            # Tentar carregar do arquivo local primeiro
-            if caminho_absoluto and os.path.exists(caminho_absoluto):
-                img = Image.open(caminho_absoluto)
-            elif drive_file_id or link_drive:
-                # Tentar baixar do Google Drive
-                img = self._baixar_imagem_drive(drive_file_id, link_drive, caminho_absoluto)
-            
-            if not img:
-                logger.warning(f"Imagem não encontrada localmente nem no Drive")
-                return
-            
-            # Redimensionar mantendo proporção
-            ratio = min(max_size / img.width, max_size / img.height)
-            if ratio < 1:
-                novo_w = int(img.width * ratio)
-                novo_h = int(img.height * ratio)
-                img = img.resize((novo_w, novo_h), Image.Resampling.LANCZOS)
-            
-            photo = ImageTk.PhotoImage(img)
-            
-            frame_img = tk.Frame(parent, bg=self.co0)
-            if posicao == "top":
-                frame_img.pack(fill="x", pady=5)
-            elif posicao == "bottom":
-                frame_img.pack(fill="x", pady=5)
-            else:
-                frame_img.pack(side="right", padx=5)
-            
-            lbl = tk.Label(frame_img, image=photo, bg=self.co0)
-            # Manter referência ao PhotoImage para evitar garbage collection
-            self._store_image_ref(photo)
-            lbl.pack()
-            
+            from PIL import ImageTk
+            from banco_questoes.imagem_service import imagens_questoes
+            from src.utils.executor import submit_background
         except ImportError:
             logger.warning("PIL não disponível para exibir imagem")
-        except Exception as e:
-            logger.error(f"Erro ao mostrar imagem: {e}")
-    
-    def _baixar_imagem_drive(self, drive_file_id: str, link_drive: str, caminho_local: Optional[str] = None):
-        """
-        Baixa uma imagem do Google Drive e salva localmente como cache.
+            return
         
-        Args:
-            drive_file_id: ID do arquivo no Drive
-            link_drive: Link alternativo do Drive
-            caminho_local: Caminho onde salvar como cache (opcional)
-            
-        Returns:
-            PIL.Image ou None em caso de erro
-        """
-        import os
-        import io
+        frame_img = tk.Frame(parent, bg=self.co0)
+        if posicao == "top":
+            frame_img.pack(fill="x", pady=5)
+        elif posicao == "bottom":
+            frame_img.pack(fill="x", pady=5)
+        else:
+            frame_img.pack(side="right", padx=5)
         
-        try:
-            from PIL import Image
-            from src.utils.utilitarios.gerenciador_documentos import gerenciador
-            
-            # Garantir que o Drive esteja configurado
-            if not gerenciador.service:
-                gerenciador.setup_google_drive()
-            
-            file_id = drive_file_id
-            if not file_id and link_drive:
-                # Extrair file_id do link
-                if '/d/' in link_drive:
-                    file_id = link_drive.split('/d/')[1].split('/')[0]
-                elif 'id=' in link_drive:
-                    file_id = link_drive.split('id=')[1].split('&')[0]
-            
-            if not file_id:
-                logger.warning("Não foi possível obter ID do arquivo no Drive")
-                return None
-            
-            # Baixar arquivo do Drive
-            svc = gerenciador.service
-            if not svc:
-                logger.warning("Drive service não inicializado ao tentar baixar arquivo")
-                return None
-
-            request = svc.files().get_media(fileId=file_id)
-            file_data = io.BytesIO()
-
-            from googleapiclient.http import MediaIoBaseDownload
-            downloader = MediaIoBaseDownload(file_data, request)
-
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-            
-            file_data.seek(0)
-            img = Image.open(file_data)
-            
-            # Salvar como cache local se caminho fornecido
-            if caminho_local:
-                try:
-                    os.makedirs(os.path.dirname(caminho_local), exist_ok=True)
-                    img.save(caminho_local)
-                    logger.info(f"Imagem baixada do Drive e salva em cache: {caminho_local}")
-                except Exception as e:
-                    logger.warning(f"Não foi possível salvar cache local: {e}")
-            
-            return img
-            
-        except Exception as e:
-            logger.error(f"Erro ao baixar imagem do Drive: {e}")
-            return None
+        lbl = tk.Label(frame_img, bg=self.co0)
+        lbl.pack()
+        
+        def exibir(img):
+            try:
+                if not lbl.winfo_exists():
+                    return
+                if img is None:
+                    logger.warning(f"Imagem não encontrada localmente nem no Drive")
+                    lbl.config(text="[Imagem indisponível]", fg=self.co9)
+                    return
+                photo = ImageTk.PhotoImage(img)
+                lbl.config(image=photo, text="")
+                # Manter referência ao PhotoImage para evitar garbage collection
+                self._store_image_ref(photo)
+            except Exception as e:
+                logger.error(f"Erro ao mostrar imagem: {e}")
+        
+        img = imagens_questoes.obter_em_cache(arquivo, max_size)
+        if img is not None:
+            exibir(img)
+            return
+        
+        lbl.config(text="Carregando imagem...", fg=self.co9, font=("Arial", 9, "italic"))
+        submit_background(
+            imagens_questoes.carregar, arquivo, max_size,
+            on_done=exibir, on_error=lambda e: exibir(None), janela=self.janela
+        )
     
     # =========================================================================
     # ABA: CADASTRAR QUESTÃO
@@ -1821,6 +1701,9 @@ Status: {questao.status.value if questao.status else ''}"""
             cursor.close()
             conn.close()
             
+            from banco_questoes.imagem_service import imagens_questoes
+            imagens_questoes.esquecer(questao_id)
+            
         except Exception as e:
             logger.error(f"Erro ao salvar arquivos da questão: {e}")
     
@@ -2,7 +2,8 @@
 Módulo unificado de conexão com o banco de dados.
 
 Responsabilidades:
-- Pool de conexões MySQL (inicialização, obtenção, encerramento)
+- Pool de conexões MySQL elástico (espera limitada, validação de conexões
+  ociosas, crescimento até um máximo e métricas)
 - Context managers: get_connection(), get_cursor()
 - Configuração centralizada via settings ou .env
 
@@ -12,12 +13,14 @@ src.core.conexao re-exporta as funções daqui para compatibilidade.
 
 import os
 import threading
+import time
 from contextlib import contextmanager
-from typing import Generator, Optional
+from typing import Callable, Generator, List, Optional, Tuple
 
 import mysql.connector
-from mysql.connector import Error, pooling
+from mysql.connector import Error
 from mysql.connector.errors import InternalError as MySQLInternalError
+from mysql.connector.errors import PoolError
 from dotenv import load_dotenv
 
 from src.core.config_logs import get_logger
@@ -44,24 +47,33 @@ def _get_db_config() -> dict:
     Retorna configuração de banco de dados a partir de settings ou .env.
 
     Returns:
-        dict com host, user, password, database, pool_size
+        dict com host, user, password, database, pool_size, pool_max_size
+        e pool_timeout
     """
     if settings:
         db = settings.database
-        return {
+        cfg = {
             "host": db.host,
             "user": db.user,
             "password": db.password,
             "database": db.name,
             "pool_size": db.pool_size,
+            "pool_max_size": db.pool_max_size,
+            "pool_timeout": db.pool_timeout,
+        }
+    else:
+        cfg = {
+            "host": os.getenv("DB_HOST", ""),
+            "user": os.getenv("DB_USER", ""),
+            "password": os.getenv("DB_PASSWORD", ""),
+            "database": os.getenv("DB_NAME", ""),
+            "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+            "pool_max_size": int(os.getenv("DB_POOL_MAX_SIZE", "0")),
+            "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
         }
-    return {
-        "host": os.getenv("DB_HOST", ""),
-        "user": os.getenv("DB_USER", ""),
-        "password": os.getenv("DB_PASSWORD", ""),
-        "database": os.getenv("DB_NAME", ""),
-        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
-    }
+    # 0 = o dobro do tamanho base
+    cfg["pool_max_size"] = max(cfg["pool_max_size"] or 2 * cfg["pool_size"], cfg["pool_size"])
+    return cfg
 
 
 def _validar_configuracao_db() -> tuple[bool, list[str]]:
@@ -108,6 +120,252 @@ def _testar_conexao_db(host: str, user: str, password: str, database: str) -> tu
         return False, f"Erro ao testar conexão: {e}"
 
 
+# ---------------------------------------------------------------------------
+# Pool elástico
+# ---------------------------------------------------------------------------
+
+class PoolEsgotadoError(PoolError):
+    """Nenhuma conexão ficou livre dentro do tempo de espera do pool."""
+
+
+class _ConexaoDoPool:
+    """Conexão emprestada pelo pool; ``close()`` devolve ao pool em vez de fechar.
+
+    Mantém o atributo ``_cnx`` de ``PooledMySQLConnection`` para o código que
+    acessa a conexão real.
+    """
+
+    __slots__ = ("_cnx", "_pool")
+
+    def __init__(self, cnx, pool: "PoolConexoes"):
+        self._cnx = cnx
+        self._pool = pool
+
+    @property
+    def pool_name(self) -> str:
+        return self._pool.pool_name
+
+    def close(self) -> None:
+        cnx, self._cnx = self._cnx, None
+        if cnx is not None:
+            self._pool._devolver(cnx)
+
+    def __enter__(self) -> "_ConexaoDoPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __getattr__(self, name):
+        if self._cnx is None:
+            raise PoolError("Conexão já devolvida ao pool")
+        return getattr(self._cnx, name)
+
+
+class PoolConexoes:
+    """Pool de conexões MySQL com espera limitada, validação e métricas.
+
+    - Mantém até ``pool_size`` conexões ociosas e cresce até ``pool_max_size``
+      sob carga; as conexões extras são fechadas após ``ocioso_max`` segundos
+      sem uso.
+    - Quando todas as conexões estão em uso, ``get_connection`` espera até
+      ``timeout`` segundos e levanta :class:`PoolEsgotadoError`, em vez de
+      abrir conexões fora do pool.
+    - Conexões ociosas há mais de ``validar_apos`` segundos são testadas com
+      ``ping`` antes de serem entregues; as que falham são descartadas.
+    - Ao devolver, a sessão é resetada (equivale a ``pool_reset_session``).
+    """
+
+    def __init__(
+        self,
+        pool_name: str,
+        pool_size: int,
+        pool_max_size: Optional[int] = None,
+        timeout: float = 10.0,
+        validar_apos: float = 30.0,
+        ocioso_max: float = 300.0,
+        fabrica: Optional[Callable] = None,
+        **cnx_config,
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size deve ser maior que 0")
+        self.pool_name = pool_name
+        self.pool_size = pool_size
+        self.pool_max_size = max(pool_max_size or pool_size, pool_size)
+        self.timeout = timeout
+        self.validar_apos = validar_apos
+        self.ocioso_max = ocioso_max
+        self._cnx_config = cnx_config
+        self._fabrica = fabrica or (lambda: mysql.connector.connect(**cnx_config))
+
+        self._cond = threading.Condition(threading.Lock())
+        self._ociosas: List[Tuple[object, float]] = []  # (conexão, devolvida_em)
+        self._total = 0  # conexões abertas ou sendo abertas
+        self._em_uso = 0
+        self._fechado = False
+        self._metricas = {
+            "checkouts": 0,
+            "esperas": 0,
+            "esgotamentos": 0,
+            "latencia_total": 0.0,
+            "latencia_max": 0.0,
+            "criadas": 0,
+            "descartadas": 0,
+            "pico_em_uso": 0,
+        }
+
+    # -- empréstimo --------------------------------------------------------
+
+    def get_connection(self, timeout: Optional[float] = None) -> _ConexaoDoPool:
+        """Empresta uma conexão, esperando no máximo ``timeout`` segundos."""
+        timeout = self.timeout if timeout is None else timeout
+        inicio = time.perf_counter()
+        limite = time.monotonic() + timeout
+        esperou = False
+
+        while True:
+            cnx = None
+            criar = False
+            with self._cond:
+                while True:
+                    if self._fechado:
+                        raise PoolError(f"Pool {self.pool_name} encerrado")
+                    if self._ociosas:
+                        cnx, devolvida_em = self._ociosas.pop()
+                        break
+                    if self._total < self.pool_max_size:
+                        self._total += 1
+                        criar = True
+                        break
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self._metricas["esgotamentos"] += 1
+                        logger.warning(
+                            f"Pool {self.pool_name} esgotado: {self._em_uso} conexões em uso "
+                            f"(máximo {self.pool_max_size}), espera de {timeout:.1f}s excedida"
+                        )
+                        raise PoolEsgotadoError(
+                            f"Nenhuma conexão livre em {timeout:.1f}s "
+                            f"({self._em_uso}/{self.pool_max_size} em uso)"
+                        )
+                    if not esperou:
+                        esperou = True
+                        self._metricas["esperas"] += 1
+                    self._cond.wait(restante)
+
+            # Abertura e validação fora do lock (envolvem rede)
+            if criar:
+                try:
+                    cnx = self._fabrica()
+                except Exception:
+                    with self._cond:
+                        self._total -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._metricas["criadas"] += 1
+            elif time.monotonic() - devolvida_em > self.validar_apos and not self._valida(cnx):
+                self._descartar(cnx)
+                continue
+
+            latencia = time.perf_counter() - inicio
+            with self._cond:
+                self._em_uso += 1
+                m = self._metricas
+                m["checkouts"] += 1
+                m["latencia_total"] += latencia
+                m["latencia_max"] = max(m["latencia_max"], latencia)
+                m["pico_em_uso"] = max(m["pico_em_uso"], self._em_uso)
+            return _ConexaoDoPool(cnx, self)
+
+    @staticmethod
+    def _valida(cnx) -> bool:
+        try:
+            cnx.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _devolver(self, cnx) -> None:
+        try:
+            cnx.reset_session()
+        except Exception:
+            # Sessão em estado inconsistente (ex.: resultado não lido): não reaproveitar
+            logger.debug("Falha ao resetar sessão; conexão descartada", exc_info=True)
+            with self._cond:
+                self._em_uso -= 1
+            self._descartar(cnx)
+            return
+
+        agora = time.monotonic()
+        expiradas = []
+        with self._cond:
+            self._em_uso -= 1
+            if self._fechado:
+                expiradas.append(cnx)
+                self._total -= 1
+            else:
+                self._ociosas.append((cnx, agora))
+                # Fecha as conexões extras que ficaram ociosas por muito tempo;
+                # as mais antigas ficam no início da lista.
+                while (len(self._ociosas) > self.pool_size
+                       and agora - self._ociosas[0][1] > self.ocioso_max):
+                    expiradas.append(self._ociosas.pop(0)[0])
+                    self._total -= 1
+                    self._metricas["descartadas"] += 1
+            self._cond.notify()
+        for antiga in expiradas:
+            self._fechar_silencioso(antiga)
+
+    def _descartar(self, cnx) -> None:
+        with self._cond:
+            self._total -= 1
+            self._metricas["descartadas"] += 1
+            self._cond.notify()
+        self._fechar_silencioso(cnx)
+
+    @staticmethod
+    def _fechar_silencioso(cnx) -> None:
+        try:
+            cnx.close()
+        except Exception:
+            pass
+
+    # -- ciclo de vida e métricas -----------------------------------------
+
+    def fechar(self) -> int:
+        """Fecha as conexões ociosas; as emprestadas são fechadas ao voltar."""
+        with self._cond:
+            self._fechado = True
+            ociosas = [cnx for cnx, _ in self._ociosas]
+            self._ociosas.clear()
+            self._total -= len(ociosas)
+            self._cond.notify_all()
+        for cnx in ociosas:
+            self._fechar_silencioso(cnx)
+        return len(ociosas)
+
+    def metricas(self) -> dict:
+        """Retrato das métricas e medidores do pool."""
+        with self._cond:
+            m = dict(self._metricas)
+            em_uso, ociosas, total = self._em_uso, len(self._ociosas), self._total
+        checkouts = m["checkouts"]
+        return {
+            "em_uso": em_uso,
+            "ociosas": ociosas,
+            "total_conexoes": total,
+            "pico_em_uso": m["pico_em_uso"],
+            "checkouts": checkouts,
+            "esperas": m["esperas"],
+            "esgotamentos": m["esgotamentos"],
+            "latencia_media_ms": (m["latencia_total"] / checkouts * 1000) if checkouts else 0.0,
+            "latencia_max_ms": m["latencia_max"] * 1000,
+            "criadas": m["criadas"],
+            "descartadas": m["descartadas"],
+        }
+
+
 # ---------------------------------------------------------------------------
 # Gerenciamento do Pool
 # ---------------------------------------------------------------------------
@@ -118,7 +376,8 @@ def inicializar_pool():
     Deve ser chamado uma vez no início da aplicação.
 
     Returns:
-        MySQLConnectionPool: Pool de conexões inicializado
+        PoolConexoes: Pool de conexões inicializado (espera limitada,
+        validação de conexões ociosas e métricas)
 
     Raises:
         ValueError: Se a configuração do banco estiver inválida
@@ -156,10 +415,11 @@ def inicializar_pool():
 
         try:
             pool_name = "gestao_escolar_pool"
-            _connection_pool = pooling.MySQLConnectionPool(
+            _connection_pool = PoolConexoes(
                 pool_name=pool_name,
                 pool_size=cfg["pool_size"],
-                pool_reset_session=True,
+                pool_max_size=cfg["pool_max_size"],
+                timeout=cfg["pool_timeout"],
                 host=cfg["host"],
                 user=cfg["user"],
                 password=cfg["password"],
@@ -167,9 +427,10 @@ def inicializar_pool():
                 auth_plugin="mysql_native_password",
             )
             logger.info(
-                f"✓ Connection Pool inicializado: {pool_name} (size={cfg['pool_size']})"
+                f"✓ Connection Pool inicializado: {pool_name} "
+                f"(size={cfg['pool_size']}, max={cfg['pool_max_size']}, timeout={cfg['pool_timeout']}s)"
             )
-        except Error as e:
+        except (Error, ValueError) as e:
             logger.exception(f"Erro ao criar connection pool: {e}")
             _connection_pool = None
             raise
@@ -182,8 +443,11 @@ def conectar_bd():
     Obtém uma conexão do pool de conexões.
     Se o pool não estiver inicializado, inicializa automaticamente.
 
+    Com o pool cheio, espera até ``DB_POOL_TIMEOUT`` segundos por uma conexão
+    livre; conexões diretas só são usadas quando o pool não existe.
+
     Returns:
-        MySQLConnection: Conexão do pool ou None em caso de erro
+        Conexão do pool (``close()`` a devolve) ou None em caso de erro
     """
     global _connection_pool
 
@@ -192,20 +456,18 @@ def conectar_bd():
             inicializar_pool()
 
         if _connection_pool is not None:
-            conn = _connection_pool.get_connection()
-            if conn.is_connected():
-                return conn
-            logger.warning("Conexão do pool não está ativa, tentando reconectar...")
-            conn.reconnect(attempts=3, delay=1)
-            return conn if conn.is_connected() else None
+            return _connection_pool.get_connection()
 
         # Fallback: conexão direta
         logger.warning("Pool não disponível, usando conexão direta (fallback)")
         return _conectar_direto()
 
+    except PoolEsgotadoError as e:
+        logger.error(f"Sem conexão disponível no pool: {e}")
+        return None
     except Error as e:
         logger.exception(f"Erro ao obter conexão do pool: {e}")
-        return _conectar_direto()
+        return None
 
 
 def _conectar_direto():
@@ -242,40 +504,50 @@ def fechar_pool():
         pool = _connection_pool
         _connection_pool = None
 
-    # Drenar conexões do pool
     closed = 0
     try:
-        while True:
-            try:
-                conn = pool.get_connection()
-                conn.close()
-                closed += 1
-            except Exception:
-                break
+        closed = pool.fechar()
     except Exception:
-        pass
+        logger.debug("Erro ao fechar conexões do pool", exc_info=True)
 
     logger.debug(f"Connection Pool encerrado ({closed} conexões fechadas)")
 
 
+def obter_tamanho_pool() -> int:
+    """
+    Retorna o número de conexões ociosas mantidas pelo pool (``pool_size``).
+
+    Usa o pool já inicializado ou, antes da inicialização, a configuração.
+    """
+    if _connection_pool is not None:
+        return _connection_pool.pool_size
+    return int(_get_db_config().get("pool_size", 5))
+
+
 def obter_info_pool() -> Optional[dict]:
     """
-    Retorna informações sobre o estado atual do pool.
+    Retorna informações e métricas sobre o estado atual do pool.
 
     Returns:
-        dict com pool_name, pool_size, host, database, user — ou None
+        dict com pool_name, pool_size, pool_max_size, timeout, host, database,
+        user e as métricas de :meth:`PoolConexoes.metricas` (em_uso, ociosas,
+        esperas, esgotamentos, latência de checkout...) — ou None
     """
     if _connection_pool is None:
         return None
     try:
         pool_config = _connection_pool._cnx_config
-        return {
+        info = {
             "pool_name": _connection_pool.pool_name,
-            "pool_size": _connection_pool._pool_size,
+            "pool_size": _connection_pool.pool_size,
+            "pool_max_size": _connection_pool.pool_max_size,
+            "timeout": _connection_pool.timeout,
             "host": pool_config.get("host", "N/A"),
             "database": pool_config.get("database", "N/A"),
             "user": pool_config.get("user", "N/A"),
         }
+        info.update(_connection_pool.metricas())
+        return info
     except Exception as e:
         logger.exception(f"Erro ao obter informações do pool: {e}")
         return None
@@ -0,0 +1,143 @@
+"""
+Execução concorrente de consultas independentes.
+
+Dashboards costumam disparar várias agregações que não dependem umas das
+outras. Executadas em sequência no mesmo cursor, a latência é a soma de
+todas; com :class:`LoteConsultas` cada consulta roda em sua própria conexão
+do pool e a latência passa a ser a da consulta mais lenta.
+
+Uso básico::
+
+    from db.lote_consultas import LoteConsultas, resolver_ano_letivo
+
+    ano_letivo, ano_letivo_id = resolver_ano_letivo()
+    lote = LoteConsultas()
+    lote.adicionar('medias', "SELECT ... WHERE n.ano_letivo_id = %s", (ano_letivo_id,))
+    lote.adicionar('totais', "SELECT COUNT(*) AS total ...", (ano_letivo_id,), um=True)
+    resultados = lote.executar()      # {'medias': [...], 'totais': {...}}
+    lote.tempos                       # {'medias': 12.3, 'totais': 4.1, 'total': 12.9} (ms)
+"""
+
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from db.connection import get_cursor
+from src.core.config_logs import get_logger
+
+logger = get_logger(__name__)
+
+# Abaixo do tamanho base do pool (DB_POOL_SIZE=5) para não esgotá-lo
+MAX_PARALELAS_PADRAO = 4
+
+
+def resolver_ano_letivo(ano_letivo: Optional[str] = None, cursor=None) -> Tuple[str, Optional[int]]:
+    """Resolve ``(ano_letivo, ano_letivo_id)`` com uma única consulta.
+
+    Args:
+        ano_letivo: Ano (ex.: '2025'). Se None, usa o ano letivo vigente ou,
+            na falta dele, o ano do calendário.
+        cursor: Cursor ``dictionary=True`` já aberto (opcional).
+
+    Returns:
+        Tupla ``(ano_letivo, id)``; ``id`` é None se o ano não existir.
+    """
+    if cursor is None:
+        with get_cursor() as cur:
+            return resolver_ano_letivo(ano_letivo, cur)
+
+    if ano_letivo is None:
+        cursor.execute(
+            "SELECT id, ano_letivo FROM AnosLetivos WHERE CURDATE() BETWEEN data_inicio AND data_fim LIMIT 1"
+        )
+        r = cursor.fetchone()
+        if r:
+            return r['ano_letivo'], r['id']
+        ano_letivo = str(datetime.datetime.now().year)
+
+    cursor.execute("SELECT id FROM AnosLetivos WHERE ano_letivo = %s LIMIT 1", (ano_letivo,))
+    r = cursor.fetchone()
+    return ano_letivo, (r['id'] if r else None)
+
+
+class LoteConsultas:
+    """Lote de consultas somente leitura executadas em paralelo.
+
+    Cada consulta usa uma conexão própria obtida por ``get_cursor()``; o
+    número de conexões simultâneas é limitado por ``max_paralelas``.
+    Depois de :meth:`executar`, ``tempos`` contém a duração de cada consulta
+    em milissegundos e a chave ``'total'`` com o tempo de parede do lote.
+    """
+
+    def __init__(self, max_paralelas: int = MAX_PARALELAS_PADRAO, descricao: str = 'lote'):
+        if max_paralelas < 1:
+            raise ValueError("max_paralelas deve ser positivo")
+        self.max_paralelas = max_paralelas
+        self.descricao = descricao
+        self._consultas: List[Tuple[str, str, Sequence, bool]] = []
+        self.tempos: Dict[str, float] = {}
+
+    def adicionar(self, nome: str, sql: str, params: Sequence = (), um: bool = False) -> 'LoteConsultas':
+        """Registra uma consulta.
+
+        Args:
+            nome: Chave do resultado em :meth:`executar`.
+            sql: Consulta parametrizada.
+            params: Parâmetros da consulta.
+            um: Se True, o resultado é ``fetchone()``; senão ``fetchall() or []``.
+        """
+        if any(n == nome for n, _, _, _ in self._consultas):
+            raise ValueError(f"Consulta '{nome}' já adicionada ao lote")
+        self._consultas.append((nome, sql, tuple(params), um))
+        return self
+
+    def __len__(self) -> int:
+        return len(self._consultas)
+
+    @staticmethod
+    def _executar_uma(sql: str, params: Sequence, um: bool) -> Tuple[Any, float]:
+        inicio = time.perf_counter()
+        with get_cursor() as cursor:
+            cursor.execute(sql, params)
+            resultado = cursor.fetchone() if um else (cursor.fetchall() or [])
+        return resultado, (time.perf_counter() - inicio) * 1000
+
+    def executar(self) -> Dict[str, Any]:
+        """Executa todas as consultas e devolve ``{nome: resultado}``.
+
+        Raises:
+            A primeira exceção levantada por uma das consultas (na ordem em
+            que foram adicionadas), depois que todas terminarem.
+        """
+        self.tempos = {}
+        if not self._consultas:
+            return {}
+
+        inicio = time.perf_counter()
+        resultados: Dict[str, Any] = {}
+        erro: Optional[BaseException] = None
+        trabalhadores = min(self.max_paralelas, len(self._consultas))
+
+        with ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix='consulta') as executor:
+            futuros = [
+                (nome, executor.submit(self._executar_uma, sql, params, um))
+                for nome, sql, params, um in self._consultas
+            ]
+            for nome, futuro in futuros:
+                try:
+                    resultados[nome], self.tempos[nome] = futuro.result()
+                except Exception as e:
+                    logger.error(f"{self.descricao}: consulta '{nome}' falhou: {e}")
+                    erro = erro or e
+
+        self.tempos['total'] = (time.perf_counter() - inicio) * 1000
+        if erro is not None:
+            raise erro
+
+        mais_lenta = max((n for n, _, _, _ in self._consultas), key=self.tempos.__getitem__)
+        logger.info(
+            f"{self.descricao}: {len(self._consultas)} consulta(s) em {self.tempos['total']:.0f} ms "
+            f"com {trabalhadores} conexão(ões); mais lenta: {mais_lenta} ({self.tempos[mais_lenta]:.0f} ms)"
+        )
+        return resultados
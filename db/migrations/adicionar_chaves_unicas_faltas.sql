@@ -0,0 +1,86 @@
+-- ============================================================================
+-- MIGRAÇÃO: Chaves únicas para gravação em lote de faltas
+-- Banco: redeescola (MySQL 8.0)
+-- Descrição: As telas de lançamento de frequência e de faltas de funcionários
+-- gravam a turma/quadro inteiro com INSERT ... ON DUPLICATE KEY UPDATE
+-- (db.upsert_lote). Para isso cada registro precisa de uma chave única:
+--   faltas_bimestrais         (aluno_id, bimestre, ano_letivo_id)
+--   funcionario_faltas_mensal (funcionario_id, ano, mes)
+-- ============================================================================
+
+-- ----------------------------------------------------------------------------
+-- 1. faltas_bimestrais
+-- ----------------------------------------------------------------------------
+
+-- Remover duplicatas mantendo o registro mais recente (maior id)
+DELETE f1 FROM faltas_bimestrais f1
+JOIN faltas_bimestrais f2
+  ON f2.aluno_id = f1.aluno_id
+ AND f2.bimestre = f1.bimestre
+ AND f2.ano_letivo_id = f1.ano_letivo_id
+ AND f2.id > f1.id;
+
+SET @index_exists = (
+    SELECT COUNT(1)
+    FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'faltas_bimestrais'
+    AND INDEX_NAME = 'uk_faltas_aluno_bim_ano'
+);
+
+SET @sql = IF(@index_exists = 0,
+    'ALTER TABLE faltas_bimestrais ADD CONSTRAINT uk_faltas_aluno_bim_ano UNIQUE (aluno_id, bimestre, ano_letivo_id)',
+    'SELECT ''Índice uk_faltas_aluno_bim_ano já existe'''
+);
+
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- O índice não único de melhorias_estrutura_banco.sql fica redundante
+SET @index_exists2 = (
+    SELECT COUNT(1)
+    FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'faltas_bimestrais'
+    AND INDEX_NAME = 'idx_faltas_aluno_bim_ano'
+);
+
+SET @sql2 = IF(@index_exists2 > 0,
+    'DROP INDEX idx_faltas_aluno_bim_ano ON faltas_bimestrais',
+    'SELECT ''Índice idx_faltas_aluno_bim_ano não existe'''
+);
+
+PREPARE stmt2 FROM @sql2;
+EXECUTE stmt2;
+DEALLOCATE PREPARE stmt2;
+
+-- ----------------------------------------------------------------------------
+-- 2. funcionario_faltas_mensal
+-- ----------------------------------------------------------------------------
+-- A tabela é criada por InterfaceCadastroEdicaoFaltas.garantir_tabela, já com
+-- uniq_func_ano_mes; bases que a criaram antes disso podem não ter a chave.
+
+DELETE f1 FROM funcionario_faltas_mensal f1
+JOIN funcionario_faltas_mensal f2
+  ON f2.funcionario_id = f1.funcionario_id
+ AND f2.ano = f1.ano
+ AND f2.mes = f1.mes
+ AND f2.id > f1.id;
+
+SET @index_exists3 = (
+    SELECT COUNT(1)
+    FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'funcionario_faltas_mensal'
+    AND INDEX_NAME = 'uniq_func_ano_mes'
+);
+
+SET @sql3 = IF(@index_exists3 = 0,
+    'ALTER TABLE funcionario_faltas_mensal ADD UNIQUE KEY uniq_func_ano_mes (funcionario_id, ano, mes)',
+    'SELECT ''Índice uniq_func_ano_mes já existe'''
+);
+
+PREPARE stmt3 FROM @sql3;
+EXECUTE stmt3;
+DEALLOCATE PREPARE stmt3;
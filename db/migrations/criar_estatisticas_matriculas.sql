@@ -0,0 +1,190 @@
+-- Migration: Estatísticas materializadas de matrículas (dashboard)
+-- Banco: redeescola (MySQL 8.0)
+-- Descrição: Contadores por escola/ano/turma/sexo/status usados pelo dashboard.
+--
+-- O dashboard refazia várias consultas GROUP BY sobre matriculas, turmas e
+-- series a cada expiração do cache. Agora os contadores são mantidos pelos
+-- triggers abaixo, no mesmo commit de cada matrícula, transferência ou
+-- cancelamento (inclusive os feitos por matricula_service e aluno_service),
+-- e o dashboard lê apenas algumas dezenas de linhas.
+--
+-- Série e turno vêm da turma; sexo e escola vêm do aluno. Alterações nessas
+-- colunas também são propagadas. Para reconstruir os contadores use
+-- src.services.estatistica_service.reconstruir_estatisticas_matriculas().
+
+-- ============================================================================
+-- 1. TABELA
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS `estatisticas_matriculas` (
+  `escola_id` int NOT NULL,
+  `ano_letivo_id` int NOT NULL,
+  `turma_id` int NOT NULL,
+  `serie_id` int NOT NULL,
+  `turno` varchar(20) NOT NULL DEFAULT '',
+  `sexo` varchar(10) NOT NULL DEFAULT '',
+  `status` varchar(30) NOT NULL DEFAULT '',
+  `quantidade` int NOT NULL DEFAULT 0,
+  `atualizado_em` timestamp DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`escola_id`, `ano_letivo_id`, `turma_id`, `sexo`, `status`),
+  KEY `idx_estat_matriculas_turma` (`turma_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+COMMENT='Contadores de matrículas para o dashboard (mantidos por triggers)';
+
+
+-- ============================================================================
+-- 2. PROCEDURE DE AJUSTE
+-- ============================================================================
+
+DROP PROCEDURE IF EXISTS ajustar_estatistica_matricula;
+
+DELIMITER $$
+
+-- Soma p_delta (+1/-1) ao contador da matrícula descrita pelos parâmetros
+CREATE PROCEDURE ajustar_estatistica_matricula(
+    IN p_aluno_id INT,
+    IN p_turma_id INT,
+    IN p_ano_letivo_id INT,
+    IN p_status VARCHAR(30),
+    IN p_delta INT
+)
+BEGIN
+    INSERT INTO estatisticas_matriculas
+        (escola_id, ano_letivo_id, turma_id, serie_id, turno, sexo, status, quantidade)
+    SELECT COALESCE(a.escola_id, 0), p_ano_letivo_id, t.id, t.serie_id,
+           COALESCE(t.turno, ''), COALESCE(a.sexo, ''), COALESCE(p_status, ''), p_delta
+    FROM alunos a
+    JOIN turmas t ON t.id = p_turma_id
+    WHERE a.id = p_aluno_id
+    ON DUPLICATE KEY UPDATE quantidade = quantidade + VALUES(quantidade);
+
+    DELETE FROM estatisticas_matriculas
+    WHERE turma_id = p_turma_id AND quantidade <= 0;
+END$$
+
+DELIMITER ;
+
+
+-- ============================================================================
+-- 3. TRIGGERS
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS trg_matriculas_estatisticas_ins;
+DROP TRIGGER IF EXISTS trg_matriculas_estatisticas_upd;
+DROP TRIGGER IF EXISTS trg_matriculas_estatisticas_del;
+DROP TRIGGER IF EXISTS trg_alunos_estatisticas_upd;
+DROP TRIGGER IF EXISTS trg_alunos_estatisticas_del;
+DROP TRIGGER IF EXISTS trg_turmas_estatisticas_upd;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_matriculas_estatisticas_ins
+AFTER INSERT ON matriculas
+FOR EACH ROW
+BEGIN
+    CALL ajustar_estatistica_matricula(NEW.aluno_id, NEW.turma_id, NEW.ano_letivo_id, NEW.status, 1);
+END$$
+
+CREATE TRIGGER trg_matriculas_estatisticas_upd
+AFTER UPDATE ON matriculas
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.aluno_id <=> NEW.aluno_id AND OLD.turma_id <=> NEW.turma_id
+            AND OLD.ano_letivo_id <=> NEW.ano_letivo_id AND OLD.status <=> NEW.status) THEN
+        CALL ajustar_estatistica_matricula(OLD.aluno_id, OLD.turma_id, OLD.ano_letivo_id, OLD.status, -1);
+        CALL ajustar_estatistica_matricula(NEW.aluno_id, NEW.turma_id, NEW.ano_letivo_id, NEW.status, 1);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_matriculas_estatisticas_del
+AFTER DELETE ON matriculas
+FOR EACH ROW
+BEGIN
+    CALL ajustar_estatistica_matricula(OLD.aluno_id, OLD.turma_id, OLD.ano_letivo_id, OLD.status, -1);
+END$$
+
+-- Sexo ou escola do aluno alterados: move os contadores de todas as matrículas dele
+CREATE TRIGGER trg_alunos_estatisticas_upd
+AFTER UPDATE ON alunos
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.sexo <=> NEW.sexo AND OLD.escola_id <=> NEW.escola_id) THEN
+        INSERT INTO estatisticas_matriculas
+            (escola_id, ano_letivo_id, turma_id, serie_id, turno, sexo, status, quantidade)
+        SELECT COALESCE(OLD.escola_id, 0), m.ano_letivo_id, t.id, t.serie_id,
+               COALESCE(t.turno, ''), COALESCE(OLD.sexo, ''), COALESCE(m.status, ''), -COUNT(*)
+        FROM matriculas m
+        JOIN turmas t ON t.id = m.turma_id
+        WHERE m.aluno_id = NEW.id
+        GROUP BY m.ano_letivo_id, t.id, t.serie_id, t.turno, m.status
+        ON DUPLICATE KEY UPDATE quantidade = quantidade + VALUES(quantidade);
+
+        INSERT INTO estatisticas_matriculas
+            (escola_id, ano_letivo_id, turma_id, serie_id, turno, sexo, status, quantidade)
+        SELECT COALESCE(NEW.escola_id, 0), m.ano_letivo_id, t.id, t.serie_id,
+               COALESCE(t.turno, ''), COALESCE(NEW.sexo, ''), COALESCE(m.status, ''), COUNT(*)
+        FROM matriculas m
+        JOIN turmas t ON t.id = m.turma_id
+        WHERE m.aluno_id = NEW.id
+        GROUP BY m.ano_letivo_id, t.id, t.serie_id, t.turno, m.status
+        ON DUPLICATE KEY UPDATE quantidade = quantidade + VALUES(quantidade);
+
+        -- Só as linhas recém-descontadas (chave antiga do aluno nas turmas dele)
+        DELETE FROM estatisticas_matriculas
+        WHERE escola_id = COALESCE(OLD.escola_id, 0)
+          AND sexo = COALESCE(OLD.sexo, '')
+          AND turma_id IN (SELECT m.turma_id FROM matriculas m WHERE m.aluno_id = NEW.id)
+          AND quantidade <= 0;
+    END IF;
+END$$
+
+-- Exclusões em cascata de matrículas não disparam triggers: desconta antes
+CREATE TRIGGER trg_alunos_estatisticas_del
+BEFORE DELETE ON alunos
+FOR EACH ROW
+BEGIN
+    INSERT INTO estatisticas_matriculas
+        (escola_id, ano_letivo_id, turma_id, serie_id, turno, sexo, status, quantidade)
+    SELECT COALESCE(OLD.escola_id, 0), m.ano_letivo_id, t.id, t.serie_id,
+           COALESCE(t.turno, ''), COALESCE(OLD.sexo, ''), COALESCE(m.status, ''), -COUNT(*)
+    FROM matriculas m
+    JOIN turmas t ON t.id = m.turma_id
+    WHERE m.aluno_id = OLD.id
+    GROUP BY m.ano_letivo_id, t.id, t.serie_id, t.turno, m.status
+    ON DUPLICATE KEY UPDATE quantidade = quantidade + VALUES(quantidade);
+
+    DELETE FROM estatisticas_matriculas
+    WHERE escola_id = COALESCE(OLD.escola_id, 0)
+      AND sexo = COALESCE(OLD.sexo, '')
+      AND turma_id IN (SELECT m.turma_id FROM matriculas m WHERE m.aluno_id = OLD.id)
+      AND quantidade <= 0;
+END$$
+
+CREATE TRIGGER trg_turmas_estatisticas_upd
+AFTER UPDATE ON turmas
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.serie_id <=> NEW.serie_id AND OLD.turno <=> NEW.turno) THEN
+        UPDATE estatisticas_matriculas
+        SET serie_id = NEW.serie_id, turno = COALESCE(NEW.turno, '')
+        WHERE turma_id = NEW.id;
+    END IF;
+END$$
+
+DELIMITER ;
+
+
+-- ============================================================================
+-- 4. CARGA INICIAL
+-- ============================================================================
+
+DELETE FROM estatisticas_matriculas;
+
+INSERT INTO estatisticas_matriculas
+    (escola_id, ano_letivo_id, turma_id, serie_id, turno, sexo, status, quantidade)
+SELECT COALESCE(a.escola_id, 0), m.ano_letivo_id, t.id, t.serie_id,
+       COALESCE(t.turno, ''), COALESCE(a.sexo, ''), COALESCE(m.status, ''), COUNT(*)
+FROM matriculas m
+JOIN alunos a ON a.id = m.aluno_id
+JOIN turmas t ON t.id = m.turma_id
+GROUP BY 1, 2, 3, 4, 5, 6, 7;
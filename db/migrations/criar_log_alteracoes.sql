@@ -0,0 +1,38 @@
+-- Migration: Log de alterações para invalidação de cache entre clientes
+-- Banco: redeescola (MySQL 8.0)
+-- Descrição: Cada gravação feita pela camada de serviço (aluno_service,
+-- matricula_service, turma_service, funcionario_service) insere uma linha
+-- aqui, na mesma transação da alteração.
+--
+-- Cada cliente desktop roda src.services.log_alteracoes_service.MonitorAlteracoes,
+-- que lê as linhas novas (id > último visto) a cada poucos segundos e
+-- invalida apenas os caches registrados para a entidade alterada. Assim os
+-- caches de um cliente refletem gravações feitas por outro sem depender de TTL.
+--
+-- As linhas só interessam por alguns minutos; o monitor remove as mais
+-- antigas que RETENCAO_DIAS (7 dias) periodicamente.
+
+-- ============================================================================
+-- 1. TABELA
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS `log_alteracoes` (
+  `id` bigint NOT NULL AUTO_INCREMENT,
+  `entidade` varchar(40) NOT NULL,
+  `entidade_id` int DEFAULT NULL,
+  `operacao` varchar(20) NOT NULL,
+  `criado_em` timestamp(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+  PRIMARY KEY (`id`),
+  KEY `idx_log_alteracoes_criado_em` (`criado_em`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+COMMENT='Alterações recentes lidas pelos clientes para invalidar caches';
+
+
+-- ============================================================================
+-- 2. VERIFICAÇÃO
+-- ============================================================================
+
+SELECT
+  COUNT(*) AS linhas,
+  MAX(id) AS ultimo_id
+FROM log_alteracoes;
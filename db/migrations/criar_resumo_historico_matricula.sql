@@ -0,0 +1,153 @@
+-- Migration: Resumo do histórico de matrículas
+-- Banco: redeescola (MySQL 8.0)
+-- Descrição: Tabela com uma linha por matrícula contendo as datas mais recentes
+-- de cada tipo de mudança de status e a cadeia de transferências.
+--
+-- Os relatórios (lista atualizada, movimento mensal) faziam até quatro
+-- subconsultas correlacionadas em historico_matricula para cada matrícula;
+-- com o resumo, a lista principal passa a ser um JOIN simples.
+--
+-- O resumo é mantido pelos triggers de historico_matricula: cada INSERT,
+-- UPDATE ou DELETE recalcula apenas a matrícula afetada.
+-- Para recalcular manualmente (ex.: após restaurar um dump sem triggers), use
+-- src.services.matricula_service.atualizar_resumo_historico().
+
+-- ============================================================================
+-- 1. TABELA
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS `resumo_historico_matricula` (
+  `matricula_id` int NOT NULL,
+  `data_ultima_ativacao` date DEFAULT NULL COMMENT 'Última mudança para Ativo',
+  `data_ultimo_status_regular` date DEFAULT NULL COMMENT 'Última mudança para status que não é transferência/cancelamento',
+  `data_ultima_transferencia` date DEFAULT NULL,
+  `data_ultima_evasao` date DEFAULT NULL,
+  `data_ultima_saida` date DEFAULT NULL COMMENT 'Última transferência ou evasão',
+  `status_ultima_saida` varchar(30) DEFAULT NULL,
+  `historico_transferencia` text COMMENT '"Transferido em dd/mm/aaaa | ..." (mais recente primeiro)',
+  `atualizado_em` timestamp DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`matricula_id`),
+  KEY `idx_resumo_hist_saida` (`data_ultima_saida`),
+  CONSTRAINT `fk_resumo_hist_matricula` FOREIGN KEY (`matricula_id`) REFERENCES `matriculas` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+COMMENT='Resumo por matrícula de historico_matricula (mantido por triggers)';
+
+
+-- ============================================================================
+-- 2. PROCEDURE DE RECÁLCULO (UMA MATRÍCULA)
+-- ============================================================================
+
+DROP PROCEDURE IF EXISTS atualizar_resumo_historico_matricula;
+
+DELIMITER $$
+
+CREATE PROCEDURE atualizar_resumo_historico_matricula(
+    IN p_matricula_id INT
+)
+BEGIN
+    DELETE FROM resumo_historico_matricula WHERE matricula_id = p_matricula_id;
+
+    INSERT INTO resumo_historico_matricula (
+        matricula_id, data_ultima_ativacao, data_ultimo_status_regular,
+        data_ultima_transferencia, data_ultima_evasao, data_ultima_saida,
+        status_ultima_saida, historico_transferencia
+    )
+    SELECT
+        hm.matricula_id,
+        MAX(CASE WHEN hm.status_novo = 'Ativo' THEN hm.data_mudanca END),
+        MAX(CASE WHEN hm.status_novo NOT IN ('Transferido', 'Transferida', 'Cancelado', 'Cancelada')
+                 THEN hm.data_mudanca END),
+        MAX(CASE WHEN hm.status_novo IN ('Transferido', 'Transferida') THEN hm.data_mudanca END),
+        MAX(CASE WHEN hm.status_novo = 'Evadido' THEN hm.data_mudanca END),
+        MAX(CASE WHEN hm.status_novo IN ('Transferido', 'Transferida', 'Evadido') THEN hm.data_mudanca END),
+        SUBSTRING_INDEX(GROUP_CONCAT(
+            CASE WHEN hm.status_novo IN ('Transferido', 'Transferida', 'Evadido') THEN hm.status_novo END
+            ORDER BY hm.data_mudanca DESC, hm.id DESC SEPARATOR '|'
+        ), '|', 1),
+        GROUP_CONCAT(
+            CASE WHEN hm.status_novo IN ('Transferido', 'Transferida')
+                 THEN CONCAT(hm.status_novo, ' em ', DATE_FORMAT(hm.data_mudanca, '%d/%m/%Y')) END
+            ORDER BY hm.data_mudanca DESC SEPARATOR ' | '
+        )
+    FROM historico_matricula hm
+    WHERE hm.matricula_id = p_matricula_id
+    GROUP BY hm.matricula_id;
+END$$
+
+DELIMITER ;
+
+
+-- ============================================================================
+-- 3. TRIGGERS
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS trg_historico_matricula_resumo_ins;
+DROP TRIGGER IF EXISTS trg_historico_matricula_resumo_upd;
+DROP TRIGGER IF EXISTS trg_historico_matricula_resumo_del;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_historico_matricula_resumo_ins
+AFTER INSERT ON historico_matricula
+FOR EACH ROW
+BEGIN
+    CALL atualizar_resumo_historico_matricula(NEW.matricula_id);
+END$$
+
+CREATE TRIGGER trg_historico_matricula_resumo_upd
+AFTER UPDATE ON historico_matricula
+FOR EACH ROW
+BEGIN
+    CALL atualizar_resumo_historico_matricula(NEW.matricula_id);
+    IF OLD.matricula_id <> NEW.matricula_id THEN
+        CALL atualizar_resumo_historico_matricula(OLD.matricula_id);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_historico_matricula_resumo_del
+AFTER DELETE ON historico_matricula
+FOR EACH ROW
+BEGIN
+    CALL atualizar_resumo_historico_matricula(OLD.matricula_id);
+END$$
+
+DELIMITER ;
+
+
+-- ============================================================================
+-- 4. CARGA INICIAL
+-- ============================================================================
+
+INSERT INTO resumo_historico_matricula (
+    matricula_id, data_ultima_ativacao, data_ultimo_status_regular,
+    data_ultima_transferencia, data_ultima_evasao, data_ultima_saida,
+    status_ultima_saida, historico_transferencia
+)
+SELECT
+    hm.matricula_id,
+    MAX(CASE WHEN hm.status_novo = 'Ativo' THEN hm.data_mudanca END),
+    MAX(CASE WHEN hm.status_novo NOT IN ('Transferido', 'Transferida', 'Cancelado', 'Cancelada')
+             THEN hm.data_mudanca END),
+    MAX(CASE WHEN hm.status_novo IN ('Transferido', 'Transferida') THEN hm.data_mudanca END),
+    MAX(CASE WHEN hm.status_novo = 'Evadido' THEN hm.data_mudanca END),
+    MAX(CASE WHEN hm.status_novo IN ('Transferido', 'Transferida', 'Evadido') THEN hm.data_mudanca END),
+    SUBSTRING_INDEX(GROUP_CONCAT(
+        CASE WHEN hm.status_novo IN ('Transferido', 'Transferida', 'Evadido') THEN hm.status_novo END
+        ORDER BY hm.data_mudanca DESC, hm.id DESC SEPARATOR '|'
+    ), '|', 1),
+    GROUP_CONCAT(
+        CASE WHEN hm.status_novo IN ('Transferido', 'Transferida')
+             THEN CONCAT(hm.status_novo, ' em ', DATE_FORMAT(hm.data_mudanca, '%d/%m/%Y')) END
+        ORDER BY hm.data_mudanca DESC SEPARATOR ' | '
+    )
+FROM historico_matricula hm
+JOIN matriculas m ON m.id = hm.matricula_id
+GROUP BY hm.matricula_id
+ON DUPLICATE KEY UPDATE
+    data_ultima_ativacao = VALUES(data_ultima_ativacao),
+    data_ultimo_status_regular = VALUES(data_ultimo_status_regular),
+    data_ultima_transferencia = VALUES(data_ultima_transferencia),
+    data_ultima_evasao = VALUES(data_ultima_evasao),
+    data_ultima_saida = VALUES(data_ultima_saida),
+    status_ultima_saida = VALUES(status_ultima_saida),
+    historico_transferencia = VALUES(historico_transferencia);
@@ -0,0 +1,159 @@
+-- Migration: Marcadores de versão das tabelas de referência
+-- Banco: redeescola (MySQL 8.0)
+-- Descrição: Um contador por tabela, incrementado por triggers a cada
+-- INSERT/UPDATE/DELETE em niveisensino, series, turmas, disciplinas e
+-- anosletivos.
+--
+-- src.services.referencia_service guarda essas tabelas em memória e em disco
+-- (CACHE_DIR/cache_l2.sqlite3) e só as relê quando o contador muda: uma
+-- única consulta a versao_tabelas substitui as consultas de níveis, séries,
+-- turmas, disciplinas e anos letivos feitas a cada abertura de tela.
+
+-- ============================================================================
+-- 1. TABELA
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS `versao_tabelas` (
+  `tabela` varchar(64) NOT NULL,
+  `versao` bigint NOT NULL DEFAULT 0,
+  `atualizado_em` timestamp DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`tabela`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+COMMENT='Versão das tabelas de referência (mantida por triggers)';
+
+INSERT IGNORE INTO versao_tabelas (tabela, versao) VALUES
+  ('niveisensino', 1),
+  ('series', 1),
+  ('turmas', 1),
+  ('disciplinas', 1),
+  ('anosletivos', 1);
+
+
+-- ============================================================================
+-- 2. TRIGGERS
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS trg_niveisensino_versao_ins;
+DROP TRIGGER IF EXISTS trg_niveisensino_versao_upd;
+DROP TRIGGER IF EXISTS trg_niveisensino_versao_del;
+DROP TRIGGER IF EXISTS trg_series_versao_ins;
+DROP TRIGGER IF EXISTS trg_series_versao_upd;
+DROP TRIGGER IF EXISTS trg_series_versao_del;
+DROP TRIGGER IF EXISTS trg_turmas_versao_ins;
+DROP TRIGGER IF EXISTS trg_turmas_versao_upd;
+DROP TRIGGER IF EXISTS trg_turmas_versao_del;
+DROP TRIGGER IF EXISTS trg_disciplinas_versao_ins;
+DROP TRIGGER IF EXISTS trg_disciplinas_versao_upd;
+DROP TRIGGER IF EXISTS trg_disciplinas_versao_del;
+DROP TRIGGER IF EXISTS trg_anosletivos_versao_ins;
+DROP TRIGGER IF EXISTS trg_anosletivos_versao_upd;
+DROP TRIGGER IF EXISTS trg_anosletivos_versao_del;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_niveisensino_versao_ins
+AFTER INSERT ON niveisensino
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'niveisensino';
+END$$
+
+CREATE TRIGGER trg_niveisensino_versao_upd
+AFTER UPDATE ON niveisensino
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'niveisensino';
+END$$
+
+CREATE TRIGGER trg_niveisensino_versao_del
+AFTER DELETE ON niveisensino
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'niveisensino';
+END$$
+
+CREATE TRIGGER trg_series_versao_ins
+AFTER INSERT ON series
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'series';
+END$$
+
+CREATE TRIGGER trg_series_versao_upd
+AFTER UPDATE ON series
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'series';
+END$$
+
+CREATE TRIGGER trg_series_versao_del
+AFTER DELETE ON series
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'series';
+END$$
+
+CREATE TRIGGER trg_turmas_versao_ins
+AFTER INSERT ON turmas
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'turmas';
+END$$
+
+CREATE TRIGGER trg_turmas_versao_upd
+AFTER UPDATE ON turmas
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'turmas';
+END$$
+
+CREATE TRIGGER trg_turmas_versao_del
+AFTER DELETE ON turmas
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'turmas';
+END$$
+
+CREATE TRIGGER trg_disciplinas_versao_ins
+AFTER INSERT ON disciplinas
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'disciplinas';
+END$$
+
+CREATE TRIGGER trg_disciplinas_versao_upd
+AFTER UPDATE ON disciplinas
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'disciplinas';
+END$$
+
+CREATE TRIGGER trg_disciplinas_versao_del
+AFTER DELETE ON disciplinas
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'disciplinas';
+END$$
+
+CREATE TRIGGER trg_anosletivos_versao_ins
+AFTER INSERT ON anosletivos
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'anosletivos';
+END$$
+
+CREATE TRIGGER trg_anosletivos_versao_upd
+AFTER UPDATE ON anosletivos
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'anosletivos';
+END$$
+
+CREATE TRIGGER trg_anosletivos_versao_del
+AFTER DELETE ON anosletivos
+FOR EACH ROW
+BEGIN
+    UPDATE versao_tabelas SET versao = versao + 1 WHERE tabela = 'anosletivos';
+END$$
+
+DELIMITER ;
@@ -13,7 +13,7 @@ Benefícios:
 - Queries otimizadas e testadas
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable
 from db.connection import get_cursor
 import logging
 
@@ -84,7 +84,8 @@ QUERY_TURMAS_POR_SERIE = """
         t.nome as turma_nome,
         s.id as serie_id,
         s.nome as serie_nome,
-        t.turno
+        t.turno,
+        t.ano_letivo_id
     FROM turmas t
     JOIN series s ON t.serie_id = s.id
     WHERE t.escola_id = %s
@@ -164,11 +165,27 @@ QUERY_ENCERRAR_MATRICULAS = """
     AND status = 'Ativo'
 """
 
+# Versão restrita a uma escola (usada pela transição por escola/em lote,
+# para que transações paralelas não disputem as mesmas linhas)
+QUERY_ENCERRAR_MATRICULAS_ESCOLA = """
+    UPDATE matriculas m
+    JOIN alunos a ON a.id = m.aluno_id
+    SET m.status = 'Concluído'
+    WHERE m.ano_letivo_id = %s
+    AND m.status = 'Ativo'
+    AND a.escola_id = %s
+"""
+
 QUERY_CRIAR_MATRICULA = """
     INSERT INTO matriculas (aluno_id, turma_id, ano_letivo_id, status)
     VALUES (%s, %s, %s, 'Ativo')
 """
 
+# Tamanho padrão dos lotes de INSERT na rematrícula em massa.
+# O executemany do mysql-connector reescreve cada lote em um único
+# INSERT multi-linha, então cada lote custa um round trip.
+TAMANHO_LOTE_MATRICULAS = 1000
+
 # ============================================================================
 # QUERIES DE ALUNOS PARA REMATRICULAR
 # ============================================================================
@@ -440,6 +457,91 @@ class QueriesTransicao:
             resultado = cursor.fetchone()
             return resultado['turma_id'] if resultado else None
     
+    @staticmethod
+    def get_mapa_progressao(
+        escola_id: int,
+        ano_letivo_destino_id: int,
+        mapa_turmas: Optional[Dict[int, Dict]] = None
+    ) -> Dict[int, int]:
+        """Calcula a tabela de progressão de todas as turmas da escola.
+        
+        Equivalente a chamar ``get_proxima_turma`` para cada turma, mas
+        resolvido em memória a partir de ``get_mapa_turmas`` (uma única
+        consulta). Segue a mesma prioridade de QUERY_TURMA_PROXIMA_SERIE:
+        1) mesmo turno + mesmo nome, 2) mesmo turno, 3) qualquer turma
+        da série seguinte no ano de destino.
+        
+        Args:
+            escola_id: ID da escola
+            ano_letivo_destino_id: ID do ano letivo de destino
+            mapa_turmas: Mapa já carregado (evita nova consulta)
+            
+        Returns:
+            Dict turma_atual_id -> turma_destino_id. Turmas sem série
+            seguinte no destino mapeiam para si mesmas.
+        """
+        if mapa_turmas is None:
+            mapa_turmas = QueriesTransicao.get_mapa_turmas(escola_id)
+        
+        # Turmas do ano de destino agrupadas por série
+        destinos_por_serie: Dict[int, List[Dict]] = {}
+        for turma in mapa_turmas.values():
+            if turma.get('ano_letivo_id') == ano_letivo_destino_id:
+                destinos_por_serie.setdefault(turma['serie_id'], []).append(turma)
+        
+        mapa_progressao: Dict[int, int] = {}
+        for turma_id, turma in mapa_turmas.items():
+            candidatas = destinos_por_serie.get(turma['serie_id'] + 1)
+            if not candidatas:
+                mapa_progressao[turma_id] = turma_id
+                continue
+            melhor = min(
+                candidatas,
+                key=lambda t: (
+                    0 if t.get('turno') == turma.get('turno') else 1,
+                    0 if t.get('turma_nome') == turma.get('turma_nome') else 1,
+                )
+            )
+            mapa_progressao[turma_id] = melhor['turma_id']
+        
+        return mapa_progressao
+    
+    @staticmethod
+    def criar_matriculas_em_lote(
+        cursor,
+        matriculas: Iterable[Tuple[int, int]],
+        ano_letivo_id: int,
+        tamanho_lote: int = TAMANHO_LOTE_MATRICULAS,
+        ao_progredir: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """Cria matrículas 'Ativo' em lotes de tamanho fixo.
+        
+        Não faz commit: a transação pertence ao chamador (permite dry-run).
+        
+        Args:
+            cursor: Cursor da conexão que controla a transação
+            matriculas: Pares (aluno_id, turma_id)
+            ano_letivo_id: ID do ano letivo das novas matrículas
+            tamanho_lote: Linhas por executemany
+            ao_progredir: Callback (criadas, total) chamado uma vez por lote
+            
+        Returns:
+            Total de matrículas criadas
+        """
+        linhas = [(aluno_id, turma_id, ano_letivo_id) for aluno_id, turma_id in matriculas]
+        total = len(linhas)
+        tamanho_lote = max(1, int(tamanho_lote))
+        criadas = 0
+        
+        for inicio in range(0, total, tamanho_lote):
+            lote = linhas[inicio:inicio + tamanho_lote]
+            cursor.executemany(QUERY_CRIAR_MATRICULA, lote)
+            criadas += len(lote)
+            if ao_progredir:
+                ao_progredir(criadas, total)
+        
+        return criadas
+    
     @staticmethod
     def criar_tabela_auditoria() -> bool:
         """Cria tabela de auditoria se não existir.
@@ -479,7 +581,7 @@ class QueriesTransicao:
             # Garantir que a tabela existe
             QueriesTransicao.criar_tabela_auditoria()
             
-            with get_cursor() as cursor:
+            with get_cursor(commit=True) as cursor:
                 cursor.execute(QUERY_REGISTRAR_AUDITORIA, (
                     ano_origem, ano_destino, escola_id, usuario,
                     matriculas_encerradas, matriculas_criadas,
@@ -518,4 +620,6 @@ get_ano_letivo_atual = QueriesTransicao.get_ano_letivo_atual
 get_total_matriculas_ativas = QueriesTransicao.get_total_matriculas_ativas
 get_alunos_para_rematricular = QueriesTransicao.get_alunos_para_rematricular
 get_proxima_turma = QueriesTransicao.get_proxima_turma
+get_mapa_progressao = QueriesTransicao.get_mapa_progressao
+criar_matriculas_em_lote = QueriesTransicao.criar_matriculas_em_lote
 registrar_auditoria = QueriesTransicao.registrar_auditoria
@@ -0,0 +1,110 @@
+"""
+Gravação em lote com ``INSERT ... ON DUPLICATE KEY UPDATE``.
+
+Telas que salvam uma turma inteira faziam um SELECT seguido de UPDATE ou
+INSERT por aluno (2N idas ao banco). Com :func:`upsert_em_lote` a turma é
+enviada em poucos comandos ``executemany``, que o mysql-connector reescreve
+como um único INSERT de várias linhas por bloco. A tabela precisa de uma
+chave única sobre as colunas que identificam o registro
+(ver db/migrations/adicionar_chaves_unicas_faltas.sql).
+
+Uso básico::
+
+    from db.upsert_lote import upsert_em_lote
+
+    afetadas = upsert_em_lote(
+        cursor, 'faltas_bimestrais',
+        ('aluno_id', 'bimestre', 'ano_letivo_id', 'faltas'),
+        [(1, '1º bimestre', 3, 2), (2, '1º bimestre', 3, 0)],
+        atualizar=('faltas',),
+    )
+    conn.commit()
+"""
+
+import re
+from typing import Iterable, Optional, Sequence
+
+from src.core.config_logs import get_logger
+
+logger = get_logger(__name__)
+
+TAMANHO_BLOCO_PADRAO = 500
+
+_IDENTIFICADOR = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _validar_identificador(nome: str) -> str:
+    if not _IDENTIFICADOR.match(nome):
+        raise ValueError(f"Identificador SQL inválido: {nome!r}")
+    return nome
+
+
+def montar_sql_upsert(tabela: str, colunas: Sequence[str], atualizar: Sequence[str]) -> str:
+    """Monta o comando ``INSERT ... ON DUPLICATE KEY UPDATE`` parametrizado."""
+    _validar_identificador(tabela)
+    for coluna in list(colunas) + list(atualizar):
+        _validar_identificador(coluna)
+    if not atualizar:
+        raise ValueError("Informe ao menos uma coluna para atualizar")
+    faltando = [c for c in atualizar if c not in colunas]
+    if faltando:
+        raise ValueError(f"Colunas a atualizar fora do INSERT: {', '.join(faltando)}")
+
+    return (
+        f"INSERT INTO {tabela} ({', '.join(colunas)}) "
+        f"VALUES ({', '.join(['%s'] * len(colunas))}) "
+        f"ON DUPLICATE KEY UPDATE {', '.join(f'{c}=VALUES({c})' for c in atualizar)}"
+    )
+
+
+def upsert_em_lote(
+    cursor,
+    tabela: str,
+    colunas: Sequence[str],
+    linhas: Iterable[Sequence],
+    atualizar: Optional[Sequence[str]] = None,
+    tamanho_bloco: int = TAMANHO_BLOCO_PADRAO,
+) -> int:
+    """Insere ou atualiza ``linhas`` em blocos de ``tamanho_bloco``.
+
+    Não faz commit: a transação é do chamador.
+
+    Args:
+        cursor: Cursor aberto da conexão que fará o commit.
+        tabela: Nome da tabela.
+        colunas: Colunas do INSERT, na ordem dos valores de cada linha.
+        linhas: Tuplas de valores.
+        atualizar: Colunas sobrescritas quando a chave já existe. Se None,
+            todas as colunas (as da chave única são regravadas com o mesmo
+            valor, sem efeito).
+        tamanho_bloco: Máximo de linhas por ``executemany``.
+
+    Returns:
+        Total de linhas afetadas segundo o MySQL: 1 por linha inserida,
+        2 por linha existente alterada e 0 por linha que já tinha os mesmos
+        valores.
+    """
+    if tamanho_bloco < 1:
+        raise ValueError("tamanho_bloco deve ser positivo")
+
+    colunas = tuple(colunas)
+    sql = montar_sql_upsert(tabela, colunas, tuple(atualizar) if atualizar is not None else colunas)
+    linhas = [tuple(linha) for linha in linhas]
+    for linha in linhas:
+        if len(linha) != len(colunas):
+            raise ValueError(f"Linha com {len(linha)} valores; esperado {len(colunas)}: {linha!r}")
+
+    afetadas = 0
+    for inicio in range(0, len(linhas), tamanho_bloco):
+        bloco = linhas[inicio:inicio + tamanho_bloco]
+        cursor.executemany(sql, bloco)
+        afetadas += max(cursor.rowcount or 0, 0)
+
+    logger.debug(f"upsert {tabela}: {len(linhas)} linha(s) enviada(s), {afetadas} afetada(s)")
+    return afetadas
+
+
+def contar_atualizadas(afetadas: int, inseridas: int) -> int:
+    """Número de linhas existentes que mudaram, a partir do retorno de
+    :func:`upsert_em_lote` e do número de linhas que ainda não existiam."""
+    return max(afetadas - inseridas, 0) // 2
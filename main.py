@@ -151,4 +151,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necessário para o ProcessPoolExecutor dos documentos em lote no executável (PyInstaller)
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
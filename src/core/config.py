@@ -2,6 +2,7 @@
 # Mantenha valores sensíveis vazios em repositórios públicos.
 
 import json
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -188,6 +189,16 @@ IMAGENS_DIR = PROJECT_ROOT / 'imagens'
 ICON_DIR = PROJECT_ROOT / 'src' / 'icon'
 ICO_DIR = PROJECT_ROOT / 'ico'
 
+# Diretório para caches persistentes (índices, miniaturas etc.). Pode ser
+# sobrescrito pela variável de ambiente `GESTAO_CACHE_DIR`; no Windows usa o
+# LOCALAPPDATA do usuário, já que a pasta do executável pode ser somente leitura.
+if os.environ.get('GESTAO_CACHE_DIR'):
+    CACHE_DIR = Path(os.environ['GESTAO_CACHE_DIR'])
+elif os.environ.get('LOCALAPPDATA'):
+    CACHE_DIR = Path(os.environ['LOCALAPPDATA']) / 'GestaoEscolar' / 'cache'
+else:
+    CACHE_DIR = PROJECT_ROOT / 'cache'
+
 
 def get_resource_path(relative_path: str) -> Path:
     """
@@ -249,6 +260,22 @@ def get_ico_path(ico_name: str) -> Path:
     return ICO_DIR / ico_name
 
 
+def get_cache_path(nome: str) -> Path:
+    """
+    Retorna o caminho de um arquivo de cache persistente, criando o diretório.
+    
+    Args:
+        nome: Nome do arquivo (ou subcaminho) dentro de CACHE_DIR
+              Ex: 'indice_questoes.pkl'
+    
+    Returns:
+        Path: Caminho absoluto para o arquivo de cache
+    """
+    caminho = CACHE_DIR / nome
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    return caminho
+
+
 # ============================================================================
 # ANO LETIVO
 # ============================================================================
@@ -41,6 +41,7 @@ get_icon_path = _config.get_icon_path
 get_image_path = _config.get_image_path
 get_ico_path = _config.get_ico_path
 get_resource_path = _config.get_resource_path
+get_cache_path = _config.get_cache_path
 carregar_feature_flags = _config.carregar_feature_flags
 recarregar_feature_flags = _config.recarregar_feature_flags
 banco_questoes_habilitado = _config.banco_questoes_habilitado
@@ -61,6 +62,7 @@ PROJECT_ROOT = _config.PROJECT_ROOT
 IMAGENS_DIR = _config.IMAGENS_DIR
 ICON_DIR = _config.ICON_DIR
 ICO_DIR = _config.ICO_DIR
+CACHE_DIR = _config.CACHE_DIR
 
 __all__ = [
     'perfis_habilitados',
@@ -69,6 +71,7 @@ __all__ = [
     'get_image_path',
     'get_ico_path',
     'get_resource_path',
+    'get_cache_path',
     'carregar_feature_flags',
     'recarregar_feature_flags',
     'banco_questoes_habilitado',
@@ -87,5 +90,6 @@ __all__ = [
     'IMAGENS_DIR',
     'ICON_DIR',
     'ICO_DIR',
+    'CACHE_DIR',
 ]
 
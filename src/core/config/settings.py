@@ -26,6 +26,8 @@ class DatabaseConfig:
     password: str
     name: str
     pool_size: int
+    pool_max_size: int = 0
+    pool_timeout: float = 10.0
     
     def validate(self) -> list[str]:
         """Valida as configurações obrigatórias."""
@@ -40,6 +42,10 @@ class DatabaseConfig:
             errors.append("DB_NAME não configurado")
         if self.pool_size < 1 or self.pool_size > 50:
             errors.append("DB_POOL_SIZE deve estar entre 1 e 50")
+        if self.pool_max_size and self.pool_max_size < self.pool_size:
+            errors.append("DB_POOL_MAX_SIZE não pode ser menor que DB_POOL_SIZE")
+        if self.pool_timeout <= 0:
+            errors.append("DB_POOL_TIMEOUT deve ser maior que 0")
         return errors
 
 
@@ -101,7 +107,9 @@ class Settings:
             user=os.getenv('DB_USER', 'root'),
             password=os.getenv('DB_PASSWORD', ''),
             name=os.getenv('DB_NAME', 'redeescola'),
-            pool_size=int(os.getenv('DB_POOL_SIZE', '5'))
+            pool_size=int(os.getenv('DB_POOL_SIZE', '5')),
+            pool_max_size=int(os.getenv('DB_POOL_MAX_SIZE', '0')),
+            pool_timeout=float(os.getenv('DB_POOL_TIMEOUT', '10'))
         )
         
         self.app = AppConfig(
@@ -163,6 +171,7 @@ class Settings:
                 'user': self.database.user,
                 'name': self.database.name,
                 'pool_size': self.database.pool_size,
+                'pool_max_size': self.database.pool_max_size,
             },
             'app': {
                 'escola_id': self.app.escola_id,
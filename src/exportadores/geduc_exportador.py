@@ -19,8 +19,8 @@ import time
 import unicodedata
 
 from src.importadores.geduc import AutomacaoGEDUC
+from src.exportadores.mapeamento_geduc import IndiceMapeamentoGEDUC, indice_mapeamento
 from src.core.config_logs import get_logger
-from db.connection import get_connection
 
 logger = get_logger(__name__)
 
@@ -28,18 +28,22 @@ logger = get_logger(__name__)
 class MapeadorGEDUC:
     """
     Helper para mapear IDs entre sistema local e GEDUC
+
+    As consultas são atendidas pelo índice compartilhado do processo
+    (src.exportadores.mapeamento_geduc), que lê cada tipo em uma consulta.
     """
     
-    def __init__(self, conexao=None):
+    def __init__(self, conexao=None, indice: Optional[IndiceMapeamentoGEDUC] = None):
         """
         Inicializa mapeador
         
         Args:
             conexao: Conexão MySQL (se None, cria nova)
+            indice: Índice de mapeamentos (padrão: o compartilhado do processo)
         """
         # aceitar uma conexão já aberta ou usar get_connection() quando necessário
         self.conexao = conexao
-        self._cache = {}
+        self.indice = indice or indice_mapeamento
     
     def obter_id_geduc(self, tipo: str, id_local: int) -> Optional[int]:
         """
@@ -52,96 +56,35 @@ class MapeadorGEDUC:
         Returns:
             ID correspondente no GEDUC ou None se não encontrado
         """
-        cache_key = f"{tipo}_{id_local}"
-        
-        # Verificar cache
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-        
         try:
-            if self.conexao is not None:
-                cursor = self.conexao.cursor(dictionary=True)
-                cursor.execute(
-                    """
-                    SELECT id_geduc 
-                    FROM mapeamento_geduc 
-                    WHERE tipo = %s AND id_local = %s
-                    LIMIT 1
-                    """,
-                    (tipo, id_local)
-                )
-                resultado = cursor.fetchone()
-            else:
-                with get_connection() as conn:
-                    cursor = conn.cursor(dictionary=True)
-                    cursor.execute(
-                        """
-                        SELECT id_geduc 
-                        FROM mapeamento_geduc 
-                        WHERE tipo = %s AND id_local = %s
-                        LIMIT 1
-                        """,
-                        (tipo, id_local)
-                    )
-                    resultado = cursor.fetchone()
-
-            if resultado:
-                id_geduc = resultado['id_geduc']
-                self._cache[cache_key] = id_geduc
-                return id_geduc
-            else:
-                logger.warning(f"Mapeamento não encontrado: {tipo} ID local {id_local}")
-                return None
+            id_geduc = self.indice.id_geduc(tipo, id_local, self.conexao)
         except Exception as e:
             logger.error(f"Erro ao buscar mapeamento {tipo}/{id_local}: {e}")
             return None
+        if id_geduc is None:
+            logger.warning(f"Mapeamento não encontrado: {tipo} ID local {id_local}")
+        return id_geduc
     
     def obter_nome_geduc(self, tipo: str, id_local: int) -> Optional[str]:
         """
         Obtém nome do GEDUC a partir do ID local
         """
-        cache_key = f"{tipo}_{id_local}_nome"
-        
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-        
         try:
-            if self.conexao is not None:
-                cursor = self.conexao.cursor(dictionary=True)
-                cursor.execute(
-                    """
-                    SELECT nome_geduc 
-                    FROM mapeamento_geduc 
-                    WHERE tipo = %s AND id_local = %s
-                    LIMIT 1
-                    """,
-                    (tipo, id_local)
-                )
-                resultado = cursor.fetchone()
-            else:
-                with get_connection() as conn:
-                    cursor = conn.cursor(dictionary=True)
-                    cursor.execute(
-                        """
-                        SELECT nome_geduc 
-                        FROM mapeamento_geduc 
-                        WHERE tipo = %s AND id_local = %s
-                        LIMIT 1
-                        """,
-                        (tipo, id_local)
-                    )
-                    resultado = cursor.fetchone()
-
-            if resultado:
-                nome = resultado['nome_geduc']
-                self._cache[cache_key] = nome
-                return nome
-            else:
-                return None
+            return self.indice.nome_geduc(tipo, id_local, self.conexao)
         except Exception as e:
             logger.error(f"Erro ao buscar nome {tipo}/{id_local}: {e}")
             return None
     
+    def obter_id_local(self, tipo: str, id_geduc: int) -> Optional[int]:
+        """
+        Obtém ID local a partir do ID do GEDUC (busca reversa)
+        """
+        try:
+            return self.indice.id_local(tipo, id_geduc, self.conexao)
+        except Exception as e:
+            logger.error(f"Erro ao buscar ID local {tipo}/{id_geduc}: {e}")
+            return None
+    
     def mapear_disciplinas(self, disciplinas_local: List[int]) -> Dict[int, int]:
         """
         Mapeia lista de IDs de disciplinas locais para GEDUC
@@ -152,13 +95,14 @@ class MapeadorGEDUC:
         Returns:
             Dicionário {id_local: id_geduc}
         """
-        mapeamento = {}
-        
-        for id_local in disciplinas_local:
-            id_geduc = self.obter_id_geduc('disciplina', id_local)
-            if id_geduc:
-                mapeamento[id_local] = id_geduc
-        
+        try:
+            mapeamento = self.indice.mapear('disciplina', disciplinas_local, self.conexao)
+        except Exception as e:
+            logger.error(f"Erro ao mapear disciplinas: {e}")
+            return {}
+        faltando = [d for d in disciplinas_local if d not in mapeamento]
+        if faltando:
+            logger.warning(f"Mapeamento não encontrado: disciplina IDs locais {faltando}")
         return mapeamento
     
     def validar_mapeamento(self, tipo: str, id_local: int) -> bool:
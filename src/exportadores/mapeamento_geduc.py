@@ -0,0 +1,154 @@
+"""
+Índice em memória da tabela ``mapeamento_geduc``.
+
+Cada tipo (escola, disciplina, série...) é lido inteiro em uma consulta e
+guardado nos dois sentidos: id local → (id GEDUC, nome GEDUC) e id GEDUC →
+id local. A instância ``indice_mapeamento`` é compartilhada pelo processo,
+então vários MapeadorGEDUC (um por exportação) reaproveitam a mesma carga.
+
+A tabela muda raramente e quase sempre por scripts SQL; por isso cada tipo
+é relido após ``TTL_INDICE`` segundos, além da invalidação explícita feita
+por ``registrar`` e ``invalidar``.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from src.core.config_logs import get_logger
+from db.connection import get_connection
+
+logger = get_logger(__name__)
+
+TTL_INDICE = 600.0
+
+
+class _MapaTipo(NamedTuple):
+    por_local: Dict[int, Tuple[int, Optional[str]]]
+    por_geduc: Dict[int, int]
+    carregado_em: float
+
+
+class IndiceMapeamentoGEDUC:
+    """Mapeamentos local ↔ GEDUC carregados por tipo."""
+
+    def __init__(self, ttl: float = TTL_INDICE):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tipos: Dict[str, _MapaTipo] = {}
+
+    @staticmethod
+    def _consultar(sql: str, params: tuple, conexao=None):
+        if conexao is not None:
+            cursor = conexao.cursor(dictionary=True)
+            try:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+        with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def carregar(self, tipo: Optional[str] = None, conexao=None) -> int:
+        """
+        Lê ``tipo`` (ou a tabela inteira) em uma única consulta.
+
+        Com registros repetidos para o mesmo id, vale o de menor ``id`` —
+        o mesmo que o ``LIMIT 1`` das consultas antigas costumava devolver.
+
+        Returns:
+            Número de linhas lidas
+        """
+        sql = "SELECT tipo, id_local, id_geduc, nome_geduc FROM mapeamento_geduc"
+        params: tuple = ()
+        if tipo is not None:
+            sql += " WHERE tipo = %s"
+            params = (tipo,)
+        linhas = self._consultar(sql + " ORDER BY id", params, conexao)
+
+        agora = time.monotonic()
+        novos: Dict[str, _MapaTipo] = {}
+        if tipo is not None:
+            novos[tipo] = _MapaTipo({}, {}, agora)
+        for linha in linhas:
+            mapa = novos.get(linha['tipo'])
+            if mapa is None:
+                mapa = novos[linha['tipo']] = _MapaTipo({}, {}, agora)
+            id_local, id_geduc = int(linha['id_local']), int(linha['id_geduc'])
+            mapa.por_local.setdefault(id_local, (id_geduc, linha['nome_geduc']))
+            mapa.por_geduc.setdefault(id_geduc, id_local)
+
+        with self._lock:
+            if tipo is None:
+                self._tipos = novos
+            else:
+                self._tipos[tipo] = novos[tipo]
+        logger.debug(f"mapeamento_geduc carregado ({tipo or 'todos os tipos'}): {len(linhas)} linhas")
+        return len(linhas)
+
+    def _mapa(self, tipo: str, conexao=None) -> _MapaTipo:
+        with self._lock:
+            mapa = self._tipos.get(tipo)
+        if mapa is None or time.monotonic() - mapa.carregado_em > self.ttl:
+            self.carregar(tipo, conexao)
+            with self._lock:
+                mapa = self._tipos[tipo]
+        return mapa
+
+    def id_geduc(self, tipo: str, id_local: int, conexao=None) -> Optional[int]:
+        par = self._mapa(tipo, conexao).por_local.get(int(id_local))
+        return par[0] if par else None
+
+    def nome_geduc(self, tipo: str, id_local: int, conexao=None) -> Optional[str]:
+        par = self._mapa(tipo, conexao).por_local.get(int(id_local))
+        return par[1] if par else None
+
+    def id_local(self, tipo: str, id_geduc: int, conexao=None) -> Optional[int]:
+        """Busca reversa: id local correspondente a um id do GEDUC."""
+        return self._mapa(tipo, conexao).por_geduc.get(int(id_geduc))
+
+    def mapear(self, tipo: str, ids_local: Iterable[int], conexao=None) -> Dict[int, int]:
+        """{id_local: id_geduc} para os ids que têm mapeamento (em memória)."""
+        por_local = self._mapa(tipo, conexao).por_local
+        return {i: por_local[int(i)][0] for i in ids_local if int(i) in por_local}
+
+    def registrar(self, tipo: str, id_local: int, id_geduc: int,
+                  nome_local: Optional[str] = None, nome_geduc: Optional[str] = None,
+                  conexao=None) -> None:
+        """Insere um mapeamento e invalida o tipo no índice."""
+        sql = ("INSERT INTO mapeamento_geduc (tipo, id_local, nome_local, id_geduc, nome_geduc) "
+               "VALUES (%s, %s, %s, %s, %s)")
+        params = (tipo, id_local, nome_local, id_geduc, nome_geduc)
+        if conexao is not None:
+            cursor = conexao.cursor()
+            try:
+                cursor.execute(sql, params)
+                conexao.commit()
+            finally:
+                cursor.close()
+        else:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(sql, params)
+                    conn.commit()
+                finally:
+                    cursor.close()
+        self.invalidar(tipo)
+
+    def invalidar(self, tipo: Optional[str] = None) -> None:
+        """Descarta um tipo (ou tudo); a próxima consulta relê do banco."""
+        with self._lock:
+            if tipo is None:
+                self._tipos.clear()
+            else:
+                self._tipos.pop(tipo, None)
+
+
+# Instância do processo
+indice_mapeamento = IndiceMapeamentoGEDUC()
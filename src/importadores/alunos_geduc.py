@@ -48,6 +48,7 @@ import mysql.connector
 
 from db.connection import conectar_bd
 from src.core.config_logs import get_logger
+from src.importadores.pareamento_alunos import IndiceAlunos
 from src.utils.transtornos import montar_transtorno_geduc
 
 logger = get_logger(__name__)
@@ -211,38 +212,6 @@ def carregar_json_geduc(caminho: str) -> Dict:
     return dados
 
 
-def obter_alunos_locais_ativos(escola_id: int = 60) -> Dict[str, int]:
-    """
-    Retorna dicionário {nome_normalizado: aluno_id} de todos os alunos
-    com matrícula ativa no ano letivo corrente da escola informada.
-    """
-    conn = conectar_bd()
-    cursor = conn.cursor(buffered=True)
-    try:
-        # Obter ano letivo corrente (maior ano_letivo ativo)
-        cursor.execute(
-            "SELECT id FROM anosletivos ORDER BY ano_letivo DESC LIMIT 1"
-        )
-        row = cursor.fetchone()
-        ano_letivo_id = row[0] if row else None
-
-        if not ano_letivo_id:
-            return {}
-
-        cursor.execute("""
-            SELECT a.id, a.nome
-            FROM alunos a
-            INNER JOIN matriculas m ON m.aluno_id = a.id
-            WHERE m.status = 'Ativo'
-              AND m.ano_letivo_id = %s
-              AND a.escola_id = %s
-        """, (ano_letivo_id, escola_id))
-        return {_normalizar(nome): aid for aid, nome in cursor.fetchall()}
-    finally:
-        cursor.close()
-        conn.close()
-
-
 def obter_turmas_alunos_locais(escola_id: int = 60) -> Dict[str, str]:
     """
     Retorna {nome_normalizado: descricao_turma} para todos os alunos
@@ -274,10 +243,11 @@ def obter_turmas_alunos_locais(escola_id: int = 60) -> Dict[str, str]:
         conn.close()
 
 
-def obter_dados_locais_completos(escola_id: int = 60) -> Dict[str, Dict]:
+def obter_alunos_locais_pareamento(escola_id: Optional[int] = 60) -> List[Dict]:
     """
-    Retorna {nome_normalizado: row_dict} para todos os alunos com matrícula ativa
-    no ano letivo corrente, incluindo campos de dados pessoais e endereço.
+    Retorna os alunos com matrícula ativa no ano letivo corrente com os
+    campos usados no pareamento (nome, nascimento, CPF, mãe) e na
+    comparação de divergências. Com ``escola_id=None`` traz todas as escolas.
     """
     conn = conectar_bd()
     cursor = conn.cursor(dictionary=True, buffered=True)
@@ -286,37 +256,56 @@ def obter_dados_locais_completos(escola_id: int = 60) -> Dict[str, Dict]:
         row = cursor.fetchone()
         ano_letivo_id = row['id'] if row else None
         if not ano_letivo_id:
-            return {}
-        cursor.execute("""
+            return []
+        filtro_escola = "AND a.escola_id = %s" if escola_id is not None else ""
+        params = (ano_letivo_id, escola_id) if escola_id is not None else (ano_letivo_id,)
+        cursor.execute(f"""
             SELECT a.id, a.nome, a.data_nascimento, a.sexo, a.cpf, a.raca,
                    a.local_nascimento, a.UF_nascimento,
-                   a.endereco, a.descricao_transtorno
+                   a.endereco, a.descricao_transtorno, a.escola_id,
+                   (SELECT r.nome
+                      FROM responsaveisalunos ra
+                      INNER JOIN responsaveis r ON r.id = ra.responsavel_id
+                     WHERE ra.aluno_id = a.id AND r.grau_parentesco = 'Mãe'
+                     LIMIT 1) AS mae
             FROM alunos a
             INNER JOIN matriculas m ON m.aluno_id = a.id
-            WHERE m.status = 'Ativo' AND m.ano_letivo_id = %s AND a.escola_id = %s
-        """, (ano_letivo_id, escola_id))
-        return {_normalizar(r['nome']): r for r in cursor.fetchall()}
+            WHERE m.status = 'Ativo' AND m.ano_letivo_id = %s {filtro_escola}
+        """, params)
+        return cursor.fetchall()
     finally:
         cursor.close()
         conn.close()
 
 
-def comparar_divergencias_geduc_local(dados_json: Dict, escola_id: int = 60) -> List[Dict]:
+def criar_indice_locais(escola_id: Optional[int] = 60) -> IndiceAlunos:
+    """Índice de pareamento sobre os alunos locais ativos (uma consulta ao banco)."""
+    return IndiceAlunos(obter_alunos_locais_pareamento(escola_id))
+
+
+def comparar_divergencias_geduc_local(dados_json: Dict, escola_id: Optional[int] = 60,
+                                      indice: Optional[IndiceAlunos] = None) -> List[Dict]:
     """
     Retorna lista de alunos presentes tanto no GEDUC quanto localmente,
     mas com dados divergentes. Cada item indica quais campos diferem.
+
+    O aluno local é o pareamento automático (nome normalizado idêntico ou
+    CPF igual); nomes só parecidos não entram aqui, para não propor a
+    sobrescrita do cadastro de outro aluno. ``indice`` permite reaproveitar
+    o índice já montado para ``comparar_geduc_local``.
     """
-    locais = obter_dados_locais_completos(escola_id)
+    if indice is None:
+        indice = criar_indice_locais(escola_id)
     divergencias = []
 
     for turma in dados_json.get('turmas', []):
         turma_id_geduc   = turma.get('id', '')
         turma_nome_geduc = turma.get('nome', '')
         for aluno in turma.get('alunos', []):
-            nome_norm = _normalizar(aluno.get('nome', ''))
-            if not nome_norm or nome_norm not in locais:
+            pareamento = indice.melhor(aluno)
+            if pareamento is None:
                 continue  # não existe localmente — tratado por comparar_geduc_local
-            local = locais[nome_norm]
+            local = pareamento.registro
 
             # Valores GEDUC já convertidos para o mesmo formato do banco local
             sexo_raw = aluno.get('sexo')
@@ -330,6 +319,10 @@ def comparar_divergencias_geduc_local(dados_json: Dict, escola_id: int = 60) ->
             }
 
             diffs = []
+            # Nome: visível quando o pareamento foi pelo CPF, mas não é atualizado
+            if _normalizar(local.get('nome')) != _normalizar(aluno.get('nome', '')):
+                diffs.append(f"Nome ⚠️(pend.): [{_normalizar(local.get('nome'))}] → "
+                             f"[{_normalizar(aluno.get('nome', ''))}]")
             for campo, label in [
                 ('data_nascimento', 'Nascimento'),
                 ('sexo',            'Sexo ⚠️(pend.)'),
@@ -348,6 +341,7 @@ def comparar_divergencias_geduc_local(dados_json: Dict, escola_id: int = 60) ->
                     'nome_fmt':          _capitalizar(aluno.get('nome', '')),
                     'campos_diff':       ' | '.join(diffs),
                     'num_diffs':         len(diffs),
+                    'pontuacao':         pareamento.pontuacao,
                     'turma_geduc_id':    turma_id_geduc,
                     'turma_geduc_nome':  turma_nome_geduc,
                     # campos GEDUC para atualização
@@ -610,12 +604,19 @@ def verificar_pendencias_geduc(dados_json: Dict, escola_id: int = 60) -> List[Di
     return resultado
 
 
-def comparar_geduc_local(dados_json: Dict, escola_id: int = 60) -> List[Dict]:
+def comparar_geduc_local(dados_json: Dict, escola_id: Optional[int] = 60,
+                         indice: Optional[IndiceAlunos] = None) -> List[Dict]:
     """
     Retorna lista de alunos presentes no GEDUC mas sem matrícula ativa local.
     Cada item contém os dados normalizados prontos para exibição e inserção.
+
+    Um aluno é considerado já cadastrado quando há pareamento automático
+    (nome normalizado idêntico ou CPF igual); caso contrário os candidatos
+    mais próximos vão em ``possiveis_locais`` [(aluno_id, nome, pontuação), ...]
+    para conferência manual.
     """
-    locais = obter_alunos_locais_ativos(escola_id)
+    if indice is None:
+        indice = criar_indice_locais(escola_id)
     apenas_geduc = []
 
     for turma in dados_json.get('turmas', []):
@@ -626,8 +627,9 @@ def comparar_geduc_local(dados_json: Dict, escola_id: int = 60) -> List[Dict]:
             nome_norm = _normalizar(aluno.get('nome', ''))
             if not nome_norm:
                 continue
-            if nome_norm in locais:
+            if indice.melhor(aluno) is not None:
                 continue  # já está no sistema
+            candidatos = indice.buscar(aluno, limite=3)
 
             apenas_geduc.append({
                 'nome_geduc':        aluno.get('nome', ''),
@@ -658,6 +660,9 @@ def comparar_geduc_local(dados_json: Dict, escola_id: int = 60) -> List[Dict]:
                 'inep_escola':       aluno.get('inep_escola', ''),
                 'turma_geduc_id':    turma_id_geduc,
                 'turma_geduc_nome':  turma_nome_geduc,
+                'possiveis_locais':  [
+                    (c.registro['id'], c.registro['nome'], c.pontuacao) for c in candidatos
+                ],
                 # Naturalidade (codigo_naturalidade = código IBGE do município de nasc.;
                 #               local_nascimento = nome real via <select>;
                 #               codigo_estado = nome do estado via <select>)
@@ -1293,8 +1298,9 @@ class InterfaceImportarAlunosGEDUC:
         def executar():
             try:
                 dados = carregar_json_geduc(caminho)
-                alunos = comparar_geduc_local(dados, escola_id=60)
-                divergencias = comparar_divergencias_geduc_local(dados, escola_id=60)
+                indice = criar_indice_locais(escola_id=60)
+                alunos = comparar_geduc_local(dados, indice=indice)
+                divergencias = comparar_divergencias_geduc_local(dados, indice=indice)
                 pendencias = verificar_pendencias_geduc(dados)
                 self.janela.after(0, lambda a=alunos, d=dados, div=divergencias, pend=pendencias:
                                   self._exibir_resultado(a, d, div, pend))
@@ -0,0 +1,255 @@
+"""
+Pareamento de alunos GEDUC × banco local.
+
+Compara registros vindos do GEDUC com os alunos locais. O pareamento
+automático (``melhor``) só aceita nome normalizado idêntico ou CPF igual;
+grafias como "SOUSA"/"SOUZA", letras trocadas ou um sobrenome a menos
+aparecem como candidatos (``buscar``) para conferência manual, porque um
+nome parecido com o mesmo nascimento pode ser outro aluno.
+
+O índice combina duas fontes de candidatos:
+
+- chaves de bloqueio exatas: CPF, data de nascimento e nome da mãe;
+- índice invertido de trigramas do nome, que seleciona os nomes parecidos
+  sem comparar a consulta com todos os alunos.
+
+Só os candidatos selecionados são pontuados (coeficiente de Dice dos
+trigramas do nome, ajustado por CPF, nascimento e mãe; nascimento ou CPF
+diferentes não derrubam um nome idêntico abaixo de ``LIMIAR_MESMO_ALUNO``,
+já que são justamente as divergências a mostrar), então o custo por
+consulta depende do tamanho dos blocos e não do total de alunos. O índice
+pode reunir todas as escolas do município de uma vez.
+
+Uso básico::
+
+    indice = IndiceAlunos(registros_locais)
+    for pareamento in indice.buscar({'nome': ..., 'data_nascimento': ..., 'cpf': ...}):
+        print(pareamento.registro['id'], pareamento.pontuacao, pareamento.motivos)
+"""
+
+import heapq
+import re
+import unicodedata
+from array import array
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Pontuação mínima do pareamento automático (que também exige nome
+# idêntico ou CPF igual; ver Pareamento.automatico)
+LIMIAR_MESMO_ALUNO = 0.9
+
+# Pontuação mínima para um candidato aparecer como sugestão
+LIMIAR_SUGESTAO = 0.6
+
+# Trigramas presentes em mais que esta fração dos nomes (" DA", "DOS"...)
+# não ajudam a selecionar candidatos e são ignorados nessa etapa.
+FRACAO_MAXIMA_NGRAMA = 0.05
+
+# Quantos nomes mais parecidos (por trigramas em comum) são pontuados
+CANDIDATOS_POR_NOME = 30
+
+_RE_ESPACOS = re.compile(r'\s+')
+_RE_NAO_DIGITO = re.compile(r'\D')
+
+
+class Pareamento(NamedTuple):
+    """Candidato local para um registro consultado."""
+    registro: Dict[str, Any]
+    pontuacao: float
+    motivos: Tuple[str, ...]
+
+    @property
+    def automatico(self) -> bool:
+        """Nome normalizado idêntico ou CPF igual: pode ser pareado sem conferência."""
+        return 'nome_exato' in self.motivos or 'cpf' in self.motivos
+
+
+def normalizar_nome(nome: Any) -> str:
+    """Maiúsculas, sem acentos e com espaços simples (igual ao _normalizar do GEDUC)."""
+    if not nome:
+        return ''
+    nome = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode('ascii')
+    return _RE_ESPACOS.sub(' ', nome.strip().upper())
+
+
+def _cpf(valor: Any) -> str:
+    digitos = _RE_NAO_DIGITO.sub('', str(valor or ''))
+    # Zeros e sequências de preenchimento não identificam ninguém
+    return digitos if len(digitos) == 11 and len(set(digitos)) > 1 else ''
+
+
+def _data(valor: Any) -> str:
+    if not valor:
+        return ''
+    return str(valor)[:10]
+
+
+def ngramas(nome: str) -> Set[str]:
+    """Trigramas do nome normalizado, com bordas marcadas por espaço."""
+    texto = f'  {nome} '
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def similaridade(a: Set[str], b: Set[str]) -> float:
+    """Coeficiente de Dice entre dois conjuntos de trigramas."""
+    if not a or not b:
+        return 0.0
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+
+class IndiceAlunos:
+    """Índice de bloqueio + trigramas sobre uma lista de alunos."""
+
+    def __init__(self, registros: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            registros: Dicts com ``nome`` e, quando houver, ``cpf``,
+                       ``data_nascimento`` e ``mae``. São devolvidos como
+                       vieram em ``Pareamento.registro``.
+        """
+        self.registros: List[Dict[str, Any]] = []
+        self._nomes: List[str] = []
+        self._ngramas: List[Set[str]] = []
+        self._maes: List[str] = []
+        self._cpfs: List[str] = []
+        self._datas: List[str] = []
+
+        self._por_nome: Dict[str, List[int]] = defaultdict(list)
+        self._por_cpf: Dict[str, List[int]] = defaultdict(list)
+        self._por_data: Dict[str, List[int]] = defaultdict(list)
+        self._por_mae: Dict[str, List[int]] = defaultdict(list)
+        postagens: Dict[str, array] = defaultdict(lambda: array('I'))
+
+        for registro in registros:
+            nome = normalizar_nome(registro.get('nome'))
+            if not nome:
+                continue
+            i = len(self.registros)
+            grams = ngramas(nome)
+            cpf = _cpf(registro.get('cpf'))
+            data = _data(registro.get('data_nascimento'))
+            mae = normalizar_nome(registro.get('mae'))
+
+            self.registros.append(registro)
+            self._nomes.append(nome)
+            self._ngramas.append(grams)
+            self._cpfs.append(cpf)
+            self._datas.append(data)
+            self._maes.append(mae)
+
+            self._por_nome[nome].append(i)
+            if cpf:
+                self._por_cpf[cpf].append(i)
+            if data:
+                self._por_data[data].append(i)
+            if mae:
+                self._por_mae[mae].append(i)
+            for g in grams:
+                postagens[g].append(i)
+
+        limite = max(50, int(len(self.registros) * FRACAO_MAXIMA_NGRAMA))
+        self._postagens: Dict[str, array] = {
+            g: ids for g, ids in postagens.items() if len(ids) <= limite
+        }
+
+    def __len__(self) -> int:
+        return len(self.registros)
+
+    def _candidatos(self, nome: str, grams: Set[str], cpf: str, data: str, mae: str) -> Set[int]:
+        candidatos: Set[int] = set(self._por_nome.get(nome, ()))
+        if cpf:
+            candidatos.update(self._por_cpf.get(cpf, ()))
+        if data:
+            candidatos.update(self._por_data.get(data, ()))
+        if mae:
+            candidatos.update(self._por_mae.get(mae, ()))
+
+        comuns: Counter = Counter()
+        for g in grams:
+            ids = self._postagens.get(g)
+            if ids is not None:
+                comuns.update(ids)
+        candidatos.update(i for i, _ in comuns.most_common(CANDIDATOS_POR_NOME))
+        return candidatos
+
+    def _pontuar(self, i: int, nome: str, grams: Set[str], cpf: str, data: str,
+                 mae_grams: Optional[Set[str]]) -> Tuple[float, Tuple[str, ...]]:
+        nome_exato = nome == self._nomes[i]
+        pontuacao = 1.0 if nome_exato else similaridade(grams, self._ngramas[i])
+        motivos = ['nome_exato' if nome_exato else 'nome']
+
+        if data and self._datas[i]:
+            if data == self._datas[i]:
+                pontuacao += 0.25 * (1.0 - pontuacao)
+                motivos.append('nascimento')
+            else:
+                pontuacao *= 0.85
+                motivos.append('nascimento_diferente')
+
+        if mae_grams and self._maes[i]:
+            if similaridade(mae_grams, ngramas(self._maes[i])) >= 0.85:
+                pontuacao += 0.15 * (1.0 - pontuacao)
+                motivos.append('mae')
+
+        if cpf and self._cpfs[i]:
+            if cpf == self._cpfs[i]:
+                pontuacao = max(pontuacao, 0.95)
+                motivos.insert(0, 'cpf')
+            else:
+                pontuacao *= 0.8
+                motivos.append('cpf_diferente')
+
+        if nome_exato:
+            # Nascimento/CPF diferentes são divergências do mesmo aluno, não
+            # motivo para tratá-lo como novo (e cadastrá-lo em duplicidade)
+            pontuacao = max(pontuacao, LIMIAR_MESMO_ALUNO)
+
+        return round(pontuacao, 4), tuple(motivos)
+
+    def buscar(self, consulta: Dict[str, Any], limite: int = 5,
+               minimo: float = LIMIAR_SUGESTAO) -> List[Pareamento]:
+        """
+        Candidatos locais para ``consulta``, do mais provável ao menos.
+
+        Args:
+            consulta: Dict com ``nome`` e opcionalmente ``cpf``,
+                      ``data_nascimento`` e ``mae``
+            limite: Máximo de candidatos devolvidos
+            minimo: Pontuação mínima (0 a 1)
+        """
+        nome = normalizar_nome(consulta.get('nome'))
+        if not nome or not self.registros:
+            return []
+        grams = ngramas(nome)
+        cpf = _cpf(consulta.get('cpf'))
+        data = _data(consulta.get('data_nascimento'))
+        mae = normalizar_nome(consulta.get('mae'))
+        mae_grams = ngramas(mae) if mae else None
+
+        pontuados = []
+        for i in self._candidatos(nome, grams, cpf, data, mae):
+            pontuacao, motivos = self._pontuar(i, nome, grams, cpf, data, mae_grams)
+            if pontuacao >= minimo:
+                pontuados.append((pontuacao, -i, motivos))
+
+        return [
+            Pareamento(self.registros[-neg_i], pontuacao, motivos)
+            for pontuacao, neg_i, motivos in heapq.nlargest(limite, pontuados)
+        ]
+
+    def melhor(self, consulta: Dict[str, Any],
+               minimo: float = LIMIAR_MESMO_ALUNO) -> Optional[Pareamento]:
+        """
+        Pareamento automático: o candidato mais provável com nome idêntico
+        ou CPF igual e pontuação >= ``minimo``, ou None. Nomes apenas
+        parecidos ficam para conferência via ``buscar``.
+        """
+        for pareamento in self.buscar(consulta, limite=5, minimo=minimo):
+            if pareamento.automatico:
+                return pareamento
+        return None
+
+    def buscar_lote(self, consultas: Iterable[Dict[str, Any]], limite: int = 5,
+                    minimo: float = LIMIAR_SUGESTAO) -> List[List[Pareamento]]:
+        """``buscar`` para cada consulta, na mesma ordem."""
+        return [self.buscar(c, limite=limite, minimo=minimo) for c in consultas]
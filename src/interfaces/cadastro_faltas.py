@@ -14,6 +14,7 @@ from datetime import datetime
 import calendar
 from src.core.conexao import conectar_bd
 from db.connection import get_connection, get_cursor
+from db.upsert_lote import upsert_em_lote, contar_atualizadas
 from typing import Any, cast, Dict, Optional
 
 
@@ -478,7 +479,7 @@ class InterfaceCadastroEdicaoFaltas:
                 # Total de dias do mês corrente (calendário)
                 total_dias_mes = calendar.monthrange(ano, mes)[1]
 
-                # Obter observações já salvas para preservar quando não for informado
+                # Registros já existentes no mês (separa inseridos de atualizados)
                 cur_exist = cast(Any, conn).cursor(dictionary=True)
                 cur_exist.execute(
                     """
@@ -494,9 +495,8 @@ class InterfaceCadastroEdicaoFaltas:
                 except Exception:
                     pass
 
-                inseridos = 0
-                atualizados = 0
                 erros = []
+                linhas = []
 
                 for func_id, campos in self.inputs_por_id.items():
                     # Obter valores dos campos (não usar mais P do usuário, será calculado)
@@ -542,19 +542,17 @@ class InterfaceCadastroEdicaoFaltas:
                     # Se observação estiver vazia, salvar como NULL (permitir apagar)
                     obs_final = obs if obs else None
 
-                    # Upsert
-                    cast(Any, cur).execute(
-                        """
-                        INSERT INTO funcionario_faltas_mensal (funcionario_id, ano, mes, p, f, fj, observacao)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                        ON DUPLICATE KEY UPDATE p=VALUES(p), f=VALUES(f), fj=VALUES(fj), observacao=VALUES(observacao)
-                        """,
-                        (func_id, ano, mes, p, f, fj, obs_final),
-                    )
-                    if cur.rowcount == 1:
-                        inseridos += 1
-                    else:
-                        atualizados += 1
+                    linhas.append((func_id, ano, mes, p, f, fj, obs_final))
+
+                # Quadro inteiro em um único INSERT ... ON DUPLICATE KEY UPDATE
+                afetadas = upsert_em_lote(
+                    cur, 'funcionario_faltas_mensal',
+                    ('funcionario_id', 'ano', 'mes', 'p', 'f', 'fj', 'observacao'),
+                    linhas, atualizar=('p', 'f', 'fj', 'observacao'),
+                )
+                inseridos = sum(1 for linha in linhas if linha[0] not in obs_existente_map)
+                atualizados = contar_atualizadas(afetadas, inseridos)
+                inalterados = len(linhas) - inseridos - atualizados
 
                 try:
                     conn.commit()
@@ -567,7 +565,10 @@ class InterfaceCadastroEdicaoFaltas:
                     pass
             
             # Exibir resultado
-            mensagem = f"Faltas salvas com sucesso!\n\nInseridos: {inseridos}\nAtualizados: {atualizados}"
+            mensagem = (
+                f"Faltas salvas com sucesso!\n\nInseridos: {inseridos}\nAtualizados: {atualizados}"
+                f"\nSem alteração: {inalterados}"
+            )
             if erros:
                 mensagem += f"\n\n⚠️ Erros encontrados ({len(erros)}):\n" + "\n".join(erros[:5])
                 if len(erros) > 5:
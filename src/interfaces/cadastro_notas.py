@@ -14,6 +14,7 @@ import os
 # Imports para controle de perfil de usuário
 from src.core.config import perfis_habilitados
 from src.services.perfil_filter_service import PerfilFilterService, get_turmas_usuario
+from src.services import referencia_service
 from auth.usuario_logado import UsuarioLogado
 from auth.decorators import requer_permissao
 
@@ -23,6 +24,16 @@ from pathlib import Path
 from src.importadores.local_horarios import build_local_map_from_folder, _normalize_key
 from typing import List, Any, Optional, Dict
 
+
+def _invalidar_cache_atas():
+    """Descarta as notas cacheadas pelas atas após gravar notas."""
+    try:
+        from src.relatorios.nota_ata import invalidar_cache_notas
+        invalidar_cache_notas()
+    except Exception as e:
+        logger.debug(f"Cache de notas das atas não invalidado: {e}")
+
+
 class InterfaceCadastroEdicaoNotas:
     def __init__(self, root=None, aluno_id=None, janela_principal=None):
         # Armazenar referência à janela principal
@@ -428,23 +439,14 @@ class InterfaceCadastroEdicaoNotas:
         self.lbl_total_alunos.grid(row=1, column=5, padx=5, pady=5, sticky="w")
     
     def carregar_niveis_ensino(self):
-        conn = None
-        cursor = None
         try:
-            conn = conectar_bd()
-            if conn is None:
-                messagebox.showerror("Erro de Conexão", "Não foi possível conectar ao banco de dados.")
-                return
-
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, nome FROM niveisensino ORDER BY nome")
-            niveis = cursor.fetchall()
+            niveis = referencia_service.listar_niveis_ensino()
 
             if not niveis:
                 messagebox.showinfo("Informação", "Nenhum nível de ensino encontrado no banco de dados.")
                 return
 
-            self.niveis_map = {nivel[1]: nivel[0] for nivel in niveis}
+            self.niveis_map = {nivel['nome']: nivel['id'] for nivel in niveis}
             self.cb_nivel['values'] = list(self.niveis_map.keys())
             if self.cb_nivel['values']:
                 self.cb_nivel.current(0)
@@ -453,17 +455,6 @@ class InterfaceCadastroEdicaoNotas:
                 self.carregar_disciplinas()
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar níveis de ensino: {e}")
-        finally:
-            try:
-                if cursor is not None:
-                    cursor.close()
-            except Exception:
-                pass
-            try:
-                if conn is not None:
-                    conn.close()
-            except Exception:
-                pass
     
     def carregar_series(self, event=None):
         if not self.cb_nivel.get():
@@ -473,19 +464,10 @@ class InterfaceCadastroEdicaoNotas:
         if nivel_id is None:
             return
         
-        conn = None
-        cursor = None
         try:
-            conn = conectar_bd()
-            if conn is None:
-                messagebox.showerror("Erro de Conexão", "Não foi possível conectar ao banco de dados.")
-                return
+            series = referencia_service.listar_series(nivel_id=int(nivel_id))
 
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, nome FROM series WHERE nivel_id = %s ORDER BY nome", self._norm_params((nivel_id,)))
-            series = cursor.fetchall()
-
-            self.series_map = {serie[1]: serie[0] for serie in series}
+            self.series_map = {serie['nome']: serie['id'] for serie in series}
             self.cb_serie['values'] = list(self.series_map.keys())
             if self.cb_serie['values']:
                 self.cb_serie.current(0)
@@ -496,17 +478,6 @@ class InterfaceCadastroEdicaoNotas:
                 self.cb_turma['values'] = []
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar séries: {e}")
-        finally:
-            try:
-                if cursor is not None:
-                    cursor.close()
-            except Exception:
-                pass
-            try:
-                if conn is not None:
-                    conn.close()
-            except Exception:
-                pass
     
     def carregar_turmas(self, event=None):
         if not self.cb_serie.get():
@@ -516,29 +487,11 @@ class InterfaceCadastroEdicaoNotas:
         if serie_id is None:
             return
         
-        conn = None
-        cursor = None
         try:
-            conn = conectar_bd()
-            if conn is None:
-                messagebox.showerror("Erro de Conexão", "Não foi possível conectar ao banco de dados.")
-                return
-
-            cursor = conn.cursor()
-            
             # Obter filtro de turmas baseado no perfil do usuário
             turmas_permitidas = get_turmas_usuario()
             
-            # Construir query com filtro de perfil se necessário
-            if turmas_permitidas is None:
-                # Admin/Coordenador - sem filtro
-                cursor.execute("""
-                    SELECT t.id, CONCAT(t.nome, ' - ', t.turno) AS turma_nome 
-                    FROM turmas t 
-                    WHERE t.serie_id = %s AND t.ano_letivo_id = %s
-                    ORDER BY t.nome
-                """, self._norm_params((serie_id, self.ano_letivo_atual)))
-            elif not turmas_permitidas:
+            if turmas_permitidas is not None and not turmas_permitidas:
                 # Professor sem turmas vinculadas
                 self.turmas_map = {}
                 self.cb_turma['values'] = []
@@ -551,20 +504,15 @@ class InterfaceCadastroEdicaoNotas:
                     "Contate a coordenação para vincular suas disciplinas."
                 )
                 return
-            else:
-                # Professor - filtrar apenas turmas vinculadas
-                placeholders = ','.join(['%s'] * len(turmas_permitidas))
-                cursor.execute(f"""
-                    SELECT t.id, CONCAT(t.nome, ' - ', t.turno) AS turma_nome 
-                    FROM turmas t 
-                    WHERE t.serie_id = %s AND t.ano_letivo_id = %s
-                    AND t.id IN ({placeholders})
-                    ORDER BY t.nome
-                """, self._norm_params((serie_id, self.ano_letivo_atual, *turmas_permitidas)))
-            
-            turmas = cursor.fetchall()
-
-            self.turmas_map = {turma[1]: turma[0] for turma in turmas}
+            
+            # Admin/Coordenador (None) vê todas; professor só as vinculadas
+            turmas = referencia_service.listar_turmas(
+                serie_id=int(serie_id),
+                ano_letivo_id=int(self.ano_letivo_atual) if self.ano_letivo_atual is not None else None,
+                ids=turmas_permitidas,
+            )
+
+            self.turmas_map = {f"{t['nome']} - {t['turno']}": t['id'] for t in turmas}
             self.cb_turma['values'] = list(self.turmas_map.keys())
             if self.cb_turma['values']:
                 self.cb_turma.current(0)
@@ -577,17 +525,6 @@ class InterfaceCadastroEdicaoNotas:
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar turmas: {e}")
             logger.error(f"Erro detalhado ao carregar turmas: {str(e)}")
-        finally:
-            try:
-                if cursor is not None:
-                    cursor.close()
-            except Exception:
-                pass
-            try:
-                if conn is not None:
-                    conn.close()
-            except Exception:
-                pass
     
     def carregar_disciplinas(self, event=None):
         if not self.cb_nivel.get():
@@ -642,23 +579,14 @@ class InterfaceCadastroEdicaoNotas:
                     disciplinas = []
             else:
                 # Admin/Coordenador: todas as disciplinas do nível
-                cursor.execute("""
-                    SELECT id, nome 
-                    FROM disciplinas 
-                    WHERE nivel_id = %s AND escola_id = %s
-                    ORDER BY nome
-                """, self._norm_params((nivel_id, config.ESCOLA_ID)))
-                disciplinas = cursor.fetchall()
-
-                # Se não encontrar disciplinas com nivel_id, tenta buscar todas da escola
-                if not disciplinas:
-                    cursor.execute("""
-                        SELECT id, nome 
-                        FROM disciplinas 
-                        WHERE escola_id = %s
-                        ORDER BY nome
-                    """, self._norm_params((config.ESCOLA_ID,)))
-                    disciplinas = cursor.fetchall()
+                # (se não houver com nivel_id, todas da escola)
+                disciplinas = [
+                    (d['id'], d['nome'])
+                    for d in (
+                        referencia_service.listar_disciplinas(nivel_id=int(nivel_id), escola_id=config.ESCOLA_ID)
+                        or referencia_service.listar_disciplinas(escola_id=config.ESCOLA_ID)
+                    )
+                ]
 
             if not disciplinas:
                 msg = "Não há disciplinas vinculadas a você nesta turma." if perfis_habilitados() and UsuarioLogado.get_perfil() == 'professor' else "Não há disciplinas cadastradas para esta escola."
@@ -1861,6 +1789,7 @@ class InterfaceCadastroEdicaoNotas:
                     count_inseridas += 1
 
             conn.commit()
+            _invalidar_cache_atas()
             messagebox.showinfo("Sucesso", f"Notas salvas com sucesso!\n\nNovas notas: {count_inseridas}\nNotas atualizadas: {count_atualizadas}\nNotas removidas: {count_removidas}")
         except Exception as e:
             try:
@@ -3428,6 +3357,7 @@ class InterfaceCadastroEdicaoNotas:
                         inseridas += 1
                         logger.debug(f"[DEBUG_NOTAS] inseridas incrementado -> {inseridas}")
 
+            _invalidar_cache_atas()
             return inseridas, atualizadas, nao_encontrados
 
         except Exception as e:
@@ -4377,6 +4307,10 @@ class InterfaceCadastroEdicaoNotas:
                         if log_debug:
                             log_debug(f"       ❌ NÃO será atualizado (não atende critérios)")
 
+            # Fora do with: as notas já foram gravadas (commit)
+            if atualizados > 0:
+                _invalidar_cache_atas()
+
             # Debug: rodapé
             if log_debug:
                 log_debug("    " + "="*70)
@@ -4734,6 +4668,7 @@ class InterfaceCadastroEdicaoNotas:
             conn.commit()
             cursor.close()
             conn.close()
+            _invalidar_cache_atas()
             
             messagebox.showinfo("Sucesso", f"✅ {sincronizadas} nota(s) sincronizada(s)!")
             self.carregar_notas_alunos()
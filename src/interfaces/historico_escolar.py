@@ -12,6 +12,7 @@ from src.relatorios.historico_escolar import historico_escolar
 from src.utils.utilitarios.escola_cache import get_escola_municipio
 import time
 from src.core.config_logs import get_logger
+from src.services.log_alteracoes_service import assinar
 
 _logger = get_logger(__name__)
 
@@ -51,6 +52,8 @@ class InterfaceHistoricoEscolar:
         self._cache_historico = {}
         self._cache_disciplinas_filtradas = {}
         self._cache_timestamp = None
+        # Alunos alterados em outro cliente (referência fraca: some com a janela)
+        assinar(('aluno',), self._aplicar_alteracao_alunos)
         
         # Fonte para calcular largura de texto
         self.fonte_combobox = ("TkDefaultFont", 9)
@@ -1098,6 +1101,28 @@ class InterfaceHistoricoEscolar:
             # Limpar todo o cache
             self._cache_historico.clear()
 
+    def _aplicar_alteracao_alunos(self, entidade, ids):
+        """
+        Chamado pelo monitor de alterações (fora da thread do Tk).
+
+        Os caches são lidos pela thread do Tk sem lock, então a invalidação
+        é agendada nela em vez de feita aqui.
+        """
+        try:
+            self.janela.after(0, lambda: self._invalidar_caches_alunos(ids))
+        except (RuntimeError, tk.TclError):
+            # Janela já destruída: não há mais cache a invalidar
+            pass
+
+    def _invalidar_caches_alunos(self, ids):
+        """Descarta pesquisas e históricos em cache dos alunos alterados (thread do Tk)."""
+        self._cache_alunos = {}
+        if ids is None:
+            self.invalidar_cache_historico()
+        else:
+            for aluno_id in ids:
+                self.invalidar_cache_historico(aluno_id)
+
     def selecionar_historico(self, event):
         # Obter o item selecionado
         item = self.treeview_historico.selection()
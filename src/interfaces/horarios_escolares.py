@@ -5,6 +5,7 @@ from tkinter import ttk, messagebox, filedialog
 import pandas as pd
 from datetime import datetime
 from src.core.conexao import conectar_bd
+from src.services import referencia_service
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.platypus import Table, TableStyle, Paragraph, Spacer, PageBreak, HRFlowable
@@ -135,41 +136,27 @@ class InterfaceHorariosEscolares:
             
             # Buscar todas as séries com tratamento de erro
             try:
-                # Primeiro vamos listar todos os níveis de ensino disponíveis para debugar
-                cursor.execute("SELECT id, nome FROM niveisensino")
-                niveis = cursor.fetchall()
-                logger.info("Níveis de ensino disponíveis:")
-                for nivel in niveis:
-                    logger.info(f"  ID: {nivel['id']}, Nome: {nivel['nome']}")
-                
-                # Agora vamos listar todas as séries
-                cursor.execute("SELECT id, nome, nivel_id FROM series")
-                todas_series = cursor.fetchall()
-                logger.info("\nTodas as séries disponíveis:")
-                for serie in todas_series:
-                    logger.info(f"  ID: {serie['id']}, Nome: {serie['nome']}, Nível ID: {serie['nivel_id']}")
-                
-                # Buscar apenas as séries de interesse
-                cursor.execute("""
-                    SELECT id, nome, nivel_id FROM series 
-                    WHERE nivel_id IN (
-                        SELECT id FROM niveisensino WHERE nome IN ('Ensino Fundamental I', 'Ensino Fundamental II')
-                    )
-                    ORDER BY nome
-                """)
-                self.series_dados = cursor.fetchall()
-                logger.info(f"\nSéries específicas carregadas: {len(self.series_dados)}")
-                for serie in self.series_dados:
-                    logger.info(f"  ID: {serie['id']}, Nome: {serie['nome']}")
+                # Níveis e séries vêm do cache de referência (sem consulta quando nada mudou)
+                nomes_fundamental = ('Ensino Fundamental I', 'Ensino Fundamental II')
+                ids_fundamental = {
+                    n['id'] for n in referencia_service.listar_niveis_ensino() if n['nome'] in nomes_fundamental
+                }
+                todas_series = referencia_service.listar_series()
+                self.series_dados = [
+                    {'id': s['id'], 'nome': s['nome'], 'nivel_id': s['nivel_id']}
+                    for s in todas_series if s['nivel_id'] in ids_fundamental
+                ]
+                logger.info(f"Séries específicas carregadas: {len(self.series_dados)}")
                     
                 # Se não encontrar nenhuma série, podemos procurar usando IDs específicos baseados na tabela turmas
                 if not self.series_dados:
                     # IDs das séries que aparecem na tabela turmas: 3, 4, 5, 6, 7, 8, 9, 10, 11
-                    cursor.execute("SELECT id, nome, nivel_id FROM series WHERE id IN (3, 4, 5, 6, 7, 8, 9, 10, 11) ORDER BY id")
-                    self.series_dados = cursor.fetchall()
-                    logger.info(f"\nSéries por ID específico: {len(self.series_dados)}")
-                    for serie in self.series_dados:
-                        logger.info(f"  ID: {serie['id']}, Nome: {serie['nome']}")
+                    self.series_dados = sorted(
+                        ({'id': s['id'], 'nome': s['nome'], 'nivel_id': s['nivel_id']}
+                         for s in todas_series if s['id'] in range(3, 12)),
+                        key=lambda s: s['id'],
+                    )
+                    logger.info(f"Séries por ID específico: {len(self.series_dados)}")
                 
             except Exception as e:
                 logger.error(f"Erro ao carregar séries: {str(e)}")
@@ -230,12 +217,10 @@ class InterfaceHorariosEscolares:
             
             # Buscar todas as disciplinas com tratamento de erro
             try:
-                cursor.execute("""
-                    SELECT id, nome FROM disciplinas
-                    WHERE escola_id = 60
-                    ORDER BY nome
-                """)
-                self.disciplinas = cursor.fetchall()
+                self.disciplinas = [
+                    {'id': d['id'], 'nome': d['nome']}
+                    for d in referencia_service.listar_disciplinas(escola_id=60)
+                ]
                 logger.info(f"Disciplinas carregadas: {len(self.disciplinas)}")
             except Exception as e:
                 logger.error(f"Erro ao carregar disciplinas: {str(e)}")
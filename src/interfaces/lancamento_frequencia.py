@@ -10,6 +10,8 @@ logger = get_logger(__name__)
 import tkinter as tk
 from tkinter import ttk, messagebox
 from src.core.conexao import conectar_bd
+from db.upsert_lote import upsert_em_lote, contar_atualizadas
+from src.services import referencia_service
 from src.core import config
 from datetime import datetime
 from typing import cast, Optional
@@ -362,35 +364,18 @@ class InterfaceLancamentoFrequencia:
     
     def carregar_niveis_ensino(self):
         """Carrega os níveis de ensino disponíveis."""
-        conn = None
-        cursor = None
-        ano = self.ano_letivo_atual
-        if ano is None:
-            logger.error("Ano letivo atual indefinido ao salvar faltas")
+        if self.ano_letivo_atual is None:
+            logger.error("Ano letivo atual indefinido ao carregar níveis")
             messagebox.showerror("Erro", "Ano letivo não configurado.")
             return
-        ano = int(ano)
         try:
-            conn = conectar_bd()
-            if conn is None:
-                messagebox.showerror("Erro", "Não foi possível conectar ao banco de dados.")
-                return
-
-            cursor = conn.cursor()
-            ano = self.ano_letivo_atual
-            if ano is None:
-                logger.error("Ano letivo atual indefinido ao salvar faltas")
-                messagebox.showerror("Erro", "Ano letivo não configurado.")
-                return
-            ano = int(ano)
-            cursor.execute("SELECT id, nome FROM niveisensino ORDER BY nome")
-            niveis = cursor.fetchall()
+            niveis = referencia_service.listar_niveis_ensino()
 
             if not niveis:
                 messagebox.showinfo("Informação", "Nenhum nível de ensino encontrado.")
                 return
 
-            self.niveis_map = {nivel[1]: nivel[0] for nivel in niveis}
+            self.niveis_map = {nivel['nome']: nivel['id'] for nivel in niveis}
             self.cb_nivel['values'] = list(self.niveis_map.keys())
             if self.cb_nivel['values']:
                 self.cb_nivel.current(0)
@@ -398,11 +383,6 @@ class InterfaceLancamentoFrequencia:
         except Exception as e:
             logger.error(f"Erro ao carregar níveis: {e}")
             messagebox.showerror("Erro", f"Erro ao carregar níveis de ensino: {e}")
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
     
     def carregar_series(self, event=None):
         """Carrega as séries do nível selecionado."""
@@ -412,29 +392,11 @@ class InterfaceLancamentoFrequencia:
         nivel_id = self.niveis_map.get(self.cb_nivel.get())
         if nivel_id is None:
             return
-        
-        conn = None
-        cursor = None
-        ano = self.ano_letivo_atual
-        if ano is None:
-            logger.error("Ano letivo atual indefinido ao salvar faltas")
-            messagebox.showerror("Erro", "Ano letivo não configurado.")
-            return
-        ano = int(ano)
 
         try:
-            conn = conectar_bd()
-            if conn is None:
-                return
+            series = referencia_service.listar_series(nivel_id=int(nivel_id))
 
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT id, nome FROM series WHERE nivel_id = %s ORDER BY nome",
-                (nivel_id,)
-            )
-            series = cursor.fetchall()
-
-            self.series_map = {serie[1]: serie[0] for serie in series}
+            self.series_map = {serie['nome']: serie['id'] for serie in series}
             self.cb_serie['values'] = list(self.series_map.keys())
             if self.cb_serie['values']:
                 self.cb_serie.current(0)
@@ -445,11 +407,6 @@ class InterfaceLancamentoFrequencia:
                 self.cb_turma['values'] = []
         except Exception as e:
             logger.error(f"Erro ao carregar séries: {e}")
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
     
     def carregar_turmas(self, event=None):
         """Carrega as turmas da série selecionada, aplicando filtro de perfil."""
@@ -462,40 +419,18 @@ class InterfaceLancamentoFrequencia:
         # Normalizar tipo para int (ajuda o verificador estático)
         serie_id = int(serie_id)
         
-        conn = None
-        cursor = None
         ano = self.ano_letivo_atual
         if ano is None:
-            logger.error("Ano letivo atual indefinido ao salvar faltas")
+            logger.error("Ano letivo atual indefinido ao carregar turmas")
             messagebox.showerror("Erro", "Ano letivo não configurado.")
             return
         ano = int(ano)
 
         try:
-            conn = conectar_bd()
-            if conn is None:
-                return
-
-            cursor = conn.cursor()
-            # Garantir ano letivo definido e normalizado
-            ano = self.ano_letivo_atual
-            if ano is None:
-                logger.error("Ano letivo atual indefinido ao carregar turmas")
-                return
-            ano = int(ano)
-
             # Obter filtro de turmas baseado no perfil
             turmas_permitidas = get_turmas_usuario()
             
-            if turmas_permitidas is None:
-                # Admin/Coordenador - sem filtro
-                cursor.execute("""
-                    SELECT t.id, CONCAT(t.nome, ' - ', t.turno) AS turma_nome 
-                    FROM turmas t 
-                    WHERE t.serie_id = %s AND t.ano_letivo_id = %s
-                    ORDER BY t.nome
-                """, (serie_id, cast(int, self.ano_letivo_atual)))
-            elif not turmas_permitidas:
+            if turmas_permitidas is not None and not turmas_permitidas:
                 # Professor sem turmas vinculadas
                 self.turmas_map = {}
                 self.cb_turma['values'] = []
@@ -506,23 +441,13 @@ class InterfaceLancamentoFrequencia:
                     "Contate a coordenação para vincular suas turmas."
                 )
                 return
-            else:
-                # Professor - filtrar apenas turmas vinculadas
-                # Garantir sequência de parâmetros como tuple para evitar problemas
-                # com o analisador de tipos do driver (e também aceitar set/list)
-                placeholders = ','.join(['%s'] * len(turmas_permitidas))
-                params = (serie_id, cast(int, self.ano_letivo_atual)) + tuple(int(x) for x in turmas_permitidas)
-                cursor.execute(f"""
-                    SELECT t.id, CONCAT(t.nome, ' - ', t.turno) AS turma_nome 
-                    FROM turmas t 
-                    WHERE t.serie_id = %s AND t.ano_letivo_id = %s
-                    AND t.id IN ({placeholders})
-                    ORDER BY t.nome
-                """, params)
             
-            turmas = cursor.fetchall()
+            # Admin/Coordenador (None) vê todas; professor só as vinculadas
+            turmas = referencia_service.listar_turmas(
+                serie_id=serie_id, ano_letivo_id=ano, ids=turmas_permitidas
+            )
 
-            self.turmas_map = {turma[1]: turma[0] for turma in turmas}
+            self.turmas_map = {f"{t['nome']} - {t['turno']}": t['id'] for t in turmas}
             self.cb_turma['values'] = list(self.turmas_map.keys())
             if self.cb_turma['values']:
                 self.cb_turma.current(0)
@@ -531,11 +456,6 @@ class InterfaceLancamentoFrequencia:
         except Exception as e:
             logger.error(f"Erro ao carregar turmas: {e}")
             messagebox.showerror("Erro", f"Erro ao carregar turmas: {e}")
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
     
     def carregar_alunos(self, event=None):
         """Carrega os alunos da turma selecionada e suas faltas do bimestre."""
@@ -575,7 +495,8 @@ class InterfaceLancamentoFrequencia:
                 SELECT 
                     a.id AS aluno_id,
                     a.nome AS nome_aluno,
-                    COALESCE(fb.faltas, 0) AS faltas
+                    COALESCE(fb.faltas, 0) AS faltas,
+                    fb.id IS NOT NULL AS tem_registro
                 FROM alunos a
                 INNER JOIN matriculas m ON m.aluno_id = a.id
                 LEFT JOIN faltas_bimestrais fb ON fb.aluno_id = a.id 
@@ -774,40 +695,33 @@ class InterfaceLancamentoFrequencia:
 
             cursor = conn.cursor()
             
-            salvos = 0
-            for aluno_id, faltas in dados_para_salvar:
-                # Verificar se já existe registro
-                cursor.execute("""
-                    SELECT id FROM faltas_bimestrais 
-                    WHERE aluno_id = %s AND bimestre = %s AND ano_letivo_id = %s
-                """, (int(aluno_id), str(bimestre), cast(int, self.ano_letivo_atual)))
-                
-                resultado = cursor.fetchone()
-                
-                if resultado:
-                    # Atualizar registro existente
-                    cursor.execute("""
-                        UPDATE faltas_bimestrais 
-                        SET faltas = %s 
-                        WHERE aluno_id = %s AND bimestre = %s AND ano_letivo_id = %s
-                    """, (int(faltas), int(aluno_id), str(bimestre), cast(int, self.ano_letivo_atual)))
-                else:
-                    # Inserir novo registro
-                    cursor.execute("""
-                        INSERT INTO faltas_bimestrais (aluno_id, bimestre, ano_letivo_id, faltas)
-                        VALUES (%s, %s, %s, %s)
-                    """, (int(aluno_id), str(bimestre), cast(int, self.ano_letivo_atual), int(faltas)))
-                
-                salvos += 1
-            
+            # Turma inteira em um único INSERT ... ON DUPLICATE KEY UPDATE
+            ano_letivo_id = cast(int, self.ano_letivo_atual)
+            linhas = [
+                (int(aluno_id), str(bimestre), ano_letivo_id, int(faltas))
+                for aluno_id, faltas in dados_para_salvar
+            ]
+            afetadas = upsert_em_lote(
+                cursor, 'faltas_bimestrais',
+                ('aluno_id', 'bimestre', 'ano_letivo_id', 'faltas'),
+                linhas, atualizar=('faltas',),
+            )
             conn.commit()
             
+            salvos = len(linhas)
+            com_registro = {a['aluno_id'] for a in self.alunos_data if a.get('tem_registro')}
+            inseridos = sum(1 for aluno_id, _ in dados_para_salvar if aluno_id not in com_registro)
+            atualizados = contar_atualizadas(afetadas, inseridos)
+            for aluno in self.alunos_data:
+                aluno['tem_registro'] = 1
+            
             messagebox.showinfo(
                 "Sucesso",
-                f"Frequência salva com sucesso!\n{salvos} registros atualizados."
+                f"Frequência salva com sucesso!\n{salvos} registros gravados "
+                f"({inseridos} novos, {atualizados} alterados)."
             )
             
-            logger.info(f"Frequência salva: {salvos} alunos, bimestre {bimestre}")
+            logger.info(f"Frequência salva: {salvos} alunos, bimestre {bimestre}, {afetadas} linha(s) afetada(s)")
             
         except Exception as e:
             if conn:
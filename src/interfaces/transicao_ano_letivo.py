@@ -20,14 +20,12 @@ from tkinter import (Tk, Toplevel, Frame, Label, LabelFrame, Button,
                      BOTH, LEFT, X, W, E, RIDGE, DISABLED, NORMAL)
 from tkinter import ttk, messagebox
 from src.core.conexao import conectar_bd
-from db.connection import get_connection, get_cursor
+from db.connection import get_cursor
 from db.queries_transicao import (
     QueriesTransicao, 
-    QUERY_TURMAS_9ANO, 
-    QUERY_CRIAR_ANO_LETIVO,
-    QUERY_ENCERRAR_MATRICULAS,
-    QUERY_CRIAR_MATRICULA
+    QUERY_TURMAS_9ANO
 )
+from src.services.transicao_service import executar_rollover
 from typing import Any, cast
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -836,230 +834,125 @@ class InterfaceTransicaoAnoLetivo:
         total_alunos = 0
         
         try:
-            # Carregar mapa de turmas para progressão
-            self._carregar_mapa_turmas()
+            resultado = executar_rollover(
+                escola_id=self.escola_id,
+                ano_origem_id=self.ano_atual['id'],
+                ano_destino=self.ano_novo['ano_letivo'],
+                dry_run=dry_run,
+                ao_progredir=self._atualizar_status_seguro,
+            )
+            matriculas_encerradas = resultado['matriculas_encerradas']
+            total_alunos = resultado['matriculas_criadas']
+            alunos_promovidos = resultado['alunos_promovidos']
+            alunos_retidos = resultado['alunos_retidos']
+            logger.info(f"Tempos por etapa (s): {resultado['tempos']}")
+
+            # Contar alunos concluintes (9º ano aprovados)
+            alunos_concluintes = self.estatisticas.get('total_matriculas', 0) - total_alunos - self.estatisticas.get('alunos_excluir', 0)
+            if alunos_concluintes < 0:
+                alunos_concluintes = 0
+
+            # Finalizar
+            self._atualizar_status_seguro("Transição concluída com sucesso!", 100)
+
+            # Log de resumo final
+            logger.info("=" * 60)
+            logger.info(f"TRANSIÇÃO CONCLUÍDA {'[DRY-RUN]' if dry_run else 'COM SUCESSO'}")
+            logger.info(f"Resumo:")
+            logger.info(f"  - Ano letivo criado: {self.ano_novo['ano_letivo']}")
+            logger.info(f"  - Matrículas encerradas: {matriculas_encerradas}")
+            logger.info(f"  - Novas matrículas: {total_alunos}")
+            logger.info(f"  - Alunos promovidos: {alunos_promovidos}")
+            logger.info(f"  - Alunos retidos: {alunos_retidos}")
+            logger.info(f"  - Alunos concluintes (9º ano): {alunos_concluintes}")
+            logger.info("=" * 60)
             
-            # Usar get_connection para controle de transação
-            with get_connection() as conn:
-                cursor = conn.cursor(dictionary=True)
-
-                # Passo 1: Criar novo ano letivo
-                self._atualizar_status_seguro("Criando novo ano letivo...", 10)
-                logger.info(f"[Passo 1] Criando ano letivo {self.ano_novo['ano_letivo']}")
-                cursor.execute(QUERY_CRIAR_ANO_LETIVO, (self.ano_novo['ano_letivo'],))
-                if not dry_run:
-                    conn.commit()
-                logger.info(f"[Passo 1] ✓ Ano letivo {self.ano_novo['ano_letivo']} criado/verificado")
-
-                # Buscar ID do novo ano
-                cursor.execute("""
-                    SELECT id FROM anosletivos WHERE ano_letivo = %s
-                """, (self.ano_novo['ano_letivo'],))
-                _tmp = cast(Any, cursor.fetchone())
-                novo_ano_id = _tmp['id']
-                logger.info(f"[Passo 1] Novo ano_letivo_id: {novo_ano_id}")
-
-                # Passo 2: Buscar alunos ativos para rematricular
-                self._atualizar_status_seguro("Buscando alunos para rematricular...", 30)
-                logger.info("[Passo 2] Buscando alunos para rematricular")
-
-                # Buscar turmas do 9º ano usando query centralizada
-                turmas_9ano = QueriesTransicao.get_turmas_9ano(self.escola_id)
-                logger.info(f"[Passo 2] Turmas do 9º ano identificadas: {turmas_9ano}")
-
-                # Buscar alunos usando queries centralizadas
-                alunos_normais_raw, alunos_reprovados_raw = QueriesTransicao.get_alunos_para_rematricular(
-                    self.ano_atual['id'], 
-                    self.escola_id, 
-                    turmas_9ano
+            # Registrar auditoria
+            if not dry_run:
+                self._registrar_auditoria(
+                    status='sucesso',
+                    matriculas_encerradas=matriculas_encerradas,
+                    matriculas_criadas=total_alunos,
+                    alunos_promovidos=alunos_promovidos,
+                    alunos_retidos=alunos_retidos,
+                    alunos_concluintes=alunos_concluintes,
+                    detalhes=json.dumps({
+                        'ano_origem': self.ano_atual['ano_letivo'],
+                        'ano_destino': self.ano_novo['ano_letivo'],
+                        'data': datetime.now().isoformat(),
+                        'tempos_etapas': resultado['tempos']
+                    })
                 )
-                
-                # Converter para lista mutável
-                alunos_normais = [dict(a) for a in alunos_normais_raw] if alunos_normais_raw else []
-                alunos_reprovados = [dict(a) for a in alunos_reprovados_raw] if alunos_reprovados_raw else []
-                
-                logger.info(f"[Passo 2] Alunos normais (1º ao 8º): {len(alunos_normais)}")
-                logger.info(f"[Passo 2] Alunos reprovados: {len(alunos_reprovados)}")
-                
-                # IDs dos reprovados para marcação
-                ids_reprovados = {a['aluno_id'] for a in alunos_reprovados}
-                
-                # Combinar alunos, marcando reprovados
-                alunos_map: Dict[int, Dict] = {}
-                
-                for a in alunos_normais:
-                    aid = int(a['aluno_id'])
-                    a['reprovado'] = aid in ids_reprovados
-                    alunos_map[aid] = a
-                
-                for a in alunos_reprovados:
-                    aid = int(a['aluno_id'])
-                    if aid not in alunos_map:
-                        a['reprovado'] = True
-                        alunos_map[aid] = a
-
-                alunos = list(alunos_map.values())
-                total_alunos = len(alunos)
-                logger.info(f"[Passo 2] ✓ Total de alunos a rematricular: {total_alunos}")
-
-                # Passo 2.5: Pré-calcular mapeamento de turmas (otimização)
-                logger.info("[Passo 2.5] Pré-calculando mapeamento de turmas para otimização")
-                turmas_unicas = {a['turma_id'] for a in alunos}
-                mapa_progressao = {}
-                for turma_id in turmas_unicas:
-                    proxima = QueriesTransicao.get_proxima_turma(turma_id, self.escola_id, novo_ano_id)
-                    mapa_progressao[turma_id] = proxima if proxima else turma_id
-                logger.info(f"[Passo 2.5] ✓ Mapeamento calculado para {len(turmas_unicas)} turmas")
-
-                # Passo 3: Criar novas matrículas COM PROGRESSÃO DE SÉRIE
-                self._atualizar_status_seguro(f"Criando {total_alunos} novas matrículas...", 50)
-                logger.info(f"[Passo 3] Criando {total_alunos} novas matrículas com progressão de série")
-
-                for i, aluno in enumerate(alunos):
-                    turma_atual = aluno['turma_id']
-                    reprovado = aluno.get('reprovado', False)
-                    
-                    # Determinar turma de destino usando mapa pré-calculado
-                    if reprovado:
-                        nova_turma = turma_atual
-                    else:
-                        nova_turma = mapa_progressao.get(turma_atual, turma_atual)
+            
+            # Calcular duração
+            duracao = time.time() - tempo_inicio
+            
+            # Gerar relatório PDF
+            caminho_pdf = None
+            if not dry_run:
+                try:
+                    from scripts.diagnostico.relatorio_transicao import gerar_relatorio_transicao
                     
-                    # Criar matrícula
-                    cursor.execute(QUERY_CRIAR_MATRICULA, (aluno['aluno_id'], nova_turma, novo_ano_id))
+                    dados_relatorio = {
+                        'matriculas_encerradas': matriculas_encerradas,
+                        'matriculas_criadas': total_alunos,
+                        'alunos_promovidos': alunos_promovidos,
+                        'alunos_retidos': alunos_retidos,
+                        'alunos_concluintes': alunos_concluintes,
+                        'status': 'sucesso',
+                        'duracao_segundos': duracao
+                    }
                     
-                    # Contabilizar
-                    if reprovado:
-                        alunos_retidos += 1
-                    else:
-                        alunos_promovidos += 1
-
-                    # Atualizar progresso (thread-safe)
-                    if total_alunos > 0:
-                        progresso = 50 + (i + 1) / total_alunos * 30
-                        self.janela.after(0, lambda p=progresso: setattr(self.progressbar, 'value', p))
-
-                # Passo 4: Encerrar matrículas antigas (ano de origem) - FORA DO LOOP
-                self._atualizar_status_seguro("Encerrando matrículas do ano anterior...", 85)
-                logger.info(f"[Passo 4] Encerrando matrículas do ano {self.ano_atual['ano_letivo']}")
-                cursor.execute(QUERY_ENCERRAR_MATRICULAS, (self.ano_atual['id'],))
-                matriculas_encerradas = cursor.rowcount
-                logger.info(f"[Passo 4] ✓ {matriculas_encerradas} matrículas encerradas")
-
-                # Contar alunos concluintes (9º ano aprovados)
-                alunos_concluintes = self.estatisticas.get('total_matriculas', 0) - total_alunos - self.estatisticas.get('alunos_excluir', 0)
-                if alunos_concluintes < 0:
-                    alunos_concluintes = 0
-
-                # Commit ou rollback baseado no modo
-                if dry_run:
-                    conn.rollback()
-                    logger.info("[DRY-RUN] Rollback executado - nenhuma alteração foi persistida")
-                else:
-                    conn.commit()
-                    logger.info(f"[Passo 4] ✓ {total_alunos} matrículas criadas com sucesso")
-                # Finalizar
-                self._atualizar_status_seguro("Transição concluída com sucesso!", 100)
-
-                cursor.close()
-                
-                # Log de resumo final
-                logger.info("=" * 60)
-                logger.info(f"TRANSIÇÃO CONCLUÍDA {'[DRY-RUN]' if dry_run else 'COM SUCESSO'}")
-                logger.info(f"Resumo:")
-                logger.info(f"  - Ano letivo criado: {self.ano_novo['ano_letivo']}")
-                logger.info(f"  - Matrículas encerradas: {matriculas_encerradas}")
-                logger.info(f"  - Novas matrículas: {total_alunos}")
-                logger.info(f"  - Alunos promovidos: {alunos_promovidos}")
-                logger.info(f"  - Alunos retidos: {alunos_retidos}")
-                logger.info(f"  - Alunos concluintes (9º ano): {alunos_concluintes}")
-                logger.info("=" * 60)
-                
-                # Registrar auditoria
-                if not dry_run:
-                    self._registrar_auditoria(
-                        status='sucesso',
-                        matriculas_encerradas=matriculas_encerradas,
-                        matriculas_criadas=total_alunos,
-                        alunos_promovidos=alunos_promovidos,
-                        alunos_retidos=alunos_retidos,
-                        alunos_concluintes=alunos_concluintes,
-                        detalhes=json.dumps({
-                            'ano_origem': self.ano_atual['ano_letivo'],
-                            'ano_destino': self.ano_novo['ano_letivo'],
-                            'data': datetime.now().isoformat()
-                        })
+                    caminho_pdf = gerar_relatorio_transicao(
+                        ano_origem=self.ano_atual['ano_letivo'],
+                        ano_destino=self.ano_novo['ano_letivo'],
+                        dados=dados_relatorio,
+                        escola_id=self.escola_id,
+                        abrir=False  # Abriremos após a mensagem
                     )
+                    
+                    if caminho_pdf:
+                        logger.info(f"Relatório PDF gerado: {caminho_pdf}")
+                except Exception as e:
+                    logger.warning(f"Erro ao gerar relatório PDF (não crítico): {e}")
+            
+            # Mostrar mensagem de sucesso
+            msg_modo = "\n\n🔍 MODO DRY-RUN: Nenhuma alteração foi feita no banco." if dry_run else ""
+            msg_pdf = f"\n\n📄 Relatório PDF gerado com sucesso!" if caminho_pdf else ""
+            
+            def mostrar_sucesso():
+                messagebox.showinfo(
+                    "✅ Sucesso!",
+                    f"Transição de ano letivo concluída com sucesso!\n\n"
+                    f"✓ Ano letivo {self.ano_novo['ano_letivo']} criado\n"
+                    f"✓ {matriculas_encerradas} matrículas encerradas\n"
+                    f"✓ {total_alunos} novas matrículas criadas\n"
+                    f"   • {alunos_promovidos} alunos promovidos\n"
+                    f"   • {alunos_retidos} alunos retidos (reprovados)\n\n"
+                    f"ℹ️ {alunos_concluintes} alunos do 9º ano concluíram o ensino fundamental"
+                    f"{msg_modo}{msg_pdf}\n\n"
+                    f"O sistema agora está configurado para o ano {self.ano_novo['ano_letivo']}."
+                )
                 
-                # Calcular duração
-                duracao = time.time() - tempo_inicio
-                
-                # Gerar relatório PDF
-                caminho_pdf = None
-                if not dry_run:
+                # Abrir PDF após a mensagem
+                if caminho_pdf and not dry_run:
                     try:
-                        from scripts.diagnostico.relatorio_transicao import gerar_relatorio_transicao
-                        
-                        dados_relatorio = {
-                            'matriculas_encerradas': matriculas_encerradas,
-                            'matriculas_criadas': total_alunos,
-                            'alunos_promovidos': alunos_promovidos,
-                            'alunos_retidos': alunos_retidos,
-                            'alunos_concluintes': alunos_concluintes,
-                            'status': 'sucesso',
-                            'duracao_segundos': duracao
-                        }
-                        
-                        caminho_pdf = gerar_relatorio_transicao(
-                            ano_origem=self.ano_atual['ano_letivo'],
-                            ano_destino=self.ano_novo['ano_letivo'],
-                            dados=dados_relatorio,
-                            escola_id=self.escola_id,
-                            abrir=False  # Abriremos após a mensagem
-                        )
-                        
-                        if caminho_pdf:
-                            logger.info(f"Relatório PDF gerado: {caminho_pdf}")
-                    except Exception as e:
-                        logger.warning(f"Erro ao gerar relatório PDF (não crítico): {e}")
-                
-                # Mostrar mensagem de sucesso
-                msg_modo = "\n\n🔍 MODO DRY-RUN: Nenhuma alteração foi feita no banco." if dry_run else ""
-                msg_pdf = f"\n\n📄 Relatório PDF gerado com sucesso!" if caminho_pdf else ""
-                
-                def mostrar_sucesso():
-                    messagebox.showinfo(
-                        "✅ Sucesso!",
-                        f"Transição de ano letivo concluída com sucesso!\n\n"
-                        f"✓ Ano letivo {self.ano_novo['ano_letivo']} criado\n"
-                        f"✓ {matriculas_encerradas} matrículas encerradas\n"
-                        f"✓ {total_alunos} novas matrículas criadas\n"
-                        f"   • {alunos_promovidos} alunos promovidos\n"
-                        f"   • {alunos_retidos} alunos retidos (reprovados)\n\n"
-                        f"ℹ️ {alunos_concluintes} alunos do 9º ano concluíram o ensino fundamental"
-                        f"{msg_modo}{msg_pdf}\n\n"
-                        f"O sistema agora está configurado para o ano {self.ano_novo['ano_letivo']}."
-                    )
-                    
-                    # Abrir PDF após a mensagem
-                    if caminho_pdf and not dry_run:
-                        try:
-                            import platform
-                            import os as os_mod
-                            sistema = platform.system()
-                            if sistema == 'Windows':
-                                os_mod.startfile(caminho_pdf)
-                            elif sistema == 'Darwin':
-                                os_mod.system(f'open "{caminho_pdf}"')
-                            else:
-                                os_mod.system(f'xdg-open "{caminho_pdf}"')
-                        except Exception:
-                            pass
-                    
-                    if not dry_run:
-                        self.fechar()
+                        import platform
+                        import os as os_mod
+                        sistema = platform.system()
+                        if sistema == 'Windows':
+                            os_mod.startfile(caminho_pdf)
+                        elif sistema == 'Darwin':
+                            os_mod.system(f'open "{caminho_pdf}"')
+                        else:
+                            os_mod.system(f'xdg-open "{caminho_pdf}"')
+                    except Exception:
+                        pass
                 
-                self.janela.after(0, mostrar_sucesso)
+                if not dry_run:
+                    self.fechar()
+            
+            self.janela.after(0, mostrar_sucesso)
 
         except Exception as e:
             logger.exception(f"ERRO na transição de ano letivo: {e}")
@@ -100,8 +100,11 @@ def obter_disciplinas_por_serie(serie_id):
         logger.exception("Erro ao obter disciplinas por serie")
         return {}
 
-def consultar_dados_aluno(aluno_id, ano_letivo_id):
-    query_aluno = """
+# Colunas de cada linha de notas (acessadas por índice pelos geradores):
+# 0 escola, 1 aluno, 2 série, 3 turma, 4 turno, 5 ano letivo, 6 disciplina,
+# 7 nota, 8 bimestre, 9 faltas, 10 dias de aula, 11 serie_id,
+# 12 disciplina_id, 13 aluno_id
+_SELECT_DADOS_BOLETIM = """
         SELECT
             escolas.nome AS nome_escola,
             alunos.nome AS nome_aluno,
@@ -114,7 +117,9 @@ def consultar_dados_aluno(aluno_id, ano_letivo_id):
             notas.bimestre AS bimestre,
             faltas.faltas AS faltas_bimestrais,
             anosletivos.numero_dias_aula,
-            series.id AS serie_id
+            series.id AS serie_id,
+            disciplinas.id AS disciplina_id,
+            alunos.id AS aluno_id
         FROM
             matriculas
         JOIN
@@ -132,6 +137,14 @@ def consultar_dados_aluno(aluno_id, ano_letivo_id):
         LEFT JOIN faltas_bimestrais AS faltas ON faltas.aluno_id = alunos.id 
             AND faltas.bimestre = notas.bimestre
             AND faltas.ano_letivo_id = anosletivos.id
+"""
+
+# Situações de matrícula que não recebem boletim na impressão por turma/série
+_STATUS_SEM_BOLETIM = ('Cancelado', 'Cancelada', 'Evadido', 'Evadida', 'Transferido', 'Transferida')
+
+
+def consultar_dados_aluno(aluno_id, ano_letivo_id):
+    query_aluno = _SELECT_DADOS_BOLETIM + """
         WHERE alunos.id = %s AND notas.ano_letivo_id = %s
         ORDER BY disciplinas.nome, notas.bimestre;
     """
@@ -155,17 +168,130 @@ def consultar_dados_aluno(aluno_id, ano_letivo_id):
         return []
 
 
-def boletiminiciais(aluno_id, ano_letivo_id):
-    from src.utils.utilitarios.gerenciador_documentos import salvar_documento_sistema
-    from src.utils.utilitarios.tipos_documentos import TIPO_BOLETIM
-    
-    # Consultar os dados do aluno
-    dados_aluno = consultar_dados_aluno(aluno_id, ano_letivo_id)
+def _consultar_complementos(cursor, aluno_ids, ano_letivo_id) -> Dict[int, Dict[str, Dict[Any, Any]]]:
+    """Recuperações e notas finais de vários alunos em uma única consulta.
 
-    if not dados_aluno:
-        logger.info("Aluno não encontrado ou sem notas registradas.")
-        return
-    
+    Returns:
+        aluno_id -> {'recuperacoes': {disciplina_id: nota},
+                     'notas_finais': {disciplina_id: media_final}}
+    """
+    complementos: Dict[int, Dict[str, Dict[Any, Any]]] = {
+        _safe_int(a): {'recuperacoes': {}, 'notas_finais': {}} for a in aluno_ids
+    }
+    if not aluno_ids:
+        return complementos
+    placeholders = ', '.join(['%s'] * len(aluno_ids))
+    ids = tuple(_to_int_param(a) for a in aluno_ids)
+    try:
+        cursor.execute(f"""
+            SELECT 'recuperacoes' AS origem, aluno_id, disciplina_id, nota AS valor
+            FROM recuperacao
+            WHERE ano_letivo_id = %s AND aluno_id IN ({placeholders})
+            UNION ALL
+            SELECT 'notas_finais', aluno_id, disciplina_id, media_final
+            FROM notas_finais
+            WHERE ano_letivo_id = %s AND aluno_id IN ({placeholders})
+        """, (_to_int_param(ano_letivo_id),) + ids + (_to_int_param(ano_letivo_id),) + ids)
+        for origem, aluno, disciplina_id, valor in cursor.fetchall():
+            destino = complementos.setdefault(_safe_int(aluno), {'recuperacoes': {}, 'notas_finais': {}})
+            if origem == 'notas_finais':
+                destino['notas_finais'][disciplina_id] = _safe_float(valor, 0.0)
+            else:
+                destino['recuperacoes'][disciplina_id] = valor
+    except Exception:
+        # Sem as complementações o boletim ainda sai com as médias bimestrais
+        logger.exception("Erro ao consultar recuperações/notas finais do boletim")
+    return complementos
+
+
+def consultar_complementos(aluno_ids, ano_letivo_id) -> Dict[int, Dict[str, Dict[Any, Any]]]:
+    """Versão de ``_consultar_complementos`` que abre a própria conexão."""
+    try:
+        with get_connection() as conn:
+            if conn is None:
+                return {}
+            cursor = cast(Any, conn).cursor()
+            try:
+                return _consultar_complementos(cursor, aluno_ids, ano_letivo_id)
+            finally:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+    except Exception:
+        logger.exception("Erro ao consultar complementações do boletim")
+        return {}
+
+
+def consultar_dados_boletins(ano_letivo_id, turma_id=None, serie_id=None, escola_id=None):
+    """Dados de boletim de todos os alunos de uma turma ou série.
+
+    Usa uma conexão e duas consultas (notas/faltas/disciplinas de todos os
+    alunos e, em seguida, recuperações/notas finais), agrupando em memória.
+
+    Args:
+        ano_letivo_id: ID do ano letivo
+        turma_id: Turma a imprimir (tem precedência sobre serie_id)
+        serie_id: Série a imprimir; com escola_id, restringe à escola
+        escola_id: Escola (opcional, usado com serie_id)
+
+    Returns:
+        Lista de (aluno_id, linhas, complementos) em ordem alfabética de aluno
+    """
+    if turma_id is not None:
+        filtro, params = "matriculas.turma_id = %s", [_to_int_param(turma_id)]
+    elif serie_id is not None:
+        filtro, params = "turmas.serie_id = %s", [_to_int_param(serie_id)]
+        if escola_id is not None:
+            filtro += " AND turmas.escola_id = %s"
+            params.append(_to_int_param(escola_id))
+    else:
+        raise ValueError("Informe turma_id ou serie_id")
+
+    status = ', '.join(['%s'] * len(_STATUS_SEM_BOLETIM))
+    query = _SELECT_DADOS_BOLETIM + f"""
+        WHERE {filtro}
+          AND matriculas.ano_letivo_id = %s
+          AND notas.ano_letivo_id = %s
+          AND matriculas.status NOT IN ({status})
+        ORDER BY alunos.nome, alunos.id, disciplinas.nome, notas.bimestre
+    """
+    params.extend([_to_int_param(ano_letivo_id), _to_int_param(ano_letivo_id)])
+    params.extend(_STATUS_SEM_BOLETIM)
+
+    try:
+        with get_connection() as conn:
+            if conn is None:
+                return []
+            cursor = cast(Any, conn).cursor()
+            try:
+                cursor.execute(query, tuple(params))
+                linhas_por_aluno: Dict[int, List[Any]] = {}
+                for linha in cursor.fetchall():
+                    linhas_por_aluno.setdefault(_safe_int(linha[13]), []).append(linha)
+
+                complementos = _consultar_complementos(cursor, list(linhas_por_aluno), ano_letivo_id)
+                return [
+                    (aluno_id, linhas, complementos.get(aluno_id, {}))
+                    for aluno_id, linhas in linhas_por_aluno.items()
+                ]
+            finally:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+    except Exception:
+        logger.exception("Erro ao consultar dados dos boletins em lote")
+        return []
+
+
+def _elementos_boletiminiciais(dados_aluno, complementos):
+    """Monta as páginas do boletim dos anos iniciais (1º ao 5º) de um aluno.
+
+    Não acessa o banco: recebe as linhas de notas/faltas do aluno e as
+    complementações de ``consultar_complementos``. Retorna ``(elements, info)``
+    ou ``None`` quando não há disciplinas cursadas.
+    """
     # Extrair as informações do cabeçalho da primeira linha
     primeira_linha = dados_aluno[0]
     nome_escola = str(primeira_linha[0] or "")
@@ -189,19 +315,6 @@ def boletiminiciais(aluno_id, ano_letivo_id):
         logger.info("Não foi possível encontrar disciplinas cursadas pelo aluno")
         return
 
-    # Criar o PDF em memória
-    buffer = io.BytesIO()
-    # Definindo as margens em pontos (1,27 cm = 36 pontos)
-    margem = 10
-
-    # Criar o documento com margens
-    doc = SimpleDocTemplate(buffer,
-                            pagesize=landscape(A4),
-                            topMargin=margem,
-                            bottomMargin=margem,
-                            leftMargin=margem,
-                            rightMargin=margem)
-
     # Informações do cabeçalho
     cabecalho = [
         "<b>PREFEITURA MUNICIPAL DE PAÇO DO LUMIAR</b>",
@@ -388,174 +501,121 @@ def boletiminiciais(aluno_id, ano_letivo_id):
             notas_disciplinas[disciplina][3] = f"{arredondar_personalizado(nota)/10:.1f}"
             faltas_bimestrais[disciplina][3] = faltas
 
-    # Conectar ao banco de dados para buscar recuperação
-    try:
-        with get_connection() as conn:
-            if conn is None:
-                recuperacoes = {}
-                disciplina_ids = {}
+    # Recuperações e notas finais consolidadas (pós-recuperação, escala 0-100)
+    # consultadas junto com as demais complementações
+    recuperacoes = complementos.get('recuperacoes', {})
+    notas_finais_map = complementos.get('notas_finais', {})
+    disciplina_ids = {linha[6]: linha[12] for linha in dados_aluno if linha[6] and linha[12]}
+
+    # Preencher a tabela data_nota com as disciplinas e suas respectivas notas
+    for disciplina in ordem_disciplinas:
+        # Calcular média aritmética das notas a partir dos valores brutos
+        notas_raw = [n for n in notas_brutas_disciplinas[disciplina] if n is not None]
+
+        media_anual_arredondada = None
+        if notas_raw:
+            media_anual_sem_arredondamento = sum(notas_raw) / len(notas_raw)
+            media_anual_arredondada = arredondar_personalizado(media_anual_sem_arredondamento)
+
+        # Verificar se temos o ID desta disciplina
+        disciplina_id = disciplina_ids.get(disciplina)
+
+        if disciplina_id:
+            # Priorizar nota final consolidada (notas_finais) se existir; caso contrário usar cálculo bimestral/recuperação
+            nota_final_consolidada = notas_finais_map.get(disciplina_id)
+            nota_recuperacao = "--"
+            media_final_arredondada = media_anual_arredondada
+
+            if nota_final_consolidada is not None:
+                media_final_arredondada = int(round(nota_final_consolidada))
+            elif media_anual_arredondada is not None:
+                if disciplina_id in recuperacoes:
+                    rec_val = _safe_float(recuperacoes[disciplina_id], 0.0)
+                    nota_recuperacao = f"{arredondar_personalizado(rec_val)/10:.1f}"
+                    media_final_sem_arredondamento = (media_anual_sem_arredondamento + rec_val) / 2
+                    media_final_arredondada = arredondar_personalizado(media_final_sem_arredondamento)
             else:
-                cursor = cast(Any, conn).cursor()
+                media_final_arredondada = None
+
+            # Sempre mostrar a linha, mesmo que não tenha todas as notas bimestrais
+            data_nota.append([
+                _cell(quebra_linha(disciplina)),
+                _cell(notas_disciplinas[disciplina][0]),
+                _cell(notas_disciplinas[disciplina][1]),
+                _cell(notas_disciplinas[disciplina][2]),
+                _cell(notas_disciplinas[disciplina][3]),
+                _cell(f"{(media_anual_arredondada or 0)/10:.1f}" if media_anual_arredondada is not None else "--"),
+                _cell(nota_recuperacao),
+                _cell(f"{media_final_arredondada/10:.1f}" if media_final_arredondada is not None else "--")
+            ])
+
+            # Registrar média final desta disciplina para cálculo geral
+            if media_final_arredondada is not None:
                 try:
-                    # Dicionário para armazenar as recuperações e IDs das disciplinas
-                    recuperacoes = {}
-                    disciplina_ids = {}
-
-                    # Buscar IDs de todas as disciplinas necessárias de uma vez
-                    placeholders = ', '.join(['%s'] * len(ordem_disciplinas))
-                    cursor.execute(f"""
-                        SELECT id, nome FROM disciplinas 
-                        WHERE nome IN ({placeholders})
-                    """, _tuple_of_str(ordem_disciplinas))
-
-                    for disc_id, disc_nome in cursor.fetchall():
-                        disciplina_ids[disc_nome] = disc_id
-
-                    # Buscar todas as recuperações de uma vez para este aluno
-                    cursor.execute("""
-                        SELECT disciplina_id, nota 
-                        FROM recuperacao 
-                        WHERE aluno_id = %s AND ano_letivo_id = %s
-                    """, (_to_int_param(aluno_id), _to_int_param(ano_letivo_id)))
-
-                    for disc_id, nota_rec in cursor.fetchall():
-                        recuperacoes[disc_id] = nota_rec
-
-                    # Buscar notas finais consolidadas (pós-recuperação) na tabela notas_finais (escala 0-100)
-                    cursor.execute("""
-                        SELECT disciplina_id, media_final 
-                        FROM notas_finais 
-                        WHERE aluno_id = %s AND ano_letivo_id = %s
-                    """, (_to_int_param(aluno_id), _to_int_param(ano_letivo_id)))
-                    notas_finais_map = {r[0]: _safe_float(r[1], 0.0) for r in cursor.fetchall()}
-
-                    # Buscar todas as avaliações finais (legado) caso notas_finais não exista
-                    cursor.execute("""
-                        SELECT disciplina_id, nota 
-                        FROM avaliacao_final 
-                        WHERE aluno_id = %s AND ano_letivo_id = %s
-                    """, (_to_int_param(aluno_id), _to_int_param(ano_letivo_id)))
-                    resultados_av = cursor.fetchall()
-                    avaliacoes = {r[0]: r[1] for r in resultados_av}
-
-                    # Preencher a tabela data_nota com as disciplinas e suas respectivas notas
-                    for disciplina in ordem_disciplinas:
-                        # Calcular média aritmética das notas a partir dos valores brutos
-                        notas_raw = [n for n in notas_brutas_disciplinas[disciplina] if n is not None]
-
-                        media_anual_arredondada = None
-                        if notas_raw:
-                            media_anual_sem_arredondamento = sum(notas_raw) / len(notas_raw)
-                            media_anual_arredondada = arredondar_personalizado(media_anual_sem_arredondamento)
-
-                        # Verificar se temos o ID desta disciplina
-                        disciplina_id = disciplina_ids.get(disciplina)
-
-                        if disciplina_id:
-                            # Priorizar nota final consolidada (notas_finais) se existir; caso contrário usar cálculo bimestral/recuperação
-                            nota_final_consolidada = notas_finais_map.get(disciplina_id)
-                            nota_recuperacao = "--"
-                            media_final_arredondada = media_anual_arredondada
-
-                            if nota_final_consolidada is not None:
-                                media_final_arredondada = int(round(nota_final_consolidada))
-                            elif media_anual_arredondada is not None:
-                                if disciplina_id in recuperacoes:
-                                    rec_val = _safe_float(recuperacoes[disciplina_id], 0.0)
-                                    nota_recuperacao = f"{arredondar_personalizado(rec_val)/10:.1f}"
-                                    media_final_sem_arredondamento = (media_anual_sem_arredondamento + rec_val) / 2
-                                    media_final_arredondada = arredondar_personalizado(media_final_sem_arredondamento)
-                            else:
-                                media_final_arredondada = None
-
-                            # Sempre mostrar a linha, mesmo que não tenha todas as notas bimestrais
-                            data_nota.append([
-                                _cell(quebra_linha(disciplina)),
-                                _cell(notas_disciplinas[disciplina][0]),
-                                _cell(notas_disciplinas[disciplina][1]),
-                                _cell(notas_disciplinas[disciplina][2]),
-                                _cell(notas_disciplinas[disciplina][3]),
-                                _cell(f"{(media_anual_arredondada or 0)/10:.1f}" if media_anual_arredondada is not None else "--"),
-                                _cell(nota_recuperacao),
-                                _cell(f"{media_final_arredondada/10:.1f}" if media_final_arredondada is not None else "--")
-                            ])
-
-                            # Registrar média final desta disciplina para cálculo geral
-                            if media_final_arredondada is not None:
-                                try:
-                                    medias_finais_disciplinas.append(int(media_final_arredondada))
-                                except Exception:
-                                    pass
-                        else:
-                            # quando não temos disciplina_id, usamos a média anual arredondada como final
-                            media_final_arredondada = media_anual_arredondada
-                            # Só mostrar a média final se tiver 4 notas
-                            if len(notas_raw) == 4:
-                                data_nota.append([
-                                    _cell(quebra_linha(disciplina)),
-                                    _cell(notas_disciplinas[disciplina][0]),
-                                    _cell(notas_disciplinas[disciplina][1]),
-                                    _cell(notas_disciplinas[disciplina][2]),
-                                    _cell(notas_disciplinas[disciplina][3]),
-                                    _cell(f"{media_anual_arredondada/10:.1f}"),
-                                    _cell("--"),
-                                    _cell(f"{media_anual_arredondada/10:.1f}")
-                                ])
-                            else:
-                                data_nota.append([
-                                    _cell(quebra_linha(disciplina)),
-                                    _cell(notas_disciplinas[disciplina][0]),
-                                    _cell(notas_disciplinas[disciplina][1]),
-                                    _cell(notas_disciplinas[disciplina][2]),
-                                    _cell(notas_disciplinas[disciplina][3]),
-                                    _cell(f"{media_anual_arredondada/10:.1f}"),
-                                    _cell("--"),
-                                    _cell("--")
-                                ])
-
-                            # Registrar média final desta disciplina quando houver 4 notas
-                            if len(notas_raw) == 4:
-                                try:
-                                    medias_finais_disciplinas.append(int(media_final_arredondada))
-                                except Exception:
-                                    pass
-
-                    # Calcular total de faltas por disciplina
-                    total_faltas_por_disciplina = {}
-                    for disciplina in ordem_disciplinas:
-                        total_faltas_por_disciplina[disciplina] = sum(faltas_bimestrais[disciplina])
-
-                    # Calcular total geral de faltas
-                    total_faltas = sum(sum(faltas) for faltas in faltas_bimestrais.values())
-
-                    # Calcular média final global do aluno (média das médias finais das disciplinas)
-                    if medias_finais_disciplinas:
-                        try:
-                            soma_medias = sum(medias_finais_disciplinas)
-                            media_final_global = (soma_medias / len(medias_finais_disciplinas)) / 10.0
-                        except Exception:
-                            media_final_global = 0.0
-                    else:
-                        media_final_global = 0.0
-
-                    # Adicionar a linha de Faltas ao final da tabela (garantir Paragraphs nas células)
-                    faltas_row = [
-                        _cell("FALTAS"),
-                    ]
-                    for i in range(4):
-                        faltas_row.append(_cell(sum(faltas_bimestrais[disciplina][i] for disciplina in ordem_disciplinas)))
-                    faltas_row.extend([_cell(""), _cell(""), _cell(f"{total_faltas}")])
-
-                    data_nota.append(faltas_row)
-                finally:
-                    try:
-                        cursor.close()
-                    except Exception:
-                        pass
-    except Exception:
-        logger.exception("Erro ao obter recuperações/ids de disciplinas em boletiminiciais")
-        recuperacoes = {}
-        disciplina_ids = {}
+                    medias_finais_disciplinas.append(int(media_final_arredondada))
+                except Exception:
+                    pass
+        else:
+            # quando não temos disciplina_id, usamos a média anual arredondada como final
+            media_final_arredondada = media_anual_arredondada
+            # Só mostrar a média final se tiver 4 notas
+            if len(notas_raw) == 4:
+                data_nota.append([
+                    _cell(quebra_linha(disciplina)),
+                    _cell(notas_disciplinas[disciplina][0]),
+                    _cell(notas_disciplinas[disciplina][1]),
+                    _cell(notas_disciplinas[disciplina][2]),
+                    _cell(notas_disciplinas[disciplina][3]),
+                    _cell(f"{media_anual_arredondada/10:.1f}"),
+                    _cell("--"),
+                    _cell(f"{media_anual_arredondada/10:.1f}")
+                ])
+            else:
+                data_nota.append([
+                    _cell(quebra_linha(disciplina)),
+                    _cell(notas_disciplinas[disciplina][0]),
+                    _cell(notas_disciplinas[disciplina][1]),
+                    _cell(notas_disciplinas[disciplina][2]),
+                    _cell(notas_disciplinas[disciplina][3]),
+                    _cell(f"{media_anual_arredondada/10:.1f}"),
+                    _cell("--"),
+                    _cell("--")
+                ])
+
+            # Registrar média final desta disciplina quando houver 4 notas
+            if len(notas_raw) == 4:
+                try:
+                    medias_finais_disciplinas.append(int(media_final_arredondada))
+                except Exception:
+                    pass
+
+    # Calcular total de faltas por disciplina
+    total_faltas_por_disciplina = {}
+    for disciplina in ordem_disciplinas:
+        total_faltas_por_disciplina[disciplina] = sum(faltas_bimestrais[disciplina])
+
+    # Calcular total geral de faltas
+    total_faltas = sum(sum(faltas) for faltas in faltas_bimestrais.values())
+
+    # Calcular média final global do aluno (média das médias finais das disciplinas)
+    if medias_finais_disciplinas:
+        try:
+            soma_medias = sum(medias_finais_disciplinas)
+            media_final_global = (soma_medias / len(medias_finais_disciplinas)) / 10.0
+        except Exception:
+            media_final_global = 0.0
+    else:
+        media_final_global = 0.0
+
+    # Adicionar a linha de Faltas ao final da tabela (garantir Paragraphs nas células)
+    faltas_row = [
+        _cell("FALTAS"),
+    ]
+    for i in range(4):
+        faltas_row.append(_cell(sum(faltas_bimestrais[disciplina][i] for disciplina in ordem_disciplinas)))
+    faltas_row.extend([_cell(""), _cell(""), _cell(f"{total_faltas}")])
+
+    data_nota.append(faltas_row)
 
     # Criando a tabela de notas com ReportLab
     tabela_notas = Table(data_nota, colWidths=[1.6 * inch] + [1.2 * inch] * 4 + [1 * inch] + [1.5 * inch]+ [1.2 * inch])
@@ -696,106 +756,18 @@ def boletiminiciais(aluno_id, ano_letivo_id):
         # Adicionando a mensagem ao PDF
         elements.append(Paragraph(f"<b>{mensagem}</b>", estilo_centro))
 
-    # Construindo o PDF 
-    doc.build(elements)
-
-    # Resetar o buffer para o início
-    buffer.seek(0)
-    
-    # Criar nome do arquivo
-    data_atual = datetime.now().strftime("%Y%m%d_%H%M%S")
-    nome_arquivo = f"Boletim_{nome_aluno.replace(' ', '_')}_{data_atual}.pdf"
-    caminho_arquivo = os.path.join('documentos_gerados', nome_arquivo)
-    
-    # Garantir que o diretório existe
-    os.makedirs('documentos_gerados', exist_ok=True)
-    
-    # Salvar o arquivo localmente
-    with open(caminho_arquivo, 'wb') as f:
-        f.write(buffer.getvalue())
-    
-    # Criar descrição detalhada
-    descricao = f"Boletim do aluno {nome_aluno}"
-    if turma:
-        descricao += f" - {serie} {turma}"
-    if turno:
-        descricao += f" - Turno: {'Matutino' if turno == 'MAT' else 'Vespertino'}"
-    
-    # Salvar no sistema de gerenciamento de documentos
-    sucesso, mensagem, link = salvar_documento_sistema(
-        caminho_arquivo=caminho_arquivo,
-        tipo_documento=TIPO_BOLETIM,
-        aluno_id=aluno_id,
-        finalidade=f"Boletim {ano_letivo}",
-        descricao=descricao
-    )
-    
-    if not sucesso:
-        from tkinter import messagebox
-        messagebox.showwarning("Aviso", 
-                           "O boletim foi gerado mas houve um erro ao salvá-lo no sistema:\n" + mensagem)
-    
-    salvar_e_abrir_pdf(buffer)
+    return elements, {
+        'nome_aluno': nome_aluno, 'serie': serie, 'turma': turma,
+        'turno': turno, 'ano_letivo': ano_letivo,
+    }
 
-def boletimfinais(aluno_id, ano_letivo_id):
-    # Consulta para obter informações do aluno específico
-    try:
-        with get_connection() as conn:
-            if conn is None:
-                logger.error("Erro ao conectar ao banco de dados.")
-                return
-            cursor = cast(Any, conn).cursor()
+def _elementos_boletimfinais(dados_aluno, complementos):
+    """Monta as páginas do boletim dos anos finais (6º ao 9º) de um aluno.
 
-            query_aluno = """
-        SELECT
-            escolas.nome AS nome_escola,
-            alunos.nome AS nome_aluno,
-            series.nome AS serie,
-            turmas.nome AS turma,
-            turmas.turno AS turno,
-            anosletivos.ano_letivo,
-            disciplinas.nome AS disciplina,
-            notas.nota AS nota,
-            notas.bimestre AS bimestre,
-            faltas.faltas AS faltas_bimestrais,
-            anosletivos.numero_dias_aula,
-            series.id AS serie_id
-        FROM
-            matriculas
-        JOIN
-            alunos ON matriculas.aluno_id = alunos.id
-        JOIN
-            turmas ON matriculas.turma_id = turmas.id
-        JOIN
-            series ON turmas.serie_id = series.id
-        JOIN
-            anosletivos ON matriculas.ano_letivo_id = anosletivos.id
-        JOIN
-            escolas ON turmas.escola_id = escolas.id
-        LEFT JOIN notas ON notas.aluno_id = alunos.id AND notas.ano_letivo_id = anosletivos.id
-        LEFT JOIN disciplinas ON notas.disciplina_id = disciplinas.id
-        LEFT JOIN faltas_bimestrais AS faltas ON faltas.aluno_id = alunos.id 
-            AND faltas.bimestre = notas.bimestre
-            AND faltas.ano_letivo_id = anosletivos.id
-        WHERE alunos.id = %s AND notas.ano_letivo_id = %s
-        ORDER BY disciplinas.nome, notas.bimestre;
+    Não acessa o banco: recebe as linhas de notas/faltas do aluno e as
+    complementações de ``consultar_complementos``. Retorna ``(elements, info)``
+    ou ``None`` quando não há disciplinas cursadas.
     """
-
-            params = (_to_int_param(aluno_id), _to_int_param(ano_letivo_id))
-            cursor.execute(query_aluno, params)
-            dados_aluno = cursor.fetchall()
-            try:
-                cursor.close()
-            except Exception:
-                pass
-    except Exception:
-        logger.exception("Erro ao obter dados do aluno em boletimfinais")
-        return
-
-    if not dados_aluno:
-        logger.info("Aluno não encontrado ou sem notas registradas.")
-        return
-
     # Extrair as informações do cabeçalho da primeira linha
     primeira_linha = dados_aluno[0]
     nome_escola = str(primeira_linha[0] or "")
@@ -815,32 +787,8 @@ def boletimfinais(aluno_id, ano_letivo_id):
     # Ordenar as disciplinas alfabeticamente
     ordem_disciplinas = sorted(list(disciplinas_cursadas))
     
-    # Obter os IDs das disciplinas para posterior consulta de recuperação e avaliação final
-    try:
-        with get_connection() as conn:
-            disciplina_id_map = {}
-            if conn is None:
-                disciplina_id_map = {}
-            else:
-                cursor = cast(Any, conn).cursor()
-                try:
-                    # Buscar IDs das disciplinas que o aluno cursou
-                    placeholders = ', '.join(['%s'] * len(ordem_disciplinas))
-                    cursor.execute(f"""
-                        SELECT id, nome FROM disciplinas 
-                        WHERE nome IN ({placeholders})
-                    """, _tuple_of_str(ordem_disciplinas))
-
-                    for disc_id, disc_nome in cursor.fetchall():
-                        disciplina_id_map[disc_nome] = disc_id
-                finally:
-                    try:
-                        cursor.close()
-                    except Exception:
-                        pass
-    except Exception:
-        logger.exception("Erro ao obter disciplina_id_map em boletimfinais")
-        disciplina_id_map = {}
+    # IDs das disciplinas vêm da própria consulta de notas (coluna disciplina_id)
+    disciplina_id_map = {linha[6]: linha[12] for linha in dados_aluno if linha[6] and linha[12]}
     
     if not ordem_disciplinas:
         logger.info("Não foi possível encontrar disciplinas cursadas pelo aluno")
@@ -864,19 +812,6 @@ def boletimfinais(aluno_id, ano_letivo_id):
             fontSize=9,
             alignment=1))  # Centralizado
 
-    # Criar o PDF em memória
-    buffer = io.BytesIO()
-    # Definindo as margens em pontos (1,27 cm = 36 pontos)
-    margem = 10
-
-    # Criar o documento com margens
-    doc = SimpleDocTemplate(buffer,
-                            pagesize=landscape(A4),
-                            topMargin=margem,
-                            bottomMargin=margem,
-                            leftMargin=margem,
-                            rightMargin=margem)
-
     # Informações do cabeçalho
     cabecalho = [
         "<b>PREFEITURA MUNICIPAL DE PAÇO DO LUMIAR</b>",
@@ -1065,116 +1000,83 @@ def boletimfinais(aluno_id, ano_letivo_id):
     numero_dias_aula = _safe_int(primeira_linha[10], 0)
     finalizado = False
     
-    # Obter todas as recuperações e avaliações finais de uma vez
-    try:
-        with get_connection() as conn:
-            if conn is None:
-                recuperacoes = {}
-                avaliacoes = {}
-            else:
-                cursor = cast(Any, conn).cursor()
+    # Recuperações por disciplina (consultadas junto com as demais complementações)
+    recuperacoes = complementos.get('recuperacoes', {})
+
+    # Preencher a tabela data_nota com as disciplinas e suas respectivas notas
+    for disciplina in ordem_disciplinas:
+        # Calcular média aritmética das notas a partir dos valores brutos
+        notas_raw = [n for n in notas_brutas_disciplinas[disciplina] if n is not None]
+
+        if not notas_raw:
+            continue  # Pular disciplinas sem notas registradas
+
+        # media_anual_sem_arredondamento está em unidade bruta (ex: 63.7 representa 6.37)
+        media_anual_sem_arredondamento = sum(notas_raw) / len(notas_raw)
+        media_anual_arredondada = arredondar_personalizado(media_anual_sem_arredondamento)
+
+        # Verificar se temos o ID desta disciplina
+        disciplina_id = disciplina_id_map.get(disciplina)
+
+        if disciplina_id:
+            # Verificar se há recuperação para esta disciplina
+            nota_recuperacao = "--"
+            media_final_arredondada = media_anual_arredondada
+
+            if disciplina_id in recuperacoes:
+                rec_val = _safe_float(recuperacoes[disciplina_id], 0.0)
+                nota_recuperacao = f"{arredondar_personalizado(rec_val)/10:.1f}"
+                media_final_sem_arredondamento = (media_anual_sem_arredondamento + rec_val) / 2
+                media_final_arredondada = arredondar_personalizado(media_final_sem_arredondamento)
+
+            # Adicionar a linha à tabela data_nota com as notas reais
+            data_nota.append([
+                _cell(quebra_linha(disciplina)),
+                _cell(notas_disciplinas[disciplina][0]),
+                _cell(str(faltas_bimestrais[disciplina][0]) if faltas_bimestrais[disciplina][0] > 0 else "--"),
+                _cell(notas_disciplinas[disciplina][1]),
+                _cell(str(faltas_bimestrais[disciplina][1]) if faltas_bimestrais[disciplina][1] > 0 else "--"),
+                _cell(notas_disciplinas[disciplina][2]),
+                _cell(str(faltas_bimestrais[disciplina][2]) if faltas_bimestrais[disciplina][2] > 0 else "--"),
+                _cell(notas_disciplinas[disciplina][3]),
+                _cell(str(faltas_bimestrais[disciplina][3]) if faltas_bimestrais[disciplina][3] > 0 else "--"),
+                _cell(f"{media_anual_arredondada/10:.1f}"),
+                _cell(nota_recuperacao),
+                _cell(f"{media_final_arredondada/10:.1f}" if len(notas_raw) == 4 else "--"),
+                _cell(str(sum(faltas_bimestrais[disciplina]))),
+                _cell("AP" if len(notas_raw) == 4 and media_final_arredondada/10 >= 6 else ("RP" if len(notas_raw) == 4 else "--"))
+            ])
+            # Registrar média final desta disciplina
+            if len(notas_raw) == 4:
                 try:
-                    # Buscar todas as recuperações
-                    cursor.execute("""
-                        SELECT disciplina_id, nota 
-                        FROM recuperacao 
-                        WHERE aluno_id = %s AND ano_letivo_id = %s
-                    """, (_to_int_param(aluno_id), _to_int_param(ano_letivo_id)))
-                    resultados_rec = cursor.fetchall()
-                    recuperacoes = {r[0]: r[1] for r in resultados_rec}
-
-                    # Buscar todas as avaliações finais
-                    cursor.execute("""
-                        SELECT disciplina_id, nota 
-                        FROM avaliacao_final 
-                        WHERE aluno_id = %s AND ano_letivo_id = %s
-                    """, (_to_int_param(aluno_id), _to_int_param(ano_letivo_id)))
-                    resultados_av = cursor.fetchall()
-                    avaliacoes = {r[0]: r[1] for r in resultados_av}
-
-                    # Preencher a tabela data_nota com as disciplinas e suas respectivas notas
-                    for disciplina in ordem_disciplinas:
-                        # Calcular média aritmética das notas a partir dos valores brutos
-                        notas_raw = [n for n in notas_brutas_disciplinas[disciplina] if n is not None]
-
-                        if not notas_raw:
-                            continue  # Pular disciplinas sem notas registradas
-
-                        # media_anual_sem_arredondamento está em unidade bruta (ex: 63.7 representa 6.37)
-                        media_anual_sem_arredondamento = sum(notas_raw) / len(notas_raw)
-                        media_anual_arredondada = arredondar_personalizado(media_anual_sem_arredondamento)
-
-                        # Verificar se temos o ID desta disciplina
-                        disciplina_id = disciplina_id_map.get(disciplina)
-
-                        if disciplina_id:
-                            # Verificar se há recuperação para esta disciplina
-                            nota_recuperacao = "--"
-                            media_final_arredondada = media_anual_arredondada
-
-                            if disciplina_id in recuperacoes:
-                                rec_val = _safe_float(recuperacoes[disciplina_id], 0.0)
-                                nota_recuperacao = f"{arredondar_personalizado(rec_val)/10:.1f}"
-                                media_final_sem_arredondamento = (media_anual_sem_arredondamento + rec_val) / 2
-                                media_final_arredondada = arredondar_personalizado(media_final_sem_arredondamento)
-
-                            # Adicionar a linha à tabela data_nota com as notas reais
-                            data_nota.append([
-                                _cell(quebra_linha(disciplina)),
-                                _cell(notas_disciplinas[disciplina][0]),
-                                _cell(str(faltas_bimestrais[disciplina][0]) if faltas_bimestrais[disciplina][0] > 0 else "--"),
-                                _cell(notas_disciplinas[disciplina][1]),
-                                _cell(str(faltas_bimestrais[disciplina][1]) if faltas_bimestrais[disciplina][1] > 0 else "--"),
-                                _cell(notas_disciplinas[disciplina][2]),
-                                _cell(str(faltas_bimestrais[disciplina][2]) if faltas_bimestrais[disciplina][2] > 0 else "--"),
-                                _cell(notas_disciplinas[disciplina][3]),
-                                _cell(str(faltas_bimestrais[disciplina][3]) if faltas_bimestrais[disciplina][3] > 0 else "--"),
-                                _cell(f"{media_anual_arredondada/10:.1f}"),
-                                _cell(nota_recuperacao),
-                                _cell(f"{media_final_arredondada/10:.1f}" if len(notas_raw) == 4 else "--"),
-                                _cell(str(sum(faltas_bimestrais[disciplina]))),
-                                _cell("AP" if len(notas_raw) == 4 and media_final_arredondada/10 >= 6 else ("RP" if len(notas_raw) == 4 else "--"))
-                            ])
-                            # Registrar média final desta disciplina
-                            if len(notas_raw) == 4:
-                                try:
-                                    medias_finais_disciplinas.append(int(media_final_arredondada))
-                                except Exception:
-                                    pass
-                        else:
-                            # usar média anual arredondada como final quando não há id de disciplina
-                            media_final_arredondada = media_anual_arredondada
-                            data_nota.append([
-                                _cell(quebra_linha(disciplina)),
-                                _cell(notas_disciplinas[disciplina][0]),
-                                _cell(str(faltas_bimestrais[disciplina][0]) if faltas_bimestrais[disciplina][0] > 0 else "--"),
-                                _cell(notas_disciplinas[disciplina][1]),
-                                _cell(str(faltas_bimestrais[disciplina][1]) if faltas_bimestrais[disciplina][1] > 0 else "--"),
-                                _cell(notas_disciplinas[disciplina][2]),
-                                _cell(str(faltas_bimestrais[disciplina][2]) if faltas_bimestrais[disciplina][2] > 0 else "--"),
-                                _cell(notas_disciplinas[disciplina][3]),
-                                _cell(str(faltas_bimestrais[disciplina][3]) if faltas_bimestrais[disciplina][3] > 0 else "--"),
-                                _cell(f"{media_anual_arredondada/10:.1f}"),
-                                _cell("--"),
-                                _cell(f"{media_anual_arredondada/10:.1f}" if len(notas_raw) == 4 else "--"),
-                                _cell(str(sum(faltas_bimestrais[disciplina]))),
-                                _cell("AP" if len(notas_raw) == 4 and media_anual_arredondada/10 >= 6 else ("RP" if len(notas_raw) == 4 else "--"))
-                            ])
-                            # Registrar média final desta disciplina quando houver 4 notas
-                            if len(notas_raw) == 4:
-                                try:
-                                    medias_finais_disciplinas.append(int(media_final_arredondada))
-                                except Exception:
-                                    pass
-                finally:
-                    try:
-                        cursor.close()
-                    except Exception:
-                        pass
-    except Exception:
-        logger.exception("Erro ao obter recuperações/avaliacoes em boletimfinais")
-        recuperacoes = {}
-        avaliacoes = {}
+                    medias_finais_disciplinas.append(int(media_final_arredondada))
+                except Exception:
+                    pass
+        else:
+            # usar média anual arredondada como final quando não há id de disciplina
+            media_final_arredondada = media_anual_arredondada
+            data_nota.append([
+                _cell(quebra_linha(disciplina)),
+                _cell(notas_disciplinas[disciplina][0]),
+                _cell(str(faltas_bimestrais[disciplina][0]) if faltas_bimestrais[disciplina][0] > 0 else "--"),
+                _cell(notas_disciplinas[disciplina][1]),
+                _cell(str(faltas_bimestrais[disciplina][1]) if faltas_bimestrais[disciplina][1] > 0 else "--"),
+                _cell(notas_disciplinas[disciplina][2]),
+                _cell(str(faltas_bimestrais[disciplina][2]) if faltas_bimestrais[disciplina][2] > 0 else "--"),
+                _cell(notas_disciplinas[disciplina][3]),
+                _cell(str(faltas_bimestrais[disciplina][3]) if faltas_bimestrais[disciplina][3] > 0 else "--"),
+                _cell(f"{media_anual_arredondada/10:.1f}"),
+                _cell("--"),
+                _cell(f"{media_anual_arredondada/10:.1f}" if len(notas_raw) == 4 else "--"),
+                _cell(str(sum(faltas_bimestrais[disciplina]))),
+                _cell("AP" if len(notas_raw) == 4 and media_anual_arredondada/10 >= 6 else ("RP" if len(notas_raw) == 4 else "--"))
+            ])
+            # Registrar média final desta disciplina quando houver 4 notas
+            if len(notas_raw) == 4:
+                try:
+                    medias_finais_disciplinas.append(int(media_final_arredondada))
+                except Exception:
+                    pass
 
     # Calcular média final global do aluno (média das médias finais das disciplinas)
     if medias_finais_disciplinas:
@@ -1323,8 +1225,34 @@ def boletimfinais(aluno_id, ano_letivo_id):
         # Adicionando a mensagem ao PDF
         elements.append(Paragraph(f"<b>{mensagem}</b>", estilo_centro))
 
-    # Construindo o PDF 
-    doc.build(elements)
+    return elements, {
+        'nome_aluno': nome_aluno, 'serie': serie, 'turma': turma,
+        'turno': turno, 'ano_letivo': ano_letivo,
+    }
+
+def _novo_documento(buffer):
+    """Documento A4 paisagem com as margens usadas nos boletins."""
+    # Definindo as margens em pontos (1,27 cm = 36 pontos)
+    margem = 10
+    return SimpleDocTemplate(buffer,
+                             pagesize=landscape(A4),
+                             topMargin=margem,
+                             bottomMargin=margem,
+                             leftMargin=margem,
+                             rightMargin=margem)
+
+
+def _salvar_boletim(elements, info, aluno_id):
+    """Gera o PDF de um aluno, registra no gerenciador de documentos e abre."""
+    nome_aluno = info['nome_aluno']
+    serie = info['serie']
+    turma = info['turma']
+    turno = info['turno']
+    ano_letivo = info['ano_letivo']
+
+    # Criar o PDF em memória
+    buffer = io.BytesIO()
+    _novo_documento(buffer).build(elements)
 
     # Resetar o buffer para o início
     buffer.seek(0)
@@ -1364,6 +1292,90 @@ def boletimfinais(aluno_id, ano_letivo_id):
     
     salvar_e_abrir_pdf(buffer)
 
+
+def _gerar_boletim_aluno(montar, aluno_id, ano_letivo_id):
+    dados_aluno = consultar_dados_aluno(aluno_id, ano_letivo_id)
+
+    if not dados_aluno:
+        logger.info("Aluno não encontrado ou sem notas registradas.")
+        return
+
+    complementos = consultar_complementos([aluno_id], ano_letivo_id).get(_safe_int(aluno_id), {})
+    montado = montar(dados_aluno, complementos)
+    if montado is None:
+        return
+    elements, info = montado
+    _salvar_boletim(elements, info, aluno_id)
+
+
+def boletiminiciais(aluno_id, ano_letivo_id):
+    _gerar_boletim_aluno(_elementos_boletiminiciais, aluno_id, ano_letivo_id)
+
+
+def boletimfinais(aluno_id, ano_letivo_id):
+    _gerar_boletim_aluno(_elementos_boletimfinais, aluno_id, ano_letivo_id)
+
+
+def gerar_boletins_lote(ano_letivo_id, turma_id=None, serie_id=None, escola_id=None,
+                        abrir: bool = True) -> Optional[io.BytesIO]:
+    """Gera os boletins de uma turma ou série inteira em um único PDF.
+
+    Os dados de todos os alunos vêm de ``consultar_dados_boletins`` (uma
+    conexão, duas consultas) em vez de uma consulta por aluno. Cada aluno
+    ocupa suas próprias páginas, com o modelo de anos iniciais ou finais
+    conforme a série.
+
+    Args:
+        ano_letivo_id: ID do ano letivo
+        turma_id: Turma a imprimir
+        serie_id: Série a imprimir (quando turma_id não é informado)
+        escola_id: Escola, para restringir a série
+        abrir: Se True, salva e abre o PDF ao final
+
+    Returns:
+        Buffer com o PDF combinado ou None se nenhum aluno tiver notas
+    """
+    elements = []
+    gerados = 0
+    for aluno_id, linhas, complementos in consultar_dados_boletins(
+        ano_letivo_id, turma_id=turma_id, serie_id=serie_id, escola_id=escola_id
+    ):
+        # Mesmo critério de boletim(): séries acima de 7 são anos finais
+        if _safe_int(linhas[0][11], 0) > 7:
+            montado = _elementos_boletimfinais(linhas, complementos)
+        else:
+            montado = _elementos_boletiminiciais(linhas, complementos)
+        if montado is None:
+            logger.info(f"Aluno ID {aluno_id} sem disciplinas cursadas; boletim não incluído no lote")
+            continue
+        if elements:
+            elements.append(PageBreak())
+        elements.extend(montado[0])
+        gerados += 1
+
+    if not gerados:
+        logger.info("Nenhum aluno com notas registradas para gerar boletins em lote.")
+        return None
+
+    buffer = io.BytesIO()
+    _novo_documento(buffer).build(elements)
+    buffer.seek(0)
+    logger.info(f"{gerados} boletins gerados em lote")
+
+    if abrir:
+        salvar_e_abrir_pdf(buffer)
+    return buffer
+
+
+def boletins_turma(turma_id, ano_letivo_id, abrir: bool = True) -> Optional[io.BytesIO]:
+    """Boletins de todos os alunos da turma em um único PDF."""
+    return gerar_boletins_lote(ano_letivo_id, turma_id=turma_id, abrir=abrir)
+
+
+def boletins_serie(serie_id, ano_letivo_id, escola_id=None, abrir: bool = True) -> Optional[io.BytesIO]:
+    """Boletins de todos os alunos da série (opcionalmente de uma escola) em um único PDF."""
+    return gerar_boletins_lote(ano_letivo_id, serie_id=serie_id, escola_id=escola_id, abrir=abrir)
+
 def boletim(aluno_id, ano_letivo_id):
     """Busca o serie_id e ano_letivo_id para um aluno específico e gera o boletim apropriado."""
     try:
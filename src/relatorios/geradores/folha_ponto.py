@@ -18,9 +18,76 @@ from src.core.config import get_image_path
 from PyPDF2 import PdfWriter, PdfReader
 import os
 import io
+import time
 
 logger = get_logger(__name__)
 
+# Dados exibidos na folha; completada com WHERE pelo chamador
+_QUERY_FUNCIONARIOS = """
+    SELECT 
+        f.id,
+        f.nome,
+        f.matricula,
+        f.cargo,
+        f.data_admissao,
+        f.carga_horaria,
+        f.telefone,
+        f.email,
+        f.escola_id,
+        e.nome as escola_nome
+    FROM Funcionarios f
+    LEFT JOIN escolas e ON f.escola_id = e.id
+"""
+
+# Linhas de identificação do cabeçalho das folhas geradas em lote
+_INFO_CABECALHO = [
+    ("Prefeitura de Paço do Lumiar", True),
+    ("06.003.636/0001-73", False),
+    ("Centro Administrativo - Avenida 13, S/N - Maiobão - Paço do Lumiar", False),
+    ("Secretaria Municipal de Educação", True),
+    ("19.931.246/0001-05", False),
+    ("Avenida 09, 15, quadra 76 - Maiobão -Paço do Lumiar", False),
+]
+
+
+def _formatar_funcionario(funcionario):
+    """Formata a data de admissão e troca nulos por '' (linha em branco na folha)."""
+    # Formatar data de admissão
+    if funcionario.get('data_admissao'):
+        funcionario['data_admissao_formatada'] = funcionario['data_admissao'].strftime('%d/%m/%Y')
+    else:
+        funcionario['data_admissao_formatada'] = ''
+        
+    # Valores padrão para campos nulos (linha em branco para preenchimento manual)
+    funcionario['matricula'] = funcionario.get('matricula') or ''
+    funcionario['carga_horaria'] = funcionario.get('carga_horaria') or ''
+    funcionario['telefone'] = funcionario.get('telefone') or ''
+    funcionario['email'] = funcionario.get('email') or ''
+    funcionario['escola_nome'] = funcionario.get('escola_nome') or ''
+    return funcionario
+
+
+class _ModeloTabelaPonto:
+    """
+    Grade do mês (cabeçalho, dias, larguras e estilo) montada uma vez.
+
+    O calendário é o mesmo para todos os funcionários; cada folha recebe
+    uma Table nova (um flowable não pode aparecer duas vezes na story),
+    mas sem refazer Paragraphs, medições e o TableStyle.
+    """
+
+    def __init__(self, dados, col_widths, row_heights, estilo):
+        self.dados = dados
+        self.col_widths = col_widths
+        self.row_heights = row_heights
+        self.estilo = estilo
+
+    def clonar(self):
+        tabela = Table([list(linha) for linha in self.dados],
+                       colWidths=self.col_widths, rowHeights=self.row_heights)
+        tabela.setStyle(self.estilo)
+        return tabela
+
 
 class FolhaPontoGenerator:
     """Gerador de Folha de Ponto em PDF"""
@@ -31,6 +98,8 @@ class FolhaPontoGenerator:
         self.margin = 1.5 * cm
         # Tamanho da fonte do texto central do cabeçalho (configurável)
         self.header_font_size = header_font_size
+        # Grades já montadas por (mes, ano)
+        self._modelos_tabela = {}
         
     def _buscar_dados_funcionario(self, funcionario_id):
         """
@@ -51,43 +120,14 @@ class FolhaPontoGenerator:
             cursor = conn.cursor(dictionary=True)
             
             # Buscar dados do funcionário
-            query = """
-                SELECT 
-                    f.id,
-                    f.nome,
-                    f.matricula,
-                    f.cargo,
-                    f.data_admissao,
-                    f.carga_horaria,
-                    f.telefone,
-                    f.email,
-                    e.nome as escola_nome
-                FROM Funcionarios f
-                LEFT JOIN escolas e ON f.escola_id = e.id
-                WHERE f.id = %s
-            """
-            
-            cursor.execute(query, (funcionario_id,))
+            cursor.execute(_QUERY_FUNCIONARIOS + " WHERE f.id = %s", (funcionario_id,))
             funcionario = cursor.fetchone()
             
             if not funcionario:
                 logger.warning(f"Funcionário com ID {funcionario_id} não encontrado")
                 return None
                 
-            # Formatar data de admissão
-            if funcionario.get('data_admissao'):
-                funcionario['data_admissao_formatada'] = funcionario['data_admissao'].strftime('%d/%m/%Y')
-            else:
-                funcionario['data_admissao_formatada'] = ''
-                
-            # Valores padrão para campos nulos (linha em branco para preenchimento manual)
-            funcionario['matricula'] = funcionario.get('matricula') or ''
-            funcionario['carga_horaria'] = funcionario.get('carga_horaria') or ''
-            funcionario['telefone'] = funcionario.get('telefone') or ''
-            funcionario['email'] = funcionario.get('email') or ''
-            funcionario['escola_nome'] = funcionario.get('escola_nome') or ''
-            
-            return funcionario
+            return _formatar_funcionario(funcionario)
             
         except Exception as e:
             logger.exception(f"Erro ao buscar dados do funcionário: {e}")
@@ -95,6 +135,55 @@ class FolhaPontoGenerator:
         finally:
             if conn:
                 conn.close()
+
+    def _buscar_funcionarios_escolas(self, escola_ids, mes, ano):
+        """
+        Busca em uma única consulta os funcionários de várias escolas
+        admitidos até o mês informado.
+
+        Args:
+            escola_ids: IDs das escolas, ou None para todas
+            mes: Mês (1-12)
+            ano: Ano
+
+        Returns:
+            dict: {escola_id: [funcionário formatado, ...]} ordenado por nome,
+                  ou None se houver erro
+        """
+        filtro_escola = ""
+        params = [ano, ano, mes]
+        if escola_ids is not None:
+            escola_ids = list(escola_ids)
+            if not escola_ids:
+                return {}
+            filtro_escola = f"AND f.escola_id IN ({', '.join(['%s'] * len(escola_ids))})"
+            params.extend(escola_ids)
+
+        conn = conectar_bd()
+        if not conn:
+            logger.error("Não foi possível conectar ao banco de dados para listar funcionários")
+            return None
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(_QUERY_FUNCIONARIOS + f"""
+                WHERE (
+                      f.data_admissao IS NULL
+                      OR YEAR(f.data_admissao) < %s
+                      OR (YEAR(f.data_admissao) = %s AND MONTH(f.data_admissao) <= %s)
+                  )
+                  {filtro_escola}
+                ORDER BY f.escola_id, f.nome
+            """, tuple(params))
+            por_escola = {}
+            for row in cursor.fetchall():
+                por_escola.setdefault(row['escola_id'], []).append(_formatar_funcionario(row))
+            return por_escola
+        except Exception as e:
+            logger.exception(f"Erro ao buscar funcionários das escolas {escola_ids}: {e}")
+            return None
+        finally:
+            conn.close()
     
     def _desenhar_borda(self, c):
         """
@@ -290,6 +379,9 @@ class FolhaPontoGenerator:
         """
         Cria a tabela de registro de ponto para o mês especificado
         
+        A grade é montada na primeira chamada para (mes, ano) e clonada
+        nas seguintes.
+        
         Args:
             mes: Mês (1-12)
             ano: Ano (ex: 2025)
@@ -297,6 +389,13 @@ class FolhaPontoGenerator:
         Returns:
             Table: Tabela formatada
         """
+        modelo = self._modelos_tabela.get((mes, ano))
+        if modelo is None:
+            modelo = self._modelos_tabela[(mes, ano)] = self._montar_modelo_tabela(mes, ano)
+        return modelo.clonar()
+
+    def _montar_modelo_tabela(self, mes, ano):
+        """Monta a grade do mês (ver _ModeloTabelaPonto)."""
         # Cabeçalho da tabela (texto simples será convertido em Paragraphs para quebra automática)
         header_texts = [
             'Dia',
@@ -360,9 +459,6 @@ class FolhaPontoGenerator:
                 ''   # Assinatura
             ])
 
-        # Criar tabela com larguras ajustadas e alturas (cabeçalho dinâmico)
-        tabela = Table(dados_tabela, colWidths=colWidths, rowHeights=[header_row_height] + [0.49*cm] * num_dias)
-        
         # Estilo da tabela
         estilo = TableStyle([
             # Cabeçalho
@@ -388,9 +484,9 @@ class FolhaPontoGenerator:
             ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
         ])
         
-        tabela.setStyle(estilo)
-        
-        return tabela
+        # Larguras ajustadas e alturas (cabeçalho dinâmico)
+        return _ModeloTabelaPonto(dados_tabela, colWidths,
+                                  [header_row_height] + [0.49*cm] * num_dias, estilo)
     
     def _adicionar_rodape(self, c, y_position):
         """
@@ -699,73 +795,22 @@ def _criar_capa_folha_ponto(mes, ano):
     return buffer.getvalue()
 
 
-def gerar_folhas_para_escola(escola_id, mes=None, ano=None, output_path=None, header_font_size: int = None):
-    """
-    Gera um único arquivo PDF contendo as folhas de ponto de todos os funcionários
-    pertencentes à escola especificada por `escola_id`.
-    
-    Agora inclui:
-    - Uma capa com o cabeçalho padrão da Lista Atualizada
-    - As folhas de ponto dos funcionários
-    - Duas cópias do modelo de folha de ponto em branco ao final
-
-    Args:
-        escola_id: ID da escola (campo `escola_id` na tabela Funcionarios)
-        mes: mês (1-12). Se None, usa o mês atual.
-        ano: ano. Se None, usa o ano atual.
-        output_path: caminho do arquivo de saída. Se None, gera em `Modelos/Folhas_Escola_<escola_id>_<mes>_<ano>.pdf`.
-        header_font_size: tamanho da fonte do cabeçalho (opcional).
-
-    Returns:
-        str: caminho do arquivo gerado ou None em caso de erro.
-    """
-    # usar data atual se não informado
-    if mes is None or ano is None:
-        hoje = datetime.now()
-        mes = mes or hoje.month
-        ano = ano or hoje.year
-
-    conn = conectar_bd()
-    if not conn:
-        logger.error("Não foi possível conectar ao banco de dados para listar funcionários")
-        return None
+def _cronometrar(tempos, etapa, inicio):
+    """Acumula em ``tempos[etapa]`` os segundos desde ``inicio``."""
+    tempos[etapa] = tempos.get(etapa, 0.0) + (time.perf_counter() - inicio)
 
-    try:
-        cursor = conn.cursor(dictionary=True)
-        query = """
-            SELECT f.id, f.nome
-            FROM Funcionarios f
-            WHERE f.escola_id = %s
-              AND (
-                  f.data_admissao IS NULL
-                  OR YEAR(f.data_admissao) < %s
-                  OR (YEAR(f.data_admissao) = %s AND MONTH(f.data_admissao) <= %s)
-              )
-            ORDER BY f.nome
-        """
-        cursor.execute(query, (escola_id, ano, ano, mes))
-        funcionarios = cursor.fetchall()
-    except Exception as e:
-        logger.exception(f"Erro ao buscar funcionários da escola {escola_id}: {e}")
-        return None
-    finally:
-        conn.close()
 
-    if not funcionarios:
-        logger.warning(f"Nenhum funcionário encontrado para a escola_id={escola_id}")
-        return None
+def _resumo_tempos(tempos):
+    return ' | '.join(f"{etapa} {segundos:.2f}s" for etapa, segundos in tempos.items())
 
-    # criar gerador com font configurada
-    gerador = FolhaPontoGenerator(header_font_size=header_font_size or 24)
 
-    # caminho de saída padrão
-    if output_path is None:
-        from src.services.utils.pdf import get_docs_subpasta, formatar_nome_arquivo
-        output_dir = get_docs_subpasta("Faltas")
-        nome_base = f"Folhas de Ponto_Escola_{escola_id}"
-        nome_arquivo = formatar_nome_arquivo(f"{nome_base}.pdf")
-        output_path = os.path.join(output_dir, nome_arquivo)
+def _montar_pdf_escola(gerador, funcionarios, mes, ano, output_path, capa_bytes, branco_bytes, tempos):
+    """
+    Grava o PDF de uma escola: capa + folhas dos funcionários + modelo em branco.
 
+    ``capa_bytes`` e ``branco_bytes`` vêm prontos para que uma geração de
+    várias escolas monte essas páginas uma única vez.
+    """
     # Caminho temporário para as folhas de ponto (usa diretório temp do SO)
     import tempfile
     _tmp_fd, temp_folhas_path = tempfile.mkstemp(suffix="_temp.pdf", prefix="folhas_ponto_")
@@ -773,6 +818,7 @@ def gerar_folhas_para_escola(escola_id, mes=None, ano=None, output_path=None, he
 
     try:
         # 1. Gerar as folhas de ponto dos funcionários
+        inicio = time.perf_counter()
         doc = SimpleDocTemplate(
             temp_folhas_path,
             pagesize=gerador.pagesize,
@@ -784,14 +830,11 @@ def gerar_folhas_para_escola(escola_id, mes=None, ano=None, output_path=None, he
 
         story = []
 
-        for idx, f in enumerate(funcionarios):
+        for idx, funcionario in enumerate(funcionarios):
             # garantir espaçamento similar à geração individual
             story.append(Spacer(1, 0.3*cm))
-            funcionario = gerador._buscar_dados_funcionario(f['id'])
-            if not funcionario:
-                continue
 
-            # seção de dados + tabela
+            # seção de dados + tabela (grade do mês clonada)
             story.extend(gerador._criar_secao_dados_funcionario(funcionario))
             story.append(gerador._criar_tabela_ponto(mes, ano))
 
@@ -799,81 +842,181 @@ def gerar_folhas_para_escola(escola_id, mes=None, ano=None, output_path=None, he
             if idx < len(funcionarios) - 1:
                 story.append(PageBreak())
 
-        # callbacks de página (reusar os mesmos do gerador)
-        nome_mes = calendar.month_name[mes].upper()
-        texto_cabecalho = f"Folha de Ponto"
-        start_day = 1
+        # callback de página (mesmo cabeçalho/rodapé em todas as páginas)
         end_day = calendar.monthrange(ano, mes)[1]
-        periodo_text = f"{start_day:02d} à {end_day:02d}/{mes:02d}/{ano}"
-        info_lines = [
-            ("Prefeitura de Paço do Lumiar", True),
-            ("06.003.636/0001-73", False),
-            ("Centro Administrativo - Avenida 13, S/N - Maiobão - Paço do Lumiar", False),
-            ("Secretaria Municipal de Educação", True),
-            ("19.931.246/0001-05", False),
-            ("Avenida 09, 15, quadra 76 - Maiobão -Paço do Lumiar", False),
-        ]
+        periodo_text = f"01 à {end_day:02d}/{mes:02d}/{ano}"
 
-        def primeira_pagina(canvas_obj, doc_obj):
+        def _pagina(canvas_obj, doc_obj):
             canvas_obj.saveState()
             gerador._desenhar_borda(canvas_obj)
             y_cabecalho = gerador.height - 1*cm
-            gerador._desenhar_cabecalho(canvas_obj, y_cabecalho, texto_cabecalho, periodo_text, info_lines)
+            gerador._desenhar_cabecalho(canvas_obj, y_cabecalho, "Folha de Ponto", periodo_text, _INFO_CABECALHO)
             gerador._adicionar_rodape(canvas_obj, 4.5*cm)
             canvas_obj.restoreState()
 
-        def paginas_seguintes(canvas_obj, doc_obj):
-            canvas_obj.saveState()
-            gerador._desenhar_borda(canvas_obj)
-            y_cabecalho = gerador.height - 1*cm
-            gerador._desenhar_cabecalho(canvas_obj, y_cabecalho, texto_cabecalho, periodo_text, info_lines)
-            gerador._adicionar_rodape(canvas_obj, 4.5*cm)
-            canvas_obj.restoreState()
+        doc.build(story, onFirstPage=_pagina, onLaterPages=_pagina)
+        _cronometrar(tempos, 'folhas', inicio)
 
-        doc.build(story, onFirstPage=primeira_pagina, onLaterPages=paginas_seguintes)
-        
-        # 2. Criar o PDF final mesclando: capa + folhas + 2x modelo em branco
+        # 2. Criar o PDF final mesclando: capa + folhas + modelo em branco
+        inicio = time.perf_counter()
         writer = PdfWriter()
-        
-        # Adicionar capa
-        capa_bytes = _criar_capa_folha_ponto(mes, ano)
-        capa_reader = PdfReader(io.BytesIO(capa_bytes))
-        for page in capa_reader.pages:
-            writer.add_page(page)
-        
-        # Adicionar folhas de ponto dos funcionários
-        folhas_reader = PdfReader(temp_folhas_path)
-        for page in folhas_reader.pages:
-            writer.add_page(page)
-        
-        # Adicionar folha de ponto em branco ao final (para novos funcionários)
-        branco_bytes = gerador._gerar_folha_em_branco_bytes(mes, ano)
-        branco_reader = PdfReader(io.BytesIO(branco_bytes))
-        for page in branco_reader.pages:
-            writer.add_page(page)
-        
+        for reader in (PdfReader(io.BytesIO(capa_bytes)),
+                       PdfReader(temp_folhas_path),
+                       PdfReader(io.BytesIO(branco_bytes))):
+            for page in reader.pages:
+                writer.add_page(page)
+
         # Salvar o PDF final
         with open(output_path, 'wb') as output_file:
             writer.write(output_file)
-        
+        _cronometrar(tempos, 'mesclagem', inicio)
+        return output_path
+    finally:
         # Remover arquivo temporário
         if os.path.exists(temp_folhas_path):
-            os.remove(temp_folhas_path)
-        
-        logger.info(f"Folhas geradas para escola_id={escola_id}: {output_path}")
+            try:
+                os.remove(temp_folhas_path)
+            except OSError:
+                pass
+
+
+def gerar_folhas_para_escola(escola_id, mes=None, ano=None, output_path=None, header_font_size: int = None,
+                             tempos=None):
+    """
+    Gera um único arquivo PDF contendo as folhas de ponto de todos os funcionários
+    pertencentes à escola especificada por `escola_id`.
+    
+    Agora inclui:
+    - Uma capa com o cabeçalho padrão da Lista Atualizada
+    - As folhas de ponto dos funcionários
+    - Uma cópia do modelo de folha de ponto em branco ao final
+
+    Os dados de todos os funcionários vêm de uma única consulta e a grade
+    do mês é montada uma vez e clonada para cada folha.
+
+    Args:
+        escola_id: ID da escola (campo `escola_id` na tabela Funcionarios)
+        mes: mês (1-12). Se None, usa o mês atual.
+        ano: ano. Se None, usa o ano atual.
+        output_path: caminho do arquivo de saída. Se None, gera em `Modelos/Folhas_Escola_<escola_id>_<mes>_<ano>.pdf`.
+        header_font_size: tamanho da fonte do cabeçalho (opcional).
+        tempos: dict opcional que recebe os segundos gastos por etapa
+                (consulta, capa, modelo_branco, folhas, mesclagem).
+
+    Returns:
+        str: caminho do arquivo gerado ou None em caso de erro.
+    """
+    # usar data atual se não informado
+    if mes is None or ano is None:
+        hoje = datetime.now()
+        mes = mes or hoje.month
+        ano = ano or hoje.year
+    tempos = {} if tempos is None else tempos
+
+    # criar gerador com font configurada
+    gerador = FolhaPontoGenerator(header_font_size=header_font_size or 24)
+
+    inicio = time.perf_counter()
+    por_escola = gerador._buscar_funcionarios_escolas([escola_id], mes, ano)
+    _cronometrar(tempos, 'consulta', inicio)
+    if por_escola is None:
+        return None
+
+    funcionarios = por_escola.get(escola_id)
+    if not funcionarios:
+        logger.warning(f"Nenhum funcionário encontrado para a escola_id={escola_id}")
+        return None
+
+    # caminho de saída padrão
+    if output_path is None:
+        from src.services.utils.pdf import get_docs_subpasta, formatar_nome_arquivo
+        output_dir = get_docs_subpasta("Faltas")
+        nome_base = f"Folhas de Ponto_Escola_{escola_id}"
+        nome_arquivo = formatar_nome_arquivo(f"{nome_base}.pdf")
+        output_path = os.path.join(output_dir, nome_arquivo)
+
+    try:
+        inicio = time.perf_counter()
+        capa_bytes = _criar_capa_folha_ponto(mes, ano)
+        _cronometrar(tempos, 'capa', inicio)
+
+        inicio = time.perf_counter()
+        branco_bytes = gerador._gerar_folha_em_branco_bytes(mes, ano)
+        _cronometrar(tempos, 'modelo_branco', inicio)
+
+        _montar_pdf_escola(gerador, funcionarios, mes, ano, output_path, capa_bytes, branco_bytes, tempos)
+        logger.info(f"Folhas geradas para escola_id={escola_id}: {output_path} ({_resumo_tempos(tempos)})")
         return output_path
 
     except Exception as e:
         logger.exception(f"Erro ao gerar folhas para escola {escola_id}: {e}")
-        # Limpar arquivo temporário em caso de erro
-        if os.path.exists(temp_folhas_path):
-            try:
-                os.remove(temp_folhas_path)
-            except:
-                pass
         return None
 
 
+def gerar_folhas_todas_escolas(mes=None, ano=None, output_dir=None, header_font_size: int = None,
+                               escola_ids=None, tempos=None):
+    """
+    Gera, em uma execução, o PDF de folhas de ponto de cada escola no mês.
+
+    Uma consulta traz os funcionários de todas as escolas; capa, folha em
+    branco e grade do mês são montadas uma única vez e reaproveitadas.
+
+    Args:
+        mes: mês (1-12). Se None, usa o mês atual.
+        ano: ano. Se None, usa o ano atual.
+        output_dir: pasta dos arquivos. Se None, usa a subpasta "Faltas".
+        header_font_size: tamanho da fonte do cabeçalho (opcional).
+        escola_ids: restringe às escolas informadas (None = todas com funcionários).
+        tempos: dict opcional que recebe os segundos gastos por etapa.
+
+    Returns:
+        dict: {escola_id: caminho do arquivo} das escolas geradas com sucesso.
+    """
+    if mes is None or ano is None:
+        hoje = datetime.now()
+        mes = mes or hoje.month
+        ano = ano or hoje.year
+    tempos = {} if tempos is None else tempos
+
+    gerador = FolhaPontoGenerator(header_font_size=header_font_size or 24)
+
+    inicio = time.perf_counter()
+    por_escola = gerador._buscar_funcionarios_escolas(escola_ids, mes, ano)
+    _cronometrar(tempos, 'consulta', inicio)
+    if not por_escola:
+        logger.warning(f"Nenhum funcionário encontrado para gerar folhas de {mes:02d}/{ano}")
+        return {}
+
+    if output_dir is None:
+        from src.services.utils.pdf import get_docs_subpasta
+        output_dir = get_docs_subpasta("Faltas")
+    from src.services.utils.pdf import formatar_nome_arquivo
+
+    inicio = time.perf_counter()
+    capa_bytes = _criar_capa_folha_ponto(mes, ano)
+    _cronometrar(tempos, 'capa', inicio)
+
+    inicio = time.perf_counter()
+    branco_bytes = gerador._gerar_folha_em_branco_bytes(mes, ano)
+    _cronometrar(tempos, 'modelo_branco', inicio)
+
+    gerados = {}
+    for escola_id, funcionarios in por_escola.items():
+        nome_arquivo = formatar_nome_arquivo(f"Folhas de Ponto_Escola_{escola_id}.pdf")
+        output_path = os.path.join(output_dir, nome_arquivo)
+        try:
+            _montar_pdf_escola(gerador, funcionarios, mes, ano, output_path, capa_bytes, branco_bytes, tempos)
+            gerados[escola_id] = output_path
+        except Exception as e:
+            logger.exception(f"Erro ao gerar folhas para escola {escola_id}: {e}")
+
+    logger.info(
+        f"Folhas de ponto {mes:02d}/{ano}: {len(gerados)}/{len(por_escola)} escola(s), "
+        f"{sum(len(f) for f in por_escola.values())} funcionário(s) ({_resumo_tempos(tempos)})"
+    )
+    return gerados
+
+
 if __name__ == "__main__":
     # Exemplo de uso
     import sys
@@ -88,39 +88,9 @@ def fetch_student_data(ano_letivo):
             t.turno AS 'TURNO', 
             m.status AS 'SITUAÇÃO',
             f.nome AS 'NOME_PROFESSOR',
-            COALESCE(
-                (
-                    SELECT MAX(hm.data_mudanca)
-                    FROM historico_matricula hm
-                    WHERE hm.matricula_id = m.id
-                    AND hm.status_novo = 'Ativo'
-                ),
-                (
-                    SELECT MAX(hm2.data_mudanca)
-                    FROM historico_matricula hm2
-                    WHERE hm2.matricula_id = m.id
-                    AND hm2.status_novo NOT IN ('Transferido', 'Transferida', 'Cancelado', 'Cancelada')
-                ),
-                m.data_matricula
-            ) AS 'DATA_MATRICULA',
-            (
-                SELECT hm.data_mudanca 
-                FROM historico_matricula hm 
-                WHERE hm.matricula_id = m.id 
-                AND hm.status_novo IN ('Transferido', 'Transferida')
-                ORDER BY hm.data_mudanca DESC 
-                LIMIT 1
-            ) AS 'DATA_TRANSFERENCIA',
-            (
-                SELECT GROUP_CONCAT(
-                    CONCAT(hm.status_novo, ' em ', DATE_FORMAT(hm.data_mudanca, '%d/%m/%Y'))
-                    ORDER BY hm.data_mudanca DESC
-                    SEPARATOR ' | '
-                )
-                FROM historico_matricula hm 
-                WHERE hm.matricula_id = m.id 
-                AND hm.status_novo IN ('Transferido', 'Transferida')
-            ) AS 'HISTORICO_TRANSFERENCIA',
+            COALESCE(rh.data_ultima_ativacao, rh.data_ultimo_status_regular, m.data_matricula) AS 'DATA_MATRICULA',
+            rh.data_ultima_transferencia AS 'DATA_TRANSFERENCIA',
+            rh.historico_transferencia AS 'HISTORICO_TRANSFERENCIA',
             e_origem.nome AS 'ESCOLA_ORIGEM',
             e_destino.nome AS 'ESCOLA_DESTINO',
             GROUP_CONCAT(DISTINCT r.telefone ORDER BY r.id SEPARATOR '/') AS 'TELEFONES'
@@ -138,6 +108,8 @@ def fetch_student_data(ano_letivo):
             Responsaveis r ON ra.responsavel_id = r.id
         LEFT JOIN
             Funcionarios f ON f.turma = t.id AND f.cargo = 'Professor@'
+        LEFT JOIN
+            resumo_historico_matricula rh ON rh.matricula_id = m.id
         LEFT JOIN
             escolas e_origem ON m.escola_origem_id = e_origem.id
         LEFT JOIN
@@ -151,7 +123,9 @@ def fetch_student_data(ano_letivo):
         GROUP BY 
             a.id, a.nome, a.sexo, a.data_nascimento, a.descricao_transtorno,
             s.nome, s.id, t.nome, t.turno, m.status, f.nome, m.data_matricula, m.id,
-            e_origem.nome, e_destino.nome
+            e_origem.nome, e_destino.nome,
+            rh.data_ultima_ativacao, rh.data_ultimo_status_regular,
+            rh.data_ultima_transferencia, rh.historico_transferencia
         ORDER BY
             CASE 
                 WHEN m.data_matricula < %s THEN 1  -- Alunos matriculados antes da data_inicio
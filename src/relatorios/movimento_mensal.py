@@ -104,29 +104,25 @@ def contar_alunos_por_serie_sexo(df, data_referencia=None, tipo_contagem='atual'
     return contagem
 
 def contar_movimentacao_mensal(cursor, ano_letivo_id, mes, serie):
-    # Conta transferências e evasões acumuladas até o fim do mês específico
+    # Conta transferências e evasões acumuladas até o fim do mês específico.
+    # Usa a última saída de cada matrícula (resumo_historico_matricula); uma
+    # reativação posterior à saída desfaz a movimentação.
     query = """
     SELECT 
-        hm.status_novo as status,
+        CASE WHEN rh.status_ultima_saida = 'Evadido' THEN 'Evadido' ELSE 'Transferido' END as status,
         COUNT(CASE WHEN a.sexo = 'M' THEN 1 END) as total_m,
         COUNT(CASE WHEN a.sexo = 'F' THEN 1 END) as total_f
-    FROM historico_matricula hm
-    JOIN matriculas m ON hm.matricula_id = m.id
+    FROM resumo_historico_matricula rh
+    JOIN matriculas m ON rh.matricula_id = m.id
     JOIN alunos a ON m.aluno_id = a.id
     JOIN turmas t ON m.turma_id = t.id
     JOIN series s ON t.serie_id = s.id
     WHERE 
         m.ano_letivo_id = %s
-        AND hm.data_mudanca <= LAST_DAY(DATE(CONCAT(YEAR(CURDATE()), '-', %s, '-01')))
+        AND rh.data_ultima_saida <= LAST_DAY(DATE(CONCAT(YEAR(CURDATE()), '-', %s, '-01')))
         AND CONCAT(s.nome, ' ', t.nome) = %s
-        AND hm.status_novo IN ('Evadido', 'Transferido')
-        AND NOT EXISTS (
-            SELECT 1 FROM historico_matricula hm2 
-            WHERE hm2.matricula_id = hm.matricula_id 
-            AND hm2.data_mudanca > hm.data_mudanca
-            AND hm2.status_novo = 'Ativo'
-        )
-    GROUP BY hm.status_novo;
+        AND (rh.data_ultima_ativacao IS NULL OR rh.data_ultima_ativacao <= rh.data_ultima_saida)
+    GROUP BY 1;
     """
     cursor.execute(query, (ano_letivo_id, mes, serie))
     return cursor.fetchall()
@@ -150,9 +146,9 @@ def contar_aprovacoes_reprovacoes(cursor, ano_letivo_id, serie):
             m.ano_letivo_id = %s
             AND CONCAT(s.nome, ' ', t.nome) = %s
             AND NOT EXISTS (
-                SELECT 1 FROM historico_matricula hm 
-                WHERE hm.matricula_id = m.id 
-                AND hm.status_novo IN ('Transferido', 'Evadido')
+                SELECT 1 FROM resumo_historico_matricula rh 
+                WHERE rh.matricula_id = m.id 
+                AND rh.data_ultima_saida IS NOT NULL
             )
         GROUP BY a.id, a.sexo, s.nome, m.id
     )
@@ -17,7 +17,9 @@ from db.connection import get_cursor
 from decimal import Decimal, ROUND_HALF_UP
 from scripts.auxiliares.biblio_editor import arredondar_personalizado
 import re
+import unicodedata
 from typing import Any, cast
+from src.utils.cache import CacheManager
 
 
 # ============================================================================
@@ -257,14 +259,7 @@ def construir_consulta_sql(bimestre, filtro_serie, disciplinas, nivel_id, ano_le
     Returns:
         str: Consulta SQL formatada
     """
-    # Mapeamento de nomes abreviados para nomes completos no banco de dados
-    mapeamento_disciplinas = {
-        'L. PORTUGUESA': 'LÍNGUA PORTUGUESA',
-        'ENS. RELIGIOSO': 'ENSINO RELIGIOSO',
-        'ED. FÍSICA': 'EDUCAÇÃO FÍSICA',
-        'L. INGLESA': 'LÍNGUA INGLESA',
-        # Adicione outros mapeamentos conforme necessário
-    }
+    mapeamento_disciplinas = MAPEAMENTO_DISCIPLINAS
     
     # Definir status de matrícula a filtrar
     if status_matricula is None:
@@ -348,6 +343,192 @@ def construir_consulta_sql(bimestre, filtro_serie, disciplinas, nivel_id, ano_le
     return query
 
 
+# ============================================================================
+# Notas em formato longo + pivô em memória
+# Uma busca por (ano letivo, escola) atende todas as atas: os quatro bimestres
+# e os dois níveis saem do mesmo DataFrame cacheado.
+# ============================================================================
+
+# Mapeamento de nomes abreviados (colunas da ata) para nomes completos no banco
+MAPEAMENTO_DISCIPLINAS = {
+    'L. PORTUGUESA': 'LÍNGUA PORTUGUESA',
+    'ENS. RELIGIOSO': 'ENSINO RELIGIOSO',
+    'ED. FÍSICA': 'EDUCAÇÃO FÍSICA',
+    'L. INGLESA': 'LÍNGUA INGLESA',
+}
+
+# Nível de ensino -> (nivel_id das disciplinas, filtro de série por s.id)
+NIVEIS_ATA = {
+    'iniciais': {'nivel_id': 2, 'serie_max': 7},
+    'finais': {'nivel_id': 3, 'serie_min': 8},
+}
+
+_cache_notas = CacheManager(ttl_seconds=300, max_size=8)
+
+_QUERY_MATRICULAS_ATA = """
+    SELECT DISTINCT
+        a.id AS ALUNO_ID,
+        a.nome AS 'NOME DO ALUNO',
+        a.sexo AS 'SEXO',
+        a.data_nascimento AS 'NASCIMENTO',
+        s.id AS SERIE_ID,
+        s.nome AS 'NOME_SERIE',
+        t.id AS 'ID_TURMA',
+        t.nome AS 'NOME_TURMA',
+        t.turno AS 'TURNO',
+        m.status AS 'STATUS',
+        m.data_matricula AS 'DATA_MATRICULA',
+        f.nome AS 'NOME_PROFESSOR'
+    FROM Alunos a
+    JOIN Matriculas m ON a.id = m.aluno_id
+    JOIN Turmas t ON m.turma_id = t.id
+    JOIN series s ON t.serie_id = s.id
+    LEFT JOIN Funcionarios f ON f.turma = t.id AND f.cargo = 'Professor@'
+    WHERE m.ano_letivo_id = %s AND a.escola_id = %s
+"""
+
+_QUERY_NOTAS_LONGAS = """
+    SELECT n.aluno_id AS ALUNO_ID, d.nome AS DISCIPLINA, d.nivel_id AS NIVEL_ID,
+           n.bimestre AS BIMESTRE, n.nota AS NOTA
+    FROM Notas n
+    JOIN Alunos a ON a.id = n.aluno_id
+    JOIN Disciplinas d ON d.id = n.disciplina_id
+    WHERE n.ano_letivo_id = %s AND a.escola_id = %s
+"""
+
+_COLUNAS_MATRICULA = [
+    'NOME DO ALUNO', 'SEXO', 'NASCIMENTO', 'NOME_SERIE', 'ID_TURMA', 'NOME_TURMA',
+    'TURNO', 'STATUS', 'DATA_MATRICULA', 'NOME_PROFESSOR',
+]
+
+
+def _normalizar_chave(texto):
+    """Maiúsculas e sem acentos, como a comparação ``_ci``/``_ai`` do MySQL."""
+    sem_acento = unicodedata.normalize('NFKD', str(texto or '')).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sem_acento.upper().split())
+
+
+def _pivotar_notas(linhas):
+    """Converte as notas em formato longo em uma tabela larga.
+
+    Returns:
+        DataFrame indexado por ALUNO_ID com colunas MultiIndex
+        (NIVEL_ID, BIMESTRE, DISCIPLINA normalizada) e a maior nota de cada par,
+        equivalente ao ``MAX(CASE WHEN ...)`` da consulta antiga.
+    """
+    longo = pd.DataFrame(linhas, columns=['ALUNO_ID', 'DISCIPLINA', 'NIVEL_ID', 'BIMESTRE', 'NOTA'])
+    if longo.empty:
+        return pd.DataFrame(index=pd.Index([], name='ALUNO_ID'))
+
+    bimestre = longo['BIMESTRE'].astype(str).str.extract(r'^\s*([1-4])º\s*bimestre\s*$', flags=re.IGNORECASE)[0]
+    longo['BIMESTRE'] = pd.to_numeric(bimestre, errors='coerce')
+    longo['NIVEL_ID'] = pd.to_numeric(longo['NIVEL_ID'], errors='coerce')
+    longo['NOTA'] = pd.to_numeric(longo['NOTA'].astype(str), errors='coerce')
+    longo = longo.dropna(subset=['BIMESTRE', 'NIVEL_ID'])
+    if longo.empty:
+        return pd.DataFrame(index=pd.Index([], name='ALUNO_ID'))
+
+    # Poucas disciplinas distintas: normaliza uma vez por nome e mapeia a coluna inteira
+    nomes = {nome: _normalizar_chave(nome) for nome in longo['DISCIPLINA'].unique()}
+    longo['DISCIPLINA'] = longo['DISCIPLINA'].map(nomes)
+    longo = longo.astype({'BIMESTRE': 'int64', 'NIVEL_ID': 'int64'})
+
+    return longo.pivot_table(
+        index='ALUNO_ID', columns=['NIVEL_ID', 'BIMESTRE', 'DISCIPLINA'],
+        values='NOTA', aggfunc='max'
+    )
+
+
+def carregar_notas_ano(ano_letivo, escola_id=60):
+    """Matrículas e notas pivotadas do ano/escola, com cache.
+
+    Duas consultas parametrizadas (matrículas e notas em formato longo) por
+    (ano_letivo, escola); as chamadas seguintes reaproveitam o resultado por
+    até 5 minutos ou até :func:`invalidar_cache_notas`.
+
+    Returns:
+        dict com ``matriculas`` (uma linha por matrícula/professor) e ``notas``
+        (saída de :func:`_pivotar_notas`). Os DataFrames não devem ser alterados.
+    """
+    chave = f"notas:{ano_letivo}:{escola_id}"
+    dados = _cache_notas.get(chave, None)
+    if dados is not None:
+        return dados
+
+    with get_cursor() as cursor:
+        cursor.execute("SELECT id FROM AnosLetivos WHERE ano_letivo = %s LIMIT 1", (ano_letivo,))
+        linha = cursor.fetchone()
+        ano_letivo_id = linha['id'] if linha else None
+        matriculas, notas = [], []
+        if ano_letivo_id is not None:
+            cursor.execute(_QUERY_MATRICULAS_ATA, (ano_letivo_id, escola_id))
+            matriculas = cursor.fetchall()
+            cursor.execute(_QUERY_NOTAS_LONGAS, (ano_letivo_id, escola_id))
+            notas = cursor.fetchall()
+
+    dados = {
+        'matriculas': pd.DataFrame(matriculas, columns=['ALUNO_ID', 'SERIE_ID'] + _COLUNAS_MATRICULA),
+        'notas': _pivotar_notas(notas),
+    }
+    _cache_notas.set(chave, dados)
+    logger.info(
+        f"Notas de {ano_letivo} (escola {escola_id}) carregadas: "
+        f"{len(dados['matriculas'])} matrículas, {len(notas)} notas"
+    )
+    return dados
+
+
+def invalidar_cache_notas(ano_letivo=None, escola_id=None):
+    """Descarta as notas cacheadas (todas, de um ano ou de um ano/escola)."""
+    if ano_letivo is None:
+        _cache_notas.invalidate()
+    elif escola_id is None:
+        _cache_notas.invalidate_pattern(f"notas:{ano_letivo}:")
+    else:
+        _cache_notas.invalidate(f"notas:{ano_letivo}:{escola_id}")
+
+
+def obter_dados_ata(bimestre, nivel_ensino, disciplinas, ano_letivo=2025, escola_id=60, status_matricula=None):
+    """Linhas da ata de um bimestre/nível a partir do cache de notas.
+
+    Produz as mesmas colunas da consulta de :func:`construir_consulta_sql`
+    ('NOME DO ALUNO' ... 'NOME_PROFESSOR' e uma coluna ``NOTA_*`` por
+    disciplina), ordenadas pelo nome do aluno.
+    """
+    nivel = NIVEIS_ATA.get(nivel_ensino)
+    if nivel is None:
+        raise ValueError(f"Nível de ensino '{nivel_ensino}' inválido. Use 'iniciais' ou 'finais'.")
+    bimestre_num = int(re.search(r'([1-4])', validar_bimestre(bimestre)).group(1))
+
+    if status_matricula is None:
+        status = ['Ativo']
+    elif isinstance(status_matricula, str):
+        status = [status_matricula]
+    else:
+        status = list(status_matricula)
+
+    dados = carregar_notas_ano(ano_letivo, escola_id)
+    matriculas = dados['matriculas']
+    filtro = matriculas['STATUS'].isin(status)
+    if 'serie_max' in nivel:
+        filtro &= matriculas['SERIE_ID'] <= nivel['serie_max']
+    if 'serie_min' in nivel:
+        filtro &= matriculas['SERIE_ID'] >= nivel['serie_min']
+    df = matriculas.loc[filtro]
+
+    chaves = pd.MultiIndex.from_tuples([
+        (nivel['nivel_id'], bimestre_num,
+         _normalizar_chave(MAPEAMENTO_DISCIPLINAS.get(d['nome'], d['nome'])))
+        for d in disciplinas
+    ])
+    notas = dados['notas'].reindex(columns=chaves)
+    notas.columns = [d['coluna'] for d in disciplinas]
+
+    df = df.merge(notas, how='left', left_on='ALUNO_ID', right_index=True)
+    df = df.sort_values('NOME DO ALUNO', key=lambda nomes: nomes.map(_normalizar_chave), kind='stable')
+    return df.drop(columns=['ALUNO_ID', 'SERIE_ID']).reset_index(drop=True)
+
+
 def processar_dados_alunos(dados_aluno, disciplinas, preencher_nulos=False):
     """
     Converte os dados obtidos do banco em DataFrame e faz processamentos necessários
@@ -360,8 +541,8 @@ def processar_dados_alunos(dados_aluno, disciplinas, preencher_nulos=False):
     Returns:
         DataFrame: Dados processados
     """
-    # Verificar se existem dados para processar
-    if not dados_aluno:
+    # Verificar se existem dados para processar (lista de linhas ou DataFrame)
+    if dados_aluno is None or len(dados_aluno) == 0:
         logger.info("Aviso: Nenhum dado de aluno fornecido para processamento")
         return pd.DataFrame()  # Retorna DataFrame vazio
     
@@ -961,16 +1142,12 @@ def gerar_relatorio_notas(bimestre=None, nivel_ensino="iniciais", ano_letivo=Non
         
         # Configurações baseadas no nível de ensino
         if nivel_ensino == "iniciais":
-            filtro_serie = "s.id <= 7"
             disciplinas = obter_disciplinas_iniciais()
             nome_arquivo = f'Notas {bimestre} {ano_letivo}.pdf'
-            nivel_id = 2
             tipo_ensino = "fundamental_iniciais"
         elif nivel_ensino == "finais":
-            filtro_serie = "s.id > 7"
             disciplinas = obter_disciplinas_finais()
             nome_arquivo = f'Notas {bimestre} {ano_letivo} Series Finais.pdf'
-            nivel_id = 3
             tipo_ensino = "fundamental_finais"
         else:
             raise ValueError(f"Nível de ensino '{nivel_ensino}' inválido. Use 'iniciais' ou 'finais'.")
@@ -979,23 +1156,17 @@ def gerar_relatorio_notas(bimestre=None, nivel_ensino="iniciais", ano_letivo=Non
         if status_matricula and ('Transferido' in status_matricula if isinstance(status_matricula, (list, tuple)) else status_matricula == 'Transferido'):
             nome_arquivo = nome_arquivo.replace('.pdf', ' (com Transferidos).pdf')
         
-        # Conectar ao banco de dados e executar a consulta de leitura
-        with get_cursor() as cursor:
-            # Ajustar a consulta SQL para usar todos os parâmetros
-            query = construir_consulta_sql(
-                bimestre=bimestre, 
-                filtro_serie=filtro_serie, 
-                disciplinas=disciplinas, 
-                nivel_id=nivel_id, 
-                ano_letivo=ano_letivo,
-                escola_id=escola_id,
-                status_matricula=status_matricula
-            )
-
-            cursor.execute(query)
-            dados_aluno = cursor.fetchall()
-
-        if not dados_aluno:
+        # Notas do ano/escola vêm do cache (uma busca atende todos os bimestres e níveis)
+        dados_aluno = obter_dados_ata(
+            bimestre=bimestre,
+            nivel_ensino=nivel_ensino,
+            disciplinas=disciplinas,
+            ano_letivo=ano_letivo,
+            escola_id=escola_id,
+            status_matricula=status_matricula
+        )
+
+        if dados_aluno.empty:
             logger.info(f"Nenhum dado encontrado para o bimestre {bimestre} e nível {nivel_ensino} no ano {ano_letivo}")
             return False
 
@@ -1074,16 +1245,12 @@ def gerar_relatorio_notas_com_assinatura(bimestre=None, nivel_ensino="iniciais",
         
         # Configurações baseadas no nível de ensino
         if nivel_ensino == "iniciais":
-            filtro_serie = "s.id <= 7"
             disciplinas = obter_disciplinas_iniciais()
             nome_arquivo = f'Notas {bimestre} {ano_letivo} (Com Assinatura).pdf'
-            nivel_id = 2
             tipo_ensino = "fundamental_iniciais"
         elif nivel_ensino == "finais":
-            filtro_serie = "s.id > 7"
             disciplinas = obter_disciplinas_finais()
             nome_arquivo = f'Notas {bimestre} {ano_letivo} Series Finais (Com Assinatura).pdf'
-            nivel_id = 3
             tipo_ensino = "fundamental_finais"
         else:
             raise ValueError(f"Nível de ensino '{nivel_ensino}' inválido. Use 'iniciais' ou 'finais'.")
@@ -1092,23 +1259,17 @@ def gerar_relatorio_notas_com_assinatura(bimestre=None, nivel_ensino="iniciais",
         if status_matricula and ('Transferido' in status_matricula if isinstance(status_matricula, (list, tuple)) else status_matricula == 'Transferido'):
             nome_arquivo = nome_arquivo.replace('.pdf', ' (com Transferidos).pdf')
         
-        # Conectar ao banco de dados e executar a consulta de leitura
-        with get_cursor() as cursor:
-            # Ajustar a consulta SQL para usar todos os parâmetros
-            query = construir_consulta_sql(
-                bimestre=bimestre, 
-                filtro_serie=filtro_serie, 
-                disciplinas=disciplinas, 
-                nivel_id=nivel_id, 
-                ano_letivo=ano_letivo,
-                escola_id=escola_id,
-                status_matricula=status_matricula
-            )
-
-            cursor.execute(query)
-            dados_aluno = cursor.fetchall()
-
-        if not dados_aluno:
+        # Notas do ano/escola vêm do cache (uma busca atende todos os bimestres e níveis)
+        dados_aluno = obter_dados_ata(
+            bimestre=bimestre,
+            nivel_ensino=nivel_ensino,
+            disciplinas=disciplinas,
+            ano_letivo=ano_letivo,
+            escola_id=escola_id,
+            status_matricula=status_matricula
+        )
+
+        if dados_aluno.empty:
             logger.info(f"Nenhum dado encontrado para o bimestre {bimestre} e nível {nivel_ensino} no ano {ano_letivo}")
             return False
 
@@ -10,6 +10,7 @@ from tkinter import ttk, messagebox
 from tkinter import font as tkfont
 from src.core.conexao import conectar_bd
 from src.core.config import ANO_LETIVO_ATUAL
+from src.services import referencia_service
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
@@ -224,16 +225,9 @@ class RelatorioAnaliseNotas:
     def carregar_niveis(self):
         """Carrega níveis de ensino"""
         try:
-            conn: Any = conectar_bd()
-            cursor = cast(Any, conn).cursor()
-            cursor.execute("SELECT id, nome FROM niveisensino ORDER BY nome")
-            niveis = cursor.fetchall()
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+            niveis = referencia_service.listar_niveis_ensino()
             
-            self.niveis_map = {nivel[1]: nivel[0] for nivel in niveis}
+            self.niveis_map = {nivel['nome']: nivel['id'] for nivel in niveis}
             self.cb_nivel['values'] = list(self.niveis_map.keys())
             
             if self.cb_nivel['values']:
@@ -251,19 +245,9 @@ class RelatorioAnaliseNotas:
         nivel_id = self.niveis_map.get(self.cb_nivel.get())
         
         try:
-            conn: Any = conectar_bd()
-            cursor = cast(Any, conn).cursor()
-            cursor.execute(
-                "SELECT id, nome FROM series WHERE nivel_id = %s ORDER BY nome",
-                (nivel_id,)
-            )
-            series = cursor.fetchall()
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+            series = referencia_service.listar_series(nivel_id=nivel_id)
             
-            self.series_map = {serie[1]: serie[0] for serie in series}
+            self.series_map = {serie['nome']: serie['id'] for serie in series}
             self.cb_serie['values'] = list(self.series_map.keys())
             
             if self.cb_serie['values']:
@@ -284,21 +268,9 @@ class RelatorioAnaliseNotas:
         serie_id = self.series_map.get(self.cb_serie.get())
         
         try:
-            conn: Any = conectar_bd()
-            cursor = cast(Any, conn).cursor()
-            cursor.execute("""
-                SELECT t.id, CONCAT(t.nome, ' - ', t.turno) AS turma_nome 
-                FROM turmas t 
-                WHERE t.serie_id = %s AND t.ano_letivo_id = %s
-                ORDER BY t.nome
-            """, (serie_id, self.ano_letivo_atual))
-            turmas = cursor.fetchall()
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+            turmas = referencia_service.listar_turmas(serie_id=serie_id, ano_letivo_id=self.ano_letivo_atual)
             
-            self.turmas_map = {turma[1]: turma[0] for turma in turmas}
+            self.turmas_map = {f"{t['nome']} - {t['turno']}": t['id'] for t in turmas}
             self.cb_turma['values'] = ["Todas"] + list(self.turmas_map.keys())
             
             if self.cb_turma['values']:
@@ -14,6 +14,7 @@ Refatorado no Sprint 22 — removido acoplamento com tkinter.
 from typing import Tuple, List, Dict, Optional
 from mysql.connector import Error as MySQLError
 from db.connection import get_cursor
+from src.services.log_alteracoes_service import registrar_alteracao
 from src.core.config_logs import get_logger
 from src.core.config import ANO_LETIVO_ATUAL
 from src.utils.safe import converter_para_int_seguro
@@ -284,6 +285,7 @@ def excluir_aluno_com_confirmacao(aluno_id: int, nome_aluno: str, callback_suces
     try:
         with get_cursor(commit=True) as cursor:
             cursor.execute("DELETE FROM alunos WHERE id = %s", (aluno_id_int,))
+            registrar_alteracao(cursor, 'aluno', aluno_id_int, 'exclusao')
             logger.info(f"Aluno {aluno_id_int} ({nome_aluno}) excluído com sucesso")
             
             if callback_sucesso:
@@ -0,0 +1,307 @@
+"""
+Serviço de busca de pessoas (alunos e funcionários) da pesquisa principal
+
+Substitui as consultas FULLTEXT/LIKE feitas a cada pesquisa por um índice
+em memória de nomes e CPFs:
+
+- termos do nome sem acentos, em lista ordenada: cada palavra digitada
+  casa por prefixo ("jo sil" encontra "João da Silva");
+- trigramas do nome completo, usados quando nenhuma pessoa casa por
+  prefixo (erros de digitação, "Sousa"/"Souza");
+- dígitos do CPF, buscados por prefixo.
+
+O índice é carregado na primeira pesquisa (ou por ``aquecer``), mantido
+atualizado pelos eventos de :mod:`src.services.log_alteracoes_service` e
+relido por completo a cada ``INTERVALO_RECARGA`` segundos para cobrir
+gravações que não passam pelos serviços.
+
+As funções deste módulo bloqueiam; a UI as chama de uma thread de trabalho
+(ver :class:`src.ui.search.PesquisaAssincrona`).
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from db.connection import get_cursor
+from src.core.config_logs import get_logger
+from src.services.log_alteracoes_service import assinar
+
+logger = get_logger(__name__)
+
+TIPO_ALUNO = 'Aluno'
+TIPO_FUNCIONARIO = 'Funcionário'
+
+# Releitura completa periódica (gravações fora dos serviços)
+INTERVALO_RECARGA = 900.0
+
+# Resultados devolvidos por pesquisa
+LIMITE_RESULTADOS = 1000
+
+# Busca aproximada: fração mínima dos trigramas da pesquisa presentes no nome
+SIMILARIDADE_MINIMA = 0.6
+
+# Dígitos mínimos para tratar a pesquisa como CPF
+MIN_DIGITOS_CPF = 3
+
+_QUERY_ALUNOS = "SELECT id, nome, NULL AS cargo, data_nascimento, cpf FROM alunos"
+_QUERY_FUNCIONARIOS = "SELECT id, nome, funcao AS cargo, data_nascimento, cpf FROM funcionarios"
+
+_RE_TERMO = re.compile(r'[a-z0-9]+')
+_RE_NAO_DIGITO = re.compile(r'\D')
+
+Chave = Tuple[str, int]
+
+
+class Pessoa(NamedTuple):
+    id: int
+    nome: str
+    tipo: str
+    cargo: Optional[str]
+    data_nascimento: Any
+    cpf: str
+
+
+def normalizar(texto: Any) -> str:
+    """Minúsculas, sem acentos."""
+    texto = unicodedata.normalize('NFKD', str(texto or ''))
+    return ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+
+
+def _trigramas(texto: str) -> Set[str]:
+    texto = f'  {texto} '
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndicePessoas:
+    """
+    Índice de prefixos, trigramas e CPF sobre alunos e funcionários.
+
+    ``buscar``, ``atualizar`` e ``remover`` são serializados por um lock
+    próprio: os eventos de alteração chegam na thread do monitor enquanto a
+    pesquisa roda na thread de trabalho da UI.
+    """
+
+    def __init__(self, pessoas: Iterable[Pessoa] = ()):
+        self._lock = threading.Lock()
+        self._pessoas: Dict[Chave, Pessoa] = {}
+        self._ordem: Dict[Chave, Tuple[str, str]] = {}
+        self._termos_de: Dict[Chave, Tuple[str, ...]] = {}
+        self._grams_de: Dict[Chave, Set[str]] = {}
+        self._por_termo: Dict[str, Set[Chave]] = defaultdict(set)
+        self._termos: List[str] = []
+        self._por_grama: Dict[str, Set[Chave]] = defaultdict(set)
+        self._cpfs: List[Tuple[str, Chave]] = []
+        self.atualizar(pessoas)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pessoas)
+
+    def _remover(self, chave: Chave) -> None:
+        pessoa = self._pessoas.pop(chave, None)
+        if pessoa is None:
+            return
+        del self._ordem[chave]
+        for termo in self._termos_de.pop(chave):
+            chaves = self._por_termo[termo]
+            chaves.discard(chave)
+            if not chaves:
+                del self._por_termo[termo]
+                i = bisect_left(self._termos, termo)
+                if i < len(self._termos) and self._termos[i] == termo:
+                    del self._termos[i]
+        for grama in self._grams_de.pop(chave):
+            chaves = self._por_grama[grama]
+            chaves.discard(chave)
+            if not chaves:
+                del self._por_grama[grama]
+        if pessoa.cpf:
+            i = bisect_left(self._cpfs, (pessoa.cpf, chave))
+            if i < len(self._cpfs) and self._cpfs[i] == (pessoa.cpf, chave):
+                del self._cpfs[i]
+
+    def atualizar(self, pessoas: Iterable[Pessoa]) -> None:
+        """Insere ou substitui pessoas (chave: tipo + id)."""
+        with self._lock:
+            for pessoa in pessoas:
+                self._inserir(pessoa)
+
+    def _inserir(self, pessoa: Pessoa) -> None:
+        chave = (pessoa.tipo, pessoa.id)
+        self._remover(chave)
+        nome = normalizar(pessoa.nome)
+        termos = tuple(dict.fromkeys(_RE_TERMO.findall(nome)))
+        grams = _trigramas(' '.join(termos))
+
+        self._pessoas[chave] = pessoa
+        self._ordem[chave] = (pessoa.tipo, nome)
+        self._termos_de[chave] = termos
+        self._grams_de[chave] = grams
+        for termo in termos:
+            if termo not in self._por_termo:
+                insort(self._termos, termo)
+            self._por_termo[termo].add(chave)
+        for grama in grams:
+            self._por_grama[grama].add(chave)
+        if pessoa.cpf:
+            insort(self._cpfs, (pessoa.cpf, chave))
+
+    def remover(self, tipo: str, ids: Iterable[int]) -> None:
+        with self._lock:
+            for i in ids:
+                self._remover((tipo, int(i)))
+
+    def substituir(self, tipo: str, ids: Iterable[int], pessoas: Iterable[Pessoa]) -> None:
+        """Remove ``ids`` e insere ``pessoas`` num só passo (a pesquisa não vê o meio-termo)."""
+        with self._lock:
+            for i in ids:
+                self._remover((tipo, int(i)))
+            for pessoa in pessoas:
+                self._inserir(pessoa)
+
+    def _com_prefixo(self, prefixo: str) -> Set[Chave]:
+        encontrados: Set[Chave] = set()
+        i = bisect_left(self._termos, prefixo)
+        while i < len(self._termos) and self._termos[i].startswith(prefixo):
+            encontrados |= self._por_termo.get(self._termos[i], set())
+            i += 1
+        return encontrados
+
+    def _por_prefixos(self, termos: List[str]) -> Set[Chave]:
+        # Termo mais longo primeiro: costuma ser o mais seletivo
+        resultado: Optional[Set[Chave]] = None
+        for termo in sorted(termos, key=len, reverse=True):
+            chaves = self._com_prefixo(termo)
+            resultado = chaves if resultado is None else resultado & chaves
+            if not resultado:
+                return set()
+        return resultado or set()
+
+    def _aproximados(self, texto: str, cancelado: Callable[[], bool]) -> Set[Chave]:
+        grams = _trigramas(texto)
+        comuns: Counter = Counter()
+        for grama in grams:
+            if cancelado():
+                return set()
+            comuns.update(self._por_grama.get(grama, ()))
+        minimo = SIMILARIDADE_MINIMA * len(grams)
+        return {chave for chave, n in comuns.items() if n >= minimo}
+
+    def _por_cpf(self, digitos: str) -> Set[Chave]:
+        encontrados: Set[Chave] = set()
+        i = bisect_left(self._cpfs, (digitos,))
+        while i < len(self._cpfs) and self._cpfs[i][0].startswith(digitos):
+            encontrados.add(self._cpfs[i][1])
+            i += 1
+        return encontrados
+
+    def buscar(self, texto: str, limite: int = LIMITE_RESULTADOS,
+               cancelado: Callable[[], bool] = lambda: False) -> List[Pessoa]:
+        """
+        Pessoas que casam com ``texto``, ordenadas por tipo e nome.
+
+        Args:
+            texto: Nome (ou trecho de palavras do nome) ou dígitos do CPF
+            limite: Máximo de resultados
+            cancelado: Consultado durante a busca aproximada; se devolver
+                       True a busca é abandonada
+        """
+        normalizado = normalizar(texto).strip()
+        termos = _RE_TERMO.findall(normalizado)
+        if not termos:
+            return []
+
+        digitos = _RE_NAO_DIGITO.sub('', normalizado)
+        with self._lock:
+            if len(digitos) >= MIN_DIGITOS_CPF and not re.search(r'[a-z]', normalizado):
+                chaves = self._por_cpf(digitos)
+            else:
+                chaves = self._por_prefixos(termos)
+                if not chaves:
+                    chaves = self._aproximados(' '.join(termos), cancelado)
+
+            ordenadas = sorted(chaves, key=self._ordem.__getitem__)
+            return [self._pessoas[c] for c in ordenadas[:limite]]
+
+
+def _pessoa(linha: Dict[str, Any], tipo: str) -> Pessoa:
+    return Pessoa(
+        int(linha['id']), linha['nome'] or '', tipo, linha.get('cargo'),
+        linha.get('data_nascimento'), _RE_NAO_DIGITO.sub('', str(linha.get('cpf') or '')),
+    )
+
+
+def _consultar(tipo: str, ids: Optional[Iterable[int]] = None) -> List[Pessoa]:
+    sql = _QUERY_ALUNOS if tipo == TIPO_ALUNO else _QUERY_FUNCIONARIOS
+    params: tuple = ()
+    if ids is not None:
+        params = tuple(ids)
+        if not params:
+            return []
+        sql += f" WHERE id IN ({', '.join(['%s'] * len(params))})"
+    with get_cursor() as cursor:
+        cursor.execute(sql, params)
+        return [_pessoa(linha, tipo) for linha in cursor.fetchall() or []]
+
+
+_lock = threading.Lock()
+_indice: Optional[IndicePessoas] = None
+_carregado_em = 0.0
+
+_TIPOS = {'aluno': TIPO_ALUNO, 'funcionario': TIPO_FUNCIONARIO}
+
+
+def obter_indice() -> IndicePessoas:
+    """Índice do processo, carregado (ou relido) quando necessário."""
+    global _indice, _carregado_em
+    with _lock:
+        if _indice is not None and time.monotonic() - _carregado_em < INTERVALO_RECARGA:
+            return _indice
+        inicio = time.perf_counter()
+        indice = IndicePessoas(_consultar(TIPO_ALUNO) + _consultar(TIPO_FUNCIONARIO))
+        _indice, _carregado_em = indice, time.monotonic()
+        logger.info(f"Índice de pessoas carregado: {len(indice)} registros "
+                    f"em {time.perf_counter() - inicio:.2f}s")
+        return indice
+
+
+def aquecer() -> None:
+    """Carrega o índice (para chamar em segundo plano na abertura)."""
+    try:
+        obter_indice()
+    except Exception as e:
+        logger.warning(f"Não foi possível carregar o índice de pessoas: {e}")
+
+
+def pesquisar(texto: str, limite: int = LIMITE_RESULTADOS,
+              cancelado: Callable[[], bool] = lambda: False) -> List[Pessoa]:
+    """Pesquisa no índice do processo (bloqueia na primeira carga)."""
+    return obter_indice().buscar(texto, limite=limite, cancelado=cancelado)
+
+
+def invalidar_indice() -> None:
+    """Força a releitura completa na próxima pesquisa."""
+    global _carregado_em
+    with _lock:
+        _carregado_em = 0.0
+
+
+def _ao_alterar(entidade: str, ids: Optional[Set[int]]) -> None:
+    global _carregado_em
+    tipo = _TIPOS[entidade]
+    with _lock:
+        if _indice is None:
+            return
+        if ids is None:
+            # Alteração sem id (em massa): releitura completa na próxima pesquisa
+            _carregado_em = 0.0
+            return
+        _indice.substituir(tipo, ids, _consultar(tipo, ids))
+
+
+assinar(('aluno', 'funcionario'), _ao_alterar)
@@ -7,15 +7,93 @@ from typing import Dict, List, Optional, Any
 from mysql.connector import Error as MySQLError
 import logging
 from db.connection import get_cursor
+from src.services.log_alteracoes_service import assinar
 from src.utils.cache import dashboard_cache
 
 logger = logging.getLogger(__name__)
 
+# Funções do dashboard_cache que dependem de alunos/matrículas/turmas
+_PADROES_DASHBOARD = (
+    'obter_estatisticas',
+    'obter_movimento_mensal_resumo',
+    'calcular_media_idade_alunos',
+)
+
+
+def _invalidar_dashboard(entidade, ids):
+    """Descarta as estatísticas em cache após alteração feita em qualquer cliente."""
+    total = sum(dashboard_cache.invalidate_pattern(p) for p in _PADROES_DASHBOARD)
+    if total:
+        logger.debug(f"Cache do dashboard invalidado por alteração em '{entidade}': {total} entradas")
+
+
+assinar(('aluno', 'matricula', 'turma'), _invalidar_dashboard)
+
+
+# Status que contam como "aluno da escola no ano" no dashboard
+STATUS_MATRICULADOS = ('Ativo', 'Transferido', 'Transferida')
+
+# Contadores mantidos pelos triggers de db/migrations/criar_estatisticas_matriculas.sql
+_QUERY_CONTADORES = """
+    SELECT
+        e.serie_id, s.nome AS serie, e.turma_id, t.nome AS turma,
+        e.turno, e.sexo, e.status, e.quantidade
+    FROM estatisticas_matriculas e
+    INNER JOIN series s ON s.id = e.serie_id
+    INNER JOIN turmas t ON t.id = e.turma_id
+    WHERE e.escola_id = %s AND e.ano_letivo_id = {ano_letivo}
+      AND e.quantidade > 0
+"""
+
+
+# Alunos distintos com matrícula no ano (um aluno com duas matrículas, por
+# exemplo após transferência entre turmas, conta uma vez) e total no cadastro
+_QUERY_TOTAIS_ALUNOS = f"""
+    SELECT
+        (SELECT COUNT(*) FROM alunos WHERE escola_id = %s) AS total_cadastrados,
+        (SELECT COUNT(DISTINCT m.aluno_id)
+         FROM matriculas m
+         INNER JOIN alunos a ON a.id = m.aluno_id
+         WHERE a.escola_id = %s
+           AND m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
+           AND m.status IN ({', '.join(repr(s) for s in STATUS_MATRICULADOS)})) AS total_alunos
+"""
+
+
+def _ler_contadores(cursor, escola_id: int, ano_letivo: Optional[str] = None,
+                    ano_letivo_id: Optional[int] = None) -> List[Dict]:
+    """Lê os contadores materializados de uma escola/ano (poucas dezenas de linhas)."""
+    if ano_letivo_id is not None:
+        cursor.execute(_QUERY_CONTADORES.format(ano_letivo='%s'), (escola_id, ano_letivo_id))
+    else:
+        cursor.execute(
+            _QUERY_CONTADORES.format(ano_letivo='(SELECT id FROM AnosLetivos WHERE ano_letivo = %s)'),
+            (escola_id, ano_letivo)
+        )
+    colunas = ('serie_id', 'serie', 'turma_id', 'turma', 'turno', 'sexo', 'status', 'quantidade')
+    return [
+        r if isinstance(r, dict) else dict(zip(colunas, r))
+        for r in (cursor.fetchall() or [])
+    ]
+
+
+def _somar(contadores: List[Dict], chave, status=STATUS_MATRICULADOS) -> Dict[Any, int]:
+    """Soma ``quantidade`` agrupando por ``chave(linha)`` (ordem de inserção preservada)."""
+    totais: Dict[Any, int] = {}
+    for linha in contadores:
+        if status is None or linha['status'] in status:
+            k = chave(linha)
+            totais[k] = totais.get(k, 0) + int(linha['quantidade'])
+    return totais
+
 
-@dashboard_cache.cached(ttl=600)  # Cache de 10 minutos
 def obter_estatisticas_alunos(escola_id: int = 60, ano_letivo: Optional[str] = None) -> Optional[Dict]:
     """
-    Calcula estatísticas gerais de alunos da escola (OTIMIZADO + CACHE).
+    Calcula estatísticas gerais de alunos da escola.
+    
+    Lê a tabela estatisticas_matriculas, atualizada pelos triggers a cada
+    matrícula/transferência/cancelamento; por isso não usa cache e nunca
+    fica desatualizada.
     
     Args:
         escola_id: ID da escola (padrão: 60)
@@ -25,7 +103,7 @@ def obter_estatisticas_alunos(escola_id: int = 60, ano_letivo: Optional[str] = N
         dict: Estatísticas ou None em caso de erro
     """
     try:
-        logger.debug(f"Iniciando obter_estatisticas_alunos OTIMIZADO para escola_id={escola_id}, ano_letivo={ano_letivo}")
+        logger.debug(f"Iniciando obter_estatisticas_alunos para escola_id={escola_id}, ano_letivo={ano_letivo}")
         
         with get_cursor() as cursor:
             if cursor is None:
@@ -45,156 +123,41 @@ def obter_estatisticas_alunos(escola_id: int = 60, ano_letivo: Optional[str] = N
                 ano_letivo = resultado['ano_letivo'] if resultado else str(__import__('datetime').datetime.now().year)
                 logger.debug(f"Ano letivo: {ano_letivo}")
             
-            # QUERY OTIMIZADA: Uma única query com todas as agregações
-            logger.debug("Executando query otimizada única...")
-            cursor.execute("""
-                WITH base_alunos AS (
-                    SELECT 
-                        m.aluno_id,
-                        m.status,
-                        s.nome as serie,
-                        t.nome as turma,
-                        t.turno
-                    FROM matriculas m
-                    INNER JOIN turmas t ON m.turma_id = t.id
-                    INNER JOIN series s ON t.serie_id = s.id
-                    INNER JOIN alunos a ON m.aluno_id = a.id
-                    WHERE m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                      AND a.escola_id = %s
-                      AND (m.status = 'Ativo' OR m.status = 'Transferido' OR m.status = 'Transferida')
-                )
-                SELECT 
-                    COUNT(DISTINCT aluno_id) as total_alunos,
-                    SUM(CASE WHEN status = 'Ativo' THEN 1 ELSE 0 END) as alunos_ativos,
-                    GROUP_CONCAT(DISTINCT CONCAT_WS(':', serie, turma, turno)) as turmas_detalhes
-                FROM base_alunos
-            """, (ano_letivo, escola_id))
-            
-            resultado_base = cursor.fetchone()
-            
-            if not resultado_base:
-                return {
-                    'total_alunos': 0,
-                    'alunos_ativos': 0,
-                    'alunos_por_serie': [],
-                    'alunos_por_serie_turma': [],
-                    'alunos_por_turno': []
-                }
-            
-            # Extrair totais
-            estatisticas = {
-                'total_alunos': resultado_base['total_alunos'] if isinstance(resultado_base, dict) else resultado_base[0],
-                'alunos_ativos': resultado_base['alunos_ativos'] if isinstance(resultado_base, dict) else resultado_base[1]
-            }
-            
-            logger.debug(f"Total: {estatisticas['total_alunos']}, Ativos: {estatisticas['alunos_ativos']}")
-            
-            # Agora buscar agregações por série e turma (queries menores)
-            cursor.execute("""
-                SELECT 
-                    s.nome as serie, 
-                    COUNT(DISTINCT m.aluno_id) as total
-                FROM matriculas m
-                INNER JOIN turmas t ON m.turma_id = t.id
-                INNER JOIN series s ON t.serie_id = s.id
-                INNER JOIN alunos a ON m.aluno_id = a.id
-                WHERE m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                  AND a.escola_id = %s
-                  AND (m.status = 'Ativo' OR m.status = 'Transferido' OR m.status = 'Transferida')
-                GROUP BY s.id, s.nome
-                ORDER BY s.nome
-            """, (ano_letivo, escola_id))
-            
-            resultados = cursor.fetchall()
-            alunos_por_serie = []
-            if resultados:
-                if isinstance(resultados[0], dict):
-                    alunos_por_serie = [{'serie': r['serie'], 'quantidade': r['total']} for r in resultados]
-                else:
-                    alunos_por_serie = [{'serie': r[0], 'quantidade': r[1]} for r in resultados]
-            
-            estatisticas['alunos_por_serie'] = alunos_por_serie
-            logger.debug(f"Séries: {len(alunos_por_serie)}")
-            
-            # Alunos por série E turma
-            cursor.execute("""
-                SELECT 
-                    s.nome as serie, 
-                    t.nome as turma,
-                    COUNT(DISTINCT m.aluno_id) as total
-                FROM matriculas m
-                INNER JOIN turmas t ON m.turma_id = t.id
-                INNER JOIN series s ON t.serie_id = s.id
-                INNER JOIN alunos a ON m.aluno_id = a.id
-                WHERE m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                  AND a.escola_id = %s
-                  AND (m.status = 'Ativo' OR m.status = 'Transferido' OR m.status = 'Transferida')
-                GROUP BY s.id, s.nome, t.id, t.nome
-                ORDER BY s.nome, t.nome
-            """, (ano_letivo, escola_id))
-            
-            resultados = cursor.fetchall()
-            alunos_por_turma = []
-            if resultados:
-                if isinstance(resultados[0], dict):
-                    alunos_por_turma = [{'serie': r['serie'], 'turma': r['turma'], 'quantidade': r['total']} for r in resultados]
-                else:
-                    alunos_por_turma = [{'serie': r[0], 'turma': r[1], 'quantidade': r[2]} for r in resultados]
-            
-            estatisticas['alunos_por_serie_turma'] = alunos_por_turma
-            logger.debug(f"Turmas: {len(alunos_por_turma)}")
-            
-            # Alunos por turno (apenas ativos, sem transferidos)
-            cursor.execute("""
-                SELECT t.turno, COUNT(DISTINCT m.aluno_id) as total
-                FROM matriculas m
-                INNER JOIN turmas t ON m.turma_id = t.id
-                INNER JOIN alunos a ON m.aluno_id = a.id
-                WHERE m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                  AND a.escola_id = %s
-                  AND m.status = 'Ativo'
-                GROUP BY t.turno
-            """, (ano_letivo, escola_id))
-            
-            resultados = cursor.fetchall()
-            alunos_por_turno = []
-            
-            if resultados:
-                if isinstance(resultados[0], dict):
-                    alunos_por_turno = [{'turno': r['turno'], 'quantidade': r['total']} for r in resultados]
-                else:
-                    alunos_por_turno = [{'turno': r[0], 'quantidade': r[1]} for r in resultados]
-            
-            estatisticas['alunos_por_turno'] = alunos_por_turno
-            
-            # Alunos transferidos no ano letivo
-            cursor.execute("""
-                SELECT COUNT(DISTINCT m.aluno_id) as total
-                FROM matriculas m
-                INNER JOIN alunos a ON m.aluno_id = a.id
-                WHERE m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                  AND a.escola_id = %s
-                  AND (m.status = 'Transferido' OR m.status = 'Transferida')
-            """, (ano_letivo, escola_id))
-            resultado = cursor.fetchone()
-            estatisticas['alunos_transferidos'] = resultado['total'] if resultado else 0
+            contadores = _ler_contadores(cursor, escola_id, ano_letivo=ano_letivo)
             
             # Alunos sem matrícula (calculado como diferença)
-            # Total no cadastro - Total com matrícula ativa/transferida
-            cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM alunos
-                WHERE escola_id = %s
-            """, (escola_id,))
-            resultado = cursor.fetchone()
-            total_cadastrados = resultado['total'] if resultado else 0
-            
-            estatisticas['alunos_sem_matricula'] = (
-                total_cadastrados - estatisticas['total_alunos']
-            )
-            
-            logger.debug(f"Estatísticas calculadas com sucesso: {estatisticas['total_alunos']} alunos total, {len(alunos_por_serie)} séries")
-            return estatisticas
+            # Total no cadastro - Alunos distintos com matrícula ativa/transferida
+            cursor.execute(_QUERY_TOTAIS_ALUNOS, (escola_id, escola_id, ano_letivo))
+            resultado = cursor.fetchone() or {}
+            total_cadastrados = int(resultado.get('total_cadastrados') or 0)
+            total_alunos = int(resultado.get('total_alunos') or 0)
+        
+        contadores.sort(key=lambda r: (r['serie'] or '', r['turma'] or ''))
+        por_serie = _somar(contadores, lambda r: (r['serie_id'], r['serie']))
+        por_turma = _somar(contadores, lambda r: (r['serie'], r['turma_id'], r['turma']))
+        
+        estatisticas = {
+            'total_alunos': total_alunos,
+            'alunos_ativos': sum(_somar(contadores, lambda r: None, status=('Ativo',)).values()),
+            'alunos_por_serie': [{'serie': serie, 'quantidade': qtd} for (_, serie), qtd in por_serie.items()],
+            'alunos_por_serie_turma': [
+                {'serie': serie, 'turma': turma, 'quantidade': qtd}
+                for (serie, _, turma), qtd in por_turma.items()
+            ],
+            # Alunos por turno (apenas ativos, sem transferidos)
+            'alunos_por_turno': [
+                {'turno': turno, 'quantidade': qtd}
+                for turno, qtd in _somar(contadores, lambda r: r['turno'], status=('Ativo',)).items()
+            ],
+            'alunos_por_sexo': _somar(contadores, lambda r: r['sexo'], status=('Ativo',)),
+            'alunos_transferidos': sum(
+                _somar(contadores, lambda r: None, status=('Transferido', 'Transferida')).values()
+            ),
+            'alunos_sem_matricula': total_cadastrados - total_alunos,
+        }
+        
+        logger.debug(f"Estatísticas calculadas com sucesso: {total_alunos} alunos total, {len(por_serie)} séries")
+        return estatisticas
             
     except MySQLError as e:
         logger.exception(f"Erro MySQL ao calcular estatísticas de alunos: {e}")
@@ -204,10 +167,9 @@ def obter_estatisticas_alunos(escola_id: int = 60, ano_letivo: Optional[str] = N
         return None
 
 
-@dashboard_cache.cached(ttl=600)  # Cache de 10 minutos
 def obter_estatisticas_por_ano_letivo(ano_letivo_id: int, escola_id: int = 60) -> Optional[Dict]:
     """
-    Calcula estatísticas de alunos para um ano letivo específico (CACHE).
+    Calcula estatísticas de alunos para um ano letivo específico.
     
     Args:
         ano_letivo_id: ID do ano letivo
@@ -217,60 +179,21 @@ def obter_estatisticas_por_ano_letivo(ano_letivo_id: int, escola_id: int = 60) -
         dict: Estatísticas ou None em caso de erro
     """
     try:
-        estatisticas = {}
-        
         with get_cursor() as cursor:
-            # Matrículas no ano
-            cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM matriculas m
-                INNER JOIN alunos a ON m.aluno_id = a.id
-                WHERE m.ano_letivo_id = %s AND a.escola_id = %s
-            """, (ano_letivo_id, escola_id))
-            resultado = cursor.fetchone()
-            estatisticas['total_matriculas'] = resultado[0] if resultado else 0
-            
-            # Matrículas por status
-            cursor.execute("""
-                SELECT m.status, COUNT(*) as total
-                FROM matriculas m
-                INNER JOIN alunos a ON m.aluno_id = a.id
-                WHERE m.ano_letivo_id = %s AND a.escola_id = %s
-                GROUP BY m.status
-            """, (ano_letivo_id, escola_id))
-            
-            resultados = cursor.fetchall()
-            matriculas_por_status = {}
-            
-            if resultados:
-                if isinstance(resultados[0], dict):
-                    matriculas_por_status = {r['status']: r['total'] for r in resultados}
-                else:
-                    matriculas_por_status = {r[0]: r[1] for r in resultados}
-            
-            estatisticas['matriculas_por_status'] = matriculas_por_status
-            
-            # Taxa de conclusão (se houver dados de conclusão)
-            cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM matriculas m
-                INNER JOIN alunos a ON m.aluno_id = a.id
-                WHERE m.ano_letivo_id = %s 
-                AND a.escola_id = %s 
-                AND m.status = 'Concluído'
-            """, (ano_letivo_id, escola_id))
-            resultado = cursor.fetchone()
-            concluidos = resultado[0] if resultado else 0
-            
-            if estatisticas['total_matriculas'] > 0:
-                estatisticas['taxa_conclusao'] = (
-                    concluidos / estatisticas['total_matriculas'] * 100
-                )
-            else:
-                estatisticas['taxa_conclusao'] = 0
-            
-            logger.info(f"Estatísticas do ano letivo {ano_letivo_id} calculadas")
-            return estatisticas
+            contadores = _ler_contadores(cursor, escola_id, ano_letivo_id=ano_letivo_id)
+        
+        matriculas_por_status = _somar(contadores, lambda r: r['status'], status=None)
+        total_matriculas = sum(matriculas_por_status.values())
+        concluidos = matriculas_por_status.get('Concluído', 0)
+        
+        estatisticas = {
+            'total_matriculas': total_matriculas,
+            'matriculas_por_status': matriculas_por_status,
+            'taxa_conclusao': concluidos / total_matriculas * 100 if total_matriculas > 0 else 0,
+        }
+        
+        logger.info(f"Estatísticas do ano letivo {ano_letivo_id} calculadas")
+        return estatisticas
             
     except MySQLError as e:
         logger.exception(f"Erro MySQL ao calcular estatísticas do ano letivo {ano_letivo_id}")
@@ -280,7 +203,52 @@ def obter_estatisticas_por_ano_letivo(ano_letivo_id: int, escola_id: int = 60) -
         return None
 
 
-@dashboard_cache.cached(ttl=600)  # Cache de 10 minutos
+def reconstruir_estatisticas_matriculas(escola_id: Optional[int] = None) -> Optional[int]:
+    """
+    Recalcula estatisticas_matriculas a partir das matrículas.
+    
+    Os triggers mantêm os contadores; esta função serve para a carga inicial,
+    para cargas feitas sem triggers ou para conferir os contadores.
+    
+    Args:
+        escola_id: Escola a reconstruir (se None, todas)
+        
+    Returns:
+        int: Quantidade de linhas de contadores gravadas ou None em caso de erro
+    """
+    filtro = "WHERE a.escola_id = %s" if escola_id is not None else ""
+    params = (escola_id,) if escola_id is not None else ()
+    try:
+        with get_cursor(commit=True) as cursor:
+            cursor.execute(
+                "DELETE FROM estatisticas_matriculas" + (" WHERE escola_id = %s" if escola_id is not None else ""),
+                params
+            )
+            cursor.execute(f"""
+                INSERT INTO estatisticas_matriculas
+                    (escola_id, ano_letivo_id, turma_id, serie_id, turno, sexo, status, quantidade)
+                SELECT COALESCE(a.escola_id, 0), m.ano_letivo_id, t.id, t.serie_id,
+                       COALESCE(t.turno, ''), COALESCE(a.sexo, ''), COALESCE(m.status, ''), COUNT(*)
+                FROM matriculas m
+                INNER JOIN alunos a ON a.id = m.aluno_id
+                INNER JOIN turmas t ON t.id = m.turma_id
+                {filtro}
+                GROUP BY 1, 2, 3, 4, 5, 6, 7
+            """, params)
+            linhas = cursor.rowcount
+        
+        logger.info(f"Estatísticas de matrículas reconstruídas: {linhas} contador(es)")
+        return linhas
+            
+    except MySQLError as e:
+        logger.exception(f"Erro MySQL ao reconstruir estatísticas de matrículas: {e}")
+        return None
+    except Exception as e:
+        logger.exception(f"Erro inesperado ao reconstruir estatísticas de matrículas: {e}")
+        return None
+
+
+@dashboard_cache.cached(ttl=3600)  # 1 hora; invalidado pelo log_alteracoes
 def obter_movimento_mensal_resumo(escola_id: int = 60, ano_letivo: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """Retorna resumo mensal (até o mês corrente) de movimento de matrículas.
 
@@ -481,7 +449,7 @@ def obter_alunos_por_situacao(situacao: str, escola_id: int = 60) -> List[Dict]:
         return []
 
 
-@dashboard_cache.cached(ttl=300)  # Cache de 5 minutos
+@dashboard_cache.cached(ttl=3600)  # 1 hora; invalidado pelo log_alteracoes
 def calcular_media_idade_alunos(escola_id: int = 60) -> Optional[float]:
     """
     Calcula a média de idade dos alunos ativos (CACHE).
@@ -7,6 +7,7 @@ from typing import Optional, Dict, List, Tuple
 from mysql.connector import Error as MySQLError
 import logging
 from db.connection import get_cursor
+from src.services.log_alteracoes_service import registrar_alteracao
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +70,7 @@ def criar_funcionario(
             """, tuple(valores))
             
             funcionario_id = cursor.lastrowid
+            registrar_alteracao(cursor, 'funcionario', funcionario_id, 'inclusao')
             
             logger.info(f"Funcionário '{nome}' cadastrado com ID {funcionario_id}")
             return True, "Funcionário cadastrado com sucesso", funcionario_id
@@ -130,6 +132,7 @@ def atualizar_funcionario(
                 SET {', '.join(sets)}
                 WHERE id = %s
             """, tuple(valores))
+            registrar_alteracao(cursor, 'funcionario', funcionario_id, 'alteracao')
             
             logger.info(f"Funcionário {funcionario_id} atualizado")
             return True, "Funcionário atualizado com sucesso"
@@ -188,6 +191,7 @@ def excluir_funcionario(
                 "DELETE FROM funcionarios WHERE id = %s",
                 (funcionario_id,)
             )
+            registrar_alteracao(cursor, 'funcionario', funcionario_id, 'exclusao')
             
             logger.info(f"Funcionário {funcionario_id} ({nome}) excluído")
             return True, f"Funcionário '{nome}' excluído com sucesso"
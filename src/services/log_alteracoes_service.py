@@ -0,0 +1,242 @@
+"""
+Serviço de log de alterações (invalidação de cache entre clientes)
+
+Vários clientes desktop usam o mesmo servidor MySQL, cada um com seus
+próprios caches. Sem coordenação, uma gravação feita em um cliente só
+aparece nos outros quando o TTL expira.
+
+Aqui a camada de serviço registra cada gravação em ``log_alteracoes``
+(db/migrations/criar_log_alteracoes.sql) na mesma transação da alteração,
+e cada cliente roda um :class:`MonitorAlteracoes` que lê as linhas novas
+em segundo plano e chama os callbacks assinados para a entidade alterada.
+
+Uso básico::
+
+    from src.services.log_alteracoes_service import assinar, registrar_alteracao
+
+    # Na gravação (mesmo cursor/transação)
+    registrar_alteracao(cursor, 'aluno', aluno_id, 'exclusao')
+
+    # No dono do cache
+    assinar(('aluno', 'matricula'), lambda entidade, ids: cache.invalidate_pattern('notas:'))
+
+Os callbacks rodam na thread do monitor: podem limpar dicionários e caches,
+mas não devem tocar em widgets Tk.
+"""
+
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from db.connection import get_cursor
+from src.core.config_logs import get_logger
+
+logger = get_logger(__name__)
+
+ENTIDADES = ('aluno', 'matricula', 'turma', 'funcionario')
+
+# Linhas lidas por consulta
+TAMANHO_LOTE = 500
+
+# Ids de transações concorrentes podem ficar visíveis fora de ordem (o id 10
+# pode aparecer depois do 11). Cada leitura volta essa quantidade de ids
+# e descarta os já aplicados.
+MARGEM_REORDENACAO = 50
+
+RETENCAO_DIAS = 7
+INTERVALO_LIMPEZA = 3600.0
+
+# Callback: (entidade, ids) — ids é None quando alguma linha não informou o id
+CallbackAlteracao = Callable[[str, Optional[Set[int]]], None]
+
+_lock_assinaturas = threading.Lock()
+_assinaturas: List[tuple] = []
+_avisado_registro = False
+
+
+def registrar_alteracao(cursor, entidade: str, entidade_id: Optional[int] = None,
+                        operacao: str = 'alteracao') -> bool:
+    """
+    Registra uma alteração no log usando o cursor da própria gravação.
+
+    Não faz commit: a linha entra junto com a alteração. Se a tabela não
+    existir (migração não aplicada) a gravação principal segue normalmente.
+
+    Args:
+        cursor: Cursor da transação que fez a alteração
+        entidade: Uma de ``ENTIDADES``
+        entidade_id: ID do registro alterado (None se vários/desconhecido)
+        operacao: 'inclusao', 'alteracao' ou 'exclusao'
+
+    Returns:
+        True se a linha foi inserida
+    """
+    global _avisado_registro
+    if entidade not in ENTIDADES:
+        raise ValueError(f"Entidade desconhecida para o log de alterações: {entidade}")
+    try:
+        cursor.execute(
+            "INSERT INTO log_alteracoes (entidade, entidade_id, operacao) VALUES (%s, %s, %s)",
+            (entidade, entidade_id, operacao),
+        )
+        return True
+    except Exception as e:
+        if not _avisado_registro:
+            logger.warning(f"log_alteracoes indisponível, outros clientes dependerão do TTL: {e}")
+            _avisado_registro = True
+        return False
+
+
+def assinar(entidades: Iterable[str], callback: CallbackAlteracao) -> None:
+    """
+    Registra ``callback`` para alterações das entidades informadas.
+
+    Métodos ligados são guardados por referência fraca: a assinatura some
+    junto com o objeto (por exemplo, uma janela fechada).
+    """
+    if hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+        ref = weakref.WeakMethod(callback)
+    else:
+        ref = lambda: callback  # noqa: E731 - funções de módulo vivem com o processo
+    with _lock_assinaturas:
+        _assinaturas.append((frozenset(entidades), ref))
+
+
+def _notificar(alteracoes: Dict[str, Optional[Set[int]]]) -> None:
+    with _lock_assinaturas:
+        vivas = [(e, ref) for e, ref in _assinaturas if ref() is not None]
+        _assinaturas[:] = vivas
+
+    for entidades, ref in vivas:
+        callback = ref()
+        if callback is None:
+            continue
+        for entidade, ids in alteracoes.items():
+            if entidade not in entidades:
+                continue
+            try:
+                callback(entidade, None if ids is None else set(ids))
+            except Exception as e:
+                logger.exception(f"Erro ao aplicar invalidação de '{entidade}': {e}")
+
+
+def _agrupar(linhas: Iterable[Dict]) -> Dict[str, Optional[Set[int]]]:
+    """Junta as linhas de um lote por entidade (ids None = invalidar tudo)."""
+    alteracoes: Dict[str, Optional[Set[int]]] = {}
+    for linha in linhas:
+        entidade = linha['entidade']
+        entidade_id = linha['entidade_id']
+        if entidade in alteracoes and alteracoes[entidade] is None:
+            continue
+        if entidade_id is None:
+            alteracoes[entidade] = None
+        else:
+            alteracoes.setdefault(entidade, set()).add(int(entidade_id))
+    return alteracoes
+
+
+class MonitorAlteracoes:
+    """Lê ``log_alteracoes`` periodicamente e notifica os assinantes."""
+
+    def __init__(self, intervalo: float = 5.0, tamanho_lote: int = TAMANHO_LOTE):
+        self.intervalo = intervalo
+        self.tamanho_lote = tamanho_lote
+        self._ultimo_id: Optional[int] = None
+        self._piso = 0  # último id existente quando o monitor começou
+        self._aplicados: deque = deque(maxlen=tamanho_lote * 2)
+        self._aplicados_set: Set[int] = set()
+        self._limpeza_em = 0.0
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._avisado = False
+
+    def iniciar(self) -> None:
+        """Inicia a thread de leitura (idempotente)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name='MonitorAlteracoes', daemon=True)
+        self._thread.start()
+        logger.debug(f"Monitor de alterações iniciado (intervalo {self.intervalo}s)")
+
+    def parar(self, timeout: float = 2.0) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _executar(self) -> None:
+        while not self._parar.is_set():
+            self.verificar()
+            self._parar.wait(self.intervalo)
+
+    def _marcar_aplicado(self, linha_id: int) -> None:
+        if len(self._aplicados) == self._aplicados.maxlen:
+            self._aplicados_set.discard(self._aplicados[0])
+        self._aplicados.append(linha_id)
+        self._aplicados_set.add(linha_id)
+
+    def verificar(self) -> int:
+        """
+        Aplica as alterações registradas desde a última leitura.
+
+        Na primeira chamada apenas posiciona no fim do log: o que foi gravado
+        antes de o cliente abrir já está refletido no que ele vai carregar.
+
+        Returns:
+            Número de linhas novas aplicadas
+        """
+        try:
+            with get_cursor() as cursor:
+                if self._ultimo_id is None:
+                    cursor.execute("SELECT COALESCE(MAX(id), 0) AS ultimo FROM log_alteracoes")
+                    self._ultimo_id = self._piso = int(cursor.fetchone()['ultimo'])
+                    return 0
+
+                novas: List[Dict] = []
+                while True:
+                    cursor.execute(
+                        "SELECT id, entidade, entidade_id FROM log_alteracoes "
+                        "WHERE id > %s ORDER BY id LIMIT %s",
+                        (max(self._piso, self._ultimo_id - MARGEM_REORDENACAO), self.tamanho_lote),
+                    )
+                    linhas = cursor.fetchall() or []
+                    for linha in linhas:
+                        if linha['id'] not in self._aplicados_set:
+                            novas.append(linha)
+                            self._marcar_aplicado(linha['id'])
+                        self._ultimo_id = max(self._ultimo_id, linha['id'])
+                    if len(linhas) < self.tamanho_lote:
+                        break
+            self._avisado = False
+        except Exception as e:
+            if not self._avisado:
+                logger.warning(f"Não foi possível ler log_alteracoes: {e}")
+                self._avisado = True
+            return 0
+
+        if novas:
+            logger.debug(f"{len(novas)} alteração(ões) de outros clientes aplicada(s)")
+            _notificar(_agrupar(novas))
+        self._limpar_antigas()
+        return len(novas)
+
+    def _limpar_antigas(self) -> None:
+        agora = time.monotonic()
+        if agora < self._limpeza_em:
+            return
+        self._limpeza_em = agora + INTERVALO_LIMPEZA
+        try:
+            with get_cursor(commit=True) as cursor:
+                cursor.execute(
+                    "DELETE FROM log_alteracoes WHERE criado_em < NOW() - INTERVAL %s DAY",
+                    (RETENCAO_DIAS,),
+                )
+        except Exception as e:
+            logger.debug(f"Limpeza de log_alteracoes falhou: {e}")
+
+
+# Instância do processo, iniciada pela aplicação após o pool de conexões
+monitor_alteracoes = MonitorAlteracoes()
@@ -7,6 +7,7 @@ from typing import Optional, Dict, List, Tuple
 from mysql.connector import Error as MySQLError
 import logging
 from db.connection import get_cursor
+from src.services.log_alteracoes_service import registrar_alteracao
 from src.core.config import ANO_LETIVO_ATUAL
 
 logger = logging.getLogger(__name__)
@@ -287,6 +288,7 @@ def matricular_aluno(
                     SET turma_id = %s, status = %s, data_matricula = %s
                     WHERE id = %s
                 """, (turma_id, status, data_matricula, matricula_id))
+                registrar_alteracao(cursor, 'matricula', matricula_id, 'alteracao')
 
                 logger.info(f"Matrícula {matricula_id} do aluno {aluno_id} atualizada com sucesso")
                 return True, "Matrícula atualizada com sucesso"
@@ -296,6 +298,7 @@ def matricular_aluno(
                     INSERT INTO matriculas (aluno_id, turma_id, ano_letivo_id, status, data_matricula)
                     VALUES (%s, %s, %s, %s, %s)
                 """, (aluno_id, turma_id, ano_letivo_id, status, data_matricula))
+                registrar_alteracao(cursor, 'matricula', cursor.lastrowid, 'inclusao')
 
                 logger.info(f"Aluno {aluno_id} matriculado na turma {turma_id} com sucesso")
                 return True, "Matrícula realizada com sucesso"
@@ -338,6 +341,7 @@ def transferir_aluno(
                 SET turma_id = %s 
                 WHERE id = %s
             """, (nova_turma_id, matricula_id))
+            registrar_alteracao(cursor, 'matricula', matricula_id, 'alteracao')
             
             logger.info(f"Matrícula {matricula_id} transferida para turma {nova_turma_id}")
             return True, "Transferência realizada com sucesso"
@@ -387,6 +391,7 @@ def cancelar_matricula(
                 SET status = 'Cancelado'
                 WHERE id = %s
             """, (matricula_id,))
+            registrar_alteracao(cursor, 'matricula', matricula_id, 'alteracao')
             
             logger.info(f"Matrícula {matricula_id} cancelada. Motivo: {motivo or 'Não informado'}")
             return True, "Matrícula cancelada com sucesso"
@@ -434,6 +439,7 @@ def atualizar_status_matricula(
                 SET status = %s 
                 WHERE id = %s
             """, (novo_status, matricula_id))
+            registrar_alteracao(cursor, 'matricula', matricula_id, 'alteracao')
             
             logger.info(f"Status da matrícula {matricula_id} atualizado para '{novo_status}'")
             return True, f"Status atualizado para '{novo_status}' com sucesso"
@@ -499,3 +505,46 @@ def obter_matricula_por_id(matricula_id: int) -> Optional[Dict]:
     except Exception as e:
         logger.exception(f"Erro inesperado ao obter matrícula: {e}")
         return None
+
+
+def atualizar_resumo_historico(matricula_ids: Optional[List[int]] = None) -> Optional[int]:
+    """
+    Recalcula a tabela resumo_historico_matricula.
+    
+    Os triggers de historico_matricula já mantêm o resumo atualizado; esta
+    função serve para cargas feitas sem triggers (restauração de dump,
+    importações em massa) ou para conferir o resumo.
+    
+    Args:
+        matricula_ids: Matrículas a recalcular (se None, recalcula todas e
+            remove resumos de matrículas sem histórico)
+        
+    Returns:
+        int: Quantidade de matrículas recalculadas ou None em caso de erro
+    """
+    try:
+        with get_cursor(commit=True) as cursor:
+            if matricula_ids is None:
+                cursor.execute("""
+                    DELETE r FROM resumo_historico_matricula r
+                    LEFT JOIN historico_matricula hm ON hm.matricula_id = r.matricula_id
+                    WHERE hm.id IS NULL
+                """)
+                cursor.execute("SELECT DISTINCT matricula_id FROM historico_matricula")
+                matricula_ids = [
+                    linha['matricula_id'] if isinstance(linha, dict) else linha[0]
+                    for linha in cursor.fetchall()
+                ]
+            
+            for matricula_id in matricula_ids:
+                cursor.execute("CALL atualizar_resumo_historico_matricula(%s)", (matricula_id,))
+        
+        logger.info(f"Resumo do histórico recalculado para {len(matricula_ids)} matrícula(s)")
+        return len(matricula_ids)
+            
+    except MySQLError as e:
+        logger.exception(f"Erro MySQL ao atualizar resumo do histórico: {e}")
+        return None
+    except Exception as e:
+        logger.exception(f"Erro inesperado ao atualizar resumo do histórico: {e}")
+        return None
@@ -0,0 +1,197 @@
+"""
+Serviço de dados de referência (níveis, séries, turmas, disciplinas e anos letivos)
+
+Essas tabelas mudam poucas vezes por ano, mas eram consultadas a cada
+abertura de tela e a cada troca de combobox. Aqui cada tabela é lida
+inteira uma vez e mantida em dois níveis:
+
+- memória do processo;
+- disco (:mod:`src.utils.cache_disco`), para que a próxima execução do
+  sistema não precise relê-la.
+
+A validade é conferida pelos marcadores de ``versao_tabelas``
+(db/migrations/criar_versao_tabelas_referencia.sql): uma única consulta
+informa a versão das cinco tabelas, e só as que mudaram são relidas.
+Se a tabela de versões não existir, os dados são sempre lidos do banco.
+"""
+
+import os
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from db.connection import get_cursor
+from src.core.config_logs import get_logger
+from src.services.log_alteracoes_service import assinar
+from src.utils.cache import _CACHE_MISS
+from src.utils.cache_disco import cache_disco
+
+logger = get_logger(__name__)
+
+TABELAS_REFERENCIA = ('niveisensino', 'series', 'turmas', 'disciplinas', 'anosletivos')
+
+# Janela em que os marcadores conferidos há pouco são considerados atuais.
+# Evita uma consulta por combobox ao navegar nível → série → turma.
+INTERVALO_VALIDACAO = 5.0
+
+_QUERY_MARCADORES = (
+    "SELECT tabela, versao, atualizado_em FROM versao_tabelas WHERE tabela IN ("
+    + ', '.join(['%s'] * len(TABELAS_REFERENCIA)) + ")"
+)
+
+_lock = threading.Lock()
+_memoria: Dict[str, Tuple[Any, List[Dict[str, Any]]]] = {}
+_marcadores: Optional[Dict[str, Any]] = None
+_validado_em = 0.0
+_avisado = False
+
+
+def _prefixo_disco() -> str:
+    # Bancos diferentes (produção, homologação) não compartilham entradas
+    return f"referencia:{os.getenv('DB_HOST', '')}/{os.getenv('DB_NAME', '')}:"
+
+
+def _chave_ordenacao(texto: Any) -> str:
+    """Aproxima o ORDER BY da collation utf8mb4_0900_ai_ci (sem acento/caixa)."""
+    texto = unicodedata.normalize('NFKD', str(texto or ''))
+    return ''.join(c for c in texto if not unicodedata.combining(c)).casefold()
+
+
+def _ler_marcadores(cursor) -> Dict[str, Any]:
+    global _avisado
+    try:
+        cursor.execute(_QUERY_MARCADORES, TABELAS_REFERENCIA)
+        return {r['tabela']: (r['versao'], str(r['atualizado_em'])) for r in cursor.fetchall()}
+    except Exception as e:
+        if not _avisado:
+            logger.warning(f"Marcadores de versao_tabelas indisponíveis, sem cache de referência: {e}")
+            _avisado = True
+        return {}
+
+
+def _marcadores_recentes() -> Optional[Dict[str, Any]]:
+    if _marcadores is not None and time.monotonic() - _validado_em < INTERVALO_VALIDACAO:
+        return _marcadores
+    return None
+
+
+def _validar(cursor) -> Dict[str, Any]:
+    """Marcadores atuais; consulta o banco no máximo a cada INTERVALO_VALIDACAO."""
+    global _marcadores, _validado_em
+    marcadores = _marcadores_recentes()
+    if marcadores is None:
+        marcadores = _ler_marcadores(cursor)
+        _marcadores, _validado_em = marcadores, time.monotonic()
+    return marcadores
+
+
+def obter_tabela(tabela: str) -> List[Dict[str, Any]]:
+    """
+    Retorna todas as linhas de uma tabela de referência.
+
+    Ordem de tentativa: memória, disco, banco. A lista devolvida é
+    compartilhada; não a modifique.
+
+    Args:
+        tabela: Uma de ``TABELAS_REFERENCIA``.
+    """
+    if tabela not in TABELAS_REFERENCIA:
+        raise ValueError(f"Tabela de referência desconhecida: {tabela}")
+
+    with _lock:
+        # Caminho rápido: marcadores conferidos há pouco, sem abrir conexão
+        recentes = _marcadores_recentes()
+        em_memoria = _memoria.get(tabela)
+        if recentes and em_memoria is not None and em_memoria[0] == recentes.get(tabela):
+            return em_memoria[1]
+
+        with get_cursor() as cursor:
+            marcadores = _validar(cursor)
+            marcador = marcadores.get(tabela)
+
+            if marcador is not None:
+                em_memoria = _memoria.get(tabela)
+                if em_memoria is not None and em_memoria[0] == marcador:
+                    return em_memoria[1]
+
+                linhas = cache_disco.ler(_prefixo_disco() + tabela, marcador)
+                if linhas is not _CACHE_MISS:
+                    _memoria[tabela] = (marcador, linhas)
+                    logger.debug(f"Referência '{tabela}' lida do disco ({len(linhas)} linhas)")
+                    return linhas
+
+            cursor.execute(f"SELECT * FROM {tabela}")
+            linhas = cursor.fetchall() or []
+
+        if marcador is not None:
+            _memoria[tabela] = (marcador, linhas)
+            cache_disco.gravar(_prefixo_disco() + tabela, marcador, linhas)
+        logger.debug(f"Referência '{tabela}' lida do banco ({len(linhas)} linhas)")
+        return linhas
+
+
+def invalidar_referencia(tabela: Optional[str] = None) -> None:
+    """
+    Força a conferência dos marcadores na próxima leitura.
+
+    Chamado após gravações feitas por este processo, para que a mudança seja
+    vista imediatamente em vez de esperar INTERVALO_VALIDACAO.
+    """
+    global _marcadores
+    with _lock:
+        _marcadores = None
+        if tabela is None:
+            _memoria.clear()
+        else:
+            _memoria.pop(tabela, None)
+
+
+def _filtrar(linhas: Iterable[Dict[str, Any]], **filtros: Any) -> List[Dict[str, Any]]:
+    ativos = {k: v for k, v in filtros.items() if v is not None}
+    return [r for r in linhas if all(r.get(k) == v for k, v in ativos.items())]
+
+
+def listar_niveis_ensino() -> List[Dict[str, Any]]:
+    """Níveis de ensino ordenados por nome."""
+    return sorted(obter_tabela('niveisensino'), key=lambda r: _chave_ordenacao(r.get('nome')))
+
+
+def listar_series(nivel_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Séries (opcionalmente de um nível) ordenadas por nome."""
+    return sorted(
+        _filtrar(obter_tabela('series'), nivel_id=nivel_id),
+        key=lambda r: _chave_ordenacao(r.get('nome')),
+    )
+
+
+def listar_turmas(
+    serie_id: Optional[int] = None,
+    ano_letivo_id: Optional[int] = None,
+    escola_id: Optional[int] = None,
+    ids: Optional[Iterable[int]] = None,
+) -> List[Dict[str, Any]]:
+    """Turmas filtradas, ordenadas por nome."""
+    turmas = _filtrar(obter_tabela('turmas'), serie_id=serie_id,
+                      ano_letivo_id=ano_letivo_id, escola_id=escola_id)
+    if ids is not None:
+        permitidas = {int(i) for i in ids}
+        turmas = [t for t in turmas if t['id'] in permitidas]
+    return sorted(turmas, key=lambda r: _chave_ordenacao(r.get('nome')))
+
+
+def listar_disciplinas(nivel_id: Optional[int] = None, escola_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Disciplinas filtradas, ordenadas por nome."""
+    return sorted(
+        _filtrar(obter_tabela('disciplinas'), nivel_id=nivel_id, escola_id=escola_id),
+        key=lambda r: _chave_ordenacao(r.get('nome')),
+    )
+
+
+def listar_anos_letivos() -> List[Dict[str, Any]]:
+    """Anos letivos do mais recente para o mais antigo."""
+    return sorted(obter_tabela('anosletivos'), key=lambda r: r.get('ano_letivo') or 0, reverse=True)
+
+
+# Turmas criadas/alteradas em outro cliente: conferir marcadores já na próxima leitura
+assinar(('turma',), lambda entidade, ids: invalidar_referencia('turmas'))
@@ -0,0 +1,417 @@
+"""
+Serviço de transição de ano letivo (rematrícula em massa).
+
+Motor set-based usado pela InterfaceTransicaoAnoLetivo:
+- Tabela de progressão de turmas pré-calculada em memória
+  (uma consulta via QueriesTransicao.get_mapa_turmas)
+- Novas matrículas criadas com executemany em lotes de tamanho fixo
+- Progresso reportado uma vez por lote (não por aluno)
+- Dry-run: tudo roda na mesma transação, que é desfeita no final
+- Modo em lote: várias escolas em paralelo, cada uma em sua própria
+  conexão do pool e transação, com auditoria e resultado individuais
+
+Não depende de Tkinter; a interface apenas repassa um callback de progresso.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from db.connection import get_connection, obter_tamanho_pool
+from db.queries_transicao import (
+    QueriesTransicao,
+    QUERY_CRIAR_ANO_LETIVO,
+    QUERY_ENCERRAR_MATRICULAS_ESCOLA,
+    TAMANHO_LOTE_MATRICULAS,
+)
+from src.core.config_logs import get_logger
+
+logger = get_logger(__name__)
+
+# Callback de progresso: (mensagem, percentual 0-100)
+ProgressoCallback = Callable[[str, float], None]
+
+# Callback de progresso do modo em lote: (escola_id, mensagem, percentual)
+ProgressoEscolaCallback = Callable[[int, str, float], None]
+
+
+def combinar_alunos_rematricula(
+    alunos_normais: List[Dict],
+    alunos_reprovados: List[Dict]
+) -> List[Dict]:
+    """Une alunos normais e reprovados, marcando a flag 'reprovado'.
+
+    Args:
+        alunos_normais: Linhas de QUERY_ALUNOS_NORMAIS
+        alunos_reprovados: Linhas de QUERY_ALUNOS_REPROVADOS
+
+    Returns:
+        Lista de alunos (um por aluno_id) com a chave 'reprovado'
+    """
+    ids_reprovados = {int(a['aluno_id']) for a in alunos_reprovados}
+    alunos_map: Dict[int, Dict] = {}
+
+    for a in alunos_normais:
+        aid = int(a['aluno_id'])
+        aluno = dict(a)
+        aluno['reprovado'] = aid in ids_reprovados
+        alunos_map[aid] = aluno
+
+    for a in alunos_reprovados:
+        aid = int(a['aluno_id'])
+        if aid not in alunos_map:
+            aluno = dict(a)
+            aluno['reprovado'] = True
+            alunos_map[aid] = aluno
+
+    return list(alunos_map.values())
+
+
+def planejar_matriculas(
+    alunos: List[Dict],
+    mapa_progressao: Dict[int, int]
+) -> Dict[str, Any]:
+    """Define a turma de destino de cada aluno.
+
+    Args:
+        alunos: Saída de combinar_alunos_rematricula
+        mapa_progressao: Saída de QueriesTransicao.get_mapa_progressao
+
+    Returns:
+        Dict com 'matriculas' (pares aluno_id, turma_id),
+        'alunos_promovidos' e 'alunos_retidos'
+    """
+    matriculas = []
+    promovidos = 0
+    retidos = 0
+
+    for aluno in alunos:
+        turma_atual = aluno['turma_id']
+        if aluno.get('reprovado', False):
+            matriculas.append((aluno['aluno_id'], turma_atual))
+            retidos += 1
+        else:
+            matriculas.append((aluno['aluno_id'], mapa_progressao.get(turma_atual, turma_atual)))
+            promovidos += 1
+
+    return {
+        'matriculas': matriculas,
+        'alunos_promovidos': promovidos,
+        'alunos_retidos': retidos,
+    }
+
+
+def resolver_ano_letivo(ano_destino: int, criar: bool = True) -> Optional[int]:
+    """Retorna o id do ano letivo de destino, criando-o (com commit) se preciso.
+
+    Args:
+        ano_destino: Ano (ex: 2026)
+        criar: Se False, apenas consulta (dry-run não persiste o ano)
+
+    Returns:
+        anosletivos.id, ou None se o ano não existe e ``criar`` é False
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        try:
+            if criar:
+                cursor.execute(QUERY_CRIAR_ANO_LETIVO, (ano_destino,))
+                conn.commit()
+            cursor.execute("SELECT id FROM anosletivos WHERE ano_letivo = %s", (ano_destino,))
+            linha = cursor.fetchone()
+            return linha['id'] if linha else None
+        finally:
+            cursor.close()
+
+
+def executar_rollover(
+    escola_id: int,
+    ano_origem_id: int,
+    ano_destino: int,
+    dry_run: bool = False,
+    ao_progredir: Optional[ProgressoCallback] = None,
+    tamanho_lote: int = TAMANHO_LOTE_MATRICULAS,
+    novo_ano_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """Executa a rematrícula em massa de uma escola.
+
+    Passos: cria o ano de destino, busca alunos a rematricular, calcula a
+    progressão de todas as turmas de uma vez, insere as matrículas em
+    lotes e encerra as matrículas do ano de origem.
+
+    Args:
+        escola_id: ID da escola
+        ano_origem_id: ID (anosletivos.id) do ano que está sendo encerrado
+        ano_destino: Ano (ex: 2026) que será criado/rematriculado
+        dry_run: Se True, faz rollback no final ao invés de commit
+        ao_progredir: Callback (mensagem, percentual)
+        tamanho_lote: Linhas por executemany
+        novo_ano_id: ID do ano de destino já resolvido (modo em lote); se
+                     informado, o passo de criação do ano é pulado
+
+    Returns:
+        Dict com novo_ano_id, matriculas_criadas, matriculas_encerradas,
+        alunos_promovidos, alunos_retidos e tempos por etapa (segundos)
+    """
+    def progresso(mensagem: str, valor: float):
+        if ao_progredir:
+            ao_progredir(mensagem, valor)
+
+    tempos: Dict[str, float] = {}
+
+    with get_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        try:
+            # Passo 1: Criar novo ano letivo
+            inicio = time.perf_counter()
+            progresso("Criando novo ano letivo...", 10)
+            if novo_ano_id is None:
+                cursor.execute(QUERY_CRIAR_ANO_LETIVO, (ano_destino,))
+                if not dry_run:
+                    conn.commit()
+                cursor.execute("SELECT id FROM anosletivos WHERE ano_letivo = %s", (ano_destino,))
+                linha = cursor.fetchone()
+                if not linha:
+                    raise RuntimeError(f"Ano letivo {ano_destino} não encontrado após criação")
+                novo_ano_id = linha['id']
+            tempos['ano_letivo'] = time.perf_counter() - inicio
+            logger.info(f"[Passo 1] ✓ Ano letivo {ano_destino} (id={novo_ano_id})")
+
+            # Passo 2: Buscar alunos para rematricular
+            inicio = time.perf_counter()
+            progresso("Buscando alunos para rematricular...", 30)
+            turmas_9ano = QueriesTransicao.get_turmas_9ano(escola_id)
+            alunos_normais, alunos_reprovados = QueriesTransicao.get_alunos_para_rematricular(
+                ano_origem_id, escola_id, turmas_9ano
+            )
+            alunos = combinar_alunos_rematricula(alunos_normais or [], alunos_reprovados or [])
+            tempos['busca_alunos'] = time.perf_counter() - inicio
+            logger.info(f"[Passo 2] ✓ Total de alunos a rematricular: {len(alunos)}")
+
+            # Passo 2.5: Tabela de progressão (uma consulta para todas as turmas)
+            inicio = time.perf_counter()
+            mapa_progressao = QueriesTransicao.get_mapa_progressao(escola_id, novo_ano_id)
+            plano = planejar_matriculas(alunos, mapa_progressao)
+            tempos['progressao'] = time.perf_counter() - inicio
+            logger.info(f"[Passo 2.5] ✓ Progressão calculada para {len(mapa_progressao)} turmas")
+
+            # Passo 3: Criar novas matrículas em lotes
+            inicio = time.perf_counter()
+            total_alunos = len(plano['matriculas'])
+            progresso(f"Criando {total_alunos} novas matrículas...", 50)
+
+            def progresso_lote(criadas: int, total: int):
+                progresso(f"Criando matrículas... ({criadas}/{total})", 50 + criadas / total * 30)
+
+            matriculas_criadas = QueriesTransicao.criar_matriculas_em_lote(
+                cursor, plano['matriculas'], novo_ano_id,
+                tamanho_lote=tamanho_lote, ao_progredir=progresso_lote
+            )
+            tempos['insercao'] = time.perf_counter() - inicio
+            logger.info(f"[Passo 3] ✓ {matriculas_criadas} matrículas preparadas")
+
+            # Passo 4: Encerrar matrículas do ano de origem
+            inicio = time.perf_counter()
+            progresso("Encerrando matrículas do ano anterior...", 85)
+            cursor.execute(QUERY_ENCERRAR_MATRICULAS_ESCOLA, (ano_origem_id, escola_id))
+            matriculas_encerradas = cursor.rowcount
+            tempos['encerramento'] = time.perf_counter() - inicio
+            logger.info(f"[Passo 4] ✓ {matriculas_encerradas} matrículas encerradas")
+
+            if dry_run:
+                conn.rollback()
+                logger.info("[DRY-RUN] Rollback executado - nenhuma alteração foi persistida")
+            else:
+                conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                logger.exception("Erro ao dar rollback na transição")
+            raise
+        finally:
+            cursor.close()
+
+    return {
+        'novo_ano_id': novo_ano_id,
+        'matriculas_criadas': matriculas_criadas,
+        'matriculas_encerradas': matriculas_encerradas,
+        'alunos_promovidos': plano['alunos_promovidos'],
+        'alunos_retidos': plano['alunos_retidos'],
+        'tempos': tempos,
+    }
+
+
+def _transicao_escola(
+    escola_id: int,
+    ano_origem: Dict,
+    ano_destino: int,
+    dry_run: bool,
+    usuario: str,
+    ao_progredir: Optional[ProgressoEscolaCallback],
+    tamanho_lote: int,
+    novo_ano_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """Executa a transição de uma escola e registra sua auditoria.
+
+    Nunca propaga exceção: falhas são devolvidas no próprio resultado
+    para não interromper as demais escolas do lote.
+    """
+    inicio = time.perf_counter()
+    resultado: Dict[str, Any] = {'escola_id': escola_id}
+    try:
+        # Contagens do ano de origem precisam ser lidas antes do encerramento
+        total_matriculas = QueriesTransicao.get_total_matriculas_ativas(ano_origem['id'], escola_id)
+        alunos_excluir = QueriesTransicao.get_alunos_a_excluir(ano_origem['id'], escola_id)
+
+        def progresso(mensagem: str, valor: float):
+            if ao_progredir:
+                ao_progredir(escola_id, mensagem, valor)
+
+        dados = executar_rollover(
+            escola_id=escola_id,
+            ano_origem_id=ano_origem['id'],
+            ano_destino=ano_destino,
+            dry_run=dry_run,
+            ao_progredir=progresso,
+            tamanho_lote=tamanho_lote,
+            novo_ano_id=novo_ano_id,
+        )
+        resultado.update(dados)
+        resultado['alunos_concluintes'] = max(
+            0, total_matriculas - dados['matriculas_criadas'] - alunos_excluir
+        )
+        resultado['status'] = 'sucesso'
+    except Exception as e:
+        logger.exception(f"Erro na transição da escola {escola_id}: {e}")
+        resultado['status'] = 'erro'
+        resultado['erro'] = str(e)
+
+    resultado['duracao_segundos'] = time.perf_counter() - inicio
+
+    if not dry_run:
+        sucesso = resultado['status'] == 'sucesso'
+        QueriesTransicao.registrar_auditoria(
+            ano_origem=ano_origem['ano_letivo'],
+            ano_destino=ano_destino,
+            escola_id=escola_id,
+            usuario=usuario,
+            matriculas_encerradas=resultado.get('matriculas_encerradas', 0),
+            matriculas_criadas=resultado.get('matriculas_criadas', 0),
+            alunos_promovidos=resultado.get('alunos_promovidos', 0),
+            alunos_retidos=resultado.get('alunos_retidos', 0),
+            alunos_concluintes=resultado.get('alunos_concluintes', 0),
+            status='sucesso' if sucesso else 'erro',
+            detalhes=json.dumps({
+                'ano_origem': ano_origem['ano_letivo'],
+                'ano_destino': ano_destino,
+                'data': datetime.now().isoformat(),
+                'modo': 'lote',
+                'tempos_etapas': resultado.get('tempos', {}),
+            }) if sucesso else resultado['erro']
+        )
+
+    return resultado
+
+
+def executar_transicao_escolas(
+    escola_ids: Iterable[int],
+    ano_origem: Dict,
+    ano_destino: int,
+    dry_run: bool = False,
+    usuario: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    ao_progredir: Optional[ProgressoEscolaCallback] = None,
+    tamanho_lote: int = TAMANHO_LOTE_MATRICULAS
+) -> Dict[str, Any]:
+    """Executa a transição de várias escolas em paralelo.
+
+    Cada escola roda em uma thread com sua própria conexão do pool e sua
+    própria transação; uma escola com erro é desfeita sozinha e não
+    bloqueia nem desfaz as outras. Cada escola gera sua linha de auditoria.
+
+    O ano de destino é resolvido (e, fora do dry-run, criado) uma única vez
+    antes das escolas: se cada thread inserisse a mesma linha de
+    ``anosletivos``, as demais esperariam pelo bloqueio dessa linha. No
+    dry-run com o ano ainda inexistente, cada escola precisa criá-lo na
+    própria transação (desfeita no final), então as escolas rodam uma de
+    cada vez.
+
+    Args:
+        escola_ids: IDs das escolas
+        ano_origem: Dict do ano de origem (com 'id' e 'ano_letivo')
+        ano_destino: Ano (ex: 2026) de destino
+        dry_run: Se True, nenhuma escola persiste alterações
+        usuario: Usuário registrado na auditoria (padrão: USERNAME)
+        max_workers: Escolas simultâneas (padrão: metade do pool, pois cada
+                     escola usa até duas conexões ao mesmo tempo)
+        ao_progredir: Callback (escola_id, mensagem, percentual).
+                      Chamado a partir das threads de trabalho.
+        tamanho_lote: Linhas por executemany
+
+    Returns:
+        Relatório consolidado com 'escolas' (resultado por escola),
+        'sucesso' e 'falhas' (listas de IDs), 'totais' e 'duracao_segundos'
+    """
+    escola_ids = list(dict.fromkeys(escola_ids))
+    usuario = usuario or os.getenv('USERNAME', 'sistema')
+    if max_workers is None:
+        max_workers = max(1, obter_tamanho_pool() // 2)
+    max_workers = max(1, min(max_workers, len(escola_ids) or 1))
+
+    novo_ano_id = resolver_ano_letivo(ano_destino, criar=not dry_run) if escola_ids else None
+    if novo_ano_id is None and escola_ids:
+        logger.info(f"[DRY-RUN] Ano letivo {ano_destino} inexistente; escolas em sequência")
+        max_workers = 1
+
+    inicio = time.perf_counter()
+    logger.info(
+        f"Transição em lote: {len(escola_ids)} escolas, {max_workers} em paralelo"
+        f"{' [DRY-RUN]' if dry_run else ''}"
+    )
+
+    resultados: Dict[int, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transicao") as executor:
+        futuros = {
+            executor.submit(
+                _transicao_escola, escola_id, ano_origem, ano_destino,
+                dry_run, usuario, ao_progredir, tamanho_lote, novo_ano_id
+            ): escola_id
+            for escola_id in escola_ids
+        }
+        for futuro in as_completed(futuros):
+            escola_id = futuros[futuro]
+            resultados[escola_id] = futuro.result()
+
+    campos = ('matriculas_criadas', 'matriculas_encerradas', 'alunos_promovidos',
+              'alunos_retidos', 'alunos_concluintes')
+    totais = {campo: 0 for campo in campos}
+    sucesso: List[int] = []
+    falhas: List[int] = []
+    for escola_id in escola_ids:
+        resultado = resultados[escola_id]
+        if resultado['status'] == 'sucesso':
+            sucesso.append(escola_id)
+            for campo in campos:
+                totais[campo] += resultado.get(campo, 0)
+        else:
+            falhas.append(escola_id)
+
+    relatorio = {
+        'ano_origem': ano_origem['ano_letivo'],
+        'ano_destino': ano_destino,
+        'dry_run': dry_run,
+        'escolas': {escola_id: resultados[escola_id] for escola_id in escola_ids},
+        'sucesso': sucesso,
+        'falhas': falhas,
+        'totais': totais,
+        'duracao_segundos': time.perf_counter() - inicio,
+    }
+    logger.info(
+        f"Transição em lote concluída: {len(sucesso)} escolas com sucesso, "
+        f"{len(falhas)} com falha, {totais['matriculas_criadas']} matrículas criadas"
+    )
+    return relatorio
@@ -11,6 +11,8 @@ Este módulo encapsula toda a lógica de negócio relacionada a turmas:
 from typing import List, Dict, Any, Optional, Tuple
 from db.connection import get_connection
 from src.core.config_logs import get_logger
+from src.services.log_alteracoes_service import registrar_alteracao
+from src.services.referencia_service import invalidar_referencia
 
 logger = get_logger(__name__)
 
@@ -283,9 +285,11 @@ def criar_turma(
                 (nome, turno, ano_letivo_id, serie_id, escola_id)
                 VALUES (%s, %s, %s, %s, %s)
             """, (nome.strip(), turno, ano_letivo_id, serie_id, escola_id))
+            turma_id = cursor.lastrowid
+            registrar_alteracao(cursor, 'turma', turma_id, 'inclusao')
             
             conn.commit()
-            turma_id = cursor.lastrowid
+            invalidar_referencia('turmas')
             
             logger.info(f"Turma criada: ID={turma_id}, Nome={nome}, Série={serie_id}, Turno={turno}")
             
@@ -346,7 +350,9 @@ def atualizar_turma(
             valores.append(turma_id)
             
             cursor.execute(query, tuple(valores))
+            registrar_alteracao(cursor, 'turma', turma_id, 'alteracao')
             conn.commit()
+            invalidar_referencia('turmas')
             
             logger.info(f"Turma {turma_id} atualizada: {campos}")
             
@@ -384,7 +390,9 @@ def excluir_turma(turma_id: int, verificar_matriculas: bool = True) -> Tuple[boo
             cursor = conn.cursor()
             
             cursor.execute("DELETE FROM turmas WHERE id = %s", (turma_id,))
+            registrar_alteracao(cursor, 'turma', turma_id, 'exclusao')
             conn.commit()
+            invalidar_referencia('turmas')
             
             logger.info(f"Turma {turma_id} excluída: {turma['nome']}")
             
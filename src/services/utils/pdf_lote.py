@@ -0,0 +1,291 @@
+"""Renderização de documentos em lote com vários processos.
+
+Lotes grandes (declarações de fim de ano da escola inteira, certificados)
+são divididos em blocos; cada bloco vira um PDF parcial renderizado em um
+processo separado e os parciais são concatenados ao final por
+:func:`concatenar_pdfs`, que grava os objetos de um arquivo por vez em vez
+de manter todas as páginas do lote em memória.
+
+Uso básico::
+
+    from functools import partial
+    from src.services.utils.pdf_lote import renderizar_em_blocos
+
+    # ``renderizar_bloco(itens, caminho)`` precisa ser uma função de nível de
+    # módulo (ou ``functools.partial`` de uma) para ser enviada aos processos.
+    renderizar_em_blocos(paginas, partial(_renderizar_bloco, data=data),
+                         "saida.pdf", ao_progredir=lambda f, t: print(f, t))
+"""
+
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+    StreamObject,
+)
+
+from src.core.config_logs import get_logger
+
+logger = get_logger(__name__)
+
+TAMANHO_BLOCO_PADRAO = 50
+
+# Atributos que uma página pode herdar dos nós /Pages ancestrais (PDF 1.7, 7.7.3.4)
+_ATRIBUTOS_HERDAVEIS = ('/Resources', '/MediaBox', '/CropBox', '/Rotate')
+
+# Números reservados no arquivo concatenado
+_NUM_CATALOGO = 1
+_NUM_PAGINAS = 2
+
+
+def dividir_em_blocos(itens: Sequence, tamanho: int) -> List[list]:
+    """Divide ``itens`` em listas consecutivas de até ``tamanho`` elementos."""
+    if tamanho < 1:
+        raise ValueError("tamanho do bloco deve ser positivo")
+    return [list(itens[i:i + tamanho]) for i in range(0, len(itens), tamanho)]
+
+
+def _numero_processos(max_processos: Optional[int], total_blocos: int) -> int:
+    if max_processos is None:
+        # Deixa um núcleo livre para a interface
+        max_processos = max(1, (os.cpu_count() or 2) - 1)
+    return max(1, min(max_processos, total_blocos))
+
+
+def renderizar_em_blocos(
+    itens: Sequence,
+    renderizar_bloco: Callable[[list, str], None],
+    caminho_saida: str,
+    tamanho_bloco: int = TAMANHO_BLOCO_PADRAO,
+    max_processos: Optional[int] = None,
+    ao_progredir: Optional[Callable[[int, int], None]] = None,
+) -> str:
+    """Renderiza ``itens`` em blocos paralelos e grava um único PDF.
+
+    Args:
+        itens: Dados de cada documento (precisam ser serializáveis com pickle).
+        renderizar_bloco: Função ``(itens_bloco, caminho_pdf)`` de nível de
+            módulo que grava o PDF de um bloco.
+        caminho_saida: Arquivo PDF final.
+        tamanho_bloco: Quantidade de itens por bloco.
+        max_processos: Limite de processos; ``1`` força renderização sequencial.
+            Padrão: número de núcleos menos um.
+        ao_progredir: Chamada como ``ao_progredir(itens_concluidos, total)``
+            no processo principal sempre que um bloco termina.
+
+    Returns:
+        ``caminho_saida``.
+    """
+    blocos = dividir_em_blocos(itens, tamanho_bloco)
+    if not blocos:
+        raise ValueError("nenhum item para renderizar")
+
+    total = len(itens)
+    pasta_temp = tempfile.mkdtemp(prefix='lote_pdf_')
+    caminhos = [os.path.join(pasta_temp, f'bloco_{i:04d}.pdf') for i in range(len(blocos))]
+    concluidos = 0
+
+    def _notificar(indice: int) -> None:
+        nonlocal concluidos
+        concluidos += len(blocos[indice])
+        if ao_progredir:
+            ao_progredir(concluidos, total)
+
+    try:
+        pendentes = set(range(len(blocos)))
+        processos = _numero_processos(max_processos, len(blocos))
+
+        if processos > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=processos) as executor:
+                    futuros = {
+                        executor.submit(renderizar_bloco, blocos[i], caminhos[i]): i
+                        for i in pendentes
+                    }
+                    for futuro in as_completed(futuros):
+                        indice = futuros[futuro]
+                        futuro.result()
+                        pendentes.discard(indice)
+                        _notificar(indice)
+            except (BrokenProcessPool, OSError) as e:
+                # Ambientes sem suporte a multiprocessing (ou um processo
+                # derrubado) não devem impedir o lote de sair.
+                logger.warning(
+                    f"Renderização paralela indisponível ({e}); "
+                    f"continuando {len(pendentes)} bloco(s) sequencialmente"
+                )
+
+        for indice in sorted(pendentes):
+            renderizar_bloco(blocos[indice], caminhos[indice])
+            _notificar(indice)
+
+        if len(caminhos) == 1:
+            shutil.move(caminhos[0], caminho_saida)
+        else:
+            concatenar_pdfs(caminhos, caminho_saida)
+
+        logger.info(
+            f"Lote de {total} documento(s) renderizado em {len(blocos)} bloco(s) "
+            f"com {processos} processo(s): {caminho_saida}"
+        )
+        return caminho_saida
+    finally:
+        shutil.rmtree(pasta_temp, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------------
+# Concatenação em fluxo
+# ---------------------------------------------------------------------------
+
+class _Remapeador:
+    """Renumera os objetos de um arquivo de entrada para o arquivo de saída."""
+
+    def __init__(self, proximo_numero: Callable[[], int]):
+        self._proximo_numero = proximo_numero
+        self._numeros: Dict[Tuple[int, int], int] = {}
+        self.pendentes: deque = deque()
+
+    def numero(self, ref: IndirectObject) -> int:
+        chave = (ref.idnum, ref.generation)
+        if chave not in self._numeros:
+            self._numeros[chave] = self._proximo_numero()
+            self.pendentes.append((self._numeros[chave], ref))
+        return self._numeros[chave]
+
+    def copiar(self, obj):
+        if isinstance(obj, IndirectObject):
+            return IndirectObject(self.numero(obj), 0, None)
+        if isinstance(obj, StreamObject):
+            novo = obj.__class__()
+            for chave, valor in obj.items():
+                # /Length é recalculado por StreamObject.write_to_stream
+                if chave != '/Length':
+                    novo[NameObject(chave)] = self.copiar(valor)
+            novo._data = obj._data
+            return novo
+        if isinstance(obj, DictionaryObject):
+            novo = DictionaryObject()
+            for chave, valor in obj.items():
+                novo[NameObject(chave)] = self.copiar(valor)
+            return novo
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self.copiar(valor) for valor in obj)
+        return obj
+
+
+def _folhas_da_arvore(no: DictionaryObject, herdados: dict):
+    """Percorre a árvore /Pages devolvendo ``(ref_pagina, atributos_herdados)``."""
+    herdados = dict(herdados)
+    for chave in _ATRIBUTOS_HERDAVEIS:
+        if chave in no:
+            herdados[chave] = no.raw_get(chave)
+    for ref in no.raw_get('/Kids'):
+        filho = ref.get_object()
+        if filho.get('/Type') == '/Pages':
+            yield from _folhas_da_arvore(filho, herdados)
+        else:
+            yield ref, herdados
+
+
+def _gravar_objeto(saida, offsets: Dict[int, int], numero: int, obj) -> None:
+    offsets[numero] = saida.tell()
+    saida.write(b'%d 0 obj\n' % numero)
+    obj.write_to_stream(saida, None)
+    saida.write(b'\nendobj\n')
+
+
+def concatenar_pdfs(caminhos: Sequence[str], caminho_saida: str) -> int:
+    """Concatena PDFs sem manter as páginas de todos os arquivos em memória.
+
+    Cada arquivo de entrada é lido, tem seus objetos renumerados e gravados
+    diretamente na saída e é descartado antes do próximo; só os offsets da
+    tabela xref e as referências das páginas permanecem até o fim. Pensado
+    para os PDFs parciais gerados pelo ReportLab (sem formulários, outlines
+    ou criptografia, que não são copiados).
+
+    Returns:
+        Total de páginas gravadas.
+    """
+    offsets: Dict[int, int] = {}
+    kids = ArrayObject()
+    contador = [_NUM_PAGINAS]
+
+    def proximo_numero() -> int:
+        contador[0] += 1
+        return contador[0]
+
+    ref_paginas = IndirectObject(_NUM_PAGINAS, 0, None)
+
+    with open(caminho_saida, 'wb') as saida:
+        saida.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+        for caminho in caminhos:
+            with open(caminho, 'rb') as entrada:
+                leitor = PdfReader(entrada)
+                remap = _Remapeador(proximo_numero)
+                raiz_paginas = leitor.trailer['/Root']['/Pages']
+
+                for ref, herdados in _folhas_da_arvore(raiz_paginas, {}):
+                    pagina = ref.get_object()
+                    nova = remap.copiar(DictionaryObject(
+                        (chave, valor) for chave, valor in pagina.items() if chave != '/Parent'
+                    ))
+                    for chave, valor in herdados.items():
+                        if chave not in nova:
+                            nova[NameObject(chave)] = remap.copiar(valor)
+                    nova[NameObject('/Parent')] = ref_paginas
+                    numero = remap.numero(ref)
+                    kids.append(IndirectObject(numero, 0, None))
+                    _gravar_objeto(saida, offsets, numero, nova)
+
+                    # Recursos, fontes e conteúdo referenciados pela página
+                    while remap.pendentes:
+                        numero_obj, ref_obj = remap.pendentes.popleft()
+                        obj = ref_obj.get_object()
+                        # Páginas citadas por links são gravadas quando a
+                        # árvore chegar nelas; nós /Pages antigos são descartados.
+                        if isinstance(obj, DictionaryObject) and obj.get('/Type') in ('/Page', '/Pages'):
+                            continue
+                        _gravar_objeto(saida, offsets, numero_obj, remap.copiar(obj))
+
+        paginas = DictionaryObject({
+            NameObject('/Type'): NameObject('/Pages'),
+            NameObject('/Kids'): kids,
+            NameObject('/Count'): NumberObject(len(kids)),
+        })
+        _gravar_objeto(saida, offsets, _NUM_PAGINAS, paginas)
+        catalogo = DictionaryObject({
+            NameObject('/Type'): NameObject('/Catalog'),
+            NameObject('/Pages'): ref_paginas,
+        })
+        _gravar_objeto(saida, offsets, _NUM_CATALOGO, catalogo)
+
+        inicio_xref = saida.tell()
+        tamanho = contador[0] + 1
+        saida.write(b'xref\n0 %d\n' % tamanho)
+        saida.write(b'0000000000 65535 f \n')
+        for numero in range(1, tamanho):
+            if numero in offsets:
+                saida.write(b'%010d 00000 n \n' % offsets[numero])
+            else:
+                saida.write(b'0000000000 65535 f \n')
+        trailer = DictionaryObject({
+            NameObject('/Size'): NumberObject(tamanho),
+            NameObject('/Root'): IndirectObject(_NUM_CATALOGO, 0, None),
+        })
+        saida.write(b'trailer\n')
+        trailer.write_to_stream(saida, None)
+        saida.write(b'\nstartxref\n%d\n%%%%EOF\n' % inicio_xref)
+
+    return len(kids)
@@ -14,6 +14,7 @@ import os
 from src.core.config_logs import get_logger
 from src.core.config import get_icon_path
 from src.core.conexao import inicializar_pool, fechar_pool
+from src.services.log_alteracoes_service import monitor_alteracoes
 from db.connection import get_connection
 
 # Importar settings centralizado
@@ -104,6 +105,12 @@ class Application:
             logger.debug("Inicializando connection pool...")
             inicializar_pool()
             logger.debug("Connection pool inicializado com sucesso")
+            # Invalidação dos caches por alterações feitas em outros clientes
+            monitor_alteracoes.iniciar()
+            # Índice da pesquisa principal pronto antes da primeira tecla
+            from src.services.busca_pessoas_service import aquecer
+            from src.utils.executor import submit_background
+            submit_background(aquecer)
         except Exception as e:
             logger.exception(f"Erro ao inicializar connection pool: {e}")
             raise
@@ -290,6 +297,8 @@ class Application:
         
         # Armazenar referência ao Entry widget (não em frames, pois Entry != Frame)
         self.e_nome_pesquisa = e_nome_pesquisa
+        # Pesquisa enquanto digita (com debounce, em segundo plano)
+        e_nome_pesquisa.bind("<KeyRelease>", self._pesquisar_ao_digitar)
         
         logger.debug("Barra de pesquisa configurada")
         return e_nome_pesquisa
@@ -325,9 +334,11 @@ class Application:
         # Lazy import
         from src.ui.table import TableManager
         
+        # Rolagem virtual: pesquisas amplas devolvem milhares de linhas
         self.table_manager = TableManager(
             parent_frame=self.frames['frame_tabela'],
-            colors=self.colors
+            colors=self.colors,
+            virtual=True
         )
         
         self.table_manager.criar_tabela(
@@ -526,12 +537,20 @@ class Application:
             self.status_label.config(text=message)
             logger.debug(f"Status atualizado: {message}")
     
-    def _pesquisar_callback(self, event=None):
+    def _pesquisar_ao_digitar(self, event=None):
+        """Pesquisa com debounce a cada tecla do campo de pesquisa."""
+        # Enter já dispara a pesquisa imediata; teclas de navegação não mudam o texto
+        if event is not None and (event.keysym in ('Return', 'KP_Enter') or not event.char):
+            return
+        self._pesquisar_callback(ao_digitar=True)
+    
+    def _pesquisar_callback(self, event=None, ao_digitar: bool = False):
         """
         Callback de pesquisa integrado.
         
         Args:
             event: Evento Tkinter (opcional)
+            ao_digitar: Pesquisa disparada pela digitação (debounce, sem mensagens)
         """
         from src.ui.search import pesquisar_alunos_funcionarios
         
@@ -547,7 +566,8 @@ class Application:
                 get_tabela_frame_func=lambda: self.table_manager.tabela_frame if self.table_manager else None,
                 frame_tabela=self.frames.get('frame_tabela'),
                 criar_tabela_func=lambda: self.setup_table(on_select_callback=self._on_select_callback),
-                criar_dashboard_func=lambda: self.dashboard_manager.criar_dashboard() if self.dashboard_manager else None
+                criar_dashboard_func=lambda: self.dashboard_manager.criar_dashboard() if self.dashboard_manager else None,
+                ao_digitar=ao_digitar
             )
     
     def _on_select_callback(self, event):
@@ -700,6 +720,9 @@ class Application:
             except Exception as e:
                 logger.error(f"Erro ao fechar dashboard: {e}")
         
+        # Parar o monitor antes de fechar o pool que ele usa
+        monitor_alteracoes.parar()
+        
         # Fechar connection pool
         try:
             fechar_pool()
@@ -17,7 +17,7 @@ from threading import Thread
 from tkinter import Frame, Label, Button, Toplevel, Scrollbar, Canvas, StringVar
 from tkinter.ttk import Progressbar, Treeview, Style, Notebook, Combobox
 from src.core.config_logs import get_logger
-from db.connection import get_cursor
+from db.lote_consultas import LoteConsultas, resolver_ano_letivo
 from src.ui.theme import CO_BG, CO_FG, CO_ACCENT, CO_WARN
 
 logger = get_logger(__name__)
@@ -369,7 +369,11 @@ class DashboardCoordenador:
         return False
     
     def _buscar_dados_pedagogicos(self) -> Optional[Dict]:
-        """Busca todos os dados pedagógicos necessários para o dashboard."""
+        """Busca todos os dados pedagógicos necessários para o dashboard.
+
+        As consultas são independentes e rodam em paralelo (LoteConsultas),
+        cada uma em sua conexão do pool.
+        """
         try:
             dados = {}
             
@@ -379,192 +383,187 @@ class DashboardCoordenador:
                 placeholders = ', '.join(['%s'] * len(self.series_permitidas))
                 filtro_series_sql = f" AND s.nome IN ({placeholders})"
             
-            with get_cursor() as cursor:
-                if cursor is None:
-                    return None
-                
-                # Obter ano letivo se não especificado
-                if self.ano_letivo is None:
-                    cursor.execute(
-                        "SELECT ano_letivo FROM AnosLetivos WHERE CURDATE() BETWEEN data_inicio AND data_fim LIMIT 1"
-                    )
-                    r = cursor.fetchone()
-                    self.ano_letivo = r['ano_letivo'] if r else str(__import__('datetime').datetime.now().year)
-                
-                # Parâmetros base
-                params_base = [self.ano_letivo, self.escola_id]
-                params_com_series = params_base + (self.series_permitidas if self.series_permitidas else [])
-                
-                # 1. Média geral por disciplina (filtrada por série)
-                query_disciplinas = f"""
-                    SELECT d.nome AS disciplina,
-                           ROUND(AVG(n.nota), 2) AS media,
-                           COUNT(DISTINCT n.aluno_id) AS total_alunos
-                    FROM notas n
-                    JOIN disciplinas d ON n.disciplina_id = d.id
-                    JOIN matriculas m ON n.aluno_id = m.aluno_id 
-                        AND n.ano_letivo_id = m.ano_letivo_id
-                    JOIN turmas t ON m.turma_id = t.id
-                    JOIN series s ON t.serie_id = s.id
-                    JOIN alunos a ON n.aluno_id = a.id
-                    WHERE n.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                      AND a.escola_id = %s
-                      AND m.status = 'Ativo'
-                      {filtro_series_sql}
-                    GROUP BY d.id, d.nome
-                    ORDER BY media DESC
-                """
-                cursor.execute(query_disciplinas, params_com_series)
-                dados['medias_disciplinas'] = cursor.fetchall() or []
-                
-                # 2. Desempenho por série (filtrado)
-                query_series = f"""
-                    SELECT 
-                        s.nome AS serie,
-                        ROUND(AVG(n.nota), 2) AS media,
-                        COUNT(DISTINCT m.aluno_id) AS total_alunos
-                    FROM matriculas m
-                    JOIN turmas t ON m.turma_id = t.id
-                    JOIN series s ON t.serie_id = s.id
-                    JOIN alunos a ON m.aluno_id = a.id
-                    LEFT JOIN notas n ON m.aluno_id = n.aluno_id 
-                        AND m.ano_letivo_id = n.ano_letivo_id
-                    WHERE m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                      AND a.escola_id = %s
-                      AND m.status = 'Ativo'
-                      {filtro_series_sql}
-                    GROUP BY s.id, s.nome
-                    ORDER BY s.nome
-                """
-                cursor.execute(query_series, params_com_series)
-                dados['desempenho_series'] = cursor.fetchall() or []
-                
-                # 3. Alunos com baixo desempenho (média < 6.0) - filtrado
-                query_baixo_desemp = f"""
-                    SELECT 
-                        a.nome AS aluno,
-                        s.nome AS serie,
-                        t.nome AS turma,
-                        ROUND(AVG(n.nota), 2) AS media_geral
-                    FROM alunos a
-                    JOIN matriculas m ON a.id = m.aluno_id
-                    JOIN turmas t ON m.turma_id = t.id
-                    JOIN series s ON t.serie_id = s.id
-                    JOIN notas n ON a.id = n.aluno_id AND n.ano_letivo_id = m.ano_letivo_id
-                    WHERE m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                      AND a.escola_id = %s
-                      AND m.status = 'Ativo'
-                      {filtro_series_sql}
-                    GROUP BY a.id, a.nome, s.nome, t.nome
-                    HAVING media_geral < 6.0
-                    ORDER BY media_geral ASC
-                    LIMIT 20
-                """
-                cursor.execute(query_baixo_desemp, params_com_series)
-                dados['alunos_baixo_desempenho'] = cursor.fetchall() or []
-                
-                # 4. Alunos com baixa frequência (> 40 faltas) - filtrado
-                query_baixa_freq = f"""
-                    SELECT 
-                        a.nome AS aluno,
-                        s.nome AS serie,
-                        t.nome AS turma,
-                        COALESCE(SUM(fb.faltas), 0) AS total_faltas
-                    FROM alunos a
-                    JOIN matriculas m ON a.id = m.aluno_id
-                    JOIN turmas t ON m.turma_id = t.id
-                    JOIN series s ON t.serie_id = s.id
-                    LEFT JOIN faltas_bimestrais fb ON a.id = fb.aluno_id 
-                        AND fb.ano_letivo_id = m.ano_letivo_id
-                    WHERE m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                      AND a.escola_id = %s
-                      AND m.status = 'Ativo'
-                      {filtro_series_sql}
-                    GROUP BY a.id, a.nome, s.nome, t.nome
-                    HAVING total_faltas > 40
-                    ORDER BY total_faltas DESC
-                    LIMIT 20
-                """
-                cursor.execute(query_baixa_freq, params_com_series)
-                dados['alunos_baixa_frequencia'] = cursor.fetchall() or []
-                
-                # 5. Turmas com notas pendentes - filtrado
-                query_pendencias = f"""
-                    SELECT 
-                        s.nome AS serie,
-                        t.nome AS turma,
-                        d.nome AS disciplina,
-                        COUNT(DISTINCT m.aluno_id) AS alunos_sem_nota
-                    FROM matriculas m
-                    JOIN turmas t ON m.turma_id = t.id
-                    JOIN series s ON t.serie_id = s.id
-                    JOIN alunos a ON m.aluno_id = a.id
-                    CROSS JOIN disciplinas d
-                    LEFT JOIN notas n ON m.aluno_id = n.aluno_id 
-                        AND n.disciplina_id = d.id 
-                        AND n.ano_letivo_id = m.ano_letivo_id
-                    WHERE m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                      AND a.escola_id = %s
-                      AND m.status = 'Ativo'
-                      AND n.id IS NULL
-                      {filtro_series_sql}
-                    GROUP BY s.id, s.nome, t.id, t.nome, d.id, d.nome
-                    HAVING alunos_sem_nota > 0
-                    ORDER BY s.nome, t.nome, d.nome
-                    LIMIT 30
-                """
-                cursor.execute(query_pendencias, params_com_series)
-                dados['turmas_pendencias'] = cursor.fetchall() or []
-                
-                # 6. Totalizadores - filtrado
-                query_totais = f"""
-                    SELECT 
-                        COUNT(DISTINCT m.aluno_id) AS total_alunos,
-                        COUNT(DISTINCT t.id) AS total_turmas
-                    FROM matriculas m
-                    JOIN turmas t ON m.turma_id = t.id
-                    JOIN series s ON t.serie_id = s.id
-                    JOIN alunos a ON m.aluno_id = a.id
-                    WHERE m.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                      AND a.escola_id = %s
-                      AND m.status = 'Ativo'
-                      {filtro_series_sql}
-                """
-                cursor.execute(query_totais, params_com_series)
-                totais = cursor.fetchone()
-                dados['total_alunos'] = totais['total_alunos'] if totais else 0
-                dados['total_turmas'] = totais['total_turmas'] if totais else 0
-                
-                # Média geral (filtrada)
-                query_media = f"""
-                    SELECT ROUND(AVG(n.nota), 2) AS media_geral
-                    FROM notas n
-                    JOIN matriculas m ON n.aluno_id = m.aluno_id 
-                        AND n.ano_letivo_id = m.ano_letivo_id
-                    JOIN turmas t ON m.turma_id = t.id
-                    JOIN series s ON t.serie_id = s.id
-                    JOIN alunos a ON n.aluno_id = a.id
-                    WHERE n.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                      AND a.escola_id = %s
-                      AND m.status = 'Ativo'
-                      {filtro_series_sql}
-                """
-                cursor.execute(query_media, params_com_series)
-                media = cursor.fetchone()
-                dados['media_geral'] = media['media_geral'] if media and media['media_geral'] else 0
-                
-                # Estatísticas adicionais para o dashboard moderno
-                # Total de disciplinas com aulas
-                cursor.execute("""
-                    SELECT COUNT(DISTINCT d.id) AS total_disciplinas
-                    FROM disciplinas d
-                    JOIN notas n ON d.id = n.disciplina_id
-                    WHERE n.ano_letivo_id = (SELECT id FROM AnosLetivos WHERE ano_letivo = %s)
-                """, (self.ano_letivo,))
-                disc_result = cursor.fetchone()
-                dados['total_disciplinas'] = disc_result['total_disciplinas'] if disc_result else 0
-                
-                return dados
+            # Resolve o ano letivo uma única vez para todas as consultas
+            self.ano_letivo, ano_letivo_id = resolver_ano_letivo(self.ano_letivo)
+            
+            # Parâmetros base
+            params_base = [ano_letivo_id, self.escola_id]
+            params_com_series = params_base + (self.series_permitidas if self.series_permitidas else [])
+            lote = LoteConsultas(descricao='Dashboard coordenador')
+            
+            # 1. Média geral por disciplina (filtrada por série)
+            query_disciplinas = f"""
+                SELECT d.nome AS disciplina,
+                       ROUND(AVG(n.nota), 2) AS media,
+                       COUNT(DISTINCT n.aluno_id) AS total_alunos
+                FROM notas n
+                JOIN disciplinas d ON n.disciplina_id = d.id
+                JOIN matriculas m ON n.aluno_id = m.aluno_id 
+                    AND n.ano_letivo_id = m.ano_letivo_id
+                JOIN turmas t ON m.turma_id = t.id
+                JOIN series s ON t.serie_id = s.id
+                JOIN alunos a ON n.aluno_id = a.id
+                WHERE n.ano_letivo_id = %s
+                  AND a.escola_id = %s
+                  AND m.status = 'Ativo'
+                  {filtro_series_sql}
+                GROUP BY d.id, d.nome
+                ORDER BY media DESC
+            """
+            lote.adicionar('medias_disciplinas', query_disciplinas, params_com_series)
+            
+            # 2. Desempenho por série (filtrado)
+            query_series = f"""
+                SELECT 
+                    s.nome AS serie,
+                    ROUND(AVG(n.nota), 2) AS media,
+                    COUNT(DISTINCT m.aluno_id) AS total_alunos
+                FROM matriculas m
+                JOIN turmas t ON m.turma_id = t.id
+                JOIN series s ON t.serie_id = s.id
+                JOIN alunos a ON m.aluno_id = a.id
+                LEFT JOIN notas n ON m.aluno_id = n.aluno_id 
+                    AND m.ano_letivo_id = n.ano_letivo_id
+                WHERE m.ano_letivo_id = %s
+                  AND a.escola_id = %s
+                  AND m.status = 'Ativo'
+                  {filtro_series_sql}
+                GROUP BY s.id, s.nome
+                ORDER BY s.nome
+            """
+            lote.adicionar('desempenho_series', query_series, params_com_series)
+            
+            # 3. Alunos com baixo desempenho (média < 6.0) - filtrado
+            query_baixo_desemp = f"""
+                SELECT 
+                    a.nome AS aluno,
+                    s.nome AS serie,
+                    t.nome AS turma,
+                    ROUND(AVG(n.nota), 2) AS media_geral
+                FROM alunos a
+                JOIN matriculas m ON a.id = m.aluno_id
+                JOIN turmas t ON m.turma_id = t.id
+                JOIN series s ON t.serie_id = s.id
+                JOIN notas n ON a.id = n.aluno_id AND n.ano_letivo_id = m.ano_letivo_id
+                WHERE m.ano_letivo_id = %s
+                  AND a.escola_id = %s
+                  AND m.status = 'Ativo'
+                  {filtro_series_sql}
+                GROUP BY a.id, a.nome, s.nome, t.nome
+                HAVING media_geral < 6.0
+                ORDER BY media_geral ASC
+                LIMIT 20
+            """
+            lote.adicionar('alunos_baixo_desempenho', query_baixo_desemp, params_com_series)
+            
+            # 4. Alunos com baixa frequência (> 40 faltas) - filtrado
+            query_baixa_freq = f"""
+                SELECT 
+                    a.nome AS aluno,
+                    s.nome AS serie,
+                    t.nome AS turma,
+                    COALESCE(SUM(fb.faltas), 0) AS total_faltas
+                FROM alunos a
+                JOIN matriculas m ON a.id = m.aluno_id
+                JOIN turmas t ON m.turma_id = t.id
+                JOIN series s ON t.serie_id = s.id
+                LEFT JOIN faltas_bimestrais fb ON a.id = fb.aluno_id 
+                    AND fb.ano_letivo_id = m.ano_letivo_id
+                WHERE m.ano_letivo_id = %s
+                  AND a.escola_id = %s
+                  AND m.status = 'Ativo'
+                  {filtro_series_sql}
+                GROUP BY a.id, a.nome, s.nome, t.nome
+                HAVING total_faltas > 40
+                ORDER BY total_faltas DESC
+                LIMIT 20
+            """
+            lote.adicionar('alunos_baixa_frequencia', query_baixa_freq, params_com_series)
+            
+            # 5. Turmas com notas pendentes - filtrado
+            query_pendencias = f"""
+                SELECT 
+                    s.nome AS serie,
+                    t.nome AS turma,
+                    d.nome AS disciplina,
+                    COUNT(DISTINCT m.aluno_id) AS alunos_sem_nota
+                FROM matriculas m
+                JOIN turmas t ON m.turma_id = t.id
+                JOIN series s ON t.serie_id = s.id
+                JOIN alunos a ON m.aluno_id = a.id
+                CROSS JOIN disciplinas d
+                LEFT JOIN notas n ON m.aluno_id = n.aluno_id 
+                    AND n.disciplina_id = d.id 
+                    AND n.ano_letivo_id = m.ano_letivo_id
+                WHERE m.ano_letivo_id = %s
+                  AND a.escola_id = %s
+                  AND m.status = 'Ativo'
+                  AND n.id IS NULL
+                  {filtro_series_sql}
+                GROUP BY s.id, s.nome, t.id, t.nome, d.id, d.nome
+                HAVING alunos_sem_nota > 0
+                ORDER BY s.nome, t.nome, d.nome
+                LIMIT 30
+            """
+            lote.adicionar('turmas_pendencias', query_pendencias, params_com_series)
+            
+            # 6. Totalizadores - filtrado
+            query_totais = f"""
+                SELECT 
+                    COUNT(DISTINCT m.aluno_id) AS total_alunos,
+                    COUNT(DISTINCT t.id) AS total_turmas
+                FROM matriculas m
+                JOIN turmas t ON m.turma_id = t.id
+                JOIN series s ON t.serie_id = s.id
+                JOIN alunos a ON m.aluno_id = a.id
+                WHERE m.ano_letivo_id = %s
+                  AND a.escola_id = %s
+                  AND m.status = 'Ativo'
+                  {filtro_series_sql}
+            """
+            lote.adicionar('totais', query_totais, params_com_series, um=True)
+            
+            # Média geral (filtrada)
+            query_media = f"""
+                SELECT ROUND(AVG(n.nota), 2) AS media_geral
+                FROM notas n
+                JOIN matriculas m ON n.aluno_id = m.aluno_id 
+                    AND n.ano_letivo_id = m.ano_letivo_id
+                JOIN turmas t ON m.turma_id = t.id
+                JOIN series s ON t.serie_id = s.id
+                JOIN alunos a ON n.aluno_id = a.id
+                WHERE n.ano_letivo_id = %s
+                  AND a.escola_id = %s
+                  AND m.status = 'Ativo'
+                  {filtro_series_sql}
+            """
+            lote.adicionar('media', query_media, params_com_series, um=True)
+            
+            # Estatísticas adicionais para o dashboard moderno
+            # Total de disciplinas com aulas
+            lote.adicionar('disciplinas', """
+                SELECT COUNT(DISTINCT d.id) AS total_disciplinas
+                FROM disciplinas d
+                JOIN notas n ON d.id = n.disciplina_id
+                WHERE n.ano_letivo_id = %s
+            """, (ano_letivo_id,), um=True)
+            
+            resultados = lote.executar()
+            dados['medias_disciplinas'] = resultados['medias_disciplinas']
+            dados['desempenho_series'] = resultados['desempenho_series']
+            dados['alunos_baixo_desempenho'] = resultados['alunos_baixo_desempenho']
+            dados['alunos_baixa_frequencia'] = resultados['alunos_baixa_frequencia']
+            dados['turmas_pendencias'] = resultados['turmas_pendencias']
+            totais = resultados['totais']
+            dados['total_alunos'] = totais['total_alunos'] if totais else 0
+            dados['total_turmas'] = totais['total_turmas'] if totais else 0
+            media = resultados['media']
+            dados['media_geral'] = media['media_geral'] if media and media['media_geral'] else 0
+            disc_result = resultados['disciplinas']
+            dados['total_disciplinas'] = disc_result['total_disciplinas'] if disc_result else 0
+            dados['tempos_consultas'] = lote.tempos
+            
+            return dados
                 
         except Exception as e:
             logger.exception(f"Erro ao buscar dados pedagógicos: {e}")
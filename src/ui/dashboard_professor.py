@@ -14,6 +14,7 @@ from tkinter import Frame, Label, Button, Toplevel, Scrollbar, Canvas
 from tkinter.ttk import Progressbar, Treeview, Style
 from src.core.config_logs import get_logger
 from db.connection import get_cursor
+from db.lote_consultas import LoteConsultas, resolver_ano_letivo
 from src.ui.theme import CO_BG, CO_FG, CO_ACCENT, CO_WARN
 
 logger = get_logger(__name__)
@@ -155,18 +156,8 @@ class DashboardProfessor:
                 if cursor is None:
                     return None
                 
-                # Obter ano letivo se não especificado
-                if self.ano_letivo is None:
-                    cursor.execute(
-                        "SELECT ano_letivo FROM AnosLetivos WHERE CURDATE() BETWEEN data_inicio AND data_fim LIMIT 1"
-                    )
-                    r = cursor.fetchone()
-                    self.ano_letivo = r['ano_letivo'] if r else str(__import__('datetime').datetime.now().year)
-                
-                # Obter ID do ano letivo
-                cursor.execute("SELECT id FROM AnosLetivos WHERE ano_letivo = %s", (self.ano_letivo,))
-                r = cursor.fetchone()
-                ano_letivo_id = r['id'] if r else None
+                # Resolve o ano letivo uma única vez para todas as consultas
+                self.ano_letivo, ano_letivo_id = resolver_ano_letivo(self.ano_letivo, cursor)
                 
                 if not ano_letivo_id:
                     return None
@@ -237,95 +228,102 @@ class DashboardProfessor:
                     for t in turmas
                 ] if turmas else []
                 
-                if turma_ids:
-                    # 2. Buscar notas pendentes de lançamento
-                    placeholders = ','.join(['%s'] * len(turma_ids))
-                    cursor.execute(f"""
-                        SELECT 
-                            s.nome AS serie,
-                            t.nome AS turma,
-                            d.nome AS disciplina,
-                            COUNT(DISTINCT m.aluno_id) AS alunos_sem_nota,
-                            'atual' AS bimestre
-                        FROM matriculas m
-                        JOIN turmas t ON m.turma_id = t.id
-                        JOIN series s ON t.serie_id = s.id
-                        CROSS JOIN disciplinas d
-                        LEFT JOIN notas n ON m.aluno_id = n.aluno_id 
-                            AND n.disciplina_id = d.id 
-                            AND n.ano_letivo_id = m.ano_letivo_id
-                        WHERE m.turma_id IN ({placeholders})
-                          AND m.ano_letivo_id = %s
-                          AND m.status = 'Ativo'
-                          AND n.id IS NULL
-                          AND d.ativo = 1
-                        GROUP BY t.id, s.nome, t.nome, d.id, d.nome
-                        HAVING alunos_sem_nota > 0
-                        ORDER BY s.nome, t.nome, d.nome
-                        LIMIT 20
-                    """, (*turma_ids, ano_letivo_id))
-                    dados['notas_pendentes'] = cursor.fetchall() or []
-                    
-                    # 3. Desempenho das turmas (média por turma)
-                    cursor.execute(f"""
-                        SELECT 
-                            s.nome AS serie,
-                            t.nome AS turma,
-                            ROUND(AVG(n.nota), 2) AS media,
-                            COUNT(DISTINCT n.aluno_id) AS alunos_com_nota
-                        FROM turmas t
-                        JOIN series s ON t.serie_id = s.id
-                        JOIN matriculas m ON t.id = m.turma_id AND m.status = 'Ativo'
-                        LEFT JOIN notas n ON m.aluno_id = n.aluno_id 
-                            AND n.ano_letivo_id = m.ano_letivo_id
-                        WHERE t.id IN ({placeholders})
-                          AND m.ano_letivo_id = %s
-                        GROUP BY t.id, s.nome, t.nome
-                        ORDER BY media DESC
-                    """, (*turma_ids, ano_letivo_id))
-                    dados['desempenho_turmas'] = cursor.fetchall() or []
-                    
-                    # 4. Alunos com baixo desempenho nas turmas do professor
-                    cursor.execute(f"""
-                        SELECT 
-                            a.nome AS aluno,
-                            s.nome AS serie,
-                            t.nome AS turma,
-                            ROUND(AVG(n.nota), 2) AS media_geral
-                        FROM alunos a
-                        JOIN matriculas m ON a.id = m.aluno_id
-                        JOIN turmas t ON m.turma_id = t.id
-                        JOIN series s ON t.serie_id = s.id
-                        JOIN notas n ON a.id = n.aluno_id AND n.ano_letivo_id = m.ano_letivo_id
-                        WHERE t.id IN ({placeholders})
-                          AND m.ano_letivo_id = %s
-                          AND m.status = 'Ativo'
-                        GROUP BY a.id, a.nome, s.nome, t.nome
-                        HAVING media_geral < 6.0
-                        ORDER BY media_geral ASC
-                        LIMIT 15
-                    """, (*turma_ids, ano_letivo_id))
-                    dados['alunos_baixo_desempenho'] = cursor.fetchall() or []
-                    
-                    # 5. Contagem de notas já lançadas
-                    cursor.execute(f"""
-                        SELECT COUNT(DISTINCT n.id) AS total_notas
-                        FROM notas n
-                        JOIN matriculas m ON n.aluno_id = m.aluno_id 
-                            AND n.ano_letivo_id = m.ano_letivo_id
-                        WHERE m.turma_id IN ({placeholders})
-                          AND m.ano_letivo_id = %s
-                    """, (*turma_ids, ano_letivo_id))
-                    r = cursor.fetchone()
-                    dados['total_notas_lancadas'] = r['total_notas'] if r else 0
-                else:
-                    dados['notas_pendentes'] = []
-                    dados['desempenho_turmas'] = []
-                    dados['alunos_baixo_desempenho'] = []
-                    dados['total_notas_lancadas'] = 0
+            if turma_ids:
+                # 2-5. Consultas independentes, em paralelo (uma conexão cada)
+                placeholders = ','.join(['%s'] * len(turma_ids))
+                params_turmas = (*turma_ids, ano_letivo_id)
+                lote = LoteConsultas(descricao='Dashboard professor')
+                
+                # 2. Buscar notas pendentes de lançamento
+                lote.adicionar('notas_pendentes', f"""
+                    SELECT 
+                        s.nome AS serie,
+                        t.nome AS turma,
+                        d.nome AS disciplina,
+                        COUNT(DISTINCT m.aluno_id) AS alunos_sem_nota,
+                        'atual' AS bimestre
+                    FROM matriculas m
+                    JOIN turmas t ON m.turma_id = t.id
+                    JOIN series s ON t.serie_id = s.id
+                    CROSS JOIN disciplinas d
+                    LEFT JOIN notas n ON m.aluno_id = n.aluno_id 
+                        AND n.disciplina_id = d.id 
+                        AND n.ano_letivo_id = m.ano_letivo_id
+                    WHERE m.turma_id IN ({placeholders})
+                      AND m.ano_letivo_id = %s
+                      AND m.status = 'Ativo'
+                      AND n.id IS NULL
+                      AND d.ativo = 1
+                    GROUP BY t.id, s.nome, t.nome, d.id, d.nome
+                    HAVING alunos_sem_nota > 0
+                    ORDER BY s.nome, t.nome, d.nome
+                    LIMIT 20
+                """, params_turmas)
                 
-                return dados
+                # 3. Desempenho das turmas (média por turma)
+                lote.adicionar('desempenho_turmas', f"""
+                    SELECT 
+                        s.nome AS serie,
+                        t.nome AS turma,
+                        ROUND(AVG(n.nota), 2) AS media,
+                        COUNT(DISTINCT n.aluno_id) AS alunos_com_nota
+                    FROM turmas t
+                    JOIN series s ON t.serie_id = s.id
+                    JOIN matriculas m ON t.id = m.turma_id AND m.status = 'Ativo'
+                    LEFT JOIN notas n ON m.aluno_id = n.aluno_id 
+                        AND n.ano_letivo_id = m.ano_letivo_id
+                    WHERE t.id IN ({placeholders})
+                      AND m.ano_letivo_id = %s
+                    GROUP BY t.id, s.nome, t.nome
+                    ORDER BY media DESC
+                """, params_turmas)
                 
+                # 4. Alunos com baixo desempenho nas turmas do professor
+                lote.adicionar('alunos_baixo_desempenho', f"""
+                    SELECT 
+                        a.nome AS aluno,
+                        s.nome AS serie,
+                        t.nome AS turma,
+                        ROUND(AVG(n.nota), 2) AS media_geral
+                    FROM alunos a
+                    JOIN matriculas m ON a.id = m.aluno_id
+                    JOIN turmas t ON m.turma_id = t.id
+                    JOIN series s ON t.serie_id = s.id
+                    JOIN notas n ON a.id = n.aluno_id AND n.ano_letivo_id = m.ano_letivo_id
+                    WHERE t.id IN ({placeholders})
+                      AND m.ano_letivo_id = %s
+                      AND m.status = 'Ativo'
+                    GROUP BY a.id, a.nome, s.nome, t.nome
+                    HAVING media_geral < 6.0
+                    ORDER BY media_geral ASC
+                    LIMIT 15
+                """, params_turmas)
+                
+                # 5. Contagem de notas já lançadas
+                lote.adicionar('total_notas', f"""
+                    SELECT COUNT(DISTINCT n.id) AS total_notas
+                    FROM notas n
+                    JOIN matriculas m ON n.aluno_id = m.aluno_id 
+                        AND n.ano_letivo_id = m.ano_letivo_id
+                    WHERE m.turma_id IN ({placeholders})
+                      AND m.ano_letivo_id = %s
+                """, params_turmas, um=True)
+                
+                resultados = lote.executar()
+                dados['notas_pendentes'] = resultados['notas_pendentes']
+                dados['desempenho_turmas'] = resultados['desempenho_turmas']
+                dados['alunos_baixo_desempenho'] = resultados['alunos_baixo_desempenho']
+                r = resultados['total_notas']
+                dados['total_notas_lancadas'] = r['total_notas'] if r else 0
+                dados['tempos_consultas'] = lote.tempos
+            else:
+                dados['notas_pendentes'] = []
+                dados['desempenho_turmas'] = []
+                dados['alunos_baixo_desempenho'] = []
+                dados['total_notas_lancadas'] = 0
+            
+            return dados
+            
         except Exception as e:
             logger.exception(f"Erro ao buscar dados do professor: {e}")
             return None
@@ -2,13 +2,13 @@
 Interface para selecionar estudantes que assinaram os termos do Programa Cuidar dos Olhos.
 """
 
-from tkinter import Toplevel, Frame, Label, Button, messagebox, Scrollbar, Canvas, Entry, StringVar
-from tkinter.ttk import Checkbutton
+from tkinter import Toplevel, Frame, Label, Button, messagebox, Entry, StringVar
 import tkinter as tk
 import json
 from pathlib import Path
 
 from src.ui.colors import COLORS
+from src.ui.tabela_virtual import ListaMarcavel
 from src.core.config_logs import get_logger
 from src.core.conexao import conectar_bd
 from src.core.config import ANO_LETIVO_ATUAL
@@ -49,7 +49,7 @@ class PlanilhaEstudantesWindow:
         self.janela.protocol("WM_DELETE_WINDOW", self._ao_fechar)
         
         # Dados
-        self.alunos_responsaveis = []  # Lista de tuplas (aluno, responsavel, var_checkbox, frame_widget)
+        self.alunos_responsaveis = []  # Lista de tuplas (aluno, responsavel); marcações em self.lista
         self.selecionados = []
         self.texto_busca = StringVar()
         self.texto_busca.trace('w', lambda *args: self._filtrar_lista())
@@ -201,22 +201,13 @@ class PlanilhaEstudantesWindow:
         frame_lista = Frame(frame_principal, bg=COLORS.co0)
         frame_lista.pack(fill='both', expand=True, pady=(0, 20))
         
-        # Canvas e Scrollbar
-        self.canvas = Canvas(frame_lista, bg=COLORS.co0, highlightthickness=0)
-        scrollbar = Scrollbar(frame_lista, orient="vertical", command=self.canvas.yview)
-        self.frame_checkboxes = Frame(self.canvas, bg=COLORS.co0)
-        
-        self.frame_checkboxes.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        # Lista virtual: só as linhas visíveis existem como itens do Treeview
+        self.lista = ListaMarcavel(
+            frame_lista,
+            [('Série', 140), ('Aluno', 340), ('Responsável', 340)],
+            ao_alterar=self._ao_alterar_selecao
         )
         
-        self.canvas.create_window((0, 0), window=self.frame_checkboxes, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
-        
-        self.canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
         # Frame de botões finais
         frame_botoes = Frame(frame_principal, bg=COLORS.co1)
         frame_botoes.pack(fill='x')
@@ -259,20 +250,20 @@ class PlanilhaEstudantesWindow:
                 return
             
             # Para cada aluno, buscar seus responsáveis
-            total = 0
             for aluno in alunos:
                 responsaveis = obter_responsaveis_do_aluno(aluno['id'])
                 
                 if responsaveis:
                     for responsavel in responsaveis:
-                        var = tk.BooleanVar(value=False)
-                        # Adicionar callback para atualizar contador
-                        var.trace('w', lambda *args: self._atualizar_contador())
-                        self.alunos_responsaveis.append((aluno, responsavel, var, None))  # None será o frame
-                        total += 1
-            
-            # Criar checkboxes
-            self._criar_checkboxes()
+                        self.alunos_responsaveis.append((aluno, responsavel))
+            total = len(self.alunos_responsaveis)
+            
+            # Agrupados por série e ordenados por nome (colunas reordenáveis no cabeçalho)
+            self.alunos_responsaveis.sort(key=lambda item: (item[0]['nome_serie'], item[0]['nome_aluno']))
+            self.lista.definir(
+                (aluno['nome_serie'], aluno['nome_aluno'], responsavel['nome'])
+                for aluno, responsavel in self.alunos_responsaveis
+            )
             
             # Criar botões de seleção por série
             self._criar_botoes_series()
@@ -287,81 +278,11 @@ class PlanilhaEstudantesWindow:
                 f"Erro ao carregar dados: {e}"
             )
     
-    def _criar_checkboxes(self):
-        """Cria os checkboxes para cada aluno/responsável."""
-        # Agrupar por série
-        from collections import defaultdict
-        por_serie = defaultdict(list)
-        
-        for idx, item in enumerate(self.alunos_responsaveis):
-            aluno, responsavel, var, _ = item
-            serie = aluno['nome_serie']
-            por_serie[serie].append(idx)
-        
-        # Criar checkboxes agrupados por série
-        row = 0
-        for serie in sorted(por_serie.keys()):
-            # Cabeçalho da série
-            Label(
-                self.frame_checkboxes,
-                text=f"═══ {serie} ═══",
-                font=("Arial", 11, "bold"),
-                bg=COLORS.co4,
-                fg=COLORS.co0,
-                anchor='w',
-                padx=10,
-                pady=5
-            ).grid(row=row, column=0, columnspan=3, sticky='ew', pady=(10, 5))
-            
-            row += 1
-            
-            # Checkboxes dos alunos desta série
-            indices = sorted(por_serie[serie], key=lambda i: self.alunos_responsaveis[i][0]['nome_aluno'])
-            
-            for idx in indices:
-                aluno, responsavel, var, _ = self.alunos_responsaveis[idx]
-                
-                frame_item = Frame(self.frame_checkboxes, bg=COLORS.co0)
-                frame_item.grid(row=row, column=0, columnspan=3, sticky='ew', padx=10, pady=2)
-                
-                # Atualizar referência do frame na tupla
-                self.alunos_responsaveis[idx] = (aluno, responsavel, var, frame_item)
-                
-                checkbox = Checkbutton(
-                    frame_item,
-                    variable=var,
-                    style='TCheckbutton',
-                    command=lambda f=frame_item, v=var: self._atualizar_destaque(f, v)
-                )
-                checkbox.pack(side='left', padx=5)
-                
-                # Nome do aluno
-                Label(
-                    frame_item,
-                    text=f"{aluno['nome_aluno'][:40]:<40}",
-                    font=("Arial", 9),
-                    bg=COLORS.co0,
-                    fg='black',
-                    anchor='w'
-                ).pack(side='left', padx=5)
-                
-                # Nome do responsável
-                Label(
-                    frame_item,
-                    text=f"→ {responsavel['nome'][:35]:<35}",
-                    font=("Arial", 9),
-                    bg=COLORS.co0,
-                    fg='#666',
-                    anchor='w'
-                ).pack(side='left', padx=5)
-                
-                row += 1
-    
     def _criar_botoes_series(self):
         """Cria botões para selecionar por série."""
         # Obter séries únicas
         series = set()
-        for aluno, _, _, _ in self.alunos_responsaveis:
+        for aluno, _ in self.alunos_responsaveis:
             series.add(aluno['nome_serie'])
         
         if not series:
@@ -387,83 +308,40 @@ class PlanilhaEstudantesWindow:
                 width=12
             ).pack(side='left', padx=2)
     
-    
     def _selecionar_todos(self):
-        """Seleciona todos os checkboxes visíveis."""
-        for aluno, _, var, frame in self.alunos_responsaveis:
-            if frame and frame.winfo_viewable():
-                var.set(True)
-                self._atualizar_destaque(frame, var)
-        self._salvar_selecoes()
+        """Seleciona todos os estudantes visíveis (filtro atual)."""
+        self.lista.marcar(self.lista.visiveis())
     
     def _desmarcar_todos(self):
-        """Desmarca todos os checkboxes."""
-        for _, _, var, frame in self.alunos_responsaveis:
-            var.set(False)
-            if frame:
-                self._atualizar_destaque(frame, var)
-        self._salvar_selecoes()
+        """Desmarca todos os estudantes."""
+        self.lista.marcar(range(len(self.alunos_responsaveis)), False)
     
     def _inverter_selecao(self):
         """Inverte a seleção atual (visíveis apenas)."""
-        for aluno, _, var, frame in self.alunos_responsaveis:
-            if frame and frame.winfo_viewable():
-                var.set(not var.get())
-                self._atualizar_destaque(frame, var)
-        self._salvar_selecoes()
+        self.lista.inverter(self.lista.visiveis())
     
     def _selecionar_serie(self, serie):
         """Seleciona todos os alunos de uma série específica."""
-        for aluno, _, var, frame in self.alunos_responsaveis:
-            if aluno['nome_serie'] == serie:
-                var.set(True)
-                if frame:
-                    self._atualizar_destaque(frame, var)
-        self._salvar_selecoes()
+        self.lista.marcar(
+            i for i, (aluno, _) in enumerate(self.alunos_responsaveis)
+            if aluno['nome_serie'] == serie
+        )
     
     def _filtrar_lista(self):
-        """Filtra a lista baseado no texto de busca."""
-        texto = self.texto_busca.get().lower().strip()
-        
-        for aluno, responsavel, var, frame in self.alunos_responsaveis:
-            if frame:
-                if not texto:
-                    # Mostrar todos se não há busca
-                    frame.grid()
-                else:
-                    # Verificar se o texto está no nome do aluno ou responsável
-                    nome_aluno = aluno['nome_aluno'].lower()
-                    nome_resp = responsavel['nome'].lower()
-                    
-                    if texto in nome_aluno or texto in nome_resp:
-                        frame.grid()
-                    else:
-                        frame.grid_remove()
+        """Filtra a lista pelo nome do aluno ou do responsável."""
+        self.lista.filtrar(self.texto_busca.get(), ['Aluno', 'Responsável'])
         
         # Atualizar contador
         self._atualizar_contador()
     
     def _atualizar_contador(self):
         """Atualiza o contador de selecionados."""
-        count = sum(1 for _, _, var, _ in self.alunos_responsaveis if var.get())
-        self.label_selecionados.config(text=f"{count} selecionados")
+        self.label_selecionados.config(text=f"{len(self.lista.marcados)} selecionados")
     
-    def _atualizar_destaque(self, frame, var, salvar=True):
-        """Atualiza o destaque visual do item selecionado."""
-        cor = '#E3F2FD' if var.get() else COLORS.co0
-        
-        frame.config(bg=cor)
-        for widget in frame.winfo_children():
-            try:
-                # Tentar configurar bg - nem todos os widgets suportam (ex: ttk.Checkbutton)
-                widget.config(bg=cor)
-            except tk.TclError:
-                # Ignorar widgets que não suportam bg (geralmente widgets ttk)
-                pass
-        
-        # Salvar seleções automaticamente (exceto durante carregamento)
-        if salvar:
-            self._salvar_selecoes()
+    def _ao_alterar_selecao(self):
+        """Atualiza o contador e salva as seleções após cada alteração."""
+        self._atualizar_contador()
+        self._salvar_selecoes()
     
     def _salvar_selecoes(self):
         """Salva as seleções atuais no banco de dados."""
@@ -485,18 +363,18 @@ class PlanilhaEstudantesWindow:
             
             # Salvar seleções atuais
             count = 0
-            for aluno, responsavel, var, _ in self.alunos_responsaveis:
-                if var.get():
-                    # Inserir ou atualizar seleção
-                    cursor.execute("""
-                        INSERT INTO cuidar_olhos_selecoes
-                        (tipo, aluno_id, responsavel_id, ano_letivo, selecionado)
-                        VALUES ('estudante', %s, %s, %s, TRUE)
-                        ON DUPLICATE KEY UPDATE
-                        selecionado = TRUE,
-                        data_atualizacao = CURRENT_TIMESTAMP
-                    """, (aluno['id'], responsavel['id'], ano_letivo))
-                    count += 1
+            for indice in sorted(self.lista.marcados):
+                aluno, responsavel = self.alunos_responsaveis[indice]
+                # Inserir ou atualizar seleção
+                cursor.execute("""
+                    INSERT INTO cuidar_olhos_selecoes
+                    (tipo, aluno_id, responsavel_id, ano_letivo, selecionado)
+                    VALUES ('estudante', %s, %s, %s, TRUE)
+                    ON DUPLICATE KEY UPDATE
+                    selecionado = TRUE,
+                    data_atualizacao = CURRENT_TIMESTAMP
+                """, (aluno['id'], responsavel['id'], ano_letivo))
+                count += 1
             
             conn.commit()
             cursor.close()
@@ -536,16 +414,15 @@ class PlanilhaEstudantesWindow:
             
             # Criar set de chaves para busca rápida
             selecoes_set = {f"{s['aluno_id']}_{s['responsavel_id']}" for s in selecoes_bd}
-            count = 0
             
             # Aplicar seleções
-            for aluno, responsavel, var, frame in self.alunos_responsaveis:
-                chave = f"{aluno['id']}_{responsavel['id']}"
-                if chave in selecoes_set:
-                    var.set(True)
-                    if frame:
-                        self._atualizar_destaque(frame, var, salvar=False)
-                    count += 1
+            indices = [
+                i for i, (aluno, responsavel) in enumerate(self.alunos_responsaveis)
+                if f"{aluno['id']}_{responsavel['id']}" in selecoes_set
+            ]
+            self.lista.marcar(indices, avisar=False)
+            self._atualizar_contador()
+            count = len(indices)
             
             logger.info(f"Seleções carregadas do BD: {count} de {len(selecoes_bd)} itens encontrados")
             
@@ -624,10 +501,7 @@ class PlanilhaEstudantesWindow:
     def _gerar_planilha(self):
         """Gera a planilha PDF com os selecionados."""
         # Coletar selecionados
-        selecionados = []
-        for aluno, responsavel, var, _ in self.alunos_responsaveis:
-            if var.get():
-                selecionados.append((aluno, responsavel))
+        selecionados = [self.alunos_responsaveis[i] for i in sorted(self.lista.marcados)]
         
         if not selecionados:
             messagebox.showwarning(
@@ -2,13 +2,13 @@
 Interface para selecionar professores e servidores que assinaram os termos do Programa Cuidar dos Olhos.
 """
 
-from tkinter import Toplevel, Frame, Label, Button, messagebox, Scrollbar, Canvas, Entry, StringVar
-from tkinter.ttk import Checkbutton
+from tkinter import Toplevel, Frame, Label, Button, messagebox, Entry, StringVar
 import tkinter as tk
 import json
 from pathlib import Path
 
 from src.ui.colors import COLORS
+from src.ui.tabela_virtual import ListaMarcavel
 from src.core.config_logs import get_logger
 from src.core.conexao import conectar_bd
 from src.core.config import ANO_LETIVO_ATUAL
@@ -49,7 +49,7 @@ class PlanilhaProfissionaisWindow:
         self.janela.protocol("WM_DELETE_WINDOW", self._ao_fechar)
         
         # Dados
-        self.profissionais = []  # Lista de tuplas (funcionario, var_checkbox, tipo, frame_widget)
+        self.profissionais = []  # Lista de tuplas (funcionario, tipo); marcações em self.lista
         self.texto_busca = StringVar()
         self.texto_busca.trace('w', lambda *args: self._filtrar_lista())
         
@@ -231,22 +231,13 @@ class PlanilhaProfissionaisWindow:
         frame_lista = Frame(frame_principal, bg=COLORS.co0)
         frame_lista.pack(fill='both', expand=True, pady=(0, 20))
         
-        # Canvas e Scrollbar
-        self.canvas = Canvas(frame_lista, bg=COLORS.co0, highlightthickness=0)
-        scrollbar = Scrollbar(frame_lista, orient="vertical", command=self.canvas.yview)
-        self.frame_checkboxes = Frame(self.canvas, bg=COLORS.co0)
-        
-        self.frame_checkboxes.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        # Lista virtual: só as linhas visíveis existem como itens do Treeview
+        self.lista = ListaMarcavel(
+            frame_lista,
+            [('Nome', 380), ('Cargo', 220), ('Categoria', 110)],
+            ao_alterar=self._ao_alterar_selecao
         )
         
-        self.canvas.create_window((0, 0), window=self.frame_checkboxes, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
-        
-        self.canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
         # Frame de botões finais
         frame_botoes = Frame(frame_principal, bg=COLORS.co1)
         frame_botoes.pack(fill='x')
@@ -284,25 +275,15 @@ class PlanilhaProfissionaisWindow:
             # Buscar servidores
             servidores = obter_servidores_ativos()
             
-            total = 0
-            
             # Adicionar professores
             if professores:
-                for prof in professores:
-                    var = tk.BooleanVar(value=False)
-                    # Adicionar callback para atualizar contador
-                    var.trace('w', lambda *args: self._atualizar_contador())
-                    self.profissionais.append((prof, var, 'Professor', None))  # None será o frame
-                    total += 1
+                self.profissionais.extend((prof, 'Professor') for prof in professores)
             
             # Adicionar servidores
             if servidores:
-                for serv in servidores:
-                    var = tk.BooleanVar(value=False)
-                    # Adicionar callback para atualizar contador
-                    var.trace('w', lambda *args: self._atualizar_contador())
-                    self.profissionais.append((serv, var, 'Servidor', None))  # None será o frame
-                    total += 1
+                self.profissionais.extend((serv, 'Servidor') for serv in servidores)
+            
+            total = len(self.profissionais)
             
             if total == 0:
                 messagebox.showwarning(
@@ -311,8 +292,13 @@ class PlanilhaProfissionaisWindow:
                 )
                 return
             
-            # Criar checkboxes
-            self._criar_checkboxes()
+            # Professores primeiro, cada grupo por nome (colunas reordenáveis no cabeçalho)
+            self.profissionais.sort(key=lambda item: (item[1] != 'Professor', item[0]['nome']))
+            cargo_padrao = {'Professor': 'Professor@', 'Servidor': 'Servidor'}
+            self.lista.definir(
+                (funcionario['nome'], funcionario.get('cargo', cargo_padrao[tipo]), tipo)
+                for funcionario, tipo in self.profissionais
+            )
             
             self.label_total.config(text=str(total))
             logger.info(f"{total} profissionais carregados")
@@ -324,206 +310,39 @@ class PlanilhaProfissionaisWindow:
                 f"Erro ao carregar dados: {e}"
             )
     
-    def _criar_checkboxes(self):
-        """Cria os checkboxes para cada profissional."""
-        # Separar por tipo (Professor / Servidor)
-        indices_professores = [i for i, (_, _, t, _) in enumerate(self.profissionais) if t == 'Professor']
-        indices_servidores = [i for i, (_, _, t, _) in enumerate(self.profissionais) if t == 'Servidor']
-        
-        row = 0
-        
-        # Seção de Professores
-        if indices_professores:
-            Label(
-                self.frame_checkboxes,
-                text="═══ PROFESSORES ═══",
-                font=("Arial", 12, "bold"),
-                bg=COLORS.co4,
-                fg=COLORS.co0,
-                anchor='w',
-                padx=10,
-                pady=5
-            ).grid(row=row, column=0, columnspan=3, sticky='ew', pady=(10, 5))
-            
-            row += 1
-            
-            # Ordenar por nome
-            indices_professores_ord = sorted(indices_professores, key=lambda i: self.profissionais[i][0]['nome'])
-            
-            for idx in indices_professores_ord:
-                funcionario, var, tipo, _ = self.profissionais[idx]
-                
-                frame_item = Frame(self.frame_checkboxes, bg=COLORS.co0)
-                frame_item.grid(row=row, column=0, columnspan=3, sticky='ew', padx=10, pady=2)
-                
-                # Atualizar referência do frame na tupla
-                self.profissionais[idx] = (funcionario, var, tipo, frame_item)
-                
-                checkbox = Checkbutton(
-                    frame_item,
-                    variable=var,
-                    style='TCheckbutton',
-                    command=lambda f=frame_item, v=var: self._atualizar_destaque(f, v)
-                )
-                checkbox.pack(side='left', padx=5)
-                
-                # Nome
-                Label(
-                    frame_item,
-                    text=f"{funcionario['nome'][:50]:<50}",
-                    font=("Arial", 9),
-                    bg=COLORS.co0,
-                    fg='black',
-                    anchor='w'
-                ).pack(side='left', padx=5)
-                
-                # Cargo
-                cargo_display = funcionario.get('cargo', 'Professor@')
-                Label(
-                    frame_item,
-                    text=f"({cargo_display})",
-                    font=("Arial", 9),
-                    bg=COLORS.co0,
-                    fg='#666',
-                    anchor='w'
-                ).pack(side='left', padx=5)
-                
-                row += 1
-        
-        # Seção de Servidores
-        if indices_servidores:
-            Label(
-                self.frame_checkboxes,
-                text="═══ SERVIDORES ═══",
-                font=("Arial", 12, "bold"),
-                bg=COLORS.co6,
-                fg=COLORS.co0,
-                anchor='w',
-                padx=10,
-                pady=5
-            ).grid(row=row, column=0, columnspan=3, sticky='ew', pady=(20, 5))
-            
-            row += 1
-            
-            # Ordenar por nome
-            indices_servidores_ord = sorted(indices_servidores, key=lambda i: self.profissionais[i][0]['nome'])
-            
-            for idx in indices_servidores_ord:
-                funcionario, var, tipo, _ = self.profissionais[idx]
-                
-                frame_item = Frame(self.frame_checkboxes, bg=COLORS.co0)
-                frame_item.grid(row=row, column=0, columnspan=3, sticky='ew', padx=10, pady=2)
-                
-                # Atualizar referência do frame na tupla
-                self.profissionais[idx] = (funcionario, var, tipo, frame_item)
-                
-                checkbox = Checkbutton(
-                    frame_item,
-                    variable=var,
-                    style='TCheckbutton',
-                    command=lambda f=frame_item, v=var: self._atualizar_destaque(f, v)
-                )
-                checkbox.pack(side='left', padx=5)
-                
-                # Nome
-                Label(
-                    frame_item,
-                    text=f"{funcionario['nome'][:50]:<50}",
-                    font=("Arial", 9),
-                    bg=COLORS.co0,
-                    fg='black',
-                    anchor='w'
-                ).pack(side='left', padx=5)
-                
-                # Cargo
-                cargo_display = funcionario.get('cargo', 'Servidor')
-                Label(
-                    frame_item,
-                    text=f"({cargo_display})",
-                    font=("Arial", 9),
-                    bg=COLORS.co0,
-                    fg='#666',
-                    anchor='w'
-                ).pack(side='left', padx=5)
-                
-                row += 1
-    
-    
     def _selecionar_todos(self):
-        """Seleciona todos os checkboxes visíveis."""
-        for _, var, _, frame in self.profissionais:
-            if frame and frame.winfo_viewable():
-                var.set(True)
-                self._atualizar_destaque(frame, var)
-        self._salvar_selecoes()
+        """Seleciona todos os profissionais visíveis (filtro atual)."""
+        self.lista.marcar(self.lista.visiveis())
     
     def _desmarcar_todos(self):
-        """Desmarca todos os checkboxes."""
-        for _, var, _, frame in self.profissionais:
-            var.set(False)
-            if frame:
-                self._atualizar_destaque(frame, var)
-        self._salvar_selecoes()
+        """Desmarca todos os profissionais."""
+        self.lista.marcar(range(len(self.profissionais)), False)
     
     def _inverter_selecao(self):
         """Inverte a seleção atual (visíveis apenas)."""
-        for _, var, _, frame in self.profissionais:
-            if frame and frame.winfo_viewable():
-                var.set(not var.get())
-                self._atualizar_destaque(frame, var)
-        self._salvar_selecoes()
+        self.lista.inverter(self.lista.visiveis())
     
     def _selecionar_categoria(self, categoria):
         """Seleciona todos os profissionais de uma categoria específica."""
-        for _, var, tipo, frame in self.profissionais:
-            if tipo == categoria:
-                var.set(True)
-                if frame:
-                    self._atualizar_destaque(frame, var)
-        self._salvar_selecoes()
+        self.lista.marcar(
+            i for i, (_, tipo) in enumerate(self.profissionais) if tipo == categoria
+        )
     
     def _filtrar_lista(self):
-        """Filtra a lista baseado no texto de busca."""
-        texto = self.texto_busca.get().lower().strip()
-        
-        for funcionario, var, tipo, frame in self.profissionais:
-            if frame:
-                if not texto:
-                    # Mostrar todos se não há busca
-                    frame.grid()
-                else:
-                    # Verificar se o texto está no nome
-                    nome = funcionario['nome'].lower()
-                    
-                    if texto in nome:
-                        frame.grid()
-                    else:
-                        frame.grid_remove()
+        """Filtra a lista pelo nome do profissional."""
+        self.lista.filtrar(self.texto_busca.get(), ['Nome'])
         
         # Atualizar contador
         self._atualizar_contador()
     
     def _atualizar_contador(self):
         """Atualiza o contador de selecionados."""
-        count = sum(1 for _, var, _, _ in self.profissionais if var.get())
-        self.label_selecionados.config(text=f"{count} selecionados")
+        self.label_selecionados.config(text=f"{len(self.lista.marcados)} selecionados")
     
-    def _atualizar_destaque(self, frame, var, salvar=True):
-        """Atualiza o destaque visual do item selecionado."""
-        cor = '#E3F2FD' if var.get() else COLORS.co0
-        
-        frame.config(bg=cor)
-        for widget in frame.winfo_children():
-            try:
-                # Tentar configurar bg - nem todos os widgets suportam (ex: ttk.Checkbutton)
-                widget.config(bg=cor)
-            except tk.TclError:
-                # Ignorar widgets que não suportam bg (geralmente widgets ttk)
-                pass
-        
-        # Salvar seleções automaticamente (exceto durante carregamento)
-        if salvar:
-            self._salvar_selecoes()
+    def _ao_alterar_selecao(self):
+        """Atualiza o contador e salva as seleções após cada alteração."""
+        self._atualizar_contador()
+        self._salvar_selecoes()
     
     def _salvar_selecoes(self):
         """Salva as seleções atuais no banco de dados."""
@@ -545,18 +364,18 @@ class PlanilhaProfissionaisWindow:
             
             # Salvar seleções atuais
             count = 0
-            for funcionario, var, tipo, _ in self.profissionais:
-                if var.get():
-                    # Inserir ou atualizar seleção
-                    cursor.execute("""
-                        INSERT INTO cuidar_olhos_selecoes
-                        (tipo, funcionario_id, categoria, ano_letivo, selecionado)
-                        VALUES ('profissional', %s, %s, %s, TRUE)
-                        ON DUPLICATE KEY UPDATE
-                        selecionado = TRUE,
-                        data_atualizacao = CURRENT_TIMESTAMP
-                    """, (funcionario['id'], tipo, ano_letivo))
-                    count += 1
+            for indice in sorted(self.lista.marcados):
+                funcionario, tipo = self.profissionais[indice]
+                # Inserir ou atualizar seleção
+                cursor.execute("""
+                    INSERT INTO cuidar_olhos_selecoes
+                    (tipo, funcionario_id, categoria, ano_letivo, selecionado)
+                    VALUES ('profissional', %s, %s, %s, TRUE)
+                    ON DUPLICATE KEY UPDATE
+                    selecionado = TRUE,
+                    data_atualizacao = CURRENT_TIMESTAMP
+                """, (funcionario['id'], tipo, ano_letivo))
+                count += 1
             
             conn.commit()
             cursor.close()
@@ -596,15 +415,15 @@ class PlanilhaProfissionaisWindow:
             
             # Criar set de IDs para busca rápida
             selecoes_set = {s['funcionario_id'] for s in selecoes_bd}
-            count = 0
             
             # Aplicar seleções
-            for funcionario, var, tipo, frame in self.profissionais:
-                if funcionario['id'] in selecoes_set:
-                    var.set(True)
-                    if frame:
-                        self._atualizar_destaque(frame, var, salvar=False)
-                    count += 1
+            indices = [
+                i for i, (funcionario, _) in enumerate(self.profissionais)
+                if funcionario['id'] in selecoes_set
+            ]
+            self.lista.marcar(indices, avisar=False)
+            self._atualizar_contador()
+            count = len(indices)
             
             logger.info(f"Seleções carregadas do BD: {count} de {len(selecoes_bd)} itens encontrados")
             
@@ -683,10 +502,7 @@ class PlanilhaProfissionaisWindow:
     def _gerar_planilha(self):
         """Gera a planilha PDF com os selecionados."""
         # Coletar selecionados
-        selecionados = []
-        for funcionario, var, tipo, _ in self.profissionais:
-            if var.get():
-                selecionados.append((funcionario, tipo))
+        selecionados = [self.profissionais[i] for i in sorted(self.lista.marcados)]
         
         if not selecionados:
             messagebox.showwarning(
@@ -2,15 +2,155 @@
 Módulo de pesquisa para o sistema de gestão escolar.
 
 Extração da função pesquisar() do main.py (Sprint 15).
+
+A consulta roda em uma thread de trabalho sobre o índice em memória de
+:mod:`src.services.busca_pessoas_service`. Enquanto o usuário digita, a
+pesquisa espera ``ATRASO_DIGITACAO_MS`` sem novas teclas (debounce); cada
+nova pesquisa cancela a anterior, e os resultados entram no Treeview em
+lotes, com a janela respondendo entre um lote e outro.
 """
 
+import time
 from tkinter import messagebox
 from datetime import datetime, date
-from db.connection import get_connection
+from typing import Any, Optional, Tuple
+
 from src.core.config_logs import get_logger
+from src.services import busca_pessoas_service
+from src.ui.tabela_virtual import DadosTabela, TreeviewVirtual
+from src.utils.executor import submit_background
 
 logger = get_logger(__name__)
 
+# Pausa na digitação antes de pesquisar
+ATRASO_DIGITACAO_MS = 250
+
+# Caracteres mínimos para pesquisar enquanto digita
+MIN_CARACTERES_DIGITACAO = 3
+
+# Linhas inseridas no Treeview por volta do loop de eventos
+LOTE_INSERCAO = 200
+
+# Colunas dos resultados (ver formatar_linha)
+COLUNAS_RESULTADO = ('ID', 'Nome', 'Tipo', 'Cargo', 'Data de Nascimento')
+
+
+def formatar_linha(pessoa: busca_pessoas_service.Pessoa) -> Tuple[Any, ...]:
+    """Valores do Treeview: (id, nome, tipo, cargo, data_nascimento)."""
+    data = pessoa.data_nascimento
+    try:
+        if isinstance(data, str):
+            data = datetime.strptime(data[:10], '%Y-%m-%d')
+        if isinstance(data, (datetime, date)):
+            data = data.strftime('%d/%m/%Y')
+    except ValueError:
+        pass
+    return (pessoa.id, pessoa.nome, pessoa.tipo, pessoa.cargo or '', data or '')
+
+
+class PesquisaAssincrona:
+    """
+    Pesquisa com debounce e cancelamento das pesquisas superadas.
+
+    Cada chamada a ``agendar`` incrementa a geração; pesquisas, lotes de
+    inserção e callbacks de gerações antigas são descartados.
+    """
+
+    def __init__(self, lote: int = LOTE_INSERCAO):
+        self.lote = lote
+        self._geracao = 0
+        self._agendado: Optional[Tuple[Any, str]] = None
+
+    def cancelar(self) -> None:
+        """Cancela a pesquisa agendada ou em andamento."""
+        self._geracao += 1
+        if self._agendado is not None:
+            widget, after_id = self._agendado
+            self._agendado = None
+            try:
+                widget.after_cancel(after_id)
+            except Exception:
+                pass
+
+    def agendar(self, texto: str, treeview, atraso_ms: int = 0, avisar: bool = True) -> None:
+        """
+        Pesquisa ``texto`` e preenche ``treeview`` com os resultados.
+
+        Args:
+            texto: Texto pesquisado
+            treeview: Treeview de resultados (também usado para ``after``)
+            atraso_ms: Espera antes de pesquisar; reiniciada a cada chamada
+            avisar: Mostrar mensagens (nenhum resultado, erro); desligado
+                    na pesquisa enquanto digita
+        """
+        self.cancelar()
+        geracao = self._geracao
+        after_id = treeview.after(
+            atraso_ms, lambda: self._executar(texto, treeview, geracao, avisar)
+        )
+        self._agendado = (treeview, after_id)
+
+    def _executar(self, texto: str, treeview, geracao: int, avisar: bool) -> None:
+        self._agendado = None
+        if geracao != self._geracao:
+            return
+        inicio = time.perf_counter()
+        submit_background(
+            busca_pessoas_service.pesquisar, texto,
+            cancelado=lambda: geracao != self._geracao,
+            on_done=lambda resultados: self._exibir(texto, treeview, geracao, avisar,
+                                                    resultados, 0, inicio),
+            on_error=lambda e: self._falhar(texto, geracao, avisar, e),
+            janela=treeview,
+        )
+
+    def _exibir(self, texto: str, treeview, geracao: int, avisar: bool,
+                resultados, posicao: int, inicio: float) -> None:
+        if geracao != self._geracao:
+            return
+        try:
+            if not treeview.winfo_exists():
+                return
+            visao = getattr(treeview, 'tabela_virtual', None)
+            if isinstance(visao, TreeviewVirtual):
+                # Tabela virtual: todos os resultados de uma vez, sem lotes
+                visao.definir_dados(
+                    DadosTabela(COLUNAS_RESULTADO, map(formatar_linha, resultados))
+                )
+                fim = len(resultados)
+            else:
+                if posicao == 0:
+                    treeview.delete(*treeview.get_children())
+                fim = posicao + self.lote
+                for pessoa in resultados[posicao:fim]:
+                    treeview.insert("", "end", values=formatar_linha(pessoa))
+        except Exception as e:
+            logger.exception(f"Erro ao exibir resultados: {e}")
+            if avisar:
+                messagebox.showerror("Erro", f"Erro ao exibir resultados: {e}")
+            return
+
+        if fim < len(resultados):
+            treeview.after(1, lambda: self._exibir(texto, treeview, geracao, avisar,
+                                                   resultados, fim, inicio))
+            return
+
+        logger.info(f"Pesquisa realizada: {len(resultados)} resultados para '{texto}' "
+                    f"em {time.perf_counter() - inicio:.3f}s")
+        if not resultados and avisar:
+            messagebox.showinfo("Pesquisa", f"Nenhum resultado encontrado para '{texto}'")
+
+    def _falhar(self, texto: str, geracao: int, avisar: bool, erro: BaseException) -> None:
+        if geracao != self._geracao:
+            return
+        logger.error(f"Erro ao pesquisar '{texto}': {erro}")
+        if avisar:
+            messagebox.showerror("Erro", f"Erro ao realizar a pesquisa: {erro}")
+
+
+# Pesquisa da janela principal
+pesquisa_principal = PesquisaAssincrona()
+
 
 def pesquisar_alunos_funcionarios(
     texto_pesquisa: str,
@@ -18,10 +158,14 @@ def pesquisar_alunos_funcionarios(
     get_tabela_frame_func,
     frame_tabela,
     criar_tabela_func,
-    criar_dashboard_func
+    criar_dashboard_func,
+    ao_digitar: bool = False
 ):
     """
-    Pesquisa alunos e funcionários no banco de dados.
+    Pesquisa alunos e funcionários.
+    
+    Prepara a área da tabela e agenda a pesquisa em segundo plano; os
+    resultados chegam ao Treeview depois que a função retorna.
     
     Args:
         texto_pesquisa: Texto a ser pesquisado
@@ -30,12 +174,18 @@ def pesquisar_alunos_funcionarios(
         frame_tabela: Frame pai da tabela
         criar_tabela_func: Função para criar/recriar a tabela
         criar_dashboard_func: Função para mostrar o dashboard
+        ao_digitar: Chamada a cada tecla: pesquisa com debounce, sem
+                    mensagens e sem trocar para o dashboard
     
     Returns:
-        bool: True se a pesquisa foi bem-sucedida
+        bool: True se a pesquisa foi agendada (ou o dashboard exibido)
     """
     texto_pesquisa = texto_pesquisa.strip()
     
+    if ao_digitar and len(texto_pesquisa) < MIN_CARACTERES_DIGITACAO:
+        pesquisa_principal.cancelar()
+        return True
+    
     # Obter referências atuais
     treeview = get_treeview_func()
     tabela_frame = get_tabela_frame_func()
@@ -53,6 +203,7 @@ def pesquisar_alunos_funcionarios(
         return False
 
     if not texto_pesquisa:  # Se a busca estiver vazia, mostrar dashboard
+        pesquisa_principal.cancelar()
         # Ocultar tabela se estiver visível
         try:
             if tabela_frame and tabela_frame.winfo_ismapped():
@@ -103,146 +254,34 @@ def pesquisar_alunos_funcionarios(
         messagebox.showerror("Erro", f"Falha ao preparar área da tabela: {e}")
         return False
 
-    # Limpar o Treeview
-    try:
-        for item in treeview.get_children():
-            treeview.delete(item)
-    except Exception as e:
-        logger.exception(f"Erro ao limpar treeview: {e}")
-        # Se não conseguir limpar, tentar recriar
+    # Limpar o Treeview (enquanto digita, os resultados anteriores ficam
+    # até a chegada dos novos)
+    if not ao_digitar:
         try:
-            criar_tabela_func()
-            treeview = get_treeview_func()
-            if treeview is None:
-                logger.error("Falha ao recriar treeview após erro na limpeza")
-                return False
-            # Tentar limpar novamente
+            visao = getattr(treeview, 'tabela_virtual', None)
+            if isinstance(visao, TreeviewVirtual):
+                visao.definir_dados(DadosTabela(COLUNAS_RESULTADO))
             for item in treeview.get_children():
                 treeview.delete(item)
-        except Exception as e2:
-            logger.exception(f"Falha ao recriar treeview: {e2}")
-            return False
-    
-    # Buscar no banco de dados
-    resultados_filtrados = []
-    try:
-        with get_connection() as conn:
-            if conn is None:
-                raise Exception("Falha ao conectar ao banco de dados")
-            cursor = conn.cursor()
+        except Exception as e:
+            logger.exception(f"Erro ao limpar treeview: {e}")
+            # Se não conseguir limpar, tentar recriar
             try:
-                # Tentar usar FULLTEXT primeiro (mais rápido)
-                try:
-                    # Query otimizada com FULLTEXT - ESTRUTURA CORRIGIDA
-                    query_fulltext = """
-                    SELECT 
-                        f.id AS id,
-                        f.nome AS nome,
-                        'Funcionário' AS tipo,
-                        f.funcao AS cargo,
-                        f.data_nascimento AS data_nascimento
-                    FROM 
-                        funcionarios f
-                    WHERE 
-                        MATCH(f.nome) AGAINST(%s IN NATURAL LANGUAGE MODE)
-                    UNION ALL
-                    SELECT
-                        a.id AS id,
-                        a.nome AS nome,
-                        'Aluno' AS tipo,
-                        NULL AS cargo,
-                        a.data_nascimento AS data_nascimento
-                    FROM
-                        alunos a
-                    WHERE 
-                        MATCH(a.nome) AGAINST(%s IN NATURAL LANGUAGE MODE)
-                    ORDER BY 
-                        tipo, nome
-                    """
-                    cursor.execute(query_fulltext, (texto_pesquisa, texto_pesquisa))
-                    resultados_filtrados = cursor.fetchall()
-                    
-                except Exception:
-                    # Se FULLTEXT falhar, usar LIKE tradicional
-                    logger.debug("FULLTEXT não disponível, usando LIKE")
-                    query_like = """
-                    SELECT 
-                        f.id AS id,
-                        f.nome AS nome,
-                        'Funcionário' AS tipo,
-                        f.funcao AS cargo,
-                        f.data_nascimento AS data_nascimento
-                    FROM 
-                        funcionarios f
-                    WHERE 
-                        f.nome LIKE %s
-                    UNION ALL
-                    SELECT
-                        a.id AS id,
-                        a.nome AS nome,
-                        'Aluno' AS tipo,
-                        NULL AS cargo,
-                        a.data_nascimento AS data_nascimento
-                    FROM
-                        alunos a
-                    WHERE 
-                        a.nome LIKE %s
-                    ORDER BY 
-                        tipo, nome
-                    LIMIT 100
-                    """
-                    termo_like = f"%{texto_pesquisa}%"
-                    cursor.execute(query_like, (termo_like, termo_like))
-                    resultados_filtrados = cursor.fetchall()
-                
-                cursor.close()
-                
-            except Exception as e:
-                logger.exception(f"Erro na query de pesquisa: {e}")
-                raise
-                
-    except Exception as e:
-        logger.exception(f"Erro ao pesquisar no banco: {e}")
-        messagebox.showerror("Erro", f"Erro ao realizar a pesquisa: {e}")
-        return False
-
-    # Exibir resultados no Treeview
-    if not resultados_filtrados:
-        messagebox.showinfo("Pesquisa", f"Nenhum resultado encontrado para '{texto_pesquisa}'")
-        return True
-
-    try:
-        for resultado in resultados_filtrados:
-            # Normalizar resultado para lista
-            if isinstance(resultado, dict):
-                resultado = list(resultado.values())
-            elif isinstance(resultado, (list, tuple)):
-                resultado = list(resultado)
-            else:
-                resultado = [resultado]
-            
-            # Formatar data de nascimento se existir (índice 4)
-            if len(resultado) > 4 and resultado[4]:
-                try:
-                    if isinstance(resultado[4], str):
-                        data = datetime.strptime(resultado[4], '%Y-%m-%d')
-                    elif isinstance(resultado[4], (datetime, date)):
-                        data = resultado[4]
-                    else:
-                        data = None
-                    
-                    if data:
-                        resultado[4] = data.strftime('%d/%m/%Y')
-                except Exception:
-                    pass
-            
-            # Inserir no treeview - estrutura: (id, nome, tipo, cargo, data_nascimento)
-            treeview.insert("", "end", values=resultado)
-        
-        logger.info(f"Pesquisa realizada: {len(resultados_filtrados)} resultados para '{texto_pesquisa}'")
-        return True
-        
-    except Exception as e:
-        logger.exception(f"Erro ao exibir resultados: {e}")
-        messagebox.showerror("Erro", f"Erro ao exibir resultados: {e}")
-        return False
+                criar_tabela_func()
+                treeview = get_treeview_func()
+                if treeview is None:
+                    logger.error("Falha ao recriar treeview após erro na limpeza")
+                    return False
+                # Tentar limpar novamente
+                for item in treeview.get_children():
+                    treeview.delete(item)
+            except Exception as e2:
+                logger.exception(f"Falha ao recriar treeview: {e2}")
+                return False
+    
+    pesquisa_principal.agendar(
+        texto_pesquisa, treeview,
+        atraso_ms=ATRASO_DIGITACAO_MS if ao_digitar else 0,
+        avisar=not ao_digitar
+    )
+    return True
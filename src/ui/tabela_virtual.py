@@ -0,0 +1,526 @@
+"""
+Tabela virtual sobre ttk.Treeview
+
+Para listas grandes (milhares de alunos), inserir uma linha do Treeview
+por registro custa segundos e memória do Tk. Aqui os dados ficam em
+:class:`DadosTabela` — uma lista por coluna, com a ordem e o filtro
+representados por listas de índices — e :class:`TreeviewVirtual` mantém no
+Treeview apenas as linhas visíveis mais uma margem, reaproveitando os mesmos
+itens ao rolar.
+
+Ordenar e filtrar mexem só nos índices; o Treeview é redesenhado depois,
+com o custo de algumas dezenas de ``item(...)``.
+
+Uso básico::
+
+    dados = DadosTabela.de_dataframe(df)
+    visao = TreeviewVirtual(treeview, scrollbar_vertical)
+    visao.definir_dados(dados)
+    visao.filtrar('maria', colunas=['Nome'])
+    visao.ordenar('Nome')
+"""
+
+import unicodedata
+from tkinter import ttk
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from src.core.config_logs import get_logger
+
+logger = get_logger(__name__)
+
+# Linhas materializadas além das visíveis
+MARGEM_LINHAS = 10
+
+# Altura de linha usada quando o estilo não informa rowheight
+ALTURA_LINHA_PADRAO = 20
+
+# Linhas roladas por passo da roda do mouse
+LINHAS_POR_PASSO = 3
+
+# Caixas de marcação de ListaMarcavel
+MARCADO = '☑'
+DESMARCADO = '☐'
+COR_MARCADO = '#E3F2FD'
+
+
+def _normalizar(valor: Any) -> str:
+    texto = unicodedata.normalize('NFKD', str(valor))
+    return ''.join(c for c in texto if not unicodedata.combining(c)).casefold()
+
+
+def _chave_ordenacao(valor: Any):
+    # Vazios por último; números antes de textos; textos sem acento/caixa
+    if valor is None or valor == '':
+        return (2, 0, '')
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return (0, valor, '')
+    try:
+        return (0, float(str(valor).replace(',', '.')), '')
+    except ValueError:
+        pass
+    if hasattr(valor, 'isoformat'):
+        return (1, 0, valor.isoformat())
+    return (1, 0, _normalizar(valor))
+
+
+class DadosTabela:
+    """
+    Dados de uma tabela em colunas, com visão ordenada e filtrada.
+
+    Posições (``linha``, ``indice``) referem-se à visão atual; índices
+    referem-se às linhas originais e não mudam com ordenação ou filtro.
+    """
+
+    def __init__(self, colunas: Sequence[str], linhas: Iterable[Sequence[Any]] = ()):
+        self.colunas: List[str] = list(colunas)
+        self._dados: Dict[str, List[Any]] = {c: [] for c in self.colunas}
+        largura = len(self.colunas)
+        for linha in linhas:
+            valores = list(linha)[:largura]
+            valores += [None] * (largura - len(valores))
+            for coluna, valor in zip(self.colunas, valores):
+                self._dados[coluna].append(valor)
+        self._total = len(self._dados[self.colunas[0]]) if self.colunas else 0
+        self._ordem: List[int] = list(range(self._total))
+        self._visao: List[int] = self._ordem
+        self._posicoes: Optional[Dict[int, int]] = None
+        self._normalizados: Dict[str, List[str]] = {}
+        self.filtro: Optional[str] = None
+        self._colunas_filtro: List[str] = self.colunas
+        self._predicado: Optional[Callable[[List[Any]], bool]] = None
+        self.ordenacao: Optional[tuple] = None
+
+    @classmethod
+    def de_dataframe(cls, df) -> 'DadosTabela':
+        """Cria a partir de um pandas.DataFrame (colunas inteiras, sem iterrows)."""
+        dados = cls([str(c) for c in df.columns])
+        for coluna, original in zip(dados.colunas, df.columns):
+            dados._dados[coluna] = [None if _vazio(v) else v for v in df[original].tolist()]
+        dados._total = len(df)
+        dados._ordem = list(range(dados._total))
+        dados._visao = dados._ordem
+        return dados
+
+    @classmethod
+    def de_registros(cls, registros: Iterable[Any], colunas: Optional[Sequence[str]] = None) -> 'DadosTabela':
+        """Cria a partir de dicts ou sequências."""
+        registros = list(registros)
+        if colunas is None:
+            primeiro = registros[0] if registros else {}
+            colunas = list(primeiro.keys()) if isinstance(primeiro, dict) else [
+                str(i) for i in range(len(primeiro))
+            ]
+        if registros and isinstance(registros[0], dict):
+            linhas = ([r.get(c) for c in colunas] for r in registros)
+        else:
+            linhas = registros
+        return cls(colunas, linhas)
+
+    def __len__(self) -> int:
+        return len(self._visao)
+
+    @property
+    def total(self) -> int:
+        """Linhas sem considerar o filtro."""
+        return self._total
+
+    def indice(self, posicao: int) -> int:
+        """Índice original da linha na ``posicao`` da visão."""
+        return self._visao[posicao]
+
+    def indices(self) -> List[int]:
+        """Índices originais das linhas da visão, na ordem exibida."""
+        return list(self._visao)
+
+    def posicao(self, indice: int) -> Optional[int]:
+        """Posição atual de uma linha original, ou None se filtrada."""
+        if self._posicoes is None:
+            self._posicoes = {i: p for p, i in enumerate(self._visao)}
+        return self._posicoes.get(indice)
+
+    def linha(self, posicao: int) -> List[Any]:
+        """Valores da linha na ``posicao`` da visão."""
+        i = self._visao[posicao]
+        return [self._dados[c][i] for c in self.colunas]
+
+    def coluna(self, coluna: str) -> List[Any]:
+        """Valores de uma coluna na ordem da visão."""
+        valores = self._dados[coluna]
+        return [valores[i] for i in self._visao]
+
+    def ordenar(self, coluna: str, decrescente: bool = False) -> None:
+        """Ordena (de forma estável) pela coluna; mantém o filtro atual."""
+        valores = self._dados[coluna]
+        self._ordem = sorted(range(self._total), key=lambda i: _chave_ordenacao(valores[i]),
+                             reverse=decrescente)
+        self.ordenacao = (coluna, decrescente)
+        self._aplicar_filtro()
+
+    def filtrar(self, texto: Optional[str] = None, colunas: Optional[Sequence[str]] = None,
+                predicado: Optional[Callable[[List[Any]], bool]] = None) -> None:
+        """
+        Mantém só as linhas que contêm ``texto`` (sem acento/caixa) em
+        alguma das ``colunas`` (todas, se None) e atendem a ``predicado``.
+        Sem argumentos, remove o filtro.
+        """
+        texto = _normalizar(texto).strip() if texto else ''
+        self.filtro = texto or None
+        self._colunas_filtro = list(colunas) if colunas else self.colunas
+        self._predicado = predicado
+        self._aplicar_filtro()
+
+    def _texto_normalizado(self, coluna: str) -> List[str]:
+        normalizados = self._normalizados.get(coluna)
+        if normalizados is None:
+            normalizados = self._normalizados[coluna] = [
+                '' if v is None else _normalizar(v) for v in self._dados[coluna]
+            ]
+        return normalizados
+
+    def _aplicar_filtro(self) -> None:
+        texto = self.filtro
+        predicado = self._predicado
+        if not texto and predicado is None:
+            self._visao = self._ordem
+        else:
+            visao = self._ordem
+            if texto:
+                colunas = [self._texto_normalizado(c) for c in self._colunas_filtro]
+                visao = [i for i in visao if any(texto in col[i] for col in colunas)]
+            if predicado is not None:
+                visao = [i for i in visao if predicado([self._dados[c][i] for c in self.colunas])]
+            self._visao = visao
+        self._posicoes = None
+
+
+def _vazio(valor: Any) -> bool:
+    # NaN/NaT do pandas viram None (NaN != NaN)
+    try:
+        return valor is None or valor != valor
+    except Exception:
+        return False
+
+
+class TreeviewVirtual:
+    """
+    Exibe um :class:`DadosTabela` em um ttk.Treeview materializando só a
+    janela visível.
+
+    A rolagem (barra, roda do mouse e teclado) é tratada aqui; os itens do
+    Treeview são reaproveitados e só os valores mudam. A seleção é guardada
+    pelo índice original da linha e sobrevive a rolagem, ordenação e filtro.
+    """
+
+    def __init__(self, treeview, scrollbar=None, margem: int = MARGEM_LINHAS,
+                 formatar: Optional[Callable[[List[Any]], Sequence[Any]]] = None,
+                 tags: Optional[Callable[[List[Any]], Sequence[str]]] = None,
+                 ao_navegar: Optional[Callable] = None,
+                 ordenar_pelo_cabecalho: bool = True):
+        """
+        Args:
+            treeview: ttk.Treeview já criado (colunas configuradas)
+            scrollbar: Barra de rolagem vertical (opcional)
+            margem: Linhas materializadas além das visíveis
+            formatar: Converte os valores de uma linha para exibição
+            tags: Tags do item para uma linha (ex.: destaque de selecionados)
+            ao_navegar: Chamado com o evento depois que o teclado move a seleção
+            ordenar_pelo_cabecalho: Clique no cabeçalho ordena pela coluna
+        """
+        self.treeview = treeview
+        self.scrollbar = scrollbar
+        self.margem = margem
+        self.formatar = formatar
+        self.tags = tags
+        self.ao_navegar = ao_navegar
+        self.dados = DadosTabela(list(treeview['columns']) if _tem_colunas(treeview) else [])
+        self.inicio = 0
+        self.visiveis = 1
+        self.selecionado: Optional[int] = None
+        self._itens: Dict[str, int] = {}
+
+        # Permite que outros módulos (ex.: pesquisa) reconheçam a tabela virtual
+        treeview.tabela_virtual = self
+
+        if scrollbar is not None:
+            scrollbar.configure(command=self._rolar)
+        treeview.configure(yscrollcommand=lambda *args: None)
+
+        treeview.bind('<Configure>', self._ao_redimensionar, add='+')
+        treeview.bind('<MouseWheel>', self._ao_rodar, add='+')
+        treeview.bind('<Button-4>', lambda e: self._rolar_linhas(-LINHAS_POR_PASSO), add='+')
+        treeview.bind('<Button-5>', lambda e: self._rolar_linhas(LINHAS_POR_PASSO), add='+')
+        treeview.bind('<<TreeviewSelect>>', self._ao_selecionar, add='+')
+        for tecla, passo in (('<Up>', -1), ('<Down>', 1)):
+            treeview.bind(tecla, lambda e, p=passo: self._mover_selecao(p, e), add='+')
+        for tecla, paginas in (('<Prior>', -1), ('<Next>', 1)):
+            treeview.bind(tecla, lambda e, p=paginas: self._mover_selecao(p * self.visiveis, e),
+                          add='+')
+        treeview.bind('<Home>', lambda e: self._mover_para(0, e), add='+')
+        treeview.bind('<End>', lambda e: self._mover_para(len(self.dados) - 1, e), add='+')
+
+        if ordenar_pelo_cabecalho:
+            self.configurar_cabecalhos()
+
+    # ------------------------------------------------------------------
+    # Dados
+    # ------------------------------------------------------------------
+
+    def definir_dados(self, dados: DadosTabela) -> None:
+        """Troca os dados exibidos (volta ao topo, sem seleção)."""
+        self.dados = dados
+        self.inicio = 0
+        self.selecionado = None
+        self.atualizar()
+
+    def ordenar(self, coluna: str, decrescente: Optional[bool] = None) -> None:
+        """Ordena pela coluna; sem ``decrescente``, alterna a cada chamada."""
+        if decrescente is None:
+            atual = self.dados.ordenacao
+            decrescente = bool(atual and atual[0] == coluna and not atual[1])
+        self.dados.ordenar(coluna, decrescente)
+        self._manter_selecao_visivel()
+        self.atualizar()
+
+    def filtrar(self, texto: Optional[str] = None, colunas: Optional[Sequence[str]] = None,
+                predicado: Optional[Callable[[List[Any]], bool]] = None) -> None:
+        """Filtra os dados (ver :meth:`DadosTabela.filtrar`) e redesenha."""
+        self.dados.filtrar(texto, colunas, predicado)
+        self.inicio = 0
+        self._manter_selecao_visivel()
+        self.atualizar()
+
+    def configurar_cabecalhos(self) -> None:
+        """Faz o clique em cada cabeçalho ordenar pela coluna."""
+        if not _tem_colunas(self.treeview):
+            return
+        for coluna in self.treeview['columns']:
+            self.treeview.heading(coluna, command=lambda c=coluna: self.ordenar(c))
+
+    # ------------------------------------------------------------------
+    # Desenho
+    # ------------------------------------------------------------------
+
+    def _maximo_inicio(self) -> int:
+        return max(0, len(self.dados) - self.visiveis)
+
+    def atualizar(self) -> None:
+        """Redesenha a janela visível a partir de ``inicio``."""
+        tv = self.treeview
+        self.inicio = min(max(0, self.inicio), self._maximo_inicio())
+        necessarias = max(0, min(self.visiveis + self.margem, len(self.dados) - self.inicio))
+
+        # Os itens são recriados se alguém limpou o Treeview por fora
+        itens = list(tv.get_children())
+        while len(itens) > necessarias:
+            tv.delete(itens.pop())
+        while len(itens) < necessarias:
+            itens.append(tv.insert('', 'end', values=()))
+
+        self._itens = {}
+        selecionar = []
+        for deslocamento, iid in enumerate(itens):
+            posicao = self.inicio + deslocamento
+            indice = self.dados.indice(posicao)
+            linha = self.dados.linha(posicao)
+            valores = self.formatar(linha) if self.formatar else linha
+            opcoes: Dict[str, Any] = {'values': ['' if v is None else v for v in valores]}
+            if self.tags:
+                opcoes['tags'] = tuple(self.tags(linha))
+            tv.item(iid, **opcoes)
+            self._itens[iid] = indice
+            if indice == self.selecionado:
+                selecionar.append(iid)
+
+        tv.selection_set(selecionar)
+        if selecionar:
+            tv.focus(selecionar[0])
+        tv.yview_moveto(0)
+
+        if self.scrollbar is not None:
+            total = len(self.dados)
+            if total:
+                self.scrollbar.set(self.inicio / total, min(1.0, (self.inicio + self.visiveis) / total))
+            else:
+                self.scrollbar.set(0.0, 1.0)
+
+    def _ao_redimensionar(self, event=None) -> None:
+        altura = self.treeview.winfo_height()
+        visiveis = max(1, altura // _altura_linha(self.treeview) - 1)
+        if visiveis != self.visiveis:
+            self.visiveis = visiveis
+            self.atualizar()
+
+    # ------------------------------------------------------------------
+    # Rolagem e seleção
+    # ------------------------------------------------------------------
+
+    def _rolar(self, *args) -> None:
+        """Comando da barra de rolagem (``moveto``/``scroll``)."""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.inicio = int(float(args[1]) * len(self.dados))
+        elif args[0] == 'scroll':
+            passos = int(args[1])
+            self.inicio += passos * (self.visiveis if args[2] == 'pages' else 1)
+        self.atualizar()
+
+    def _rolar_linhas(self, linhas: int) -> str:
+        self.inicio += linhas
+        self.atualizar()
+        return 'break'
+
+    def _ao_rodar(self, event) -> str:
+        # Windows: múltiplos de 120; macOS: valores pequenos
+        passos = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._rolar_linhas(-passos * LINHAS_POR_PASSO)
+
+    def _ao_selecionar(self, event=None) -> None:
+        # Seleção vazia (linha rolada para fora da janela) não desmarca
+        selecao = self.treeview.selection()
+        if selecao and selecao[0] in self._itens:
+            self.selecionado = self._itens[selecao[0]]
+
+    def _manter_selecao_visivel(self) -> None:
+        if self.selecionado is None:
+            return
+        posicao = self.dados.posicao(self.selecionado)
+        if posicao is None:
+            self.selecionado = None
+        elif not self.inicio <= posicao < self.inicio + self.visiveis:
+            self.inicio = max(0, posicao - self.visiveis // 2)
+
+    def _mover_para(self, posicao: int, event=None) -> str:
+        if not len(self.dados):
+            return 'break'
+        posicao = min(max(0, posicao), len(self.dados) - 1)
+        self.selecionado = self.dados.indice(posicao)
+        if posicao < self.inicio:
+            self.inicio = posicao
+        elif posicao >= self.inicio + self.visiveis:
+            self.inicio = posicao - self.visiveis + 1
+        self.atualizar()
+        if self.ao_navegar is not None:
+            self.ao_navegar(event)
+        return 'break'
+
+    def _mover_selecao(self, passo: int, event=None) -> str:
+        atual = self.dados.posicao(self.selecionado) if self.selecionado is not None else None
+        return self._mover_para(self.inicio if atual is None else atual + passo, event)
+
+    def indice_do_item(self, iid: str) -> Optional[int]:
+        """Índice original da linha exibida no item ``iid`` do Treeview."""
+        return self._itens.get(iid)
+
+    def linha_selecionada(self) -> Optional[List[Any]]:
+        """Valores originais (não formatados) da linha selecionada."""
+        if self.selecionado is None:
+            return None
+        return [self.dados._dados[c][self.selecionado] for c in self.dados.colunas]
+
+
+def _tem_colunas(treeview) -> bool:
+    try:
+        return bool(treeview['columns'])
+    except Exception:
+        return False
+
+
+def _altura_linha(treeview) -> int:
+    try:
+        estilo = treeview.cget('style') or 'Treeview'
+        altura = ttk.Style().lookup(estilo, 'rowheight')
+        return int(altura) if altura else ALTURA_LINHA_PADRAO
+    except Exception:
+        return ALTURA_LINHA_PADRAO
+
+
+class ListaMarcavel:
+    """
+    Lista com caixa de marcação por linha, sobre :class:`TreeviewVirtual`.
+
+    Substitui o padrão Canvas + um Frame/Checkbutton/Label por registro:
+    a marcação fica em ``marcados`` (índices das linhas passadas a
+    ``definir``) e é exibida como coluna ``☑``/``☐`` com destaque de cor.
+    Clique na linha ou espaço alternam a marcação.
+    """
+
+    def __init__(self, pai, colunas: Sequence[Tuple[str, int]],
+                 ao_alterar: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            pai: Widget onde o Treeview e a barra de rolagem são empacotados
+            colunas: (título, largura) de cada coluna exibida
+            ao_alterar: Chamado depois de cada mudança feita pelo usuário
+        """
+        self.marcados: Set[int] = set()
+        self.ao_alterar = ao_alterar
+        self.colunas = ['marcado'] + [titulo for titulo, _ in colunas]
+
+        self.treeview = ttk.Treeview(pai, columns=self.colunas, show='headings', selectmode='browse')
+        scrollbar = ttk.Scrollbar(pai, orient='vertical')
+        self.treeview.heading('marcado', text='✓', anchor='center')
+        self.treeview.column('marcado', width=40, stretch=False, anchor='center')
+        for titulo, largura in colunas:
+            self.treeview.heading(titulo, text=titulo, anchor='w')
+            self.treeview.column(titulo, width=largura, anchor='w')
+        self.treeview.tag_configure('marcado', background=COR_MARCADO)
+        self.treeview.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        # Clique no cabeçalho "✓" ordena pelo índice, isto é, volta à ordem original
+        self.visao = TreeviewVirtual(self.treeview, scrollbar,
+                                     formatar=self._formatar, tags=self._tags)
+        self.treeview.bind('<ButtonRelease-1>', self._ao_clicar, add='+')
+        self.treeview.bind('<space>', self._ao_espaco, add='+')
+
+    def _formatar(self, linha: List[Any]) -> List[Any]:
+        return [MARCADO if linha[0] in self.marcados else DESMARCADO] + linha[1:]
+
+    def _tags(self, linha: List[Any]) -> Tuple[str, ...]:
+        return ('marcado',) if linha[0] in self.marcados else ()
+
+    def definir(self, linhas: Iterable[Sequence[Any]]) -> None:
+        """Exibe ``linhas`` (valores das colunas, nessa ordem), todas desmarcadas."""
+        self.marcados.clear()
+        self.visao.definir_dados(
+            DadosTabela(self.colunas, ([i, *linha] for i, linha in enumerate(linhas)))
+        )
+
+    def visiveis(self) -> List[int]:
+        """Índices das linhas que passam no filtro atual."""
+        return self.visao.dados.indices()
+
+    def marcar(self, indices: Iterable[int], valor: bool = True, avisar: bool = True) -> None:
+        """Marca (ou desmarca) as linhas e redesenha."""
+        if valor:
+            self.marcados.update(indices)
+        else:
+            self.marcados.difference_update(indices)
+        self._alterado(avisar)
+
+    def inverter(self, indices: Iterable[int]) -> None:
+        """Inverte a marcação das linhas."""
+        self.marcados.symmetric_difference_update(indices)
+        self._alterado(True)
+
+    def filtrar(self, texto: Optional[str], colunas: Optional[Sequence[str]] = None) -> None:
+        """Mantém visíveis as linhas que contêm ``texto``; vazio mostra todas."""
+        self.visao.filtrar(texto, colunas or self.colunas[1:])
+
+    def _alterado(self, avisar: bool) -> None:
+        self.visao.atualizar()
+        if avisar and self.ao_alterar is not None:
+            self.ao_alterar()
+
+    def _ao_clicar(self, event) -> None:
+        if self.treeview.identify_region(event.x, event.y) != 'cell':
+            return
+        indice = self.visao.indice_do_item(self.treeview.identify_row(event.y))
+        if indice is not None:
+            self.inverter([indice])
+
+    def _ao_espaco(self, event=None) -> str:
+        if self.visao.selecionado is not None:
+            self.inverter([self.visao.selecionado])
+        return 'break'
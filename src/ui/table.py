@@ -12,6 +12,7 @@ from datetime import datetime, date
 from typing import List, Dict, Any, Optional, Callable
 
 from src.core.config_logs import get_logger
+from src.ui.tabela_virtual import DadosTabela, TreeviewVirtual
 
 logger = get_logger(__name__)
 
@@ -34,18 +35,23 @@ class TableManager:
         tabela_frame (Frame): Frame que contém a tabela e scrollbars
         colunas (List[str]): Lista de nomes das colunas
         df (pd.DataFrame): DataFrame com os dados atuais
+        visao (TreeviewVirtual): Rolagem virtual (apenas com ``virtual=True``)
     """
     
-    def __init__(self, parent_frame: Frame, colors: Dict[str, str]):
+    def __init__(self, parent_frame: Frame, colors: Dict[str, str], virtual: bool = False):
         """
         Inicializa o gerenciador da tabela.
         
         Args:
             parent_frame: Frame pai onde a tabela será criada
             colors: Dicionário com as cores da aplicação (co0, co1, co4, etc.)
+            virtual: Materializar só as linhas visíveis (listas grandes);
+                     ordenação e filtro passam a ser feitos sobre os dados
         """
         self.parent_frame = parent_frame
         self.colors = colors
+        self.virtual = virtual
+        self.visao: Optional[TreeviewVirtual] = None
         
         # Componentes da tabela
         self.treeview: Optional[ttk.Treeview] = None
@@ -124,15 +130,20 @@ class TableManager:
             self.treeview.heading(col, text=col, anchor=W)
             self.treeview.column(col, width=120, anchor=W)
         
-        # Adicionar dados iniciais
-        self._populate_data()
-        
         # Vincular callbacks se fornecidos
         if on_select_callback:
             self.treeview.bind("<ButtonRelease-1>", on_select_callback)
             self.treeview.bind("<Double-1>", on_select_callback)
         
-        if on_keyboard_callback:
+        if self.virtual:
+            # A rolagem e a navegação por teclado ficam com a visão virtual;
+            # o callback de teclado é chamado depois de mover a seleção
+            self.visao = TreeviewVirtual(
+                self.treeview, vsb,
+                formatar=self._formatar_linha,
+                ao_navegar=on_keyboard_callback
+            )
+        elif on_keyboard_callback:
             self.treeview.bind("<Up>", on_keyboard_callback)
             self.treeview.bind("<Down>", on_keyboard_callback)
             self.treeview.bind("<Prior>", on_keyboard_callback)  # Page Up
@@ -140,6 +151,9 @@ class TableManager:
             self.treeview.bind("<Home>", on_keyboard_callback)   # Home
             self.treeview.bind("<End>", on_keyboard_callback)    # End
         
+        # Adicionar dados iniciais
+        self._populate_data()
+        
         # Adicionar dica/instrução visual
         self.instrucao_label = Label(
             self.parent_frame,
@@ -183,22 +197,28 @@ class TableManager:
         if self.treeview is None or self.df is None:
             return
         
+        if self.visao is not None:
+            self.visao.definir_dados(DadosTabela.de_dataframe(self.df))
+            logger.debug(f"Tabela virtual com {len(self.df)} registros")
+            return
+        
         # Limpar dados existentes
         for item in self.treeview.get_children():
             self.treeview.delete(item)
         
         # Adicionar dados do DataFrame
         for i, row in self.df.iterrows():
-            row_list = list(row)
-            
-            # Padronizar data de nascimento (assumindo índice 4)
-            if len(row_list) > 4 and row_list[4]:
-                row_list[4] = self._format_date(row_list[4])
-            
-            self.treeview.insert("", "end", values=row_list)
+            self.treeview.insert("", "end", values=self._formatar_linha(list(row)))
         
         logger.debug(f"Tabela populada com {len(self.df)} registros")
     
+    def _formatar_linha(self, row_list: List[Any]) -> List[Any]:
+        """Valores exibidos de uma linha (data de nascimento no índice 4)."""
+        if len(row_list) > 4 and row_list[4]:
+            row_list = list(row_list)
+            row_list[4] = self._format_date(row_list[4])
+        return row_list
+    
     def _format_date(self, date_value: Any) -> str:
         """
         Formata valor de data para string DD/MM/YYYY.
@@ -230,12 +250,14 @@ class TableManager:
         Atualiza os dados da tabela.
         
         Args:
-            df: Novo DataFrame com os dados
+            df: Novo DataFrame com os dados (ou lista de registros)
             colunas: Nova lista de colunas (opcional)
         """
         if colunas:
             self.colunas = colunas
         
+        if not isinstance(df, pd.DataFrame):
+            df = pd.DataFrame(list(df))
         self.df = df
         self._populate_data()
         
@@ -251,12 +273,17 @@ class TableManager:
         if not self.treeview:
             return None
         
-        selection = self.treeview.selection()
-        if not selection:
-            return None
-        
-        item = selection[0]
-        values = self.treeview.item(item, "values")
+        if self.visao is not None:
+            # A linha selecionada pode estar fora da área visível
+            linha = self.visao.linha_selecionada()
+            values = self._formatar_linha(linha) if linha is not None else None
+        else:
+            selection = self.treeview.selection()
+            if not selection:
+                return None
+            
+            item = selection[0]
+            values = self.treeview.item(item, "values")
         
         if not values:
             return None
@@ -282,11 +309,35 @@ class TableManager:
         
         logger.debug("Tabela ocultada")
     
+    def ordenar(self, coluna: str, decrescente: Optional[bool] = None):
+        """
+        Ordena a tabela virtual pela coluna (sem recriar itens).
+        
+        Args:
+            coluna: Nome da coluna
+            decrescente: Sentido; se None, alterna a cada chamada
+        """
+        if self.visao is not None:
+            self.visao.ordenar(coluna, decrescente)
+    
+    def filtrar(self, texto: Optional[str] = None, colunas: Optional[List[str]] = None):
+        """
+        Filtra a tabela virtual por texto (sem acentos); vazio remove o filtro.
+        
+        Args:
+            texto: Trecho procurado
+            colunas: Colunas consultadas (todas, se None)
+        """
+        if self.visao is not None:
+            self.visao.filtrar(texto, colunas)
+    
     def limpar(self):
         """Limpa todos os itens da tabela."""
-        if self.treeview:
+        self.df = pd.DataFrame(columns=self.colunas)
+        if self.visao is not None:
+            self.visao.definir_dados(DadosTabela(self.colunas))
+        elif self.treeview:
             for item in self.treeview.get_children():
                 self.treeview.delete(item)
         
-        self.df = pd.DataFrame(columns=self.colunas)
         logger.debug("Tabela limpa")
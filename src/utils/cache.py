@@ -3,7 +3,7 @@ Sistema de cache inteligente com TTL, LRU e invalidação.
 
 Este módulo fornece uma classe CacheManager para cachear resultados
 de funções custosas com suporte a:
-- TTL (Time To Live) configurável
+- TTL (Time To Live) configurável, padrão da instância ou por entrada
 - Tamanho máximo com política LRU (Least Recently Used)
 - Invalidação manual ou automática
 - Cleanup periódico de entradas expiradas
@@ -16,6 +16,7 @@ from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Any, Optional, Callable, Dict, Tuple
 from functools import wraps
+import os
 import threading
 import logging
 
@@ -93,8 +94,8 @@ class CacheManager:
                 logger.debug(f"Cache MISS: {key}")
                 return default
 
-            # Verifica se ainda está válido
-            if datetime.now() - entry['timestamp'] < self._ttl:
+            # Verifica se ainda está válido (TTL da entrada ou o padrão)
+            if datetime.now() - entry['timestamp'] < entry.get('ttl', self._ttl):
                 self._stats['hits'] += 1
                 # Promove para o final (mais recente) na OrderedDict
                 self._cache.move_to_end(key)
@@ -107,13 +108,14 @@ class CacheManager:
                 logger.debug(f"Cache EXPIRED: {key}")
                 return default
     
-    def set(self, key: str, data: Any) -> None:
+    def set(self, key: str, data: Any, ttl: Optional[float] = None) -> None:
         """
         Armazena valor no cache.
 
         Args:
             key: Chave do cache
             data: Dados a serem cacheados (inclusive ``None``)
+            ttl: TTL específico desta entrada em segundos (usa o padrão se None)
         """
         with self._lock:
             # Se a chave já existe, remova antes para atualizar posição LRU
@@ -122,7 +124,8 @@ class CacheManager:
 
             self._cache[key] = {
                 'data': data,
-                'timestamp': datetime.now()
+                'timestamp': datetime.now(),
+                'ttl': self._ttl if ttl is None else timedelta(seconds=ttl),
             }
             self._stats['sets'] += 1
 
@@ -186,7 +189,7 @@ class CacheManager:
 
                 # Executa função e cacheia resultado
                 result = func(*args, **kwargs)
-                self.set(cache_key, result)
+                self.set(cache_key, result, ttl=ttl)
 
                 return result
             
@@ -273,7 +276,7 @@ class CacheManager:
             now = datetime.now()
             keys_to_delete = [
                 k for k, v in self._cache.items()
-                if now - v['timestamp'] >= self._ttl
+                if now - v['timestamp'] >= v.get('ttl', self._ttl)
             ]
             
             for key in keys_to_delete:
@@ -318,10 +321,40 @@ class CacheManager:
             self._cleanup_timer = None
 
 
+def criar_cache(ttl_seconds: int = 300, max_size: int = 1024,
+                auto_cleanup_seconds: int = 0, max_bytes: int = 0):
+    """
+    Cria um cache com o backend configurado em ``CACHE_BACKEND``.
+
+    - ``lru`` (padrão): :class:`CacheManager`, um único lock.
+    - ``segmentado``: :class:`src.utils.cache_segmentado.CacheSegmentado`,
+      com locks por segmento, relógio monotônico e limite de memória
+      (``max_bytes`` ou ``CACHE_MAX_MB``).
+
+    Os dois têm a mesma interface (get/set/invalidate/invalidate_pattern/
+    cached/get_stats), então o retorno pode substituir um CacheManager.
+    """
+    backend = os.getenv("CACHE_BACKEND", "lru").strip().lower()
+    if backend == "segmentado":
+        from src.utils.cache_segmentado import CacheSegmentado
+        if not max_bytes:
+            max_bytes = int(float(os.getenv("CACHE_MAX_MB", "0")) * 1024 * 1024)
+        return CacheSegmentado(
+            ttl_seconds=ttl_seconds, max_size=max_size,
+            auto_cleanup_seconds=auto_cleanup_seconds, max_bytes=max_bytes,
+        )
+    if backend != "lru":
+        logger.warning(f"CACHE_BACKEND desconhecido: {backend!r}; usando 'lru'")
+    return CacheManager(
+        ttl_seconds=ttl_seconds, max_size=max_size,
+        auto_cleanup_seconds=auto_cleanup_seconds,
+    )
+
+
 # Instância global para uso em toda a aplicação
 # TTL padrão de 5 minutos (300 segundos), max 1024 entradas
-global_cache = CacheManager(ttl_seconds=300, max_size=1024)
+global_cache = criar_cache(ttl_seconds=300, max_size=1024)
 
 # Cache específico para dashboard com TTL maior (10 minutos)
 # Cleanup automático a cada 5 minutos
-dashboard_cache = CacheManager(ttl_seconds=600, max_size=256, auto_cleanup_seconds=300)
+dashboard_cache = criar_cache(ttl_seconds=600, max_size=256, auto_cleanup_seconds=300)
@@ -0,0 +1,164 @@
+"""
+Cache persistente em disco (segundo nível) baseado em SQLite.
+
+Guarda valores serializados com pickle em ``CACHE_DIR/cache_l2.sqlite3``,
+cada um acompanhado de um *marcador* fornecido pelo chamador (por exemplo a
+versão da tabela no banco). A leitura só devolve o valor se o marcador
+gravado for igual ao atual, então o cache nunca serve dados de uma versão
+diferente; quem decide o que é "mudou" é o marcador.
+
+O SQLite cuida da atomicidade e do acesso simultâneo de várias instâncias
+do sistema na mesma máquina. Falhas de disco nunca propagam: o cache se
+comporta como vazio e o chamador volta ao banco.
+
+Uso básico::
+
+    from src.utils.cache import _CACHE_MISS
+    from src.utils.cache_disco import cache_disco
+
+    valor = cache_disco.ler('series', marcador)
+    if valor is _CACHE_MISS:
+        valor = consultar_banco()
+        cache_disco.gravar('series', marcador, valor)
+"""
+
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+from src.core.config import get_cache_path
+from src.core.config_logs import get_logger
+from src.utils.cache import _CACHE_MISS
+
+logger = get_logger(__name__)
+
+ARQUIVO_CACHE = 'cache_l2.sqlite3'
+
+# Incrementar quando o formato das entradas mudar, para descartar o que foi
+# gravado por versões anteriores.
+VERSAO_FORMATO = 1
+
+
+def _serializar_marcador(marcador: Hashable) -> str:
+    return json.dumps(marcador, default=str, sort_keys=True)
+
+
+class CacheDisco:
+    """Armazenamento chave → (marcador, valor) em um arquivo SQLite."""
+
+    def __init__(self, caminho: Optional[Path] = None):
+        """
+        Args:
+            caminho: Arquivo SQLite. Se None, usa ``get_cache_path(ARQUIVO_CACHE)``
+                     na primeira operação.
+        """
+        self._caminho = caminho
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._desabilitado = False
+
+    def _conexao(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None or self._desabilitado:
+            return self._conn
+        try:
+            caminho = self._caminho or get_cache_path(ARQUIVO_CACHE)
+            conn = sqlite3.connect(str(caminho), timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entradas ("
+                " chave TEXT PRIMARY KEY,"
+                " formato INTEGER NOT NULL,"
+                " marcador TEXT NOT NULL,"
+                " dados BLOB NOT NULL,"
+                " gravado_em REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Cache em disco indisponível, seguindo sem ele: {e}")
+            self._desabilitado = True
+        return self._conn
+
+    def ler(self, chave: str, marcador: Hashable) -> Any:
+        """
+        Retorna o valor gravado para ``chave`` se o marcador for o mesmo.
+
+        Returns:
+            O valor, ou ``_CACHE_MISS`` se ausente, de outro marcador/formato
+            ou ilegível.
+        """
+        with self._lock:
+            conn = self._conexao()
+            if conn is None:
+                return _CACHE_MISS
+            try:
+                row = conn.execute(
+                    "SELECT formato, marcador, dados FROM entradas WHERE chave = ?", (chave,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Erro ao ler cache em disco ({chave}): {e}")
+                return _CACHE_MISS
+
+        if row is None:
+            return _CACHE_MISS
+        formato, marcador_gravado, dados = row
+        if formato != VERSAO_FORMATO or marcador_gravado != _serializar_marcador(marcador):
+            return _CACHE_MISS
+        try:
+            return pickle.loads(dados)
+        except Exception as e:
+            logger.warning(f"Entrada ilegível no cache em disco ({chave}): {e}")
+            return _CACHE_MISS
+
+    def gravar(self, chave: str, marcador: Hashable, valor: Any) -> bool:
+        """Grava ``valor`` sob ``chave`` com o marcador informado."""
+        try:
+            dados = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Valor não serializável para o cache em disco ({chave}): {e}")
+            return False
+        with self._lock:
+            conn = self._conexao()
+            if conn is None:
+                return False
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entradas (chave, formato, marcador, dados, gravado_em) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (chave, VERSAO_FORMATO, _serializar_marcador(marcador), sqlite3.Binary(dados), time.time()),
+                )
+                conn.commit()
+                return True
+            except sqlite3.Error as e:
+                logger.warning(f"Erro ao gravar cache em disco ({chave}): {e}")
+                return False
+
+    def remover(self, prefixo: str = '') -> int:
+        """Remove as entradas cujas chaves começam com ``prefixo`` (todas se vazio)."""
+        with self._lock:
+            conn = self._conexao()
+            if conn is None:
+                return 0
+            try:
+                cur = conn.execute(
+                    "DELETE FROM entradas WHERE substr(chave, 1, ?) = ?", (len(prefixo), prefixo)
+                )
+                conn.commit()
+                return cur.rowcount
+            except sqlite3.Error as e:
+                logger.warning(f"Erro ao limpar cache em disco: {e}")
+                return 0
+
+    def fechar(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Instância do processo (arquivo em CACHE_DIR)
+cache_disco = CacheDisco()
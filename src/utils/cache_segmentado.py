@@ -0,0 +1,431 @@
+"""
+Cache em memória segmentado (lock striping) com limite aproximado de bytes.
+
+Alternativa ao :class:`src.utils.cache.CacheManager` para caches muito
+acessados por várias threads (dashboards, consultas em paralelo):
+
+- As chaves são distribuídas em segmentos, cada um com seu próprio lock e
+  sua própria ordem LRU; threads que acessam chaves de segmentos diferentes
+  não disputam o mesmo lock.
+- A expiração usa ``time.monotonic()`` (imune a ajustes do relógio) e não
+  há log por hit/miss.
+- Com ``max_bytes`` o cache estima o tamanho de cada valor (DataFrames via
+  ``memory_usage(deep=True)``) e descarta as entradas menos usadas quando o
+  total passa do limite.
+- Estatísticas por namespace: o trecho da chave antes do primeiro ``:``
+  (ex.: ``notas:2025:60`` → ``notas``).
+
+A interface é a mesma do CacheManager; para trocar os caches globais use
+a variável de ambiente ``CACHE_BACKEND=segmentado`` (ver
+:func:`src.utils.cache.criar_cache`).
+"""
+
+import logging
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.cache import _CACHE_MISS
+
+logger = logging.getLogger(__name__)
+
+SEGMENTOS_PADRAO = 16
+
+# Coleções maiores que isso têm o tamanho estimado por amostragem
+_AMOSTRA_TAMANHO = 64
+_PROFUNDIDADE_MAXIMA = 3
+
+# Índices das entradas [valor, expira_em, bytes, contadores do namespace]
+_VALOR, _EXPIRA, _BYTES, _STATS = 0, 1, 2, 3
+
+_CONTADORES = ('hits', 'misses', 'sets', 'invalidations', 'evictions')
+_HITS, _MISSES, _SETS, _INVALIDATIONS, _EVICTIONS = range(len(_CONTADORES))
+
+
+def tamanho_aproximado(obj: Any, _profundidade: int = 0) -> int:
+    """Estima em bytes a memória ocupada por ``obj``.
+
+    DataFrames/Series do pandas usam ``memory_usage(deep=True)`` e arrays
+    numpy usam ``nbytes``. Listas, tuplas, conjuntos e dicionários são
+    percorridos até três níveis; acima de 64 itens a média de uma amostra
+    é extrapolada para o total.
+    """
+    uso = getattr(obj, 'memory_usage', None)
+    if callable(uso):
+        try:
+            total = uso(deep=True)
+            return int(total.sum()) if hasattr(total, 'sum') else int(total)
+        except TypeError:
+            pass
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+
+    tamanho = sys.getsizeof(obj)
+    if _profundidade >= _PROFUNDIDADE_MAXIMA:
+        return tamanho
+
+    if isinstance(obj, dict):
+        itens: List[Any] = list(obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        itens = list(obj)
+    else:
+        return tamanho
+
+    if not itens:
+        return tamanho
+    passo = max(1, len(itens) // _AMOSTRA_TAMANHO)
+    amostra = itens[::passo]
+    soma = 0
+    for item in amostra:
+        if isinstance(obj, dict):
+            chave, valor = item
+            soma += tamanho_aproximado(chave, _profundidade + 1) + tamanho_aproximado(valor, _profundidade + 1)
+        else:
+            soma += tamanho_aproximado(item, _profundidade + 1)
+    return tamanho + int(soma * len(itens) / len(amostra))
+
+
+def _namespace(chave: str) -> str:
+    return chave.partition(':')[0] if ':' in chave else '-'
+
+
+class _Segmento:
+    """Um segmento do cache: dicionário LRU, lock e contadores próprios."""
+
+    __slots__ = ('lock', 'entradas', 'bytes', 'stats')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entradas: 'OrderedDict[str, list]' = OrderedDict()
+        self.bytes = 0
+        self.stats: Dict[str, List[int]] = {}
+
+    def contadores(self, chave: str) -> List[int]:
+        ns = _namespace(chave)
+        valores = self.stats.get(ns)
+        if valores is None:
+            valores = self.stats[ns] = [0] * len(_CONTADORES)
+        return valores
+
+    def contar(self, chave: str, contador: int) -> None:
+        self.contadores(chave)[contador] += 1
+
+    def remover(self, chave: str) -> None:
+        entrada = self.entradas.pop(chave)
+        self.bytes -= entrada[_BYTES]
+
+
+class CacheSegmentado:
+    """
+    Cache com TTL, LRU por segmento e limite opcional de memória.
+
+    Exemplo:
+        cache = CacheSegmentado(ttl_seconds=600, max_size=256, max_bytes=64 * 1024 * 1024)
+
+        @cache.cached(ttl=300)
+        def obter_estatisticas(escola_id):
+            return resultado
+
+        cache.set('notas:2025:60', df)
+        cache.get('notas:2025:60')
+        cache.get_stats()['namespaces']['notas']
+    """
+
+    def __init__(self, ttl_seconds: int = 300, max_size: int = 1024,
+                 auto_cleanup_seconds: int = 0, max_bytes: int = 0,
+                 segmentos: int = SEGMENTOS_PADRAO):
+        """
+        Inicializa o cache.
+
+        Args:
+            ttl_seconds: Tempo de vida padrão das entradas em segundos.
+            max_size: Número máximo de entradas (0 = ilimitado), dividido
+                      entre os segmentos; a política LRU vale por segmento.
+            auto_cleanup_seconds: Intervalo da limpeza automática de
+                                  entradas expiradas (0 = desabilitado).
+            max_bytes: Limite aproximado de memória em bytes (0 = sem limite).
+                       Valores maiores que o limite não são armazenados.
+            segmentos: Número de segmentos (locks). Caches pequenos usam
+                       menos segmentos para não fragmentar o LRU.
+        """
+        if segmentos < 1:
+            raise ValueError("segmentos deve ser positivo")
+        if max_size > 0:
+            segmentos = max(1, min(segmentos, max_size // 16))
+        self._ttl = float(ttl_seconds)
+        self._max_size = max_size
+        self._max_por_segmento = math.ceil(max_size / segmentos) if max_size > 0 else 0
+        self._max_bytes = max_bytes
+        self._segmentos = [_Segmento() for _ in range(segmentos)]
+        self._rejeitados = 0
+        self._cleanup_timer: Optional[threading.Timer] = None
+        self._cleanup_interval = auto_cleanup_seconds
+        if auto_cleanup_seconds > 0:
+            self._start_cleanup_timer()
+        logger.debug(
+            f"CacheSegmentado inicializado com TTL={ttl_seconds}s, max_size={max_size}, "
+            f"max_bytes={max_bytes}, segmentos={segmentos}"
+        )
+
+    def _segmento(self, chave: str) -> _Segmento:
+        return self._segmentos[hash(chave) % len(self._segmentos)]
+
+    def get(self, key: str, default: Any = _CACHE_MISS) -> Any:
+        """
+        Recupera valor do cache se ainda válido.
+
+        Args:
+            key: Chave do cache
+            default: Valor retornado quando a chave não existe ou expirou.
+
+        Returns:
+            Valor cacheado (pode ser ``None``) ou *default*.
+        """
+        seg = self._segmento(key)
+        with seg.lock:
+            entrada = seg.entradas.get(key)
+            if entrada is None:
+                seg.contar(key, _MISSES)
+                return default
+            if time.monotonic() >= entrada[_EXPIRA]:
+                seg.remover(key)
+                entrada[_STATS][_MISSES] += 1
+                return default
+            seg.entradas.move_to_end(key)
+            entrada[_STATS][_HITS] += 1
+            return entrada[_VALOR]
+
+    def set(self, key: str, data: Any, ttl: Optional[float] = None) -> None:
+        """
+        Armazena valor no cache.
+
+        Args:
+            key: Chave do cache
+            data: Dados a serem cacheados (inclusive ``None``)
+            ttl: TTL específico desta entrada em segundos (usa o padrão se None)
+        """
+        nbytes = tamanho_aproximado(data) if self._max_bytes > 0 else 0
+        seg = self._segmento(key)
+
+        if self._max_bytes > 0 and nbytes > self._max_bytes:
+            with seg.lock:
+                if key in seg.entradas:
+                    seg.remover(key)
+                self._rejeitados += 1
+            logger.warning(
+                f"Cache: valor de '{key}' (~{nbytes / 1048576:.1f} MB) excede o limite "
+                f"de {self._max_bytes / 1048576:.1f} MB e não foi armazenado"
+            )
+            return
+
+        expira_em = time.monotonic() + (self._ttl if ttl is None else ttl)
+        with seg.lock:
+            if key in seg.entradas:
+                seg.remover(key)
+            contadores = seg.contadores(key)
+            seg.entradas[key] = [data, expira_em, nbytes, contadores]
+            seg.bytes += nbytes
+            contadores[_SETS] += 1
+
+            if self._max_por_segmento > 0:
+                while len(seg.entradas) > self._max_por_segmento:
+                    self._despejar_mais_antiga(seg)
+            if self._max_bytes > 0:
+                while self._bytes_total() > self._max_bytes and len(seg.entradas) > 1:
+                    self._despejar_mais_antiga(seg)
+
+        # O próprio segmento não bastou: libera espaço nos demais, um lock por vez
+        if self._max_bytes > 0 and self._bytes_total() > self._max_bytes:
+            for outro in self._segmentos:
+                if outro is seg:
+                    continue
+                with outro.lock:
+                    while outro.entradas and self._bytes_total() > self._max_bytes:
+                        self._despejar_mais_antiga(outro)
+                if self._bytes_total() <= self._max_bytes:
+                    break
+
+    @staticmethod
+    def _despejar_mais_antiga(seg: _Segmento) -> None:
+        _, entrada = seg.entradas.popitem(last=False)
+        seg.bytes -= entrada[_BYTES]
+        entrada[_STATS][_EVICTIONS] += 1
+
+    def _bytes_total(self) -> int:
+        # Leitura sem lock dos demais segmentos: o limite é aproximado
+        return sum(seg.bytes for seg in self._segmentos)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Invalida cache.
+
+        Args:
+            key: Chave específica para invalidar. Se None, limpa todo o cache.
+        """
+        if key:
+            seg = self._segmento(key)
+            with seg.lock:
+                if key in seg.entradas:
+                    seg.remover(key)
+                    seg.contar(key, _INVALIDATIONS)
+                    logger.info(f"Cache invalidado: {key}")
+            return
+
+        total = 0
+        for seg in self._segmentos:
+            with seg.lock:
+                for chave in seg.entradas:
+                    seg.contar(chave, _INVALIDATIONS)
+                total += len(seg.entradas)
+                seg.entradas.clear()
+                seg.bytes = 0
+        logger.info(f"Cache completo invalidado ({total} entradas)")
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """
+        Invalida todas as entradas cujas chaves começam com ``pattern``.
+
+        Um ``*`` final é aceito por compatibilidade (``'user:*'`` equivale a ``'user:'``).
+
+        Returns:
+            Número de entradas invalidadas
+        """
+        prefixo = pattern[:-1] if pattern.endswith('*') else pattern
+        total = 0
+        for seg in self._segmentos:
+            with seg.lock:
+                chaves = [k for k in seg.entradas if k.startswith(prefixo)]
+                for chave in chaves:
+                    seg.remover(chave)
+                    seg.contar(chave, _INVALIDATIONS)
+                total += len(chaves)
+        if total > 0:
+            logger.info(f"Cache invalidado por padrão '{pattern}': {total} entradas")
+        return total
+
+    def cached(self, ttl: Optional[int] = None, key_func: Optional[Callable] = None):
+        """
+        Decorator para cache automático de funções (mesmas chaves do CacheManager).
+
+        Args:
+            ttl: TTL específico para esta função (usa padrão se None)
+            key_func: Função customizada para gerar chave do cache
+        """
+        def decorator(func: Callable):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if key_func:
+                    cache_key = key_func(*args, **kwargs)
+                else:
+                    args_str = ','.join(str(arg) for arg in args)
+                    kwargs_str = ','.join(f"{k}={v}" for k, v in sorted(kwargs.items()))
+                    cache_key = f"{func.__name__}:{args_str}:{kwargs_str}"
+
+                cached_result = self.get(cache_key)
+                if cached_result is not _CACHE_MISS:
+                    return cached_result
+
+                result = func(*args, **kwargs)
+                self.set(cache_key, result, ttl=ttl)
+                return result
+
+            setattr(wrapper, 'invalidate_cache', lambda: self.invalidate_pattern(f"{func.__name__}:"))
+            return wrapper
+        return decorator
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do cache.
+
+        Returns:
+            As mesmas chaves do CacheManager mais ``bytes``, ``max_bytes``,
+            ``rejected``, ``shards`` e ``namespaces`` (contadores por namespace).
+        """
+        por_ns: Dict[str, List[int]] = {}
+        tamanho = 0
+        nbytes = 0
+        for seg in self._segmentos:
+            with seg.lock:
+                tamanho += len(seg.entradas)
+                nbytes += seg.bytes
+                for ns, valores in seg.stats.items():
+                    acumulado = por_ns.setdefault(ns, [0] * len(_CONTADORES))
+                    for i, v in enumerate(valores):
+                        acumulado[i] += v
+
+        totais = [sum(v[i] for v in por_ns.values()) for i in range(len(_CONTADORES))]
+        total_requests = totais[_HITS] + totais[_MISSES]
+        hit_rate = (totais[_HITS] / total_requests * 100) if total_requests > 0 else 0
+
+        stats: Dict[str, Any] = dict(zip(_CONTADORES, totais))
+        stats.update({
+            'hit_rate': round(hit_rate, 2),
+            'size': tamanho,
+            'max_size': self._max_size,
+            'total_requests': total_requests,
+            'bytes': nbytes,
+            'max_bytes': self._max_bytes,
+            'rejected': self._rejeitados,
+            'shards': len(self._segmentos),
+            'namespaces': {ns: dict(zip(_CONTADORES, v)) for ns, v in sorted(por_ns.items())},
+        })
+        return stats
+
+    def clear_stats(self) -> None:
+        """Reseta estatísticas do cache."""
+        for seg in self._segmentos:
+            with seg.lock:
+                # Zera no lugar: as entradas guardam referência às listas
+                for valores in seg.stats.values():
+                    valores[:] = [0] * len(_CONTADORES)
+        self._rejeitados = 0
+        logger.info("Estatísticas do cache resetadas")
+
+    def cleanup_expired(self) -> int:
+        """
+        Remove entradas expiradas do cache.
+
+        Returns:
+            Número de entradas removidas
+        """
+        agora = time.monotonic()
+        total = 0
+        for seg in self._segmentos:
+            with seg.lock:
+                expiradas = [k for k, e in seg.entradas.items() if agora >= e[_EXPIRA]]
+                for chave in expiradas:
+                    seg.remover(chave)
+                total += len(expiradas)
+        if total > 0:
+            logger.info(f"Limpeza de cache: {total} entradas expiradas removidas")
+        return total
+
+    # ------------------------------------------------------------------
+    # Cleanup periódico
+    # ------------------------------------------------------------------
+
+    def _start_cleanup_timer(self) -> None:
+        if self._cleanup_interval <= 0:
+            return
+        self._cleanup_timer = threading.Timer(self._cleanup_interval, self._auto_cleanup)
+        self._cleanup_timer.daemon = True
+        self._cleanup_timer.start()
+
+    def _auto_cleanup(self) -> None:
+        try:
+            self.cleanup_expired()
+        except Exception:
+            logger.exception("Erro no auto-cleanup do cache")
+        finally:
+            self._start_cleanup_timer()
+
+    def stop_cleanup(self) -> None:
+        """Para o timer de limpeza automática."""
+        if self._cleanup_timer is not None:
+            self._cleanup_timer.cancel()
+            self._cleanup_timer = None
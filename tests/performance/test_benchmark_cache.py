@@ -0,0 +1,83 @@
+"""
+Micro-benchmarks do cache: CacheManager x CacheSegmentado.
+
+Mede get/set em uma thread (custo por operação) e com 8 threads
+disputando o cache (efeito do lock único x locks por segmento). O GIL
+limita o ganho em CPython; o que se compara é principalmente o custo de
+``datetime.now()``/log por acesso e a contenção no lock.
+
+Uso:
+    pytest tests/performance/test_benchmark_cache.py -m slow -s
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.utils.cache import CacheManager
+from src.utils.cache_segmentado import CacheSegmentado
+
+OPERACOES = 200_000
+THREADS = 8
+CHAVES = 512
+
+
+def _chaves():
+    return [f'obter_estatisticas:{i}:escola=60' for i in range(CHAVES)]
+
+
+def _uma_thread(cache, chaves):
+    for chave in chaves:
+        cache.set(chave, chave)
+    inicio = time.perf_counter()
+    for i in range(OPERACOES):
+        cache.get(chaves[i % CHAVES])
+    return time.perf_counter() - inicio
+
+
+def _varias_threads(cache, chaves):
+    for chave in chaves:
+        cache.set(chave, chave)
+    por_thread = OPERACOES // THREADS
+    barreira = threading.Barrier(THREADS + 1)
+
+    def trabalhar(deslocamento):
+        barreira.wait()
+        for i in range(por_thread):
+            chave = chaves[(i + deslocamento) % CHAVES]
+            if i % 10 == 0:
+                cache.set(chave, i)
+            else:
+                cache.get(chave)
+
+    threads = [threading.Thread(target=trabalhar, args=(n * 61,)) for n in range(THREADS)]
+    for t in threads:
+        t.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - inicio
+
+
+@pytest.mark.slow
+def test_benchmark_cache():
+    chaves = _chaves()
+    resultados = {}
+    for nome, fabrica in (
+        ('CacheManager', lambda: CacheManager(ttl_seconds=600, max_size=1024)),
+        ('CacheSegmentado', lambda: CacheSegmentado(ttl_seconds=600, max_size=1024)),
+    ):
+        resultados[nome] = (_uma_thread(fabrica(), chaves), _varias_threads(fabrica(), chaves))
+
+    print(f"\n{OPERACOES} operações, {CHAVES} chaves")
+    for nome, (uma, varias) in resultados.items():
+        print(
+            f"  {nome:<16} 1 thread: {uma / OPERACOES * 1e6:.2f} µs/get | "
+            f"{THREADS} threads: {varias:.3f} s"
+        )
+
+    antigo, novo = resultados['CacheManager'], resultados['CacheSegmentado']
+    assert novo[0] < antigo[0]
+    assert novo[1] < antigo[1] * 1.5
@@ -0,0 +1,101 @@
+"""
+Benchmark da correção automática do banco de questões.
+
+Compara o laço antigo (um UPDATE por resposta) com
+RespostaService.corrigir_automaticamente (contagem, deltas de desempenho
+e um UPDATE ... JOIN) para 30.000 respostas. O banco é simulado por um
+cursor que conta round trips; o tempo estimado soma o custo em Python a
+uma latência fixa.
+
+Uso:
+    pytest tests/performance/test_benchmark_correcao.py -m slow -s
+"""
+
+import random
+import time
+from unittest.mock import patch
+
+import pytest
+
+services = pytest.importorskip("banco_questoes.services")
+
+TOTAL_RESPOSTAS = 30_000
+LATENCIA_ROUND_TRIP = 0.0005  # 0,5 ms por ida e volta ao MySQL na rede local
+
+
+def _respostas_sinteticas():
+    rnd = random.Random(42)
+    return [
+        (i, rnd.choice('ABCDE'), rnd.choice('ABCDE'), 1.0)
+        for i in range(TOTAL_RESPOSTAS)
+    ]
+
+
+class CursorSimulado:
+    """Cursor falso: conta round trips e corrige em memória."""
+
+    def __init__(self, respostas):
+        self.respostas = respostas
+        self.round_trips = 0
+        self._resultado = None
+        self.rowcount = 0
+
+    def execute(self, query, params=None):
+        self.round_trips += 1
+        if query.lstrip().startswith('SELECT r.id'):
+            self._resultado = list(self.respostas)
+        elif 'COUNT(*)' in query:
+            corretas = sum(1 for _, letra, gabarito, _ in self.respostas if letra == gabarito)
+            self._resultado = {'total': len(self.respostas), 'corretas': corretas}
+        else:
+            self.rowcount = len(self.respostas) if params and len(params) == 1 else 1
+
+    def fetchall(self):
+        return self._resultado
+
+    def fetchone(self):
+        return self._resultado
+
+
+def _laco_antigo(cursor, avaliacao_aplicada_id):
+    """Reprodução do algoritmo anterior (SELECT + um UPDATE por resposta)."""
+    cursor.execute("SELECT r.id, r.resposta_letra, q.gabarito_letra, aq.pontuacao ...",
+                   (avaliacao_aplicada_id,))
+    corretas = erradas = 0
+    for resp_id, resp_letra, gabarito, pontuacao in cursor.fetchall():
+        is_correta = resp_letra and resp_letra.upper() == gabarito.upper() if gabarito else False
+        pts = pontuacao if is_correta else 0
+        cursor.execute("UPDATE respostas_alunos SET correta = %s, pontuacao_obtida = %s WHERE id = %s",
+                       (is_correta, pts, resp_id))
+        if is_correta:
+            corretas += 1
+        else:
+            erradas += 1
+    return {'corretas': corretas, 'erradas': erradas, 'total': corretas + erradas}
+
+
+@pytest.mark.slow
+def test_benchmark_correcao_automatica():
+    respostas = _respostas_sinteticas()
+
+    cursor_antigo = CursorSimulado(respostas)
+    inicio = time.perf_counter()
+    esperado = _laco_antigo(cursor_antigo, 1)
+    tempo_antigo = time.perf_counter() - inicio + cursor_antigo.round_trips * LATENCIA_ROUND_TRIP
+
+    cursor_novo = CursorSimulado(respostas)
+    with patch.object(services, 'get_cursor') as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value = cursor_novo
+        inicio = time.perf_counter()
+        resultado = services.RespostaService.corrigir_automaticamente(1)
+        tempo_novo = time.perf_counter() - inicio + cursor_novo.round_trips * LATENCIA_ROUND_TRIP
+
+    print(
+        f"\n{TOTAL_RESPOSTAS} respostas"
+        f"\n  laço antigo:      {cursor_antigo.round_trips} round trips, ~{tempo_antigo:.2f} s"
+        f"\n  UPDATE ... JOIN:  {cursor_novo.round_trips} round trips, ~{tempo_novo:.4f} s"
+    )
+
+    assert resultado == esperado
+    assert cursor_novo.round_trips == 3
+    assert tempo_novo < tempo_antigo
@@ -0,0 +1,100 @@
+"""
+Benchmark da rematrícula em massa (transição de ano letivo).
+
+Compara o caminho antigo (um INSERT por aluno) com o motor em lotes
+(QueriesTransicao.criar_matriculas_em_lote) para 12.000 matrículas.
+O banco é simulado por um cursor que conta round trips; o tempo total
+estimado soma o custo medido em Python a uma latência fixa por round trip.
+
+Uso:
+    pytest tests/performance/test_benchmark_transicao.py -m slow -s
+"""
+
+import time
+
+import pytest
+
+from db.queries_transicao import QueriesTransicao, QUERY_CRIAR_MATRICULA
+
+TOTAL_MATRICULAS = 12_000
+TOTAL_TURMAS = 120
+LATENCIA_ROUND_TRIP = 0.0005  # 0,5 ms por ida e volta ao MySQL na rede local
+
+
+class CursorContador:
+    """Cursor falso que apenas conta round trips e linhas enviadas."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.linhas = 0
+
+    def execute(self, query, params=None):
+        self.round_trips += 1
+        self.linhas += 1
+
+    def executemany(self, query, seq_params):
+        self.round_trips += 1
+        self.linhas += len(seq_params)
+
+
+def _dados_sinteticos():
+    mapa_turmas = {}
+    for turma_id in range(1, TOTAL_TURMAS + 1):
+        serie_id = (turma_id - 1) % 9 + 1
+        mapa_turmas[turma_id] = {
+            'turma_id': turma_id, 'turma_nome': 'A', 'serie_id': serie_id,
+            'turno': 'MAT', 'ano_letivo_id': 1,
+        }
+        mapa_turmas[turma_id + 1000] = {
+            'turma_id': turma_id + 1000, 'turma_nome': 'A', 'serie_id': serie_id,
+            'turno': 'MAT', 'ano_letivo_id': 2,
+        }
+    alunos = [
+        {'aluno_id': i, 'turma_id': i % TOTAL_TURMAS + 1, 'reprovado': i % 17 == 0}
+        for i in range(TOTAL_MATRICULAS)
+    ]
+    return mapa_turmas, alunos
+
+
+def _linha_a_linha(cursor, alunos, mapa_progressao):
+    for aluno in alunos:
+        turma = aluno['turma_id'] if aluno['reprovado'] else mapa_progressao[aluno['turma_id']]
+        cursor.execute(QUERY_CRIAR_MATRICULA, (aluno['aluno_id'], turma, 2))
+
+
+def _em_lote(cursor, alunos, mapa_progressao):
+    pares = [
+        (a['aluno_id'], a['turma_id'] if a['reprovado'] else mapa_progressao[a['turma_id']])
+        for a in alunos
+    ]
+    return QueriesTransicao.criar_matriculas_em_lote(cursor, pares, 2)
+
+
+@pytest.mark.slow
+def test_benchmark_rematricula_em_lote():
+    mapa_turmas, alunos = _dados_sinteticos()
+
+    inicio = time.perf_counter()
+    mapa_progressao = QueriesTransicao.get_mapa_progressao(60, 2, mapa_turmas=mapa_turmas)
+    tempo_progressao = time.perf_counter() - inicio
+
+    cursor_antigo = CursorContador()
+    inicio = time.perf_counter()
+    _linha_a_linha(cursor_antigo, alunos, mapa_progressao)
+    tempo_antigo = time.perf_counter() - inicio + cursor_antigo.round_trips * LATENCIA_ROUND_TRIP
+
+    cursor_lote = CursorContador()
+    inicio = time.perf_counter()
+    criadas = _em_lote(cursor_lote, alunos, mapa_progressao)
+    tempo_lote = time.perf_counter() - inicio + cursor_lote.round_trips * LATENCIA_ROUND_TRIP
+
+    print(
+        f"\n{TOTAL_MATRICULAS} matrículas | progressão: {tempo_progressao * 1000:.1f} ms"
+        f"\n  linha a linha: {cursor_antigo.round_trips} round trips, ~{tempo_antigo:.2f} s"
+        f"\n  em lote:       {cursor_lote.round_trips} round trips, ~{tempo_lote:.2f} s"
+    )
+
+    assert criadas == TOTAL_MATRICULAS
+    assert cursor_lote.linhas == cursor_antigo.linhas
+    assert cursor_lote.round_trips <= TOTAL_MATRICULAS // 1000 + 1
+    assert tempo_lote < tempo_antigo
@@ -0,0 +1,107 @@
+"""
+Testes da geração de boletins em lote (src.relatorios.boletim)
+Verifica que a turma inteira sai de uma conexão com duas consultas e um único PDF
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+PyPDF2 = pytest.importorskip("PyPDF2")
+boletim = pytest.importorskip("src.relatorios.boletim")
+
+BIMESTRES = ['1º bimestre', '2º bimestre', '3º bimestre', '4º bimestre']
+DISCIPLINAS = [(1, 'LÍNGUA PORTUGUESA'), (2, 'MATEMÁTICA')]
+
+
+def _linhas_aluno(aluno_id, nome, serie_id=3, serie='3º Ano'):
+    return [
+        ('ESCOLA MUNICIPAL', nome, serie, 'A', 'MAT', 2025, disc_nome, 70 + aluno_id % 20,
+         bim, 1, 200, serie_id, disc_id, aluno_id)
+        for disc_id, disc_nome in DISCIPLINAS
+        for bim in BIMESTRES
+    ]
+
+
+def _conexao(linhas, complementos):
+    cursor = MagicMock()
+    cursor.fetchall.side_effect = [linhas, complementos]
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    contexto = MagicMock()
+    contexto.__enter__.return_value = conn
+    return contexto, cursor
+
+
+class TestConsultarDadosBoletins:
+
+    @patch('src.relatorios.boletim.get_connection')
+    def test_turma_em_uma_conexao_e_duas_consultas(self, mock_get_connection):
+        linhas = [l for i in range(35) for l in _linhas_aluno(i + 1, f'ALUNO {i + 1:02d}')]
+        contexto, cursor = _conexao(linhas, [('recuperacoes', 5, 2, 65), ('notas_finais', 7, 1, 80)])
+        mock_get_connection.return_value = contexto
+
+        dados = boletim.consultar_dados_boletins(10, turma_id=4)
+
+        assert mock_get_connection.call_count == 1
+        assert cursor.execute.call_count == 2
+        sql, params = cursor.execute.call_args_list[0][0]
+        assert 'matriculas.turma_id = %s' in sql
+        assert params[:3] == (4, 10, 10)
+        assert len(dados) == 35
+        aluno_id, linhas_aluno, complementos = dados[4]
+        assert aluno_id == 5
+        assert len(linhas_aluno) == 8
+        assert complementos['recuperacoes'] == {2: 65}
+        assert dados[6][2]['notas_finais'] == {1: 80.0}
+
+    def test_exige_turma_ou_serie(self):
+        with pytest.raises(ValueError):
+            boletim.consultar_dados_boletins(10)
+
+    @patch('src.relatorios.boletim.get_connection')
+    def test_serie_filtra_por_escola(self, mock_get_connection):
+        contexto, cursor = _conexao([], [])
+        mock_get_connection.return_value = contexto
+
+        assert boletim.consultar_dados_boletins(10, serie_id=8, escola_id=60) == []
+        sql, params = cursor.execute.call_args_list[0][0]
+        assert 'turmas.serie_id = %s AND turmas.escola_id = %s' in sql
+        assert params[:2] == (8, 60)
+
+
+class TestGerarBoletinsLote:
+
+    @patch('src.relatorios.boletim.consultar_dados_boletins')
+    def test_um_pdf_para_a_turma(self, mock_consultar):
+        mock_consultar.return_value = [
+            (1, _linhas_aluno(1, 'ANA'), {}),
+            (2, _linhas_aluno(2, 'BRUNO', serie_id=9, serie='7º Ano'), {'recuperacoes': {1: 60}}),
+        ]
+
+        buffer = boletim.boletins_turma(4, 10, abrir=False)
+
+        assert buffer is not None
+        # Duas páginas por aluno (capa e rendimento)
+        assert len(PyPDF2.PdfReader(buffer).pages) == 4
+
+    @patch('src.relatorios.boletim.consultar_dados_boletins', return_value=[])
+    def test_sem_alunos_retorna_none(self, _mock):
+        assert boletim.boletins_serie(3, 10, abrir=False) is None
+
+
+class TestBoletimIndividual:
+
+    @patch('src.relatorios.boletim._salvar_boletim')
+    @patch('src.relatorios.boletim.consultar_complementos', return_value={1: {'notas_finais': {2: 75.0}}})
+    @patch('src.relatorios.boletim.consultar_dados_aluno')
+    def test_reaproveita_montagem_do_lote(self, mock_dados, mock_complementos, mock_salvar):
+        mock_dados.return_value = _linhas_aluno(1, 'ANA')
+
+        boletim.boletiminiciais(1, 10)
+
+        mock_complementos.assert_called_once_with([1], 10)
+        elements, info, aluno_id = mock_salvar.call_args[0]
+        assert info['nome_aluno'] == 'ANA'
+        assert aluno_id == 1
+        assert elements
@@ -110,6 +110,26 @@ def test_cache_pattern_invalidation():
     assert cache.get('funcao2:arg1') == 'valor3'
 
 
+def test_cache_ttl_por_entrada():
+    """TTL passado a set()/cached() vale para a entrada, não o da instância."""
+    cache = CacheManager(ttl_seconds=1)
+
+    cache.set('longa', 'valor', ttl=60)
+    cache.set('curta', 'valor')
+
+    @cache.cached(ttl=60)
+    def funcao(x):
+        return x * 2
+
+    assert funcao(2) == 4
+    time.sleep(1.1)
+
+    assert cache.get('longa') == 'valor'
+    assert cache.get('funcao:2:') == 4
+    assert cache.cleanup_expired() == 1
+    assert cache.get('curta', None) is None
+
+
 def test_cache_cleanup():
     """Testa limpeza de entradas expiradas."""
     cache = CacheManager(ttl_seconds=1)
@@ -0,0 +1,165 @@
+"""
+Testes do cache segmentado (src.utils.cache_segmentado).
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import cache_segmentado
+from src.utils.cache import CacheManager, _CACHE_MISS, criar_cache
+from src.utils.cache_segmentado import CacheSegmentado, tamanho_aproximado
+
+
+class TestOperacoes:
+
+    def test_set_get_e_none_cacheado(self):
+        cache = CacheSegmentado(ttl_seconds=5)
+
+        cache.set('a:1', 'valor')
+        cache.set('a:2', None)
+
+        assert cache.get('a:1') == 'valor'
+        assert cache.get('a:2') is None
+        assert cache.get('a:3') is _CACHE_MISS
+        assert cache.get('a:3', 'padrao') == 'padrao'
+
+    def test_expira_pelo_relogio_monotonico(self):
+        cache = CacheSegmentado(ttl_seconds=10)
+        with patch.object(cache_segmentado.time, 'monotonic', return_value=100.0):
+            cache.set('k', 1)
+            cache.set('curta', 2, ttl=1)
+        with patch.object(cache_segmentado.time, 'monotonic', return_value=105.0):
+            assert cache.get('k') == 1
+            assert cache.get('curta') is _CACHE_MISS
+        with patch.object(cache_segmentado.time, 'monotonic', return_value=111.0):
+            assert cache.cleanup_expired() == 1
+            assert cache.get_stats()['size'] == 0
+
+    def test_invalidacoes(self):
+        cache = CacheSegmentado()
+        for i in range(20):
+            cache.set(f'notas:{i}', i)
+            cache.set(f'obter_estatisticas:{i}', i)
+
+        cache.invalidate('notas:0')
+        assert cache.invalidate_pattern('notas:*') == 19
+        assert cache.get_stats()['size'] == 20
+        cache.invalidate()
+        assert cache.get_stats()['size'] == 0
+
+    def test_decorator_usa_ttl_e_invalidate_cache(self):
+        cache = CacheSegmentado()
+        chamadas = []
+
+        @cache.cached(ttl=60)
+        def dobro(x):
+            chamadas.append(x)
+            return x * 2
+
+        assert dobro(2) == 4
+        assert dobro(2) == 4
+        assert chamadas == [2]
+        dobro.invalidate_cache()
+        assert dobro(2) == 4
+        assert chamadas == [2, 2]
+
+
+class TestLimites:
+
+    def test_lru_por_contagem(self):
+        cache = CacheSegmentado(max_size=4)  # um único segmento
+        for i in range(4):
+            cache.set(f'k{i}', i)
+        cache.get('k0')
+        cache.set('k4', 4)
+
+        assert cache.get('k1') is _CACHE_MISS
+        assert cache.get('k0') == 0
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_limite_de_bytes_descarta_menos_usadas(self):
+        cache = CacheSegmentado(max_size=0, max_bytes=30_000)
+        for i in range(10):
+            cache.set(f'blob:{i}', b'x' * 5_000)
+
+        stats = cache.get_stats()
+        assert stats['bytes'] <= 30_000
+        assert stats['evictions'] >= 4
+        assert cache.get('blob:9') is not _CACHE_MISS
+
+    def test_valor_maior_que_o_limite_nao_e_armazenado(self):
+        cache = CacheSegmentado(max_bytes=1_000)
+        cache.set('grande', b'x' * 5_000)
+
+        assert cache.get('grande') is _CACHE_MISS
+        assert cache.get_stats()['rejected'] == 1
+
+    def test_tamanho_de_dataframe(self):
+        pd = pytest.importorskip('pandas')
+        df = pd.DataFrame({'nome': ['aluno'] * 1000, 'nota': [7.5] * 1000})
+
+        assert tamanho_aproximado(df) == int(df.memory_usage(deep=True).sum())
+
+    def test_tamanho_de_lista_de_dicts(self):
+        linhas = [{'id': i, 'nome': f'aluno {i}'} for i in range(1000)]
+
+        estimado = tamanho_aproximado(linhas)
+
+        assert estimado > 1000 * 200
+
+
+class TestEstatisticas:
+
+    def test_contadores_por_namespace(self):
+        cache = CacheSegmentado()
+        cache.set('notas:2025', 1)
+        cache.get('notas:2025')
+        cache.get('notas:2024')
+        cache.get('sem_namespace')
+
+        stats = cache.get_stats()
+        assert stats['namespaces']['notas']['hits'] == 1
+        assert stats['namespaces']['notas']['misses'] == 1
+        assert stats['namespaces']['-']['misses'] == 1
+        assert stats['hit_rate'] == round(1 / 3 * 100, 2)
+
+        cache.clear_stats()
+        assert cache.get_stats()['total_requests'] == 0
+
+    def test_acesso_concorrente(self):
+        cache = CacheSegmentado(max_size=512)
+
+        def trabalhar(n):
+            for i in range(500):
+                cache.set(f't{n}:{i % 50}', i)
+                cache.get(f't{n}:{(i * 7) % 50}')
+
+        threads = [threading.Thread(target=trabalhar, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = cache.get_stats()
+        assert stats['sets'] == 4000
+        assert stats['total_requests'] == 4000
+        assert stats['size'] <= 512
+
+
+class TestCriarCache:
+
+    def test_padrao_e_cache_manager(self, monkeypatch):
+        monkeypatch.delenv('CACHE_BACKEND', raising=False)
+
+        assert isinstance(criar_cache(ttl_seconds=1), CacheManager)
+
+    def test_backend_segmentado(self, monkeypatch):
+        monkeypatch.setenv('CACHE_BACKEND', 'segmentado')
+        monkeypatch.setenv('CACHE_MAX_MB', '2')
+
+        cache = criar_cache(ttl_seconds=1, max_size=256)
+
+        assert isinstance(cache, CacheSegmentado)
+        assert cache.get_stats()['max_bytes'] == 2 * 1024 * 1024
@@ -0,0 +1,74 @@
+"""
+Testes da geração em lote de folhas de ponto (src.relatorios.geradores.folha_ponto).
+"""
+
+import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+PyPDF2 = pytest.importorskip('PyPDF2')
+pytest.importorskip('reportlab')
+
+from src.relatorios.geradores import folha_ponto  # noqa: E402
+
+
+def _funcionarios(n):
+    return [
+        {'id': i, 'nome': f'Funcionário {i:02d}', 'matricula': None, 'cargo': 'Professor',
+         'data_admissao': datetime.date(2020, 2, 1), 'carga_horaria': None, 'telefone': None,
+         'email': None, 'escola_id': 60 if i % 3 else 61, 'escola_nome': 'Escola'}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def banco():
+    conn = MagicMock()
+    cursor = conn.cursor.return_value
+    cursor.fetchall.return_value = _funcionarios(9)
+    with patch.object(folha_ponto, 'conectar_bd', return_value=conn):
+        yield cursor
+
+
+def test_todas_as_escolas_em_uma_consulta(banco, tmp_path):
+    tempos = {}
+    with patch.object(folha_ponto.FolhaPontoGenerator, '_montar_modelo_tabela',
+                      autospec=True, side_effect=folha_ponto.FolhaPontoGenerator._montar_modelo_tabela) as montar:
+        gerados = folha_ponto.gerar_folhas_todas_escolas(3, 2026, output_dir=str(tmp_path), tempos=tempos)
+
+    assert banco.execute.call_count == 1
+    assert 'f.escola_id IN' not in banco.execute.call_args.args[0]
+    assert set(gerados) == {60, 61}
+    # capa + uma página por funcionário + folha em branco
+    assert len(PyPDF2.PdfReader(gerados[60]).pages) == 6 + 2
+    assert len(PyPDF2.PdfReader(gerados[61]).pages) == 3 + 2
+    # grade do mês montada uma vez e clonada para as 9 folhas e a folha em branco
+    assert montar.call_count == 1
+    assert set(tempos) == {'consulta', 'capa', 'modelo_branco', 'folhas', 'mesclagem'}
+
+
+def test_uma_escola_filtra_na_consulta(banco, tmp_path):
+    saida = tmp_path / 'folhas.pdf'
+
+    assert folha_ponto.gerar_folhas_para_escola(60, 3, 2026, output_path=str(saida)) == str(saida)
+    sql, params = banco.execute.call_args.args
+    assert 'f.escola_id IN (%s)' in sql
+    assert params == (2026, 2026, 3, 60)
+
+
+def test_tabela_clonada_e_independente():
+    gerador = folha_ponto.FolhaPontoGenerator()
+
+    a = gerador._criar_tabela_ponto(2, 2024)
+    b = gerador._criar_tabela_ponto(2, 2024)
+
+    assert a is not b
+    assert len(a._cellvalues) == len(b._cellvalues) == 1 + 29
+
+
+def test_lista_vazia_de_escolas_nao_abre_conexao():
+    with patch.object(folha_ponto, 'conectar_bd') as conectar:
+        assert folha_ponto.FolhaPontoGenerator()._buscar_funcionarios_escolas([], 3, 2026) == {}
+
+    conectar.assert_not_called()
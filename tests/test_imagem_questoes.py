@@ -0,0 +1,108 @@
+"""
+Testes do cache de miniaturas das questões (banco_questoes.imagem_service).
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from banco_questoes import imagem_service  # noqa: E402
+from banco_questoes.imagem_service import (  # noqa: E402
+    TAMANHO_ALTERNATIVA, TAMANHO_ENUNCIADO, ImagemQuestaoService, extrair_drive_id,
+)
+
+
+@pytest.fixture
+def original(tmp_path):
+    caminho = tmp_path / 'uploads' / 'q1.png'
+    caminho.parent.mkdir()
+    Image.new('RGB', (1200, 600), 'red').save(caminho)
+    return caminho
+
+
+@pytest.fixture
+def servico(tmp_path):
+    return ImagemQuestaoService(diretorio=tmp_path / 'cache', max_memoria=2)
+
+
+def test_miniatura_gerada_uma_vez_e_reaproveitada(servico, original):
+    arquivo = {'caminho_relativo': str(original)}
+    assert servico.obter_em_cache(arquivo, TAMANHO_ENUNCIADO) is None
+
+    img = servico.carregar(arquivo, TAMANHO_ENUNCIADO)
+    assert img.size == (300, 150)
+
+    # Outra instância (novo processo) encontra a miniatura no disco
+    outro = ImagemQuestaoService(diretorio=servico.diretorio)
+    with patch.object(outro, '_gerar_miniaturas') as gerar:
+        assert outro.carregar(arquivo, TAMANHO_ENUNCIADO).size == (300, 150)
+    gerar.assert_not_called()
+
+
+def test_obter_em_cache_nao_le_o_original(servico, original):
+    arquivo = {'caminho_relativo': str(original)}
+    servico.carregar(arquivo, TAMANHO_ENUNCIADO)
+
+    # Outra instância: miniatura no disco, mas hash do original ainda não calculado
+    outro = ImagemQuestaoService(diretorio=servico.diretorio)
+    with patch.object(imagem_service.hashlib, 'sha1') as sha1:
+        assert outro.obter_em_cache(arquivo, TAMANHO_ENUNCIADO) is None
+        assert servico.obter_em_cache(arquivo, TAMANHO_ENUNCIADO) is not None
+    sha1.assert_not_called()
+
+    assert outro.carregar(arquivo, TAMANHO_ENUNCIADO) is not None
+    assert outro.obter_em_cache(arquivo, TAMANHO_ENUNCIADO) is not None
+
+
+def test_conteudo_diferente_gera_outra_miniatura(servico, original):
+    arquivo = {'caminho_relativo': str(original)}
+    servico.carregar(arquivo, TAMANHO_ALTERNATIVA)
+
+    Image.new('RGB', (80, 200), 'blue').save(original)
+
+    assert servico.carregar(arquivo, TAMANHO_ALTERNATIVA).size == (32, 80)
+    assert len(list(servico.diretorio.glob('*/*.png'))) == 2
+
+
+def test_lru_em_memoria_limitado(servico, original):
+    arquivo = {'caminho_relativo': str(original)}
+    for tamanho in (80, 250, 300):
+        servico.carregar(arquivo, tamanho)
+
+    assert [t for _, t in servico._memoria] == [250, 300]
+
+
+def test_original_ausente_baixado_do_drive_uma_vez(servico, tmp_path):
+    conteudo = tmp_path / 'drive.png'
+    Image.new('RGB', (40, 40)).save(conteudo)
+    arquivo = {'caminho_relativo': None, 'link_no_drive': 'https://drive.google.com/file/d/ABC123/view'}
+
+    with patch.object(ImagemQuestaoService, '_baixar_drive', return_value=conteudo.read_bytes()) as baixar:
+        assert servico.carregar(arquivo, TAMANHO_ENUNCIADO).size == (40, 40)
+        assert servico.carregar(arquivo, TAMANHO_ALTERNATIVA).size == (40, 40)
+
+    baixar.assert_called_once_with('ABC123')
+    assert extrair_drive_id(arquivo) == 'ABC123'
+
+
+def test_pre_carregar_uma_consulta_para_a_pagina(servico, original):
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [
+        {'questao_id': 1, 'alternativa_id': None, 'posicao': 'abaixo', 'caminho_relativo': str(original)},
+        {'questao_id': 1, 'alternativa_id': 7, 'alternativa_letra': 'A', 'caminho_relativo': str(original)},
+    ]
+    contexto = MagicMock()
+    contexto.__enter__.return_value = cursor
+
+    with patch.object(imagem_service, 'get_cursor', return_value=contexto):
+        assert servico.pre_carregar([1, 2]) == 2
+        assert len(servico.arquivos_questao(1)) == 2
+        assert servico.arquivos_questao(2) == []
+
+    assert cursor.execute.call_count == 1
+    assert cursor.execute.call_args.args[1] == (1, 2)
+    arquivo = {'caminho_relativo': str(original)}
+    assert servico.obter_em_cache(arquivo, TAMANHO_ENUNCIADO) is not None
+    assert servico.obter_em_cache(arquivo, TAMANHO_ALTERNATIVA) is not None
@@ -0,0 +1,127 @@
+"""
+Testes da execução concorrente de consultas (db.lote_consultas)
+Cursores falsos: cada get_cursor() simula uma conexão própria do pool
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from db import lote_consultas
+from db.lote_consultas import LoteConsultas, resolver_ano_letivo
+
+
+class _CursorFalso:
+    """Responde ``SELECT <n>`` com ``[{'n': n}]`` depois de dormir ``n`` centésimos."""
+
+    def __init__(self, abertos):
+        self._abertos = abertos
+        self._valor = None
+
+    def execute(self, sql, params=()):
+        if 'FALHA' in sql:
+            raise RuntimeError('tabela inexistente')
+        self._valor = int(sql.split()[1])
+        time.sleep(self._valor / 100)
+
+    def fetchall(self):
+        return [{'n': self._valor}]
+
+    def fetchone(self):
+        return {'n': self._valor}
+
+
+@pytest.fixture
+def conexoes():
+    estado = {'abertas': 0, 'pico': 0}
+    trava = threading.Lock()
+
+    @contextmanager
+    def _get_cursor(commit=False):
+        with trava:
+            estado['abertas'] += 1
+            estado['pico'] = max(estado['pico'], estado['abertas'])
+        try:
+            yield _CursorFalso(estado)
+        finally:
+            with trava:
+                estado['abertas'] -= 1
+
+    with patch.object(lote_consultas, 'get_cursor', _get_cursor):
+        yield estado
+
+
+class TestLoteConsultas:
+
+    def test_executa_em_paralelo_e_mede_tempos(self, conexoes):
+        lote = LoteConsultas(max_paralelas=4)
+        for n in (20, 20, 20, 20):
+            lote.adicionar(f'q{len(lote)}', f'SELECT {n}')
+
+        resultados = lote.executar()
+
+        assert resultados == {f'q{i}': [{'n': 20}] for i in range(4)}
+        assert conexoes['pico'] == 4
+        assert all(lote.tempos[f'q{i}'] >= 190 for i in range(4))
+        # Latência do lote ~ consulta mais lenta, não a soma (800 ms)
+        assert lote.tempos['total'] < 600
+
+    def test_respeita_limite_de_conexoes(self, conexoes):
+        lote = LoteConsultas(max_paralelas=2)
+        for i in range(5):
+            lote.adicionar(f'q{i}', 'SELECT 1')
+
+        lote.executar()
+
+        assert conexoes['pico'] <= 2
+
+    def test_um_retorna_fetchone(self, conexoes):
+        resultados = LoteConsultas().adicionar('total', 'SELECT 3', um=True).executar()
+
+        assert resultados == {'total': {'n': 3}}
+
+    def test_erro_propagado_apos_todas_terminarem(self, conexoes):
+        lote = LoteConsultas()
+        lote.adicionar('ok', 'SELECT 5')
+        lote.adicionar('ruim', 'SELECT FALHA')
+
+        with pytest.raises(RuntimeError):
+            lote.executar()
+        assert 'ok' in lote.tempos and 'total' in lote.tempos
+        assert conexoes['abertas'] == 0
+
+    def test_nome_duplicado(self):
+        lote = LoteConsultas().adicionar('a', 'SELECT 1')
+        with pytest.raises(ValueError):
+            lote.adicionar('a', 'SELECT 2')
+
+    def test_lote_vazio(self):
+        assert LoteConsultas().executar() == {}
+
+
+class TestResolverAnoLetivo:
+
+    def test_ano_vigente_em_uma_consulta(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = {'id': 7, 'ano_letivo': 2025}
+
+        assert resolver_ano_letivo(None, cursor) == (2025, 7)
+        assert cursor.execute.call_count == 1
+
+    def test_ano_informado(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = {'id': 3}
+
+        assert resolver_ano_letivo('2023', cursor) == ('2023', 3)
+        cursor.execute.assert_called_once_with(
+            "SELECT id FROM AnosLetivos WHERE ano_letivo = %s LIMIT 1", ('2023',)
+        )
+
+    def test_ano_inexistente(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+
+        assert resolver_ano_letivo('1999', cursor) == ('1999', None)
@@ -0,0 +1,86 @@
+"""
+Testes do índice de mapeamentos GEDUC (src.exportadores.mapeamento_geduc).
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# src.exportadores importa o exportador Selenium no __init__
+pytest.importorskip('selenium')
+
+from src.exportadores.mapeamento_geduc import IndiceMapeamentoGEDUC  # noqa: E402
+
+LINHAS = [
+    {'tipo': 'disciplina', 'id_local': 1, 'id_geduc': 101, 'nome_geduc': 'LÍNGUA PORTUGUESA'},
+    {'tipo': 'disciplina', 'id_local': 2, 'id_geduc': 102, 'nome_geduc': 'MATEMÁTICA'},
+    {'tipo': 'disciplina', 'id_local': 2, 'id_geduc': 999, 'nome_geduc': 'DUPLICADA'},
+    {'tipo': 'escola', 'id_local': 60, 'id_geduc': 5000, 'nome_geduc': 'EM ESCOLA'},
+]
+
+
+def _conexao(linhas=LINHAS):
+    conexao = MagicMock()
+    cursor = conexao.cursor.return_value
+
+    def execute(sql, params=()):
+        cursor.fetchall.return_value = [l for l in linhas if not params or l['tipo'] == params[0]]
+
+    cursor.execute.side_effect = execute
+    return conexao, cursor
+
+
+def test_um_tipo_em_uma_consulta():
+    conexao, cursor = _conexao()
+    indice = IndiceMapeamentoGEDUC()
+
+    assert indice.mapear('disciplina', [1, 2, 3], conexao) == {1: 101, 2: 102}
+    assert indice.id_geduc('disciplina', 1, conexao) == 101
+    assert indice.nome_geduc('disciplina', 2, conexao) == 'MATEMÁTICA'
+    assert indice.id_geduc('disciplina', 3, conexao) is None
+    assert cursor.execute.call_count == 1
+
+
+def test_busca_reversa():
+    conexao, _ = _conexao()
+    indice = IndiceMapeamentoGEDUC()
+
+    assert indice.id_local('escola', 5000, conexao) == 60
+    assert indice.id_local('disciplina', 102, conexao) == 2
+
+
+def test_carga_completa_e_invalidacao():
+    conexao, cursor = _conexao()
+    indice = IndiceMapeamentoGEDUC()
+
+    assert indice.carregar(conexao=conexao) == len(LINHAS)
+    indice.id_geduc('escola', 60, conexao)
+    indice.id_geduc('disciplina', 1, conexao)
+    assert cursor.execute.call_count == 1
+
+    indice.invalidar('escola')
+    indice.id_geduc('escola', 60, conexao)
+    assert cursor.execute.call_count == 2
+
+
+def test_registrar_invalida_o_tipo():
+    conexao, cursor = _conexao()
+    indice = IndiceMapeamentoGEDUC()
+    indice.carregar('serie', conexao)
+
+    indice.registrar('serie', 7, 700, 'Sétimo', '7º ANO', conexao)
+    conexao.commit.assert_called_once()
+
+    with patch.object(indice, 'carregar', wraps=indice.carregar) as carregar:
+        indice.id_geduc('serie', 7, conexao)
+        carregar.assert_called_once_with('serie', conexao)
+
+
+def test_ttl_expirado_recarrega():
+    conexao, cursor = _conexao()
+    indice = IndiceMapeamentoGEDUC(ttl=0)
+
+    indice.id_geduc('escola', 60, conexao)
+    indice.id_geduc('escola', 60, conexao)
+
+    assert cursor.execute.call_count == 2
@@ -0,0 +1,121 @@
+"""
+Testes do pivô em memória das atas de notas (src.relatorios.nota_ata)
+Cursor falso: verifica que uma busca por ano/escola atende todos os bimestres e níveis
+"""
+
+from contextlib import contextmanager
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytest.importorskip("reportlab")
+pytest.importorskip("pandas")
+
+from src.relatorios import nota_ata
+
+
+def _matricula(aluno_id, nome, serie_id, status='Ativo'):
+    return {
+        'ALUNO_ID': aluno_id, 'NOME DO ALUNO': nome, 'SEXO': 'M', 'NASCIMENTO': date(2015, 1, 1),
+        'SERIE_ID': serie_id, 'NOME_SERIE': f'{serie_id}º Ano', 'ID_TURMA': serie_id, 'NOME_TURMA': 'A',
+        'TURNO': 'MAT', 'STATUS': status, 'DATA_MATRICULA': date(2025, 2, 1), 'NOME_PROFESSOR': 'Prof',
+    }
+
+
+MATRICULAS = [
+    _matricula(1, 'Érica Souza', 3),
+    _matricula(2, 'Bruno Lima', 3),
+    _matricula(3, 'Carla Dias', 3, status='Transferido'),
+    _matricula(4, 'Davi Rocha', 9),
+]
+
+NOTAS = [
+    {'ALUNO_ID': 1, 'DISCIPLINA': 'Língua Portuguesa', 'NIVEL_ID': 2, 'BIMESTRE': '1º bimestre', 'NOTA': 70},
+    {'ALUNO_ID': 1, 'DISCIPLINA': 'LINGUA PORTUGUESA', 'NIVEL_ID': 2, 'BIMESTRE': '1º Bimestre', 'NOTA': 85},
+    {'ALUNO_ID': 1, 'DISCIPLINA': 'MATEMÁTICA', 'NIVEL_ID': 2, 'BIMESTRE': '2º bimestre', 'NOTA': 60},
+    {'ALUNO_ID': 2, 'DISCIPLINA': 'MATEMÁTICA', 'NIVEL_ID': 2, 'BIMESTRE': '1º bimestre', 'NOTA': 90},
+    {'ALUNO_ID': 3, 'DISCIPLINA': 'MATEMÁTICA', 'NIVEL_ID': 2, 'BIMESTRE': '1º bimestre', 'NOTA': 50},
+    {'ALUNO_ID': 4, 'DISCIPLINA': 'MATEMÁTICA', 'NIVEL_ID': 3, 'BIMESTRE': '1º bimestre', 'NOTA': 77},
+    {'ALUNO_ID': 4, 'DISCIPLINA': 'MATEMÁTICA', 'NIVEL_ID': 3, 'BIMESTRE': 'recuperação', 'NOTA': 99},
+]
+
+DISCIPLINAS = [
+    {'nome': 'L. PORTUGUESA', 'coluna': 'NOTA_PORTUGUES'},
+    {'nome': 'MATEMÁTICA', 'coluna': 'NOTA_MATEMATICA'},
+]
+
+
+@pytest.fixture
+def cursor():
+    nota_ata.invalidar_cache_notas()
+    cursor = MagicMock()
+    cursor.fetchone.return_value = {'id': 26}
+    cursor.fetchall.side_effect = lambda: list(
+        MATRICULAS if 'Matriculas' in cursor.execute.call_args[0][0] else NOTAS
+    )
+
+    @contextmanager
+    def _get_cursor(*args, **kwargs):
+        yield cursor
+
+    with patch('src.relatorios.nota_ata.get_cursor', _get_cursor):
+        yield cursor
+    nota_ata.invalidar_cache_notas()
+
+
+def _ata(bimestre, nivel='iniciais', **kwargs):
+    return nota_ata.obter_dados_ata(bimestre, nivel, DISCIPLINAS, ano_letivo=2025, escola_id=60, **kwargs)
+
+
+class TestObterDadosAta:
+
+    def test_uma_busca_para_todos_bimestres_e_niveis(self, cursor):
+        for bimestre in ('1º bimestre', '2º bimestre', '3º bimestre', '4º bimestre'):
+            _ata(bimestre, 'iniciais')
+            _ata(bimestre, 'finais')
+
+        # AnosLetivos + matrículas + notas, todos parametrizados
+        assert cursor.execute.call_count == 3
+        assert all(len(c[0]) == 2 for c in cursor.execute.call_args_list)
+        assert cursor.execute.call_args_list[1][0][1] == (26, 60)
+
+    def test_pivo_usa_maior_nota_e_ignora_acentos(self, cursor):
+        df = _ata('1º bimestre')
+
+        assert list(df['NOME DO ALUNO']) == ['Bruno Lima', 'Érica Souza']
+        assert df.loc[1, 'NOTA_PORTUGUES'] == 85
+        assert df.loc[0, 'NOTA_MATEMATICA'] == 90
+        assert df['NOTA_PORTUGUES'].isna()[0]
+        assert list(df.columns) == nota_ata._COLUNAS_MATRICULA + ['NOTA_PORTUGUES', 'NOTA_MATEMATICA']
+
+    def test_bimestre_e_nivel_separados(self, cursor):
+        segundo = _ata('2', 'iniciais')
+        finais = _ata('1º Bimestre', 'finais')
+
+        assert segundo.set_index('NOME DO ALUNO').loc['Érica Souza', 'NOTA_MATEMATICA'] == 60
+        assert list(finais['NOME DO ALUNO']) == ['Davi Rocha']
+        assert finais.loc[0, 'NOTA_MATEMATICA'] == 77
+
+    def test_filtro_de_status(self, cursor):
+        assert 'Carla Dias' not in set(_ata('1º bimestre')['NOME DO ALUNO'])
+
+        df = _ata('1º bimestre', status_matricula=['Ativo', 'Transferido'])
+        assert df.set_index('NOME DO ALUNO').loc['Carla Dias', 'NOTA_MATEMATICA'] == 50
+
+    def test_invalidar_cache_refaz_a_busca(self, cursor):
+        _ata('1º bimestre')
+        nota_ata.invalidar_cache_notas(2025, 60)
+        _ata('1º bimestre')
+
+        assert cursor.execute.call_count == 6
+
+    def test_ano_inexistente_retorna_vazio(self, cursor):
+        cursor.fetchone.return_value = None
+
+        assert _ata('1º bimestre').empty
+        assert cursor.execute.call_count == 1
+
+    def test_nivel_invalido(self, cursor):
+        with pytest.raises(ValueError):
+            _ata('1º bimestre', 'medio')
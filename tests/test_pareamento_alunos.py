@@ -0,0 +1,114 @@
+"""
+Testes do pareamento de alunos GEDUC × local (src.importadores.pareamento_alunos).
+"""
+
+import datetime
+
+from src.importadores import alunos_geduc
+from src.importadores.pareamento_alunos import (
+    LIMIAR_MESMO_ALUNO, IndiceAlunos, ngramas, normalizar_nome, similaridade,
+)
+
+LOCAIS = [
+    {'id': 1, 'nome': 'Alice Vitória Ferreira Sousa', 'data_nascimento': datetime.date(2019, 4, 8),
+     'cpf': '104.851.703-96', 'mae': 'Clemilta Silva Ferreira', 'escola_id': 60},
+    {'id': 2, 'nome': 'João Pedro Silva Costa', 'data_nascimento': datetime.date(2015, 2, 1),
+     'cpf': None, 'mae': 'Maria das Dores Silva', 'escola_id': 60},
+    {'id': 3, 'nome': 'José Pedro Silva Costa', 'data_nascimento': datetime.date(2015, 2, 1),
+     'cpf': None, 'mae': 'Maria das Dores Silva', 'escola_id': 61},
+    {'id': 4, 'nome': 'Kauã Ribeiro Lima', 'data_nascimento': datetime.date(2016, 7, 20),
+     'cpf': '000.000.000-00', 'mae': None, 'escola_id': 61},
+]
+
+
+def test_normalizacao_e_similaridade():
+    assert normalizar_nome('  Kauã   Ribeiro ') == 'KAUA RIBEIRO'
+    assert similaridade(ngramas('SOUSA'), ngramas('SOUSA')) == 1.0
+    assert 0.5 < similaridade(ngramas('ALICE SOUSA'), ngramas('ALICE SOUZA')) < 1.0
+
+
+def test_grafia_diferente_so_como_candidato():
+    indice = IndiceAlunos(LOCAIS)
+    consulta = {'nome': 'ALICE VITORIA FERREIRA SOUZA', 'data_nascimento': '2019-04-08'}
+
+    candidatos = indice.buscar(consulta)
+
+    assert candidatos[0].registro['id'] == 1
+    assert 'nascimento' in candidatos[0].motivos
+    assert not candidatos[0].automatico
+    assert indice.melhor(consulta) is None
+
+
+def test_nome_contido_em_outro_nao_e_o_mesmo_aluno():
+    indice = IndiceAlunos([{'id': 9, 'nome': 'Maria Eduarda Silva Santos',
+                            'data_nascimento': datetime.date(2014, 3, 5)}])
+
+    assert indice.melhor({'nome': 'MARIA EDUARDA SILVA', 'data_nascimento': '2014-03-05'}) is None
+
+
+def test_nome_exato_com_nascimento_e_cpf_diferentes_continua_pareado():
+    indice = IndiceAlunos(LOCAIS)
+
+    par = indice.melhor({'nome': 'ALICE VITÓRIA FERREIRA SOUSA', 'data_nascimento': '2019-05-08',
+                         'cpf': '52998224725'})
+
+    assert par.registro['id'] == 1
+    assert par.pontuacao >= LIMIAR_MESMO_ALUNO
+    assert {'nascimento_diferente', 'cpf_diferente'} <= set(par.motivos)
+
+
+def test_cpf_encontra_mesmo_com_nome_diferente():
+    indice = IndiceAlunos(LOCAIS)
+
+    par = indice.melhor({'nome': 'ALICE V F SOUSA', 'cpf': '10485170396'})
+
+    assert par.registro['id'] == 1
+    assert par.motivos[0] == 'cpf'
+
+
+def test_gemeos_nao_sao_o_mesmo_aluno():
+    indice = IndiceAlunos(LOCAIS)
+    consulta = {'nome': 'JOAO PEDRO SILVA COSTA', 'data_nascimento': '2015-02-01',
+                'mae': 'MARIA DAS DORES SILVA'}
+
+    ranking = indice.buscar(consulta)
+
+    assert [p.registro['id'] for p in ranking[:2]] == [2, 3]
+    assert ranking[1].pontuacao < LIMIAR_MESMO_ALUNO
+
+
+def test_cpf_de_preenchimento_e_ignorado():
+    indice = IndiceAlunos(LOCAIS)
+
+    assert indice.melhor({'nome': 'MARCOS ALVES', 'cpf': '00000000000'}) is None
+
+
+def test_comparacoes_geduc_usam_o_mesmo_indice():
+    indice = IndiceAlunos(LOCAIS)
+    dados = {'turmas': [{'id': 't1', 'nome': '1º Ano', 'alunos': [
+        {'nome': 'ALICE VITORIA FERREIRA SOUZA', 'data_nascimento': '2019-04-08',
+         'cpf': '10485170396', 'raca': 'Parda'},
+        {'nome': 'KAUA RIBEIRO LIMAS', 'data_nascimento': '2016-07-21'},
+    ]}]}
+
+    novos = alunos_geduc.comparar_geduc_local(dados, indice=indice)
+    divergencias = alunos_geduc.comparar_divergencias_geduc_local(dados, indice=indice)
+
+    assert [a['nome_geduc'] for a in novos] == ['KAUA RIBEIRO LIMAS']
+    assert novos[0]['possiveis_locais'][0][0] == 4
+    assert [d['aluno_id'] for d in divergencias] == [1]
+    assert divergencias[0]['campos_diff'].startswith('Nome')
+
+
+def test_nome_exato_com_nascimento_diferente_vai_para_divergencias():
+    indice = IndiceAlunos(LOCAIS)
+    dados = {'turmas': [{'id': 't1', 'nome': '5º Ano', 'alunos': [
+        {'nome': 'JOAO PEDRO SILVA COSTA', 'data_nascimento': '2015-03-01', 'raca': 'Parda'},
+    ]}]}
+
+    novos = alunos_geduc.comparar_geduc_local(dados, indice=indice)
+    divergencias = alunos_geduc.comparar_divergencias_geduc_local(dados, indice=indice)
+
+    assert novos == []
+    assert [d['aluno_id'] for d in divergencias] == [2]
+    assert 'Nascimento' in divergencias[0]['campos_diff']
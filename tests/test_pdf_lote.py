@@ -0,0 +1,116 @@
+"""
+Testes da renderização de PDFs em lote (src.services.utils.pdf_lote)
+Verifica a divisão em blocos, o progresso e a concatenação em fluxo
+"""
+
+from functools import partial
+
+import pytest
+
+PyPDF2 = pytest.importorskip("PyPDF2")
+canvas = pytest.importorskip("reportlab.pdfgen.canvas")
+
+from src.services.utils import pdf_lote
+
+
+def _renderizar_bloco(itens, caminho, prefixo='ITEM'):
+    c = canvas.Canvas(caminho)
+    for item in itens:
+        c.drawString(72, 720, f'{prefixo} {item}')
+        c.showPage()
+    c.save()
+
+
+def _textos(caminho):
+    return [p.extract_text().strip() for p in PyPDF2.PdfReader(caminho).pages]
+
+
+class TestDividirEmBlocos:
+
+    def test_ultimo_bloco_menor(self):
+        assert pdf_lote.dividir_em_blocos(list(range(5)), 2) == [[0, 1], [2, 3], [4]]
+
+    def test_tamanho_invalido(self):
+        with pytest.raises(ValueError):
+            pdf_lote.dividir_em_blocos([1], 0)
+
+
+class TestConcatenarPdfs:
+
+    def test_preserva_ordem_e_conteudo(self, tmp_path):
+        caminhos = []
+        for i in range(3):
+            caminho = str(tmp_path / f'parte{i}.pdf')
+            _renderizar_bloco([f'{i}.{j}' for j in range(2)], caminho)
+            caminhos.append(caminho)
+        saida = str(tmp_path / 'final.pdf')
+
+        assert pdf_lote.concatenar_pdfs(caminhos, saida) == 6
+        assert _textos(saida) == ['ITEM 0.0', 'ITEM 0.1', 'ITEM 1.0', 'ITEM 1.1', 'ITEM 2.0', 'ITEM 2.1']
+        # A estrutura gerada deve ser válida também para o leitor estrito
+        assert len(PyPDF2.PdfReader(saida, strict=True).pages) == 6
+
+
+class TestRenderizarEmBlocos:
+
+    def test_sequencial_com_progresso(self, tmp_path):
+        progresso = []
+        saida = str(tmp_path / 'lote.pdf')
+
+        pdf_lote.renderizar_em_blocos(
+            list(range(7)), _renderizar_bloco, saida,
+            tamanho_bloco=3, max_processos=1,
+            ao_progredir=lambda feitos, total: progresso.append((feitos, total)),
+        )
+
+        assert progresso == [(3, 7), (6, 7), (7, 7)]
+        assert _textos(saida) == [f'ITEM {i}' for i in range(7)]
+
+    def test_paralelo_mantem_ordem(self, tmp_path):
+        progresso = []
+        saida = str(tmp_path / 'lote.pdf')
+
+        pdf_lote.renderizar_em_blocos(
+            list(range(10)), partial(_renderizar_bloco, prefixo='ALUNO'), saida,
+            tamanho_bloco=2, max_processos=3,
+            ao_progredir=lambda feitos, total: progresso.append(feitos),
+        )
+
+        assert progresso[-1] == 10
+        assert _textos(saida) == [f'ALUNO {i}' for i in range(10)]
+
+    def test_bloco_unico_nao_concatena(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(pdf_lote, 'concatenar_pdfs', lambda *a: pytest.fail('não deveria concatenar'))
+        saida = str(tmp_path / 'lote.pdf')
+
+        pdf_lote.renderizar_em_blocos(['a', 'b'], _renderizar_bloco, saida, tamanho_bloco=10)
+
+        assert _textos(saida) == ['ITEM a', 'ITEM b']
+
+    def test_lote_vazio(self, tmp_path):
+        with pytest.raises(ValueError):
+            pdf_lote.renderizar_em_blocos([], _renderizar_bloco, str(tmp_path / 'x.pdf'))
+
+
+class TestDeclaracoesEmBlocos:
+
+    def test_flowables_compartilhados_entre_paginas(self, tmp_path):
+        servicos = pytest.importorskip("src.gestores.servicos_lote_documentos")
+        paginas = [
+            {'titulo': 'DECLARAÇÃO' if i % 2 else 'DECLARAÇÃO DE TRANSFERÊNCIA',
+             'texto': f'Declaro que ALUNO {i} está aprovado.'}
+            for i in range(5)
+        ]
+        saida = str(tmp_path / 'declaracoes.pdf')
+
+        pdf_lote.renderizar_em_blocos(
+            paginas,
+            partial(servicos._renderizar_bloco_declaracoes, data_documento='30 de Dezembro de 2025.'),
+            saida, tamanho_bloco=2, max_processos=1,
+        )
+
+        textos = _textos(saida)
+        assert len(textos) == 5
+        assert 'ALUNO 3' in textos[3]
+        assert 'TRANSFERÊNCIA' in textos[0] and 'TRANSFERÊNCIA' not in textos[1]
+        assert all('GESTOR(A)' in t for t in textos)
@@ -0,0 +1,188 @@
+"""
+Testes do pool elástico de conexões (db.connection.PoolConexoes)
+Usa conexões falsas: nenhum teste depende de um servidor MySQL
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from db import connection
+from db.connection import PoolConexoes, PoolEsgotadoError
+
+
+class _ConexaoFalsa:
+    def __init__(self, numero):
+        self.numero = numero
+        self.fechada = False
+        self.ping_ok = True
+        self.reset_ok = True
+
+    def ping(self, reconnect=False):
+        if not self.ping_ok:
+            raise connection.Error("servidor foi embora")
+
+    def reset_session(self):
+        if not self.reset_ok:
+            raise connection.MySQLInternalError("Unread result found")
+
+    def close(self):
+        self.fechada = True
+
+
+def _pool(**kwargs):
+    criadas = []
+
+    def fabrica():
+        cnx = _ConexaoFalsa(len(criadas) + 1)
+        criadas.append(cnx)
+        return cnx
+
+    kwargs.setdefault('pool_size', 2)
+    kwargs.setdefault('timeout', 0.2)
+    return PoolConexoes('teste', fabrica=fabrica, host='h', database='d', user='u', **kwargs), criadas
+
+
+class TestEmprestimo:
+
+    def test_reaproveita_conexao_devolvida(self):
+        pool, criadas = _pool()
+
+        conn = pool.get_connection()
+        conn.close()
+        conn2 = pool.get_connection()
+
+        assert len(criadas) == 1
+        assert conn2._cnx is criadas[0]
+        assert pool.metricas()['em_uso'] == 1
+
+    def test_with_devolve_ao_pool(self):
+        pool, criadas = _pool()
+
+        with pool.get_connection() as conn:
+            assert conn._cnx is criadas[0]
+            assert pool.metricas()['em_uso'] == 1
+
+        assert pool.metricas()['em_uso'] == 0
+        assert pool.metricas()['ociosas'] == 1
+        assert not criadas[0].fechada
+
+    def test_close_duplo_nao_devolve_duas_vezes(self):
+        pool, _ = _pool()
+        conn = pool.get_connection()
+        conn.close()
+        conn.close()
+
+        assert pool.metricas()['ociosas'] == 1
+        with pytest.raises(Exception):
+            conn.cursor()
+
+    def test_cresce_ate_o_maximo_e_esgota(self):
+        pool, criadas = _pool(pool_size=1, pool_max_size=3, timeout=0.05)
+
+        emprestadas = [pool.get_connection() for _ in range(3)]
+        with pytest.raises(PoolEsgotadoError):
+            pool.get_connection()
+
+        m = pool.metricas()
+        assert len(criadas) == 3
+        assert m['em_uso'] == 3 and m['pico_em_uso'] == 3
+        assert m['esperas'] == 1 and m['esgotamentos'] == 1
+        for conn in emprestadas:
+            conn.close()
+
+    def test_espera_conexao_ser_devolvida(self):
+        pool, criadas = _pool(pool_size=1, pool_max_size=1, timeout=2)
+        conn = pool.get_connection()
+        threading.Timer(0.05, conn.close).start()
+
+        conn2 = pool.get_connection()
+
+        assert conn2._cnx is criadas[0]
+        m = pool.metricas()
+        assert m['esperas'] == 1 and m['esgotamentos'] == 0
+        assert m['latencia_max_ms'] >= 40
+
+    def test_falha_ao_criar_libera_vaga(self):
+        pool = PoolConexoes('teste', pool_size=1, timeout=0.05, fabrica=MagicMock(side_effect=connection.Error('down')))
+
+        for _ in range(2):
+            with pytest.raises(connection.Error):
+                pool.get_connection()
+        assert pool.metricas()['total_conexoes'] == 0
+
+
+class TestValidacaoEDespejo:
+
+    def test_conexao_ociosa_invalida_e_descartada(self):
+        pool, criadas = _pool(validar_apos=0)
+        pool.get_connection().close()
+        criadas[0].ping_ok = False
+
+        conn = pool.get_connection()
+
+        assert conn._cnx is criadas[1]
+        assert criadas[0].fechada
+        assert pool.metricas()['descartadas'] == 1
+
+    def test_sessao_que_nao_reseta_nao_volta_ao_pool(self):
+        pool, criadas = _pool()
+        conn = pool.get_connection()
+        criadas[0].reset_ok = False
+
+        conn.close()
+
+        assert criadas[0].fechada
+        m = pool.metricas()
+        assert m['ociosas'] == 0 and m['total_conexoes'] == 0 and m['em_uso'] == 0
+
+    def test_extras_ociosas_sao_fechadas(self):
+        pool, criadas = _pool(pool_size=1, pool_max_size=3, ocioso_max=0.01)
+        emprestadas = [pool.get_connection() for _ in range(3)]
+        emprestadas[0].close()
+        time.sleep(0.02)
+
+        for conn in emprestadas[1:]:
+            conn.close()
+
+        m = pool.metricas()
+        assert criadas[0].fechada
+        assert m['ociosas'] == 2 and m['total_conexoes'] == 2
+
+    def test_fechar_pool(self):
+        pool, criadas = _pool()
+        emprestada = pool.get_connection()
+        pool.get_connection().close()
+
+        assert pool.fechar() == 1
+        emprestada.close()
+
+        assert all(c.fechada for c in criadas)
+        with pytest.raises(connection.PoolError):
+            pool.get_connection()
+
+
+class TestConectarBd:
+
+    def test_pool_esgotado_nao_abre_conexao_direta(self):
+        pool, _ = _pool(pool_size=1, pool_max_size=1, timeout=0.01)
+        pool.get_connection()
+
+        with patch.object(connection, '_connection_pool', pool), \
+                patch.object(connection, '_conectar_direto') as mock_direto:
+            assert connection.conectar_bd() is None
+            mock_direto.assert_not_called()
+
+    def test_obter_info_pool_expoe_metricas(self):
+        pool, _ = _pool()
+        pool.get_connection()
+
+        with patch.object(connection, '_connection_pool', pool):
+            info = connection.obter_info_pool()
+
+        assert info['pool_name'] == 'teste'
+        assert info['pool_size'] == 2 and info['pool_max_size'] == 2
+        assert info['host'] == 'h'
+        assert info['em_uso'] == 1 and info['checkouts'] == 1
@@ -0,0 +1,248 @@
+"""
+Testes para o módulo banco_questoes.services
+Testa correção automática e demais operações em lote do banco de questões
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+services = pytest.importorskip("banco_questoes.services")
+RespostaService = services.RespostaService
+
+
+def _mock_get_cursor(mock_get_cursor):
+    cursor = MagicMock()
+    mock_get_cursor.return_value.__enter__.return_value = cursor
+    return cursor
+
+
+class TestCorrigirAutomaticamente:
+    """Testes para RespostaService.corrigir_automaticamente()"""
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_correcao_sem_laco_por_resposta(self, mock_get_cursor):
+        """Conta e corrige a aplicação inteira sem laço por resposta"""
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchone.return_value = {'total': 120, 'corretas': 85}
+
+        resultado = RespostaService.corrigir_automaticamente(7)
+
+        assert resultado == {'corretas': 85, 'erradas': 35, 'total': 120}
+        assert cursor.execute.call_count == 3
+        update_sql = cursor.execute.call_args_list[-1][0][0]
+        assert 'UPDATE respostas_alunos r' in update_sql
+        assert 'aq.pontuacao' in update_sql
+        mock_get_cursor.assert_called_once_with(commit=True)
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_sem_respostas_pendentes(self, mock_get_cursor):
+        """Não executa UPDATE quando não há respostas pendentes"""
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchone.return_value = {'total': 0, 'corretas': 0}
+
+        resultado = RespostaService.corrigir_automaticamente(7)
+
+        assert resultado == {'corretas': 0, 'erradas': 0, 'total': 0}
+        assert cursor.execute.call_count == 1
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_erro_retorna_contagem_zerada(self, mock_get_cursor):
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.execute.side_effect = Exception("falha")
+
+        assert RespostaService.corrigir_automaticamente(7) == {'corretas': 0, 'erradas': 0, 'total': 0}
+
+
+class TestDesempenhoIncremental:
+    """Testes da agregação incremental de DesempenhoService"""
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_correcao_automatica_aplica_deltas_antes_do_update(self, mock_get_cursor):
+        """Os deltas precisam ser lidos enquanto as respostas ainda estão pendentes"""
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchone.return_value = {'total': 10, 'corretas': 4}
+
+        RespostaService.corrigir_automaticamente(3)
+
+        sqls = [c[0][0] for c in cursor.execute.call_args_list]
+        assert len(sqls) == 3
+        assert 'INSERT INTO desempenho_aluno_habilidade' in sqls[1]
+        assert 'GROUP BY r.aluno_id, q.habilidade_bncc_codigo' in sqls[1]
+        assert 'total_acertos + VALUES(total_acertos)' in sqls[1]
+        assert 'UPDATE respostas_alunos r' in sqls[2]
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_dissertativa_primeira_correcao_soma_questao(self, mock_get_cursor):
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchone.return_value = {
+            'aluno_id': 5, 'correta': None,
+            'habilidade_bncc_codigo': 'EF05MA01', 'ano_letivo_id': 2
+        }
+        cursor.rowcount = 1
+
+        with patch.object(services.DesempenhoService, 'aplicar_delta') as mock_delta:
+            assert RespostaService.corrigir_dissertativa(9, 2.0, 1) is True
+
+        mock_delta.assert_called_once_with(cursor, 5, 'EF05MA01', 2, 1, 1)
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_dissertativa_recorrecao_ajusta_apenas_acertos(self, mock_get_cursor):
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchone.return_value = {
+            'aluno_id': 5, 'correta': 1,
+            'habilidade_bncc_codigo': 'EF05MA01', 'ano_letivo_id': 2
+        }
+        cursor.rowcount = 1
+
+        with patch.object(services.DesempenhoService, 'aplicar_delta') as mock_delta:
+            RespostaService.corrigir_dissertativa(9, 0.0, 1)
+
+        mock_delta.assert_called_once_with(cursor, 5, 'EF05MA01', 2, 0, -1)
+
+    def test_aplicar_delta_insere_com_nivel_inicial(self):
+        cursor = MagicMock()
+
+        services.DesempenhoService.aplicar_delta(cursor, 5, 'EF05MA01', 2, 1, 1)
+
+        params = cursor.execute.call_args[0][1]
+        assert params[:7] == (5, 'EF05MA01', 2, 1, 1, 100.0, 'avancado')
+        assert params[7:] == (1, 1)
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_recalcular_aplicacao_em_uma_passada(self, mock_get_cursor):
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchone.return_value = {'total': 64}
+
+        total = services.DesempenhoService.recalcular_desempenho_aplicacao(3)
+
+        assert total == 64
+        upsert_sql = cursor.execute.call_args_list[0][0][0]
+        assert 'INSERT INTO desempenho_aluno_habilidade' in upsert_sql
+        assert 'SELECT DISTINCT r2.aluno_id' in upsert_sql
+
+
+class TestBuscaQuestoes:
+    """Testes da paginação keyset e do cache de totais de QuestaoService"""
+
+    def setup_method(self):
+        services.QuestaoService.invalidar_contagens()
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_total_por_filtro_cacheado(self, mock_get_cursor):
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchone.return_value = {'total': 42}
+        cursor.fetchall.return_value = []
+        filtros = services.FiltroQuestoes(texto_busca='fração')
+
+        _, total1 = services.QuestaoService.buscar(filtros)
+        _, total2 = services.QuestaoService.buscar(filtros)
+
+        assert total1 == total2 == 42
+        counts = [c for c in cursor.execute.call_args_list if 'COUNT(*)' in c[0][0]]
+        assert len(counts) == 1
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_exclusao_invalida_total(self, mock_get_cursor):
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchone.return_value = {'total': 0}
+        cursor.fetchall.return_value = []
+        cursor.rowcount = 1
+
+        services.QuestaoService.buscar()
+        assert services.QuestaoService.excluir(99) is True
+        services.QuestaoService.buscar()
+
+        counts = [c for c in cursor.execute.call_args_list if 'FROM questoes q' in c[0][0] and 'COUNT(*)' in c[0][0]]
+        assert len(counts) == 2
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_primeira_pagina_keyset(self, mock_get_cursor):
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchall.return_value = [
+            {'id': 30, 'chave_ordenacao': 5},
+            {'id': 20, 'chave_ordenacao': 4},
+            {'id': 10, 'chave_ordenacao': 4},
+        ]
+
+        questoes, total, proximo = services.QuestaoService.buscar_pagina(
+            limite=2, ordenar_por='vezes_aplicada', contar=False
+        )
+
+        assert [q.id for q in questoes] == [30, 20]
+        assert total is None
+        assert proximo == (4, 20)
+        sql, params = cursor.execute.call_args[0]
+        assert 'OFFSET' not in sql
+        assert params[-1] == 3
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_pagina_seguinte_usa_seek(self, mock_get_cursor):
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchall.return_value = [{'id': 10, 'chave_ordenacao': 4}]
+        filtros = services.FiltroQuestoes(autor_id=7)
+
+        questoes, _, proximo = services.QuestaoService.buscar_pagina(
+            filtros, limite=2, apos=(4, 20), ordenar_por='vezes_aplicada',
+            ordem='DESC', contar=False
+        )
+
+        assert proximo is None
+        sql, params = cursor.execute.call_args[0]
+        assert 'q.autor_id = %s AND' in sql
+        assert '(q.vezes_aplicada) < %s' in sql
+        assert 'q.id < %s' in sql
+        assert params == [7, 4, 4, 20, 3]
+
+
+class TestIndiceTextual:
+    """Integração de QuestaoService com o índice textual em memória"""
+
+    def setup_method(self):
+        services.QuestaoService.invalidar_contagens()
+        indice = services.indice_busca.IndiceQuestoes()
+        indice.indexar(1, {'enunciado': 'Calcule a fração equivalente'})
+        indice.indexar(2, {'enunciado': 'Leia o poema e responda'})
+        self.patcher = patch.object(services.indice_busca, '_indice', indice)
+        self.patcher.start()
+        self.indice = indice
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_texto_busca_vira_filtro_por_ids(self):
+        filtros = services.FiltroQuestoes(texto_busca='fracao', autor_id=7)
+
+        where, params = services.QuestaoService._montar_where(filtros)
+
+        assert 'LIKE' not in where
+        assert 'q.id IN (%s)' in where
+        assert params == [1, 7]
+        assert filtros.texto_busca == 'fracao'
+
+    def test_texto_sem_resultado_nao_retorna_linhas(self):
+        where, params = services.QuestaoService._montar_where(
+            services.FiltroQuestoes(texto_busca='geometria')
+        )
+
+        assert where == "WHERE 1 = 0"
+        assert params == []
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_excluir_remove_do_indice(self, mock_get_cursor):
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchone.return_value = {'total': 0}
+        cursor.rowcount = 1
+
+        assert services.QuestaoService.excluir(2) is True
+        assert 2 not in self.indice
+        assert 1 in self.indice
+
+    @patch('banco_questoes.services.get_cursor')
+    def test_buscar_texto_preserva_ranking(self, mock_get_cursor):
+        self.indice.indexar(3, {'enunciado': 'Fração'})
+        cursor = _mock_get_cursor(mock_get_cursor)
+        cursor.fetchall.return_value = [{'id': 1}, {'id': 3}]
+
+        questoes = services.QuestaoService.buscar_texto('fraç')
+
+        assert [q.id for q in questoes] == [3, 1]
@@ -0,0 +1,139 @@
+"""
+Testes para src.services.busca_pessoas_service
+Testa o índice de nomes/CPF da pesquisa principal e a atualização por eventos
+"""
+
+import datetime
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.services import busca_pessoas_service as busca
+from src.services.busca_pessoas_service import IndicePessoas, Pessoa, TIPO_ALUNO, TIPO_FUNCIONARIO
+
+
+def _pessoas():
+    return [
+        Pessoa(1, 'João da Silva Sousa', TIPO_ALUNO, None, datetime.date(2015, 2, 1), '10485170396'),
+        Pessoa(2, 'Joana Souza', TIPO_ALUNO, None, None, ''),
+        Pessoa(7, 'Maria José Silva', TIPO_FUNCIONARIO, 'Professora', None, '22233344455'),
+    ]
+
+
+class TestIndicePessoas:
+
+    def test_prefixos_de_cada_palavra_sem_acento(self):
+        indice = IndicePessoas(_pessoas())
+
+        assert [p.id for p in indice.buscar('jo sil')] == [1, 7]
+        assert [p.id for p in indice.buscar('JOÃO S')] == [1]
+        assert [p.id for p in indice.buscar('JOSÉ')] == [7]
+
+    def test_ordena_por_tipo_e_nome(self):
+        indice = IndicePessoas(_pessoas())
+
+        assert [(p.tipo, p.id) for p in indice.buscar('silva')] == [
+            (TIPO_ALUNO, 1), (TIPO_FUNCIONARIO, 7)
+        ]
+
+    def test_aproximada_quando_nenhum_prefixo_casa(self):
+        indice = IndicePessoas(_pessoas())
+
+        assert [p.id for p in indice.buscar('joao silav')] == [1]
+        assert indice.buscar('pedro') == []
+
+    def test_cpf_por_prefixo_com_ou_sem_pontuacao(self):
+        indice = IndicePessoas(_pessoas())
+
+        assert [p.id for p in indice.buscar('104.851')] == [1]
+        assert [p.id for p in indice.buscar('22233344455')] == [7]
+
+    def test_atualizar_e_remover(self):
+        indice = IndicePessoas(_pessoas())
+
+        indice.atualizar([Pessoa(2, 'Joana Pereira', TIPO_ALUNO, None, None, '')])
+        indice.remover(TIPO_FUNCIONARIO, [7])
+
+        assert indice.buscar('souza') == []
+        assert [p.id for p in indice.buscar('pereira')] == [2]
+        assert [p.id for p in indice.buscar('silva')] == [1]
+        assert len(indice) == 2
+
+    def test_cancelada_devolve_vazio(self):
+        indice = IndicePessoas(_pessoas())
+
+        assert indice.buscar('joao silav', cancelado=lambda: True) == []
+
+    def test_remover_nao_deixa_termos_nem_trigramas_vazios(self):
+        indice = IndicePessoas(_pessoas())
+
+        indice.remover(TIPO_ALUNO, [2])
+        indice.buscar('joana souza')
+        indice.buscar('souz')
+
+        assert 'souza' not in indice._por_termo
+        assert all(indice._por_grama.values())
+
+    def test_alteracoes_concorrentes_com_pesquisa(self):
+        indice = IndicePessoas(_pessoas())
+        parar = threading.Event()
+        erros = []
+
+        def alterar():
+            n = 0
+            while not parar.is_set():
+                n += 1
+                indice.substituir(TIPO_ALUNO, [2], [Pessoa(2, f'Joana Souza{n % 7}', TIPO_ALUNO, None, None, '')])
+                indice.remover(TIPO_ALUNO, [2])
+
+        thread = threading.Thread(target=alterar)
+        thread.start()
+        try:
+            for _ in range(3000):
+                indice.buscar('jo souza')
+                indice.buscar('joana souzq')
+        except Exception as e:  # pragma: no cover - só em caso de corrida
+            erros.append(e)
+        finally:
+            parar.set()
+            thread.join()
+
+        assert erros == []
+        assert [p.id for p in indice.buscar('silva')] == [1, 7]
+
+
+class TestIndiceDoProcesso:
+
+    @pytest.fixture(autouse=True)
+    def limpar_estado(self):
+        busca._indice = None
+        busca._carregado_em = 0.0
+        yield
+        busca._indice = None
+
+    def test_carrega_uma_vez_e_aplica_alteracoes(self):
+        linhas = {
+            TIPO_ALUNO: [Pessoa(1, 'João da Silva', TIPO_ALUNO, None, None, '')],
+            TIPO_FUNCIONARIO: [Pessoa(7, 'Maria José', TIPO_FUNCIONARIO, 'Professora', None, '')],
+        }
+
+        def consultar(tipo, ids=None):
+            return [p for p in linhas[tipo] if ids is None or p.id in ids]
+
+        with patch.object(busca, '_consultar', side_effect=consultar) as consulta:
+            assert [p.id for p in busca.pesquisar('joao')] == [1]
+            assert [p.id for p in busca.pesquisar('maria')] == [7]
+            assert consulta.call_count == 2
+
+            # Aluno renomeado em outro cliente
+            linhas[TIPO_ALUNO] = [Pessoa(1, 'João Pedro', TIPO_ALUNO, None, None, '')]
+            busca._ao_alterar('aluno', {1})
+
+            assert busca.pesquisar('silva') == []
+            assert [p.id for p in busca.pesquisar('pedro')] == [1]
+
+            # Alteração sem id: releitura completa na próxima pesquisa
+            busca._ao_alterar('funcionario', None)
+            busca.pesquisar('maria')
+            assert consulta.call_count == 5
@@ -0,0 +1,111 @@
+"""
+Testes para banco_questoes.catalogo_bncc
+Testa os índices do catálogo e a carga com validação por marcador
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from banco_questoes import catalogo_bncc
+from banco_questoes.catalogo_bncc import CatalogoBNCC, Habilidade, rotulo
+from src.utils.cache import _CACHE_MISS
+
+
+HABILIDADES = [
+    Habilidade('EF07MA02', 'Resolver e elaborar problemas que envolvam porcentagens', 'MA', '07', 'EF'),
+    Habilidade('EF06MA01', 'Comparar, ordenar, ler e escrever números naturais', 'MA', '06', 'EF'),
+    Habilidade('EF67LP01', 'Analisar a estrutura e funcionamento dos hiperlinks em textos noticiosos', 'LP', '67', 'EF'),
+    Habilidade('EF69LP05', 'Inferir e justificar, em textos multissemióticos, o efeito de humor', 'LP', '69', 'EF'),
+    Habilidade('EF07MA10', 'Comparar e ordenar números racionais em diferentes contextos', 'MA', '07', 'EF'),
+]
+
+
+class TestCatalogoBNCC:
+
+    def test_filtra_por_componente_e_ano_bloco(self):
+        catalogo = CatalogoBNCC(HABILIDADES)
+
+        codigos = [h.codigo for h in catalogo.filtrar(componente='ma', anos_bloco=['07', '67', '69'])]
+
+        assert codigos == ['EF07MA02', 'EF07MA10']
+
+    def test_prefixo_do_codigo(self):
+        catalogo = CatalogoBNCC(HABILIDADES)
+
+        assert [h.codigo for h in catalogo.filtrar(prefixo='ef07')] == ['EF07MA02', 'EF07MA10']
+        assert catalogo.filtrar(prefixo='EF08') == []
+
+    def test_trecho_da_descricao_sem_acentos(self):
+        catalogo = CatalogoBNCC(HABILIDADES)
+
+        assert [h.codigo for h in catalogo.filtrar(texto='NUMEROS')] == ['EF06MA01', 'EF07MA10']
+        assert [h.codigo for h in catalogo.filtrar(texto='multissemioticos')] == ['EF69LP05']
+        assert [h.codigo for h in catalogo.filtrar(texto='comparar', limite=1)] == ['EF06MA01']
+
+    def test_sem_limite_de_linhas(self):
+        catalogo = CatalogoBNCC(
+            Habilidade(f'EF05MA{i:03d}', 'Habilidade', 'MA', '05', 'EF') for i in range(800)
+        )
+
+        assert len(catalogo.filtrar(componente='MA')) == 800
+
+    def test_rotulo_trunca_descricao(self):
+        h = Habilidade('EF01LP01', 'x' * 100, 'LP', '01', 'EF')
+
+        assert rotulo(h) == 'EF01LP01 - ' + 'x' * 77 + '...'
+
+
+class TestObterCatalogo:
+
+    @pytest.fixture(autouse=True)
+    def limpar_estado(self):
+        catalogo_bncc._catalogo = None
+        catalogo_bncc._marcador = None
+        catalogo_bncc._validado_em = 0.0
+        yield
+        catalogo_bncc._catalogo = None
+
+    @pytest.fixture
+    def cursor(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = {'total': 2, 'atualizado_em': '2026-01-10 10:00:00'}
+        cursor.fetchall.return_value = [
+            {'codigo': 'EF07MA02', 'descricao': 'Porcentagens', 'componente_codigo': 'MA',
+             'ano_bloco': '07', 'etapa_sigla': 'EF'},
+            {'codigo': 'EF67LP01', 'descricao': None, 'componente_codigo': 'LP',
+             'ano_bloco': '67', 'etapa_sigla': 'EF'},
+        ]
+        contexto = MagicMock()
+        contexto.__enter__.return_value = cursor
+        with patch.object(catalogo_bncc, 'get_cursor', return_value=contexto):
+            yield cursor
+
+    def test_carrega_do_banco_uma_vez(self, cursor):
+        with patch.object(catalogo_bncc, 'cache_disco') as disco:
+            disco.ler.return_value = _CACHE_MISS
+            primeiro = catalogo_bncc.obter_catalogo()
+            segundo = catalogo_bncc.obter_catalogo()
+
+        assert primeiro is segundo
+        assert len(primeiro) == 2
+        assert cursor.execute.call_count == 2  # marcador + tabela
+        disco.gravar.assert_called_once()
+
+    def test_disco_evita_leitura_da_tabela(self, cursor):
+        with patch.object(catalogo_bncc, 'cache_disco') as disco:
+            disco.ler.return_value = [tuple(HABILIDADES[0])]
+            catalogo = catalogo_bncc.obter_catalogo()
+
+        assert catalogo.obter('ef07ma02') == HABILIDADES[0]
+        assert cursor.execute.call_count == 1
+
+    def test_marcador_igual_mantem_catalogo(self, cursor):
+        with patch.object(catalogo_bncc, 'cache_disco') as disco:
+            disco.ler.return_value = _CACHE_MISS
+            primeiro = catalogo_bncc.obter_catalogo()
+            catalogo_bncc.invalidar_catalogo()
+            segundo = catalogo_bncc.obter_catalogo()
+
+        assert primeiro is segundo
+        assert cursor.execute.call_count == 3
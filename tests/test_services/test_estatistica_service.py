@@ -0,0 +1,117 @@
+"""
+Testes para o módulo services.estatistica_service
+Testa a leitura das estatísticas materializadas (estatisticas_matriculas)
+"""
+
+from unittest.mock import MagicMock, patch
+from src.services.estatistica_service import (
+    obter_estatisticas_alunos,
+    obter_estatisticas_por_ano_letivo,
+    reconstruir_estatisticas_matriculas,
+)
+
+
+def _contador(serie_id, serie, turma_id, turma, turno, sexo, status, quantidade):
+    return {
+        'serie_id': serie_id, 'serie': serie, 'turma_id': turma_id, 'turma': turma,
+        'turno': turno, 'sexo': sexo, 'status': status, 'quantidade': quantidade,
+    }
+
+
+CONTADORES = [
+    _contador(2, '2º Ano', 11, 'A', 'MAT', 'F', 'Ativo', 10),
+    _contador(1, '1º Ano', 10, 'B', 'VESP', 'M', 'Ativo', 4),
+    _contador(1, '1º Ano', 9, 'A', 'MAT', 'M', 'Ativo', 7),
+    _contador(1, '1º Ano', 9, 'A', 'MAT', 'F', 'Ativo', 8),
+    _contador(1, '1º Ano', 9, 'A', 'MAT', 'F', 'Transferida', 2),
+    _contador(2, '2º Ano', 11, 'A', 'MAT', 'M', 'Evadido', 1),
+    _contador(2, '2º Ano', 11, 'A', 'MAT', 'M', 'Concluído', 3),
+]
+
+
+class TestObterEstatisticasAlunos:
+    """Testes para obter_estatisticas_alunos()"""
+
+    @patch('src.services.estatistica_service.get_cursor')
+    def test_agrega_contadores(self, mock_get_cursor):
+        """Monta todas as quebras a partir de uma única leitura dos contadores"""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = list(CONTADORES)
+        # 31 matrículas ativas/transferidas de 30 alunos distintos
+        mock_cursor.fetchone.return_value = {'total_cadastrados': 40, 'total_alunos': 30}
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        est = obter_estatisticas_alunos(escola_id=60, ano_letivo='2025')
+
+        assert est['total_alunos'] == 30
+        assert est['alunos_ativos'] == 29
+        assert est['alunos_transferidos'] == 2
+        assert est['alunos_sem_matricula'] == 10
+        assert est['alunos_por_serie'] == [
+            {'serie': '1º Ano', 'quantidade': 21},
+            {'serie': '2º Ano', 'quantidade': 10},
+        ]
+        assert est['alunos_por_serie_turma'] == [
+            {'serie': '1º Ano', 'turma': 'A', 'quantidade': 17},
+            {'serie': '1º Ano', 'turma': 'B', 'quantidade': 4},
+            {'serie': '2º Ano', 'turma': 'A', 'quantidade': 10},
+        ]
+        assert {t['turno']: t['quantidade'] for t in est['alunos_por_turno']} == {'MAT': 25, 'VESP': 4}
+        assert est['alunos_por_sexo'] == {'F': 18, 'M': 11}
+
+        consulta, params = mock_cursor.execute.call_args_list[0].args
+        assert 'estatisticas_matriculas' in consulta
+        assert params == (60, '2025')
+        consulta, params = mock_cursor.execute.call_args_list[1].args
+        assert 'COUNT(DISTINCT m.aluno_id)' in consulta
+        assert params == (60, 60, '2025')
+
+    @patch('src.services.estatistica_service.get_cursor')
+    def test_sem_cache(self, mock_get_cursor):
+        """Cada chamada lê os contadores atuais"""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [[CONTADORES[0]], [CONTADORES[0], CONTADORES[1]]]
+        mock_cursor.fetchone.side_effect = [
+            {'total_cadastrados': 20, 'total_alunos': 10},
+            {'total_cadastrados': 20, 'total_alunos': 14},
+        ]
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        assert obter_estatisticas_alunos(escola_id=60, ano_letivo='2025')['alunos_por_serie'] == [
+            {'serie': '2º Ano', 'quantidade': 10}
+        ]
+        assert obter_estatisticas_alunos(escola_id=60, ano_letivo='2025')['total_alunos'] == 14
+
+
+class TestObterEstatisticasPorAnoLetivo:
+    """Testes para obter_estatisticas_por_ano_letivo()"""
+
+    @patch('src.services.estatistica_service.get_cursor')
+    def test_totais_por_status(self, mock_get_cursor):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = list(CONTADORES)
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        est = obter_estatisticas_por_ano_letivo(5, escola_id=60)
+
+        assert est['total_matriculas'] == 35
+        assert est['matriculas_por_status'] == {'Ativo': 29, 'Transferida': 2, 'Evadido': 1, 'Concluído': 3}
+        assert est['taxa_conclusao'] == 3 / 35 * 100
+        assert mock_cursor.execute.call_args.args[1] == (60, 5)
+
+
+class TestReconstruirEstatisticas:
+    """Testes para reconstruir_estatisticas_matriculas()"""
+
+    @patch('src.services.estatistica_service.get_cursor')
+    def test_reconstroi_uma_escola(self, mock_get_cursor):
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 12
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        assert reconstruir_estatisticas_matriculas(escola_id=60) == 12
+
+        mock_get_cursor.assert_called_once_with(commit=True)
+        delete, insert = mock_cursor.execute.call_args_list
+        assert delete.args == ("DELETE FROM estatisticas_matriculas WHERE escola_id = %s", (60,))
+        assert 'WHERE a.escola_id = %s' in insert.args[0]
@@ -0,0 +1,184 @@
+"""
+Testes para banco_questoes.indice_busca
+Testa normalização, ranqueamento, prefixos e persistência do índice textual
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from banco_questoes import indice_busca
+from banco_questoes.indice_busca import IndiceQuestoes, normalizar_texto, tokenizar
+
+
+def _indice_exemplo():
+    indice = IndiceQuestoes()
+    indice.indexar(1, {
+        'habilidade': 'EF05MA03',
+        'enunciado': 'Identifique a fração equivalente a 1/2.',
+        'alternativas': '2/4 3/4 1/3',
+    })
+    indice.indexar(2, {
+        'habilidade': 'EF05LP01',
+        'enunciado': 'Leia o poema e identifique a função do narrador.',
+        'texto_base': 'Poema sobre frações do dia',
+    })
+    indice.indexar(3, {'enunciado': 'Qual é a capital do Pará?'})
+    return indice
+
+
+class TestTokenizacao:
+
+    def test_remove_acentos_e_caixa(self):
+        assert normalizar_texto('Função FRAÇÃO Pará') == 'funcao fracao para'
+
+    def test_descarta_stopwords(self):
+        assert tokenizar('A função de uma reta') == ['funcao', 'reta']
+
+
+class TestIndiceQuestoes:
+
+    def test_busca_sem_acento_encontra_acentuado(self):
+        indice = _indice_exemplo()
+
+        assert [qid for qid, _ in indice.buscar('fracao ')] == [1]
+
+    def test_campo_mais_pesado_ranqueia_primeiro(self):
+        indice = _indice_exemplo()
+
+        ids = [qid for qid, _ in indice.buscar('fraç')]
+
+        # 'fracao' no enunciado da 1 pesa mais que 'fracoes' no texto base da 2
+        assert ids == [1, 2]
+
+    def test_todos_os_termos_precisam_casar(self):
+        indice = _indice_exemplo()
+
+        assert [qid for qid, _ in indice.buscar('identifique poema')] == [2]
+
+    def test_codigo_bncc(self):
+        indice = _indice_exemplo()
+
+        assert [qid for qid, _ in indice.buscar('ef05ma03')] == [1]
+
+    def test_completar_prefixo(self):
+        indice = _indice_exemplo()
+
+        assert indice.completar('fra') == ['fracao', 'fracoes']
+        assert indice.completar('xyz') == []
+
+    def test_reindexar_e_remover(self):
+        indice = _indice_exemplo()
+
+        indice.indexar(3, {'enunciado': 'Qual é a capital do Amapá?'})
+        assert indice.buscar('para ') == []
+        assert [qid for qid, _ in indice.buscar('amapa')] == [3]
+
+        indice.remover(3)
+        assert len(indice) == 2
+        assert indice.buscar('amapa') == []
+        assert indice.completar('ama') == []
+
+    def test_salvar_e_carregar(self, tmp_path):
+        indice = _indice_exemplo()
+        indice.marcador = (3, '2026-01-01 00:00:00')
+        caminho = tmp_path / 'indice.pkl'
+
+        indice.salvar(caminho)
+        carregado = IndiceQuestoes.carregar(caminho)
+
+        assert carregado.marcador == indice.marcador
+        assert carregado.buscar('fraç') == indice.buscar('fraç')
+        carregado.remover(1)
+        assert [qid for qid, _ in carregado.buscar('fraç')] == [2]
+
+    def test_arquivo_invalido_e_ignorado(self, tmp_path):
+        caminho = tmp_path / 'indice.pkl'
+        caminho.write_bytes(b'lixo')
+
+        assert IndiceQuestoes.carregar(caminho) is None
+        assert IndiceQuestoes.carregar(tmp_path / 'ausente.pkl') is None
+
+
+class TestSalvarSeAlterado:
+
+    @pytest.fixture
+    def instancia(self, tmp_path):
+        indice = _indice_exemplo()
+        indice.marcador = (3, '2026-01-01 00:00:00')
+        contexto = MagicMock()
+        with patch.object(indice_busca, '_indice', indice), \
+                patch.object(indice_busca, '_alterado', True), \
+                patch.object(indice_busca, 'get_cursor', return_value=contexto), \
+                patch.object(indice_busca, 'get_cache_path', return_value=tmp_path / 'indice.pkl'), \
+                patch.object(IndiceQuestoes, 'obter_marcador') as marcador:
+            yield indice, marcador, tmp_path / 'indice.pkl'
+
+    def test_grava_com_o_marcador_da_carga(self, instancia):
+        indice, marcador, caminho = instancia
+        marcador.return_value = (3, '2026-01-01 00:00:00')
+
+        indice_busca.salvar_se_alterado()
+
+        assert IndiceQuestoes.carregar(caminho).marcador == (3, '2026-01-01 00:00:00')
+
+    def test_banco_alterado_por_outros_nao_e_gravado(self, instancia):
+        indice, marcador, caminho = instancia
+        marcador.return_value = (4, '2026-01-02 08:00:00')
+
+        indice_busca.salvar_se_alterado()
+
+        assert not caminho.exists()
+        assert indice.marcador == (3, '2026-01-01 00:00:00')
+
+
+class TestEdicaoIncremental:
+
+    @pytest.fixture
+    def banco(self, tmp_path):
+        indice = _indice_exemplo()
+        indice.marcador = (3, '2026-01-01 00:00:00')
+        estado = {'marcador': indice.marcador}
+
+        def reindexar(self, cursor, questao_id):
+            self.indexar(questao_id, {'enunciado': 'Qual é a capital do Amapá?'})
+
+        with patch.object(indice_busca, '_indice', indice), \
+                patch.object(indice_busca, '_alterado', False), \
+                patch.object(indice_busca, 'get_cursor', return_value=MagicMock()), \
+                patch.object(indice_busca, 'get_cache_path', return_value=tmp_path / 'indice.pkl'), \
+                patch.object(IndiceQuestoes, 'obter_marcador', side_effect=lambda cursor: estado['marcador']), \
+                patch.object(IndiceQuestoes, 'reindexar_do_banco', reindexar):
+            yield indice, estado, tmp_path / 'indice.pkl'
+
+    def test_edicao_gravada_e_carregada_do_disco(self, banco):
+        indice, estado, caminho = banco
+        cursor = MagicMock()
+
+        anterior = indice_busca.marcador_antes_de_alterar(cursor)
+        estado['marcador'] = (3, '2026-01-02 10:00:00')  # UPDATE da questão
+        indice_busca.notificar_questao_salva(cursor, 3, anterior)
+
+        assert indice.marcador == (3, '2026-01-02 10:00:00')
+        indice_busca.salvar_se_alterado()
+        assert caminho.exists()
+
+        indice_busca.descartar_indice()
+        with patch.object(IndiceQuestoes, 'construir') as construir:
+            recarregado = indice_busca.obter_indice()
+
+        construir.assert_not_called()
+        assert [qid for qid, _ in recarregado.buscar('amapa')] == [3]
+
+    def test_indice_ja_defasado_nao_avanca_o_marcador(self, banco):
+        indice, estado, caminho = banco
+        cursor = MagicMock()
+
+        estado['marcador'] = (4, '2026-01-02 08:00:00')  # outro cliente
+        anterior = indice_busca.marcador_antes_de_alterar(cursor)
+        estado['marcador'] = (4, '2026-01-02 10:00:00')
+        indice_busca.notificar_questao_removida(3, cursor, anterior)
+
+        assert indice.marcador == (3, '2026-01-01 00:00:00')
+        indice_busca.salvar_se_alterado()
+        assert not caminho.exists()
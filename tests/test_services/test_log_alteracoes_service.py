@@ -0,0 +1,131 @@
+"""
+Testes para o módulo services.log_alteracoes_service
+Testa o registro no log e a leitura incremental feita pelo monitor
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services import log_alteracoes_service as las
+
+
+class _Log:
+    """Cursor que simula a tabela log_alteracoes."""
+
+    def __init__(self, linhas=()):
+        self.linhas = list(linhas)
+        self.cursor = MagicMock()
+        self.cursor.execute.side_effect = self._execute
+
+    def adicionar(self, entidade, entidade_id):
+        self.linhas.append({'id': len(self.linhas) + 1, 'entidade': entidade, 'entidade_id': entidade_id})
+
+    def _execute(self, sql, params=None):
+        if 'MAX(id)' in sql:
+            self.cursor.fetchone.return_value = {'ultimo': max((l['id'] for l in self.linhas), default=0)}
+        elif sql.startswith('SELECT'):
+            apos, limite = params
+            self.cursor.fetchall.return_value = [l for l in self.linhas if l['id'] > apos][:limite]
+
+
+@pytest.fixture(autouse=True)
+def sem_assinaturas():
+    with patch.object(las, '_assinaturas', []):
+        yield
+
+
+@pytest.fixture
+def log():
+    log = _Log()
+    with patch('src.services.log_alteracoes_service.get_cursor') as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value = log.cursor
+        yield log
+
+
+def test_registrar_usa_cursor_da_transacao():
+    cursor = MagicMock()
+
+    assert las.registrar_alteracao(cursor, 'aluno', 7, 'exclusao') is True
+    assert cursor.execute.call_args.args[1] == ('aluno', 7, 'exclusao')
+
+    cursor.execute.side_effect = RuntimeError("Table 'log_alteracoes' doesn't exist")
+    assert las.registrar_alteracao(cursor, 'aluno', 7) is False
+
+    with pytest.raises(ValueError):
+        las.registrar_alteracao(cursor, 'nota', 1)
+
+
+def test_monitor_le_apenas_linhas_novas(log):
+    log.adicionar('aluno', 1)
+    recebidas = []
+    las.assinar(('aluno', 'matricula'), lambda entidade, ids: recebidas.append((entidade, ids)))
+    monitor = las.MonitorAlteracoes()
+
+    assert monitor.verificar() == 0  # posiciona no fim do log
+    log.adicionar('aluno', 2)
+    log.adicionar('aluno', 3)
+    log.adicionar('funcionario', 9)
+
+    assert monitor.verificar() == 3
+    assert recebidas == [('aluno', {2, 3})]
+    assert monitor.verificar() == 0
+
+
+def test_linha_sem_id_invalida_tudo(log):
+    monitor = las.MonitorAlteracoes()
+    monitor.verificar()
+    recebidas = []
+    las.assinar(('turma',), lambda entidade, ids: recebidas.append(ids))
+
+    log.adicionar('turma', 4)
+    log.adicionar('turma', None)
+    monitor.verificar()
+
+    assert recebidas == [None]
+
+
+def test_id_visivel_fora_de_ordem_nao_se_perde(log):
+    monitor = las.MonitorAlteracoes()
+    monitor.verificar()
+    recebidas = []
+    las.assinar(('matricula',), lambda entidade, ids: recebidas.append(ids))
+
+    log.adicionar('matricula', 10)
+    atrasada = log.linhas.pop()  # transação com id menor ainda não confirmada
+    log.adicionar('matricula', 11)
+    log.linhas[-1]['id'] = 2
+    monitor.verificar()
+    log.linhas.insert(0, atrasada)
+    monitor.verificar()
+
+    assert recebidas == [{11}, {10}]
+
+
+def test_metodo_assinado_some_com_o_objeto(log):
+    class Tela:
+        chamadas = 0
+
+        def limpar(self, entidade, ids):
+            Tela.chamadas += 1
+
+    tela = Tela()
+    las.assinar(('aluno',), tela.limpar)
+    monitor = las.MonitorAlteracoes()
+    monitor.verificar()
+
+    log.adicionar('aluno', 1)
+    monitor.verificar()
+    del tela
+    log.adicionar('aluno', 2)
+    monitor.verificar()
+
+    assert Tela.chamadas == 1
+    assert las._assinaturas == []
+
+
+def test_tabela_ausente_nao_propaga():
+    with patch('src.services.log_alteracoes_service.get_cursor') as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.side_effect = RuntimeError("Table doesn't exist")
+
+        assert las.MonitorAlteracoes().verificar() == 0
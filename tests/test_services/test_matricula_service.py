@@ -0,0 +1,47 @@
+"""
+Testes para o módulo services.matricula_service
+Testa o recálculo do resumo do histórico de matrículas
+"""
+
+from unittest.mock import MagicMock, patch
+from mysql.connector import Error as MySQLError
+from src.services.matricula_service import atualizar_resumo_historico
+
+
+class TestAtualizarResumoHistorico:
+    """Testes para atualizar_resumo_historico()"""
+
+    @patch('src.services.matricula_service.get_cursor')
+    def test_recalcula_matriculas_informadas(self, mock_get_cursor):
+        """Chama a procedure apenas para as matrículas pedidas"""
+        mock_cursor = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        assert atualizar_resumo_historico([10, 11]) == 2
+
+        mock_get_cursor.assert_called_once_with(commit=True)
+        chamadas = [c.args for c in mock_cursor.execute.call_args_list]
+        assert chamadas == [
+            ("CALL atualizar_resumo_historico_matricula(%s)", (10,)),
+            ("CALL atualizar_resumo_historico_matricula(%s)", (11,)),
+        ]
+
+    @patch('src.services.matricula_service.get_cursor')
+    def test_recalcula_todas(self, mock_get_cursor):
+        """Sem ids, remove resumos órfãos e recalcula tudo que tem histórico"""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [{'matricula_id': 1}, {'matricula_id': 2}, {'matricula_id': 3}]
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        assert atualizar_resumo_historico() == 3
+
+        sqls = [c.args[0] for c in mock_cursor.execute.call_args_list]
+        assert 'DELETE r FROM resumo_historico_matricula' in sqls[0]
+        assert sum('CALL atualizar_resumo_historico_matricula' in sql for sql in sqls) == 3
+
+    @patch('src.services.matricula_service.get_cursor')
+    def test_erro_mysql(self, mock_get_cursor):
+        """Erros do banco retornam None"""
+        mock_get_cursor.return_value.__enter__.side_effect = MySQLError("procedure inexistente")
+
+        assert atualizar_resumo_historico([1]) is None
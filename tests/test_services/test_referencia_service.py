@@ -0,0 +1,135 @@
+"""
+Testes para o módulo services.referencia_service
+Testa o cache de duas camadas (memória + disco) validado por versao_tabelas
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services import referencia_service
+from src.utils.cache_disco import CacheDisco
+
+
+SERIES = [
+    {'id': 4, 'nome': '2º Ano', 'nivel_id': 2},
+    {'id': 3, 'nome': '1º Ano', 'nivel_id': 2},
+    {'id': 10, 'nome': '8º Ano', 'nivel_id': 3},
+]
+
+
+def _cursor(versao=1, linhas=SERIES):
+    """Cursor que responde versao_tabelas e SELECT * FROM series."""
+    cursor = MagicMock()
+
+    def execute(sql, params=None):
+        if 'versao_tabelas' in sql:
+            cursor.fetchall.return_value = [
+                {'tabela': t, 'versao': versao, 'atualizado_em': '2026-01-01 00:00:00'}
+                for t in referencia_service.TABELAS_REFERENCIA
+            ]
+        else:
+            cursor.fetchall.return_value = list(linhas)
+
+    cursor.execute.side_effect = execute
+    return cursor
+
+
+def _consultas_tabela(cursor):
+    return [c.args[0] for c in cursor.execute.call_args_list if 'versao_tabelas' not in c.args[0]]
+
+
+@pytest.fixture(autouse=True)
+def estado_limpo(tmp_path):
+    disco = CacheDisco(tmp_path / 'cache.sqlite3')
+    with patch.object(referencia_service, 'cache_disco', disco):
+        referencia_service.invalidar_referencia()
+        yield disco
+    disco.fechar()
+    referencia_service.invalidar_referencia()
+
+
+class TestObterTabela:
+
+    @patch('src.services.referencia_service.get_cursor')
+    def test_le_do_banco_uma_vez(self, mock_get_cursor):
+        cursor = _cursor()
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+
+        assert referencia_service.obter_tabela('series') == SERIES
+        assert referencia_service.obter_tabela('series') == SERIES
+
+        assert _consultas_tabela(cursor) == ["SELECT * FROM series"]
+        # Segunda leitura dentro do intervalo nem abre conexão
+        assert mock_get_cursor.call_count == 1
+
+    @patch('src.services.referencia_service.get_cursor')
+    def test_proximo_processo_le_do_disco(self, mock_get_cursor):
+        cursor = _cursor()
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+        referencia_service.obter_tabela('series')
+
+        # Simula reinício: memória vazia, disco preservado
+        referencia_service.invalidar_referencia()
+        novo_cursor = _cursor()
+        mock_get_cursor.return_value.__enter__.return_value = novo_cursor
+
+        assert referencia_service.obter_tabela('series') == SERIES
+        assert _consultas_tabela(novo_cursor) == []
+
+    @patch('src.services.referencia_service.get_cursor')
+    def test_versao_alterada_recarrega(self, mock_get_cursor):
+        mock_get_cursor.return_value.__enter__.return_value = _cursor(versao=1)
+        referencia_service.obter_tabela('series')
+
+        referencia_service.invalidar_referencia()
+        novas = SERIES + [{'id': 5, 'nome': '3º Ano', 'nivel_id': 2}]
+        cursor = _cursor(versao=2, linhas=novas)
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+
+        assert referencia_service.obter_tabela('series') == novas
+        assert _consultas_tabela(cursor) == ["SELECT * FROM series"]
+
+    @patch('src.services.referencia_service.get_cursor')
+    def test_sem_tabela_de_versoes_sempre_le_do_banco(self, mock_get_cursor, estado_limpo):
+        cursor = MagicMock()
+
+        def execute(sql, params=None):
+            if 'versao_tabelas' in sql:
+                raise RuntimeError("Table 'versao_tabelas' doesn't exist")
+            cursor.fetchall.return_value = list(SERIES)
+
+        cursor.execute.side_effect = execute
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+
+        referencia_service.obter_tabela('series')
+        referencia_service.obter_tabela('series')
+
+        assert _consultas_tabela(cursor) == ["SELECT * FROM series"] * 2
+        assert estado_limpo.remover() == 0
+
+    def test_tabela_desconhecida(self):
+        with pytest.raises(ValueError):
+            referencia_service.obter_tabela('alunos')
+
+
+class TestListagens:
+
+    @patch('src.services.referencia_service.get_cursor')
+    def test_filtra_e_ordena_em_memoria(self, mock_get_cursor):
+        mock_get_cursor.return_value.__enter__.return_value = _cursor()
+
+        series = referencia_service.listar_series(nivel_id=2)
+
+        assert [s['nome'] for s in series] == ['1º Ano', '2º Ano']
+
+    @patch('src.services.referencia_service.obter_tabela')
+    def test_turmas_por_ids_permitidos(self, mock_obter):
+        mock_obter.return_value = [
+            {'id': 1, 'nome': 'B', 'serie_id': 3, 'ano_letivo_id': 7, 'escola_id': 60},
+            {'id': 2, 'nome': 'a', 'serie_id': 3, 'ano_letivo_id': 7, 'escola_id': 60},
+            {'id': 3, 'nome': 'C', 'serie_id': 3, 'ano_letivo_id': 6, 'escola_id': 60},
+        ]
+
+        assert [t['id'] for t in referencia_service.listar_turmas(serie_id=3, ano_letivo_id=7)] == [2, 1]
+        assert [t['id'] for t in referencia_service.listar_turmas(serie_id=3, ano_letivo_id=7, ids=[1])] == [1]
@@ -0,0 +1,111 @@
+"""
+Testes do motor de declarações em lote (src.gestores.servicos_lote_documentos)
+Verifica a consulta única para várias séries e o texto gerado por série
+"""
+
+import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+PyPDF2 = pytest.importorskip("PyPDF2")
+servicos = pytest.importorskip("src.gestores.servicos_lote_documentos")
+
+SERIES = [(11, '1º Ano'), (12, '2º ANO'), (16, '6º Ano'), (19, '9º Ano'), (20, 'Educação Infantil')]
+
+
+def _aluno(aluno_id, nome, serie_id, sexo='M', responsaveis='JOSE SILVA e MARIA SILVA', status='Ativo'):
+    return (aluno_id, nome, datetime.date(2015, 3, 7), 'São Luís', 'MA', 'A', 'MAT',
+            'Escola Municipal', status, sexo, responsaveis, serie_id)
+
+
+def _conexao(alunos):
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (5,)
+    cursor.fetchall.side_effect = [SERIES, alunos]
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    return conn, cursor
+
+
+class TestNumeroSerie:
+
+    @pytest.mark.parametrize('nome, esperado', [
+        ('1º Ano', 1), ('9º ANO', 9), ('3 ANO', 3), ('Turma do 7º ano', 7), ('Educação Infantil', None), (None, None),
+    ])
+    def test_extrai_ano(self, nome, esperado):
+        assert servicos.numero_serie(nome) == esperado
+
+
+class TestMontarTextoDeclaracao:
+
+    def test_concordancia_feminina_e_rotulo(self):
+        aluno = dict(zip(servicos._CAMPOS_ALUNO, _aluno(1, 'Ana Souza', 16, sexo='F')))
+
+        texto = servicos.montar_texto_declaracao(aluno, servicos.SERIES_DECLARACAO[6], 2025)
+
+        assert 'que ANA SOUZA, nascida no dia 07 de Março de 2015' in texto
+        assert 'filha de JOSE SILVA, e de MARIA SILVA' in texto
+        assert 'está ativo no 6º ANO do Ensino Fundamental Anos Finais, na ESCOLA MUNICIPAL' in texto
+        assert 'no turno Matutino' in texto
+
+    def test_modelo_9ano_sem_virgula_e_responsaveis_ausentes(self):
+        aluno = dict(zip(servicos._CAMPOS_ALUNO, _aluno(1, 'Bruno', 19, responsaveis=None, status='Aprovado')))
+
+        texto = servicos.montar_texto_declaracao(aluno, servicos.SERIES_DECLARACAO[9], 2025)
+
+        assert 'filho de --- e de ---' in texto
+        assert 'está aprovado no 9º ANO' in texto
+        assert 'Situação Acadêmica: Aprovado' in texto
+
+
+class TestGerarDeclaracoesEmLote:
+
+    @patch('src.gestores.servicos_lote_documentos.conectar_bd')
+    def test_escola_inteira_em_uma_consulta(self, mock_conectar, tmp_path):
+        alunos = [_aluno(1, 'Carla', 19, sexo='F'), _aluno(2, 'Davi', 11), _aluno(3, 'Eva', 12, sexo='F')]
+        conn, cursor = _conexao(alunos)
+        mock_conectar.return_value = conn
+        progresso = []
+        saida = str(tmp_path / 'escola.pdf')
+
+        resultado = servicos.gerar_declaracoes_em_lote(
+            output_filename=saida, ao_progredir=lambda feitos, total: progresso.append((feitos, total))
+        )
+
+        assert mock_conectar.call_count == 1
+        sql, params = cursor.execute.call_args_list[-1][0]
+        assert 't.serie_id IN (%s,%s,%s,%s)' in sql
+        assert params == [5, 11, 12, 16, 19]
+        assert resultado['arquivo'] == saida
+        assert resultado['por_serie'] == {1: 1, 2: 1, 9: 1}
+        assert set(resultado['tempos']) == {'consulta', 'montagem', 'renderizacao', 'total'}
+        assert progresso[-1] == (3, 3)
+
+        # Ordenado por ano, com o título de cada série
+        textos = [p.extract_text() for p in PyPDF2.PdfReader(saida).pages]
+        assert 'DAVI' in textos[0] and 'TRANSFERÊNCIA' not in textos[0]
+        assert 'EVA' in textos[1] and 'TRANSFERÊNCIA' in textos[1]
+        assert 'CARLA' in textos[2]
+
+    @patch('src.gestores.servicos_lote_documentos.conectar_bd')
+    def test_serie_unica_pelo_wrapper(self, mock_conectar, tmp_path):
+        conn, cursor = _conexao([_aluno(2, 'Davi', 11)])
+        mock_conectar.return_value = conn
+        saida = str(tmp_path / '1ano.pdf')
+
+        assert servicos.gerar_declaracoes_1ano_combinadas(saida) == saida
+        sql, params = cursor.execute.call_args_list[-1][0]
+        assert params == [5, 11]
+
+    @patch('src.gestores.servicos_lote_documentos.conectar_bd')
+    def test_sem_alunos(self, mock_conectar):
+        conn, _ = _conexao([])
+        mock_conectar.return_value = conn
+
+        assert servicos.gerar_declaracoes_em_lote([4]) is None
+        conn.close.assert_called_once()
+
+    def test_serie_sem_modelo(self):
+        with pytest.raises(ValueError):
+            servicos.gerar_declaracoes_em_lote([10])
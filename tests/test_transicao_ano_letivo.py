@@ -249,6 +249,174 @@ class TestQueriesTransicao:
             assert resultado == True
             assert mock_ctx.execute.call_count >= 1  # Cria tabela + insere
 
+    def test_get_mapa_progressao_prioriza_turno_e_nome(self):
+        """Progressão em memória deve seguir a prioridade da query individual"""
+        from db.queries_transicao import QueriesTransicao
+        
+        mapa_turmas = {
+            # Ano de origem (id=1)
+            10: {'turma_id': 10, 'turma_nome': 'A', 'serie_id': 3, 'turno': 'MAT', 'ano_letivo_id': 1},
+            11: {'turma_id': 11, 'turma_nome': 'B', 'serie_id': 3, 'turno': 'VESP', 'ano_letivo_id': 1},
+            12: {'turma_id': 12, 'turma_nome': '', 'serie_id': 4, 'turno': 'MAT', 'ano_letivo_id': 1},
+            # Ano de destino (id=2)
+            20: {'turma_id': 20, 'turma_nome': 'B', 'serie_id': 4, 'turno': 'MAT', 'ano_letivo_id': 2},
+            21: {'turma_id': 21, 'turma_nome': 'A', 'serie_id': 4, 'turno': 'MAT', 'ano_letivo_id': 2},
+            22: {'turma_id': 22, 'turma_nome': 'C', 'serie_id': 4, 'turno': 'VESP', 'ano_letivo_id': 2},
+        }
+        
+        mapa = QueriesTransicao.get_mapa_progressao(60, 2, mapa_turmas=mapa_turmas)
+        
+        assert mapa[10] == 21  # mesmo turno + mesmo nome
+        assert mapa[11] == 22  # mesmo turno
+        assert mapa[12] == 12  # sem série seguinte no destino
+    
+    def test_criar_matriculas_em_lote(self):
+        """Deve inserir em lotes de tamanho fixo e reportar progresso por lote"""
+        from db.queries_transicao import QueriesTransicao, QUERY_CRIAR_MATRICULA
+        
+        cursor = MagicMock()
+        progresso = []
+        pares = [(aluno_id, 10) for aluno_id in range(1, 26)]
+        
+        criadas = QueriesTransicao.criar_matriculas_em_lote(
+            cursor, pares, 7, tamanho_lote=10,
+            ao_progredir=lambda c, t: progresso.append((c, t))
+        )
+        
+        assert criadas == 25
+        assert cursor.executemany.call_count == 3
+        query, primeiro_lote = cursor.executemany.call_args_list[0][0]
+        assert query == QUERY_CRIAR_MATRICULA
+        assert primeiro_lote[0] == (1, 10, 7)
+        assert progresso == [(10, 25), (20, 25), (25, 25)]
+
+
+class TestRolloverEmLote:
+    """Testes do motor de rematrícula em massa"""
+    
+    def _executar(self, dry_run, alunos_normais, alunos_reprovados, mapa_progressao):
+        from src.services import transicao_service
+        
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchone.return_value = {'id': 2}
+        cursor.rowcount = len(alunos_normais)
+        ctx = MagicMock()
+        ctx.__enter__ = MagicMock(return_value=conn)
+        ctx.__exit__ = MagicMock(return_value=False)
+        
+        with patch.object(transicao_service, 'get_connection', return_value=ctx), \
+             patch.object(transicao_service.QueriesTransicao, 'get_turmas_9ano', return_value=[]), \
+             patch.object(transicao_service.QueriesTransicao, 'get_alunos_para_rematricular',
+                          return_value=(alunos_normais, alunos_reprovados)), \
+             patch.object(transicao_service.QueriesTransicao, 'get_mapa_progressao',
+                          return_value=mapa_progressao):
+            resultado = transicao_service.executar_rollover(60, 1, 2026, dry_run=dry_run)
+        return resultado, conn, cursor
+    
+    def test_rollover_promove_e_retem(self):
+        alunos_normais = [
+            {'aluno_id': 1, 'turma_id': 10},
+            {'aluno_id': 2, 'turma_id': 10},
+        ]
+        alunos_reprovados = [{'aluno_id': 2, 'turma_id': 10}, {'aluno_id': 3, 'turma_id': 11}]
+        
+        resultado, conn, cursor = self._executar(False, alunos_normais, alunos_reprovados, {10: 20, 11: 21})
+        
+        assert resultado['matriculas_criadas'] == 3
+        assert resultado['alunos_promovidos'] == 1
+        assert resultado['alunos_retidos'] == 2
+        linhas = cursor.executemany.call_args[0][1]
+        assert sorted(linhas) == [(1, 20, 2), (2, 10, 2), (3, 11, 2)]
+        conn.commit.assert_called()
+        conn.rollback.assert_not_called()
+    
+    def test_rollover_dry_run_faz_rollback(self):
+        resultado, conn, cursor = self._executar(True, [{'aluno_id': 1, 'turma_id': 10}], [], {10: 20})
+        
+        assert resultado['matriculas_criadas'] == 1
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+    
+    def test_rollover_com_ano_resolvido_nao_cria_ano(self):
+        from src.services import transicao_service
+        
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        ctx = MagicMock()
+        ctx.__enter__ = MagicMock(return_value=conn)
+        ctx.__exit__ = MagicMock(return_value=False)
+        
+        with patch.object(transicao_service, 'get_connection', return_value=ctx), \
+             patch.object(transicao_service.QueriesTransicao, 'get_turmas_9ano', return_value=[]), \
+             patch.object(transicao_service.QueriesTransicao, 'get_alunos_para_rematricular',
+                          return_value=([{'aluno_id': 1, 'turma_id': 10}], [])), \
+             patch.object(transicao_service.QueriesTransicao, 'get_mapa_progressao',
+                          return_value={10: 20}):
+            transicao_service.executar_rollover(60, 1, 2026, novo_ano_id=7)
+        
+        sqls = [c.args[0] for c in cursor.execute.call_args_list]
+        assert transicao_service.QUERY_CRIAR_ANO_LETIVO not in sqls
+        assert cursor.executemany.call_args[0][1] == [(1, 20, 7)]
+
+
+class TestTransicaoEmLote:
+    """Testes da transição de várias escolas em paralelo"""
+    
+    def test_falha_de_uma_escola_nao_afeta_as_demais(self):
+        from src.services import transicao_service
+        
+        def rollover_falso(escola_id, **kwargs):
+            if escola_id == 61:
+                raise RuntimeError("turma sem série")
+            return {
+                'novo_ano_id': 2, 'matriculas_criadas': 10, 'matriculas_encerradas': 12,
+                'alunos_promovidos': 9, 'alunos_retidos': 1, 'tempos': {},
+            }
+        
+        with patch.object(transicao_service, 'resolver_ano_letivo', return_value=2) as mock_resolver, \
+             patch.object(transicao_service, 'executar_rollover', side_effect=rollover_falso) as mock_rollover, \
+             patch.object(transicao_service.QueriesTransicao, 'get_total_matriculas_ativas', return_value=15), \
+             patch.object(transicao_service.QueriesTransicao, 'get_alunos_a_excluir', return_value=2), \
+             patch.object(transicao_service.QueriesTransicao, 'registrar_auditoria') as mock_auditoria:
+            relatorio = transicao_service.executar_transicao_escolas(
+                [60, 61, 62], {'id': 1, 'ano_letivo': 2025}, 2026, usuario='admin', max_workers=3
+            )
+        
+        assert relatorio['sucesso'] == [60, 62]
+        assert relatorio['falhas'] == [61]
+        assert relatorio['escolas'][61]['erro'] == "turma sem série"
+        assert relatorio['escolas'][60]['alunos_concluintes'] == 3
+        assert relatorio['totais']['matriculas_criadas'] == 20
+        mock_resolver.assert_called_once_with(2026, criar=True)
+        assert {c.kwargs['novo_ano_id'] for c in mock_rollover.call_args_list} == {2}
+        
+        status_por_escola = {
+            c.kwargs['escola_id']: c.kwargs['status'] for c in mock_auditoria.call_args_list
+        }
+        assert status_por_escola == {60: 'sucesso', 61: 'erro', 62: 'sucesso'}
+    
+    def test_dry_run_nao_registra_auditoria(self):
+        from src.services import transicao_service
+        
+        resultado = {
+            'novo_ano_id': 2, 'matriculas_criadas': 1, 'matriculas_encerradas': 1,
+            'alunos_promovidos': 1, 'alunos_retidos': 0, 'tempos': {},
+        }
+        with patch.object(transicao_service, 'resolver_ano_letivo', return_value=2) as mock_resolver, \
+             patch.object(transicao_service, 'executar_rollover', return_value=resultado) as mock_rollover, \
+             patch.object(transicao_service.QueriesTransicao, 'get_total_matriculas_ativas', return_value=1), \
+             patch.object(transicao_service.QueriesTransicao, 'get_alunos_a_excluir', return_value=0), \
+             patch.object(transicao_service.QueriesTransicao, 'registrar_auditoria') as mock_auditoria:
+            relatorio = transicao_service.executar_transicao_escolas(
+                [60], {'id': 1, 'ano_letivo': 2025}, 2026, dry_run=True, max_workers=1
+            )
+        
+        assert relatorio['sucesso'] == [60]
+        assert mock_rollover.call_args.kwargs['dry_run'] is True
+        mock_resolver.assert_called_once_with(2026, criar=False)
+        mock_auditoria.assert_not_called()
+
 
 class TestBackup:
     """Testes do sistema de backup"""
@@ -0,0 +1,100 @@
+"""
+Testes unitários para ui.search.PesquisaAssincrona
+
+Usa um Treeview falso cujo ``after`` guarda os callbacks, para simular o
+loop de eventos passo a passo.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.services.busca_pessoas_service import Pessoa, TIPO_ALUNO
+from src.ui import search
+from src.ui.search import PesquisaAssincrona
+
+
+class TreeviewFalso:
+    def __init__(self):
+        self.linhas = []
+        self.pendentes = {}
+        self._proximo = 0
+
+    def after(self, ms, fn):
+        self._proximo += 1
+        self.pendentes[str(self._proximo)] = fn
+        return str(self._proximo)
+
+    def after_cancel(self, after_id):
+        self.pendentes.pop(after_id, None)
+
+    def rodar(self):
+        while self.pendentes:
+            after_id = next(iter(self.pendentes))
+            self.pendentes.pop(after_id)()
+
+    def winfo_exists(self):
+        return True
+
+    def get_children(self):
+        return list(range(len(self.linhas)))
+
+    def delete(self, *itens):
+        self.linhas = []
+
+    def insert(self, pai, posicao, values):
+        self.linhas.append(values)
+
+
+@pytest.fixture
+def pesquisas():
+    """Executa a pesquisa 'em segundo plano' na hora e registra os textos."""
+    feitas = []
+
+    def submit(fn, *args, on_done=None, on_error=None, janela=None, **kwargs):
+        feitas.append(args[0])
+        resultado = fn(*args, **kwargs)
+        janela.after(0, lambda: on_done(resultado))
+
+    def pesquisar(texto, cancelado=lambda: False):
+        return [Pessoa(i, f'{texto} {i}', TIPO_ALUNO, None, None, '') for i in range(5)]
+
+    with patch.object(search, 'submit_background', side_effect=submit), \
+            patch.object(search.busca_pessoas_service, 'pesquisar', side_effect=pesquisar):
+        yield feitas
+
+
+def test_debounce_pesquisa_so_o_ultimo_texto(pesquisas):
+    tree = TreeviewFalso()
+    pesquisa = PesquisaAssincrona()
+
+    for texto in ('mar', 'mari', 'maria'):
+        pesquisa.agendar(texto, tree, atraso_ms=250, avisar=False)
+    tree.rodar()
+
+    assert pesquisas == ['maria']
+    assert tree.linhas[0][1] == 'maria 0'
+
+
+def test_resultados_em_lotes_e_superados_descartados(pesquisas):
+    tree = TreeviewFalso()
+    pesquisa = PesquisaAssincrona(lote=2)
+
+    pesquisa.agendar('ana', tree)
+    # Executa a pesquisa e o primeiro lote apenas
+    for _ in range(2):
+        after_id = next(iter(tree.pendentes))
+        tree.pendentes.pop(after_id)()
+    assert len(tree.linhas) == 2
+
+    pesquisa.agendar('bia', tree)
+    tree.rodar()
+
+    assert [linha[1] for linha in tree.linhas] == [f'bia {i}' for i in range(5)]
+
+
+def test_formatar_linha():
+    import datetime
+    pessoa = Pessoa(3, 'Ana', TIPO_ALUNO, None, datetime.date(2015, 2, 1), '')
+
+    assert search.formatar_linha(pessoa) == (3, 'Ana', TIPO_ALUNO, '', '01/02/2015')
@@ -0,0 +1,263 @@
+"""
+Testes unitários para ui.tabela_virtual
+
+Usa um Treeview falso que guarda itens e valores em memória, para conferir
+quantos itens são materializados e o que cada um exibe.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.ui.tabela_virtual import DadosTabela, ListaMarcavel, TreeviewVirtual, MARCADO
+from src.ui.table import TableManager
+
+
+class TreeviewFalso:
+    def __init__(self, colunas=('ID', 'Nome')):
+        self.colunas = list(colunas)
+        self.itens = {}
+        self.selecao = []
+        self.comandos = {}
+        self._proximo = 0
+
+    def __getitem__(self, chave):
+        return self.colunas
+
+    def configure(self, **kwargs):
+        pass
+
+    def bind(self, evento, funcao, add=None):
+        pass
+
+    def heading(self, coluna, command=None, **kwargs):
+        if command is not None:
+            self.comandos[coluna] = command
+
+    def column(self, coluna, **kwargs):
+        pass
+
+    def tag_configure(self, tag, **kwargs):
+        pass
+
+    def grid(self, **kwargs):
+        pass
+
+    pack = grid
+    yview = xview = None
+
+    def get_children(self):
+        return list(self.itens)
+
+    def insert(self, pai, posicao, values=()):
+        self._proximo += 1
+        iid = f'I{self._proximo}'
+        self.itens[iid] = {'values': values, 'tags': ()}
+        return iid
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.itens.pop(iid, None)
+
+    def item(self, iid, **opcoes):
+        self.itens[iid].update(opcoes)
+
+    def selection(self):
+        return self.selecao
+
+    def selection_set(self, itens):
+        self.selecao = list(itens)
+
+    def focus(self, iid=None):
+        pass
+
+    def yview_moveto(self, fracao):
+        pass
+
+    def exibidos(self, coluna=1):
+        return [v['values'][coluna] for v in self.itens.values()]
+
+
+def _dados(n):
+    return DadosTabela(['ID', 'Nome'], ([i, f'Aluno {i:05d}'] for i in range(n)))
+
+
+class TestDadosTabela:
+
+    def test_ordenar_sem_acento_com_vazios_no_fim(self):
+        dados = DadosTabela(['Nome'], [['Érica'], [None], ['beatriz'], ['Ana']])
+
+        dados.ordenar('Nome')
+        assert dados.coluna('Nome') == ['Ana', 'beatriz', 'Érica', None]
+
+        dados.ordenar('Nome', decrescente=True)
+        assert dados.coluna('Nome')[0] is None
+
+    def test_ordenar_numeros_como_numeros(self):
+        dados = DadosTabela(['ID'], [[10], ['9'], [100]])
+
+        dados.ordenar('ID')
+
+        assert dados.coluna('ID') == ['9', 10, 100]
+
+    def test_filtro_mantem_ordenacao_e_indices_originais(self):
+        dados = DadosTabela(['Nome', 'Série'], [['José', '6º'], ['Maria', '7º'], ['Josué', '7º']])
+        dados.ordenar('Nome', decrescente=True)
+
+        dados.filtrar('jos', colunas=['Nome'])
+        assert dados.coluna('Nome') == ['Josué', 'José']
+        assert dados.indices() == [2, 0]
+        assert dados.posicao(1) is None
+
+        dados.filtrar(predicado=lambda linha: linha[1] == '7º')
+        assert dados.coluna('Nome') == ['Maria', 'Josué']
+
+        dados.filtrar()
+        assert len(dados) == dados.total == 3
+
+    def test_de_dataframe_converte_nan(self):
+        df = pd.DataFrame({'ID': [1, 2], 'Cargo': ['Professor', float('nan')]})
+
+        dados = DadosTabela.de_dataframe(df)
+
+        assert dados.linha(1) == [2, None]
+
+
+class TestTreeviewVirtual:
+
+    def _visao(self, n=10000, **kwargs):
+        tree = TreeviewFalso()
+        scrollbar = MagicMock()
+        visao = TreeviewVirtual(tree, scrollbar, margem=5, **kwargs)
+        visao.visiveis = 20
+        visao.definir_dados(_dados(n))
+        return tree, scrollbar, visao
+
+    def test_materializa_so_a_janela_visivel(self):
+        tree, scrollbar, visao = self._visao()
+
+        assert len(tree.itens) == 25
+        assert tree.exibidos()[0] == 'Aluno 00000'
+        scrollbar.set.assert_called_with(0.0, 20 / 10000)
+
+    def test_rolagem_reaproveita_itens(self):
+        tree, _, visao = self._visao()
+        itens = tree.get_children()
+
+        visao._rolar('moveto', '0.5')
+        assert tree.exibidos()[0] == 'Aluno 05000'
+
+        visao._rolar('scroll', '1', 'pages')
+        assert tree.exibidos()[0] == 'Aluno 05020'
+
+        visao._rolar('moveto', '1.0')
+        assert tree.exibidos()[-1] == 'Aluno 09999'
+        assert tree.get_children()[:20] == itens[:20]
+
+    def test_lista_menor_que_a_janela(self):
+        tree, _, visao = self._visao(n=3)
+
+        assert tree.exibidos() == ['Aluno 00000', 'Aluno 00001', 'Aluno 00002']
+
+        visao.filtrar('nada')
+        assert tree.itens == {}
+
+    def test_selecao_sobrevive_a_rolagem_e_ordenacao(self):
+        tree, _, visao = self._visao()
+        navegacoes = []
+        visao.ao_navegar = navegacoes.append
+
+        visao._mover_para(3, 'evento')
+        assert visao.linha_selecionada() == [3, 'Aluno 00003']
+        assert tree.itens[tree.selection()[0]]['values'][1] == 'Aluno 00003'
+        assert navegacoes == ['evento']
+
+        visao._rolar('moveto', '0.5')
+        assert tree.selection() == []
+
+        tree.comandos['Nome']()  # clique no cabeçalho: crescente (já estava)
+        tree.comandos['Nome']()  # segundo clique: decrescente
+        assert tree.exibidos()[0] != 'Aluno 00000'
+        assert visao.dados.posicao(3) == 9996
+        assert visao.inicio <= 9996 < visao.inicio + visao.visiveis
+        assert visao.linha_selecionada() == [3, 'Aluno 00003']
+
+    def test_teclado_desce_e_rola(self):
+        tree, _, visao = self._visao()
+
+        visao._mover_para(19)
+        assert visao._mover_selecao(1) == 'break'
+
+        assert visao.inicio == 1
+        assert visao.linha_selecionada()[0] == 20
+
+    def test_formatar_e_tags(self):
+        tree, _, visao = self._visao(
+            n=2,
+            formatar=lambda linha: [linha[0], linha[1].upper()],
+            tags=lambda linha: ('par',) if linha[0] % 2 == 0 else (),
+        )
+
+        assert tree.exibidos() == ['ALUNO 00000', 'ALUNO 00001']
+        assert [v['tags'] for v in tree.itens.values()] == [('par',), ()]
+
+
+class TestListaMarcavel:
+
+    def test_marcar_inverter_e_filtrar(self):
+        tree = TreeviewFalso()
+        alteracoes = []
+        with patch('src.ui.tabela_virtual.ttk.Treeview', return_value=tree), \
+                patch('src.ui.tabela_virtual.ttk.Scrollbar'):
+            lista = ListaMarcavel(MagicMock(), [('Nome', 200)], ao_alterar=lambda: alteracoes.append(1))
+        lista.visao.visiveis = 10
+        lista.definir([('Ana',), ('Bruno',), ('Bianca',)])
+
+        lista.filtrar('b')
+        lista.marcar(lista.visiveis())
+        assert lista.marcados == {1, 2}
+        assert tree.exibidos(0) == [MARCADO, MARCADO]
+
+        lista.filtrar('')
+        lista.inverter(lista.visiveis())
+        assert lista.marcados == {0}
+        assert [v['tags'] for v in tree.itens.values()] == [('marcado',), (), ()]
+        assert len(alteracoes) == 2
+
+        lista.marcar([1], avisar=False)
+        assert len(alteracoes) == 2
+
+
+class TestTableManagerVirtual:
+
+    @patch('src.ui.table.Frame')
+    @patch('src.ui.table.ttk.Treeview')
+    @patch('src.ui.table.ttk.Scrollbar')
+    @patch('src.ui.table.ttk.Style')
+    @patch('src.ui.table.Label')
+    def test_dados_vao_para_a_visao(self, mock_label, mock_style, mock_scrollbar,
+                                    mock_treeview, mock_frame_class):
+        tree = TreeviewFalso(['ID', 'Nome', 'Tipo', 'Cargo', 'Data'])
+        mock_treeview.return_value = tree
+        manager = TableManager(MagicMock(), {'co0': '#fff', 'co1': '#000', 'co4': '#00f'},
+                               virtual=True)
+        manager.criar_tabela(colunas=tree.colunas)
+        manager.visao.visiveis = 2
+
+        manager.atualizar_dados([
+            {'ID': i, 'Nome': f'Aluno {i}', 'Tipo': 'Aluno', 'Cargo': None, 'Data': '2015-02-01'}
+            for i in range(100)
+        ])
+
+        assert len(tree.itens) == 2 + manager.visao.margem
+        assert tree.exibidos(4)[0] == '01/02/2015'
+
+        manager.visao._mover_para(50)
+        manager.visao._rolar('moveto', '0')
+        assert manager.get_selected_item()['Nome'] == 'Aluno 50'
+
+        manager.filtrar('aluno 7')
+        assert len(manager.visao.dados) == 11
+
+        manager.limpar()
+        assert tree.itens == {}
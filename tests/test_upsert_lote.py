@@ -0,0 +1,68 @@
+"""
+Testes da gravação em lote (db.upsert_lote)
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from db.upsert_lote import contar_atualizadas, montar_sql_upsert, upsert_em_lote
+
+
+COLUNAS = ('aluno_id', 'bimestre', 'ano_letivo_id', 'faltas')
+
+
+class TestMontarSql:
+
+    def test_atualiza_colunas_informadas(self):
+        sql = montar_sql_upsert('faltas_bimestrais', COLUNAS, ('faltas',))
+
+        assert sql == (
+            "INSERT INTO faltas_bimestrais (aluno_id, bimestre, ano_letivo_id, faltas) "
+            "VALUES (%s, %s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE faltas=VALUES(faltas)"
+        )
+
+    def test_rejeita_identificador_invalido(self):
+        with pytest.raises(ValueError):
+            montar_sql_upsert('faltas; DROP TABLE alunos', COLUNAS, ('faltas',))
+
+    def test_rejeita_coluna_fora_do_insert(self):
+        with pytest.raises(ValueError):
+            montar_sql_upsert('faltas_bimestrais', COLUNAS, ('observacao',))
+
+
+class TestUpsertEmLote:
+
+    def test_envia_em_blocos_e_soma_afetadas(self):
+        cursor = MagicMock()
+        cursor.rowcount = 3
+        linhas = [(i, '1º bimestre', 5, 0) for i in range(5)]
+
+        afetadas = upsert_em_lote(cursor, 'faltas_bimestrais', COLUNAS, linhas,
+                                  atualizar=('faltas',), tamanho_bloco=2)
+
+        assert afetadas == 9
+        blocos = [c.args[1] for c in cursor.executemany.call_args_list]
+        assert [len(b) for b in blocos] == [2, 2, 1]
+        assert cursor.execute.call_count == 0
+        cursor.connection.commit.assert_not_called()
+
+    def test_sem_linhas_nao_acessa_o_banco(self):
+        cursor = MagicMock()
+
+        assert upsert_em_lote(cursor, 'faltas_bimestrais', COLUNAS, []) == 0
+        cursor.executemany.assert_not_called()
+
+    def test_linha_com_tamanho_errado(self):
+        cursor = MagicMock()
+
+        with pytest.raises(ValueError):
+            upsert_em_lote(cursor, 'faltas_bimestrais', COLUNAS, [(1, '1º bimestre', 5)])
+        cursor.executemany.assert_not_called()
+
+
+def test_contar_atualizadas():
+    # 2 inseridas (1 cada) + 3 alteradas (2 cada); linhas iguais contam 0
+    assert contar_atualizadas(8, 2) == 3
+    assert contar_atualizadas(0, 0) == 0
@@ -9,7 +9,7 @@ from datetime import datetime, timedelta
 class TestConnectionPool:
     """Testes para pool de conexões do banco"""
     
-    @patch('db.connection.pooling.MySQLConnectionPool')
+    @patch('db.connection.PoolConexoes')
     def test_inicializar_pool(self, mock_pool):
         """Deve inicializar pool de conexões"""
         from db.connection import inicializar_pool